@@ -0,0 +1,75 @@
+"""stamp project document bodies with a revision counter
+
+Revision ID: 20261018_0014
+Revises: 20260801_0013
+Create Date: 2026-10-18 09:00:00.000000
+
+The process-wide parsed-document cache keys saved versions and drafts by a
+content stamp it can read without fetching the JSONB body. ``updated_at`` is
+not enough: maintenance scripts and tests rewrite ``body`` directly. A trigger
+draws a fresh value from one shared sequence whenever ``body`` is assigned, so
+every body write — app, script, or hand-run SQL — yields a never-reused stamp.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0014"
+down_revision: str | None = "20260801_0013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE project_document_body_revision_seq")
+    op.execute(
+        """
+        ALTER TABLE project_versions
+        ADD COLUMN body_revision bigint NOT NULL
+            DEFAULT nextval('project_document_body_revision_seq')
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE project_version_drafts
+        ADD COLUMN body_revision bigint NOT NULL
+            DEFAULT nextval('project_document_body_revision_seq')
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION stamp_project_document_body_revision() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.body_revision := nextval('project_document_body_revision_seq');
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_project_versions_body_revision
+        BEFORE UPDATE OF body ON project_versions
+        FOR EACH ROW EXECUTE FUNCTION stamp_project_document_body_revision()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_project_version_drafts_body_revision
+        BEFORE UPDATE OF body ON project_version_drafts
+        FOR EACH ROW EXECUTE FUNCTION stamp_project_document_body_revision()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_project_version_drafts_body_revision ON project_version_drafts")
+    op.execute("DROP TRIGGER IF EXISTS trg_project_versions_body_revision ON project_versions")
+    op.execute("DROP FUNCTION IF EXISTS stamp_project_document_body_revision()")
+    op.execute("ALTER TABLE project_version_drafts DROP COLUMN IF EXISTS body_revision")
+    op.execute("ALTER TABLE project_versions DROP COLUMN IF EXISTS body_revision")
+    op.execute("DROP SEQUENCE IF EXISTS project_document_body_revision_seq")
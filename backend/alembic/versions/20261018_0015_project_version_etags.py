@@ -0,0 +1,55 @@
+"""store each saved version's content ETag
+
+Revision ID: 20261018_0015
+Revises: 20261018_0014
+Create Date: 2026-10-18 12:00:00.000000
+
+Every draft write used to re-hash the saved version body just to advertise and
+gate on its ETag. Save and Save As now write the ETag alongside the body, and
+readers fill it in lazily for rows written before this revision (the ETag is
+computed from the canonical serialization in Python, so there is no SQL
+backfill). A trigger clears the stored value whenever ``body`` is rewritten
+without a matching ETag — maintenance scripts and hand-run SQL — so a stale
+ETag can never outlive its body.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0015"
+down_revision: str | None = "20261018_0014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE project_versions ADD COLUMN version_etag text")
+    op.execute(
+        """
+        CREATE FUNCTION clear_stale_project_version_etag() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.version_etag IS NOT DISTINCT FROM OLD.version_etag THEN
+                NEW.version_etag := NULL;
+            END IF;
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_project_versions_version_etag
+        BEFORE UPDATE OF body ON project_versions
+        FOR EACH ROW EXECUTE FUNCTION clear_stale_project_version_etag()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_project_versions_version_etag ON project_versions")
+    op.execute("DROP FUNCTION IF EXISTS clear_stale_project_version_etag()")
+    op.execute("ALTER TABLE project_versions DROP COLUMN IF EXISTS version_etag")
@@ -0,0 +1,57 @@
+"""shared cache table for envelope calculation results
+
+Revision ID: 20261018_0016
+Revises: 20261018_0015
+Create Date: 2026-10-18 15:00:00.000000
+
+Thermal and condensation results are pure functions of their input hash. The
+process-local LRU in front of them starts cold in every worker and after every
+deploy, so this table is the shared second tier. Rows carry the calculation
+version of the code that wrote them, and readers ignore rows from any other
+version. ``result_json`` is the serialized result model as text, not jsonb:
+Postgres numerics would fold -0.0 into 0.0 and the cached payload must be
+byte-identical to a fresh calculation. ``last_used_at`` orders size-based
+eviction.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0016"
+down_revision: str | None = "20261018_0015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE public.envelope_calculation_results (
+            kind text NOT NULL,
+            input_hash text NOT NULL,
+            calculation_version integer NOT NULL,
+            result_json text NOT NULL,
+            size_bytes integer NOT NULL,
+            hit_count bigint DEFAULT 0 NOT NULL,
+            created_at timestamptz DEFAULT now() NOT NULL,
+            last_used_at timestamptz DEFAULT now() NOT NULL,
+            PRIMARY KEY (kind, input_hash),
+            CONSTRAINT ck_envelope_calculation_results_kind
+                CHECK (kind IN ('condensation', 'thermal')),
+            CONSTRAINT ck_envelope_calculation_results_size CHECK (size_bytes >= 0)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_envelope_calculation_results_last_used_at
+        ON public.envelope_calculation_results (last_used_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS public.envelope_calculation_results")
@@ -0,0 +1,77 @@
+"""index of attachment references held by project document bodies
+
+Revision ID: 20261018_0017
+Revises: 20261018_0016
+Create Date: 2026-10-18 18:00:00.000000
+
+Orphan sweeps, bulk-download filters and reference checks used to parse every
+saved and draft body of a project to learn which assets they reference. This
+table holds one row per attachment reference per stored body, maintained by
+the document write paths, so those questions become indexed queries.
+
+``draft_user_id`` is NULL for a saved version body and the draft owner for a
+draft body; the composite foreign key only applies to draft rows, so deleting
+a draft or a version drops its references with it.
+
+``asset_references_revision`` on each body row records the ``body_revision``
+its references were indexed at. A body written by any path that does not
+maintain the index (a script, hand-run SQL, rows that predate this migration)
+has a fresh ``body_revision`` from the existing trigger, so it reads as stale
+and callers fall back to parsing it until ``scripts/rebuild_asset_references``
+backfills it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0017"
+down_revision: str | None = "20261018_0016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE public.project_asset_references (
+            project_id uuid NOT NULL,
+            version_id uuid NOT NULL,
+            draft_user_id uuid,
+            table_key text NOT NULL,
+            field_key text NOT NULL,
+            row_id text,
+            row_name text,
+            row_index integer NOT NULL,
+            position integer NOT NULL,
+            asset_id text NOT NULL,
+            CONSTRAINT fk_project_asset_references_version
+                FOREIGN KEY (version_id) REFERENCES public.project_versions (id) ON DELETE CASCADE,
+            CONSTRAINT fk_project_asset_references_draft
+                FOREIGN KEY (version_id, draft_user_id)
+                REFERENCES public.project_version_drafts (version_id, user_id) ON DELETE CASCADE
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_project_asset_references_project_asset
+        ON public.project_asset_references (project_id, asset_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_project_asset_references_body
+        ON public.project_asset_references (version_id, draft_user_id, table_key)
+        """
+    )
+    op.execute("ALTER TABLE public.project_versions ADD COLUMN asset_references_revision bigint")
+    op.execute("ALTER TABLE public.project_version_drafts ADD COLUMN asset_references_revision bigint")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE public.project_version_drafts DROP COLUMN IF EXISTS asset_references_revision")
+    op.execute("ALTER TABLE public.project_versions DROP COLUMN IF EXISTS asset_references_revision")
+    op.execute("DROP TABLE IF EXISTS public.project_asset_references")
@@ -0,0 +1,94 @@
+"""notify listeners when a session, user or capability grant changes
+
+Revision ID: 20261018_0018
+Revises: 20261018_0017
+Create Date: 2026-10-18 21:00:00.000000
+
+Each API process keeps a short-lived cache of validated sessions and the
+principal inputs (``is_staff`` + global grants) behind them. Entries must drop
+as soon as the rows they were read from change, whichever process, script or
+hand-run SQL changes them. These triggers publish the affected user id on the
+``auth_principal_changed`` channel; the payload is empty for a ``TRUNCATE``,
+which tells listeners to drop everything. Postgres delivers notifications on
+commit and folds duplicates within a transaction.
+
+Only the columns the cache holds are watched: ``touch_session`` rewrites
+``last_seen_at`` and ``expires_at`` on every throttled request and must not
+fan out a notification.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0018"
+down_revision: str | None = "20261018_0017"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION notify_auth_principal_changed() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changed record;
+        BEGIN
+            IF TG_LEVEL = 'STATEMENT' THEN
+                PERFORM pg_notify('auth_principal_changed', '');
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                changed := OLD;
+            ELSE
+                changed := NEW;
+            END IF;
+            IF TG_TABLE_NAME = 'users' THEN
+                PERFORM pg_notify('auth_principal_changed', changed.id::text);
+            ELSE
+                PERFORM pg_notify('auth_principal_changed', changed.user_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_users_auth_principal_changed
+        AFTER UPDATE OF email, display_name, units_preference, is_staff, deleted_at OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_auth_principal_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_sessions_auth_principal_changed
+        AFTER UPDATE OF invalidated_at OR DELETE ON sessions
+        FOR EACH ROW EXECUTE FUNCTION notify_auth_principal_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_user_grants_auth_principal_changed
+        AFTER INSERT OR UPDATE OR DELETE ON user_grants
+        FOR EACH ROW EXECUTE FUNCTION notify_auth_principal_changed()
+        """
+    )
+    for table in ("users", "sessions", "user_grants"):
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_auth_principal_truncated
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_auth_principal_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in ("users", "sessions", "user_grants"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_auth_principal_truncated ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_auth_principal_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_auth_principal_changed()")
@@ -0,0 +1,46 @@
+"""shared rate-limit state for multi-worker deployments
+
+Revision ID: 20261018_0019
+Revises: 20261018_0018
+Create Date: 2026-10-18 22:00:00.000000
+
+One row per (budget, key) for the ``postgres`` backend of
+``features/shared/rate_limit.py``. The table is UNLOGGED: its contents are
+throwaway counters, so skipping the WAL is worth losing them on a crash
+(every client simply starts with a fresh budget). ``idle_after`` is when the
+row becomes indistinguishable from a fresh key; the limiter deletes rows past
+it periodically.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0019"
+down_revision: str | None = "20261018_0018"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE rate_limit_buckets (
+            budget text NOT NULL,
+            key text NOT NULL,
+            algorithm text NOT NULL,
+            stamp double precision,
+            current_count double precision NOT NULL,
+            previous_count double precision NOT NULL,
+            idle_after timestamptz NOT NULL,
+            PRIMARY KEY (budget, key)
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_rate_limit_buckets_idle_after ON rate_limit_buckets (idle_after)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limit_buckets")
@@ -0,0 +1,75 @@
+"""index of catalog option labels held by project document bodies
+
+Revision ID: 20261018_0020
+Revises: 20261018_0019
+Create Date: 2026-10-18 23:00:00.000000
+
+Catalog option cascades (relabels and manufacturer merges) used to load every
+active project's body and parse it just to learn which projects mention the
+old label. This table holds, per stored body, how many catalog-origin rows
+carry each frame/glazing option label and which labels each manufacturer
+filter lists, so cascade previews and target lists become indexed queries.
+
+``table_key`` is the document table (``project_frames``, ``project_glazings``
+or ``manufacturer_filters``), ``catalog_table`` the catalog the label belongs
+to. ``draft_user_id`` and the foreign keys follow
+``project_asset_references``.
+
+``option_usage_revision`` on each body row records the ``body_revision`` its
+usage was indexed at. Bodies written by paths that do not maintain the index
+read as stale and are parsed by the cascade until
+``scripts/rebuild_catalog_option_usage`` backfills them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0020"
+down_revision: str | None = "20261018_0019"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE public.project_catalog_option_usage (
+            project_id uuid NOT NULL,
+            version_id uuid NOT NULL,
+            draft_user_id uuid,
+            table_key text NOT NULL,
+            catalog_table text NOT NULL,
+            field_key text NOT NULL,
+            label text NOT NULL,
+            row_count integer NOT NULL,
+            CONSTRAINT fk_project_catalog_option_usage_version
+                FOREIGN KEY (version_id) REFERENCES public.project_versions (id) ON DELETE CASCADE,
+            CONSTRAINT fk_project_catalog_option_usage_draft
+                FOREIGN KEY (version_id, draft_user_id)
+                REFERENCES public.project_version_drafts (version_id, user_id) ON DELETE CASCADE
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_project_catalog_option_usage_label
+        ON public.project_catalog_option_usage (catalog_table, field_key, label)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_project_catalog_option_usage_body
+        ON public.project_catalog_option_usage (version_id, draft_user_id)
+        """
+    )
+    op.execute("ALTER TABLE public.project_versions ADD COLUMN option_usage_revision bigint")
+    op.execute("ALTER TABLE public.project_version_drafts ADD COLUMN option_usage_revision bigint")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE public.project_version_drafts DROP COLUMN IF EXISTS option_usage_revision")
+    op.execute("ALTER TABLE public.project_versions DROP COLUMN IF EXISTS option_usage_revision")
+    op.execute("DROP TABLE IF EXISTS public.project_catalog_option_usage")
@@ -0,0 +1,47 @@
+"""persisted sun-path diagrams per project
+
+Revision ID: 20261018_0021
+Revises: 20261018_0020
+Create Date: 2026-10-18 23:30:00.000000
+
+The sun-path route rebuilt the whole ladybug diagram (analemmas, day arcs,
+compass and the 8,760-hour solar-position grid) on every request, although
+it is a pure function of a handful of location fields. This table keeps each
+project's finished diagram as gzip-compressed JSON, next to the key it was
+built from, so the route reads it back instead of rebuilding.
+
+``cache_key`` digests the rounded inputs and the builder version (see
+``features/project_location/sun_path_cache.py``). A row whose key no longer
+matches the project's location is simply rebuilt and overwritten, so a
+location edit needs no invalidation here.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0021"
+down_revision: str | None = "20261018_0020"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE public.project_sun_paths (
+            project_id uuid PRIMARY KEY,
+            cache_key text NOT NULL,
+            payload_gzip bytea NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT fk_project_sun_paths_project
+                FOREIGN KEY (project_id) REFERENCES public.projects (id) ON DELETE CASCADE
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS public.project_sun_paths")
@@ -0,0 +1,48 @@
+"""shared cache of external geodata lookups
+
+Revision ID: 20261018_0022
+Revises: 20261018_0021
+Create Date: 2026-10-18 23:45:00.000000
+
+Location derivation and address search call FCC/Census, USGS/Open-Meteo and
+the Census geocoder on every coordinate change or search. This table keeps
+each successful answer for a TTL, keyed by lookup kind (``county``,
+``elevation`` or ``address``) and rounded coordinates or normalized query
+text (see ``features/project_location/geodata_cache.py``), so every worker
+reuses it until it expires.
+
+``result`` is the parsed answer, not the raw provider response. Expired rows
+are ignored by reads, overwritten by the next lookup of their key, and swept
+periodically by the writers.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0022"
+down_revision: str | None = "20261018_0021"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE public.geodata_lookup_cache (
+            kind text NOT NULL,
+            lookup_key text NOT NULL,
+            result jsonb NOT NULL,
+            fetched_at timestamptz NOT NULL DEFAULT now(),
+            expires_at timestamptz NOT NULL,
+            PRIMARY KEY (kind, lookup_key)
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_geodata_lookup_cache_expires_at ON public.geodata_lookup_cache (expires_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS public.geodata_lookup_cache")
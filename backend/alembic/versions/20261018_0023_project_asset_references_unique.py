@@ -0,0 +1,63 @@
+"""one index row per attachment reference per stored body
+
+Revision ID: 20261018_0023
+Revises: 20261018_0022
+Create Date: 2026-10-18 23:55:00.000000
+
+``project_asset_references`` (migration 0017) had no key, so two writers
+indexing the same body could both insert a reference the other had just
+added. The index is maintained as a set diff, so a reference is identified by
+all of its columns; NULL ``draft_user_id``, ``row_id`` and ``row_name``
+compare equal (``NULLS NOT DISTINCT``, PostgreSQL 15+). Existing duplicates
+are dropped first, and writers insert with ``ON CONFLICT DO NOTHING``.
+
+The unique index leads with ``(version_id, draft_user_id, table_key)``, so it
+replaces ``ix_project_asset_references_body``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0023"
+down_revision: str | None = "20261018_0022"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_REFERENCE_COLUMNS = "version_id, draft_user_id, table_key, field_key, row_id, row_name, row_index, position, asset_id"
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        DELETE FROM public.project_asset_references r
+        USING (
+            SELECT ctid, row_number() OVER (PARTITION BY {_REFERENCE_COLUMNS}) AS copy
+            FROM public.project_asset_references
+        ) duplicate
+        WHERE r.ctid = duplicate.ctid
+          AND duplicate.copy > 1
+        """
+    )
+    op.execute(
+        f"""
+        ALTER TABLE public.project_asset_references
+        ADD CONSTRAINT uq_project_asset_references_reference
+            UNIQUE NULLS NOT DISTINCT ({_REFERENCE_COLUMNS})
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.ix_project_asset_references_body")
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_project_asset_references_body
+        ON public.project_asset_references (version_id, draft_user_id, table_key)
+        """
+    )
+    op.execute(
+        "ALTER TABLE public.project_asset_references DROP CONSTRAINT IF EXISTS uq_project_asset_references_reference"
+    )
@@ -0,0 +1,32 @@
+"""heartbeat for background project jobs
+
+Revision ID: 20261018_0024
+Revises: 20261018_0023
+Create Date: 2026-10-18 23:58:00.000000
+
+Bulk-download bundles are built in a request's background task, so a restart
+or deploy mid-job left its ``project_jobs`` row ``pending`` or ``running``
+forever. The worker now stamps ``heartbeat_at`` as it makes progress, and the
+status read fails a job whose heartbeat has lapsed (see
+``features/assets/repository.py::fail_stale_job``), as catalog option jobs
+already do.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261018_0024"
+down_revision: str | None = "20261018_0023"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE public.project_jobs ADD COLUMN heartbeat_at timestamptz")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE public.project_jobs DROP COLUMN IF EXISTS heartbeat_at")
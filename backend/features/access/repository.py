@@ -92,6 +92,32 @@ def active_global_capabilities_for_user(conn: Connection[Any], user_id: UUID) ->
     return frozenset(row["capability"] for row in rows)
 
 
+def get_principal_inputs(conn: Connection[Any], user_id: UUID) -> dict[str, Any]:
+    """Return ``is_staff`` and the active global capabilities in one round trip.
+
+    The same answers as ``get_user_is_staff`` plus
+    ``active_global_capabilities_for_user``; an unknown user reads as a
+    non-staff user with no grants, as those two do.
+    """
+    row = conn.execute(
+        """
+        SELECT
+            COALESCE((SELECT is_staff FROM users WHERE id = %(user_id)s), false) AS is_staff,
+            ARRAY(
+                SELECT DISTINCT capability
+                FROM user_grants
+                WHERE user_id = %(user_id)s
+                  AND scope_type = 'global'
+                  AND revoked_at IS NULL
+            ) AS global_capabilities
+        """,
+        {"user_id": user_id},
+    ).fetchone()
+    if row is None:
+        raise RuntimeError("Principal input query did not return a row.")
+    return row
+
+
 def list_active_grants_for_user(conn: Connection[Any], user_id: UUID) -> list[dict[str, Any]]:
     """Return every non-revoked grant for a user (the resolver's grant input)."""
     rows = conn.execute(
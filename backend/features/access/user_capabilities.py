@@ -18,22 +18,32 @@ from database import connection
 from features.access import repository
 from features.access.capabilities import capabilities_for
 from features.access.principals import UserPrincipal
-from features.auth import repository as auth_repository
+from features.auth import session_cache
 from features.auth.models import UserPublic
+from features.auth.session_cache import PrincipalInputs
 from features.shared.errors import api_error
 
 
 def build_user_principal(conn: Connection[Any], user: UserPublic) -> UserPrincipal:
     """Build a `UserPrincipal` with the resolver inputs (is_staff + global grants).
 
-    Two small indexed point-lookups. With no users or traffic yet that cost is
-    irrelevant; folding `is_staff` into the session JOIN and/or caching the
-    principal per request are deferred optimizations.
+    Served from the session cache when the request's session lookup (which
+    reads the same inputs) or an earlier request already cached them;
+    otherwise one combined query.
     """
+    inputs = session_cache.get_principal_inputs(user.id)
+    if inputs is None:
+        generation = session_cache.cache_generation()
+        row = repository.get_principal_inputs(conn, user.id)
+        inputs = PrincipalInputs(
+            is_staff=bool(row["is_staff"]),
+            global_capabilities=frozenset(row["global_capabilities"]),
+        )
+        session_cache.put_principal_inputs(user.id, inputs, generation)
     return UserPrincipal(
         user=user,
-        is_staff=auth_repository.get_user_is_staff(conn, user.id),
-        granted_capabilities=repository.active_global_capabilities_for_user(conn, user.id),
+        is_staff=inputs.is_staff,
+        granted_capabilities=inputs.global_capabilities,
     )
 
 
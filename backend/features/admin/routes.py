@@ -5,6 +5,10 @@ session cookie (401 for anonymous) and then requires the `admin.users.manage`
 capability (403 for a signed-in non-admin). The frontend nav guard is only
 convenience; this gate is authoritative. One-time invite/reset links are
 returned only from the create/reset responses, never from list or audit reads.
+
+The calculation-cache, asset-render-queue, rate-limit and password-hashing
+routes reuse the same gate: they are operational, not user management, but
+admin is the only operator audience there is.
 """
 
 from __future__ import annotations
@@ -12,7 +16,7 @@ from __future__ import annotations
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 
 from features.access.capabilities import ADMIN_USERS_MANAGE
 from features.access.user_capabilities import require_user_capability
@@ -28,9 +32,20 @@ from features.admin.models import (
     UpdateUserEmailRequest,
     UpdateUserNameRequest,
 )
+from features.assets.render_pool import RenderQueueStats, render_queue_stats
 from features.auth.models import UserPublic
+from features.auth.password_pool import PasswordHashingStats, password_hashing_stats
 from features.auth.service import current_user_from_request, user_agent
+from features.envelope.calculation_cache import (
+    CalculationCachePurge,
+    CalculationCacheStats,
+    CalculationKind,
+    calculation_cache_stats,
+    purge_calculation_cache,
+)
+from features.project_location.geodata_cache import GeodataCacheStats, geodata_cache_stats
 from features.shared.http import client_ip
+from features.shared.rate_limit import RateLimitStats, rate_limit_stats
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
@@ -123,3 +138,41 @@ def update_user_email(
 @router.get("/users/{user_id}/audit", response_model=list[AdminAuditEntry])
 def list_user_audit(user_id: UUID, admin: AdminUser) -> list[AdminAuditEntry]:
     return service.list_user_audit(user_id)
+
+
+@router.get("/calculation-cache", response_model=list[CalculationCacheStats])
+def get_calculation_cache_stats(admin: AdminUser) -> list[CalculationCacheStats]:
+    """Hit rates are for the worker that answers; table sizes are fleet-wide."""
+    return calculation_cache_stats()
+
+
+@router.get("/asset-render-queue", response_model=list[RenderQueueStats])
+def get_asset_render_queue_stats(admin: AdminUser) -> list[RenderQueueStats]:
+    """Queue depth and render latency of the worker that answers."""
+    return render_queue_stats()
+
+
+@router.get("/rate-limits", response_model=list[RateLimitStats])
+def get_rate_limit_stats(admin: AdminUser) -> list[RateLimitStats]:
+    """Allowed and limited hits per request budget, as the answering worker saw them."""
+    return rate_limit_stats()
+
+
+@router.get("/password-hashing", response_model=PasswordHashingStats)
+def get_password_hashing_stats(admin: AdminUser) -> PasswordHashingStats:
+    """Argon2 pool load and timings of the worker that answers."""
+    return password_hashing_stats()
+
+
+@router.get("/geodata-cache", response_model=list[GeodataCacheStats])
+def get_geodata_cache_stats(admin: AdminUser) -> list[GeodataCacheStats]:
+    """Lookup counters are for the worker that answers; entry counts are fleet-wide."""
+    return geodata_cache_stats()
+
+
+@router.delete("/calculation-cache", response_model=CalculationCachePurge)
+def purge_calculation_results(
+    admin: AdminUser,
+    kind: Annotated[CalculationKind | None, Query()] = None,
+) -> CalculationCachePurge:
+    return purge_calculation_cache(kind, actor_user_id=admin.id)
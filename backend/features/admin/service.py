@@ -2,7 +2,9 @@
 
 Each mutation runs in a single transaction, takes the locks it needs (notably
 the last-admin lock before any demotion/deactivation), performs the change,
-writes an audit row, and returns the refreshed dashboard row. The caller (the
+writes an audit row, and returns the refreshed dashboard row. After the commit
+it drops the target's entries from this process's session cache; other
+processes hear about the change by NOTIFY. The caller (the
 Phase 04 routes) is responsible for the `admin.users.manage` authorization gate;
 these functions assume an already-authorized actor and never trust the frontend.
 """
@@ -23,6 +25,7 @@ from features.access.capabilities import ADMIN_USERS_MANAGE
 from features.admin import audit, repository
 from features.admin.models import AdminAuditEntry, AdminUserRow, IssuedAccountLink
 from features.auth import repository as auth_repository
+from features.auth import session_cache
 from features.auth.account_token_service import issue_account_token
 from features.auth.account_tokens import AccountTokenType
 from features.auth.models import UserPublic
@@ -156,7 +159,9 @@ def invite_user(
             user_agent=user_agent,
             details={"role": "admin" if make_admin else "user"},
         )
-        return _require_user_row(conn, user_id), IssuedAccountLink(token_type="invite", link=link)
+        row = _require_user_row(conn, user_id)
+    session_cache.invalidate_user(user_id)
+    return row, IssuedAccountLink(token_type="invite", link=link)
 
 
 def generate_reset_link(
@@ -230,7 +235,9 @@ def deactivate_user(
             ip_address=ip_address,
             user_agent=user_agent,
         )
-        return _require_user_row(conn, target_user_id)
+        row = _require_user_row(conn, target_user_id)
+    session_cache.invalidate_user(target_user_id)
+    return row
 
 
 def reactivate_user(
@@ -272,7 +279,9 @@ def reactivate_user(
             user_agent=user_agent,
             details={"token_type": token_type},
         )
-        return _require_user_row(conn, target_user_id), IssuedAccountLink(token_type=token_type, link=link)
+        row = _require_user_row(conn, target_user_id)
+    session_cache.invalidate_user(target_user_id)
+    return row, IssuedAccountLink(token_type=token_type, link=link)
 
 
 def set_admin(
@@ -324,7 +333,9 @@ def set_admin(
                     user_agent=user_agent,
                     details={"capability": ADMIN_USERS_MANAGE},
                 )
-        return _require_user_row(conn, target_user_id)
+        row = _require_user_row(conn, target_user_id)
+    session_cache.invalidate_user(target_user_id)
+    return row
 
 
 def update_user_name(
@@ -359,7 +370,9 @@ def update_user_name(
             user_agent=user_agent,
             details={"old_display_name": old_name, "new_display_name": next_name},
         )
-        return _require_user_row(conn, target_user_id)
+        row = _require_user_row(conn, target_user_id)
+    session_cache.invalidate_user(target_user_id)
+    return row
 
 
 def update_user_email(
@@ -396,4 +409,6 @@ def update_user_email(
             user_agent=user_agent,
             details={"old_email": old_email, "new_email": next_email},
         )
-        return _require_user_row(conn, target_user_id)
+        row = _require_user_row(conn, target_user_id)
+    session_cache.invalidate_user(target_user_id)
+    return row
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Protocol
+from collections.abc import Iterator
+from typing import IO, Any, Protocol
 from uuid import UUID
 
 from psycopg import Connection
@@ -56,8 +57,12 @@ class AssetStorage(Protocol):
 
     def get_object(self, object_key: str) -> bytes: ...
 
+    def iter_object_chunks(self, object_key: str, chunk_size: int) -> Iterator[bytes]: ...
+
     def put_object(self, object_key: str, body: bytes, content_type: str) -> str: ...
 
+    def upload_fileobj(self, object_key: str, body: IO[bytes], content_type: str) -> None: ...
+
     def copy_object(self, source_key: str, dest_key: str) -> None: ...
 
     def delete_object(self, object_key: str) -> None: ...
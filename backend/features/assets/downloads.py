@@ -1,4 +1,15 @@
-"""Bulk-download workflow for asset exports."""
+"""Bulk-download workflow for asset exports.
+
+The route queues a job and returns it `pending`. The bundle is then built
+as a background task: attachments are fetched concurrently by a small
+thread pool and written into the ZIP in reference order. Each object is
+spooled (in memory up to ``asset_bulk_download_spool_bytes``, on disk
+beyond), and so is the ZIP itself. Memory therefore stays bounded by the
+fetch window, not by the bundle size. The finished ZIP is hashed and
+uploaded in chunks. Job progress is written as entries land, and doubles
+as the job's heartbeat: a job whose worker died with the process (a restart
+or deploy) is failed when its status is next read.
+"""
 
 from __future__ import annotations
 
@@ -6,45 +17,124 @@ import csv
 import hashlib
 import io
 import re
+import shutil
+import tempfile
+import time
 import zipfile
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO
 from uuid import UUID
 
+from fastapi import BackgroundTasks
 from starlette import status
 
+from config import settings
 from database import connection, transaction
 from features.assets import repository
 from features.assets.base import AssetStorage, generated_asset_id, generated_job_id
 from features.assets.mapping import asset_rows, job_response, job_response_or_none
 from features.assets.models import AssetRow, BulkDownloadFilter, BulkDownloadRequest, JobResponse
+from features.assets.reference_index import saved_body_asset_references
 from features.assets.registry import list_asset_references
 from features.assets.storage_r2 import asset_object_key
 from features.project_document.store import get_saved_document
 from features.projects.access import ProjectAccess, require_editor_user
 from features.shared.errors import api_error
 
+# Read/copy granularity for object bodies and the finished bundle.
+_CHUNK_BYTES = 1024 * 1024
+# Longest a running job goes without writing its progress, which is its
+# heartbeat (``repository.fail_stale_job``).
+_HEARTBEAT_SECONDS = 30.0
+# Formats that are already compressed: deflating them costs CPU for no gain.
+_STORED_CONTENT_TYPES = frozenset(
+    {
+        "application/gzip",
+        "application/pdf",
+        "application/zip",
+        "image/avif",
+        "image/gif",
+        "image/heic",
+        "image/heif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+    }
+)
+_STORED_CONTENT_TYPE_PREFIXES = ("audio/", "video/")
+_MANIFEST_FIELDS = [
+    "table_key",
+    "row_id",
+    "row_name",
+    "field_key",
+    "asset_id",
+    "index",
+    "original_filename",
+    "content_type",
+    "size_bytes",
+    "zip_path",
+]
+
+
+@dataclass(frozen=True)
+class _BundleEntry:
+    ref: dict[str, object]
+    asset: AssetRow
+    path: str
+
 
 class AssetBulkDownloadWorkflow:
     r2: AssetStorage
 
-    def start_bulk_download(self, access: ProjectAccess, payload: BulkDownloadRequest) -> JobResponse:
-        """Run a bulk-download job synchronously, exposing job-style status."""
+    def start_bulk_download(
+        self,
+        access: ProjectAccess,
+        payload: BulkDownloadRequest,
+        background_tasks: BackgroundTasks | None = None,
+    ) -> JobResponse:
+        """Queue a bulk-download job and return its job-style status.
+
+        Without a background runner (MCP tools) the bundle is built before
+        returning, so the job comes back `completed` or `failed`.
+        """
 
         user = require_editor_user(access)
         job_id = generated_job_id()
         with transaction() as conn:
-            repository.insert_job(
-                conn,
-                job_id=job_id,
-                project_id=access.project_id,
-                created_by=user.id,
-                metadata=payload.model_dump(mode="json"),
+            job = job_response(
+                repository.insert_job(
+                    conn,
+                    job_id=job_id,
+                    project_id=access.project_id,
+                    created_by=user.id,
+                    metadata=payload.model_dump(mode="json"),
+                )
             )
+        if background_tasks is None:
+            job = self.run_bulk_download_job(access, job_id, payload, user.id)
+        else:
+            background_tasks.add_task(self.run_bulk_download_job, access, job_id, payload, user.id)
+        return job.model_copy(update={"status_url": f"/api/v1/projects/{access.project_id}/jobs/{job.id}"})
+
+    def run_bulk_download_job(
+        self, access: ProjectAccess, job_id: str, payload: BulkDownloadRequest, created_by: UUID
+    ) -> JobResponse:
+        """Build the bundle and record the job's outcome."""
+
+        def report(progress: int) -> None:
+            with transaction() as conn:
+                repository.set_job_progress(conn, project_id=access.project_id, job_id=job_id, progress=progress)
+
         try:
+            report(0)
             result_asset_id = self._run_bulk_download(
-                access, payload.filter, payload.filename_pattern, payload.include_manifest_csv, user.id
+                access, payload.filter, payload.filename_pattern, payload.include_manifest_csv, created_by, report
             )
             with transaction() as conn:
-                job = job_response(
+                return job_response(
                     repository.update_job(
                         conn,
                         project_id=access.project_id,
@@ -56,7 +146,7 @@ class AssetBulkDownloadWorkflow:
                 )
         except Exception as exc:
             with transaction() as conn:
-                job = job_response(
+                return job_response(
                     repository.update_job(
                         conn,
                         project_id=access.project_id,
@@ -67,10 +157,11 @@ class AssetBulkDownloadWorkflow:
                         error_details={"message": str(exc)},
                     )
                 )
-        return job.model_copy(update={"status_url": f"/api/v1/projects/{access.project_id}/jobs/{job.id}"})
 
     def get_job(self, access: ProjectAccess, job_id: str) -> JobResponse:
-        with connection() as conn:
+        """The job's status; one whose worker died is failed here rather than left running."""
+        with transaction() as conn:
+            repository.fail_stale_job(conn, access.project_id, job_id)
             job = job_response_or_none(repository.get_job(conn, access.project_id, job_id))
         if job is None:
             raise api_error(status.HTTP_404_NOT_FOUND, "job_not_found", "Job not found.")
@@ -83,19 +174,22 @@ class AssetBulkDownloadWorkflow:
         filename_pattern: str,
         include_manifest_csv: bool,
         created_by: UUID,
+        report_progress: Callable[[int], None],
     ) -> str:
         version_id = access.project.active_version_id
         if version_id is None:
             raise ValueError("No active version.")
-        body = get_saved_document(version_id, access)
         asset_ids = set(filter_.asset_ids or [])
-        references = list_asset_references(
-            body,
-            asset_ids=asset_ids or None,
-            table_key=filter_.table_key,
-            column_key=filter_.column_key,
-            kind=filter_.kind,
-        )
+        filters = {
+            "asset_ids": asset_ids or None,
+            "table_key": filter_.table_key,
+            "column_key": filter_.column_key,
+            "kind": filter_.kind,
+        }
+        with connection() as conn:
+            references = saved_body_asset_references(conn, version_id, **filters)
+        if references is None:
+            references = list_asset_references(get_saved_document(version_id, access), **filters)
         if not references:
             raise ValueError("No matching assets.")
         ordered_ids = [str(ref["asset_id"]) for ref in references]
@@ -104,54 +198,26 @@ class AssetBulkDownloadWorkflow:
                 asset.id: asset
                 for asset in asset_rows(repository.list_assets_by_ids(conn, access.project_id, ordered_ids))
             }
-        zip_buffer = io.BytesIO()
-        manifest_rows: list[dict[str, object]] = []
+        entries: list[_BundleEntry] = []
         used_paths: set[str] = set()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for ref in references:
-                asset = assets.get(str(ref["asset_id"]))
-                if asset is None or asset.upload_status != "uploaded":
-                    continue
-                path = _dedupe_path(
-                    _render_filename_pattern(filename_pattern, ref, asset),
-                    used_paths,
-                )
-                used_paths.add(path)
-                zf.writestr(path, self.r2.get_object(asset.object_key))
-                manifest_rows.append(
-                    {
-                        **ref,
-                        "original_filename": asset.original_filename,
-                        "content_type": asset.content_type,
-                        "size_bytes": asset.size_bytes,
-                        "zip_path": path,
-                    }
-                )
-            if include_manifest_csv:
-                manifest = io.StringIO()
-                writer = csv.DictWriter(
-                    manifest,
-                    fieldnames=[
-                        "table_key",
-                        "row_id",
-                        "row_name",
-                        "field_key",
-                        "asset_id",
-                        "index",
-                        "original_filename",
-                        "content_type",
-                        "size_bytes",
-                        "zip_path",
-                    ],
-                )
-                writer.writeheader()
-                writer.writerows(manifest_rows)
-                zf.writestr("MANIFEST.csv", manifest.getvalue())
+        for ref in references:
+            asset = assets.get(str(ref["asset_id"]))
+            if asset is None or asset.upload_status != "uploaded":
+                continue
+            path = _dedupe_path(_render_filename_pattern(filename_pattern, ref, asset), used_paths)
+            used_paths.add(path)
+            entries.append(_BundleEntry(ref=ref, asset=asset, path=path))
 
-        digest = hashlib.sha256(zip_buffer.getvalue()).hexdigest()
         asset_id = generated_asset_id()
         object_key = asset_object_key(access.project_id, asset_id, "zip")
-        self.r2.put_object(object_key, zip_buffer.getvalue(), "application/zip")
+        with tempfile.SpooledTemporaryFile(max_size=settings.asset_bulk_download_spool_bytes) as bundle:
+            self._write_bundle(bundle, entries, include_manifest_csv, report_progress)
+            report_progress(99)  # Heartbeat before the upload, which reports nothing.
+            size_bytes = bundle.tell()
+            bundle.seek(0)
+            digest = hashlib.file_digest(bundle, "sha256").hexdigest()
+            bundle.seek(0)
+            self.r2.upload_fileobj(object_key, bundle, "application/zip")
         with transaction() as conn:
             repository.insert_pending_asset(
                 conn,
@@ -162,13 +228,102 @@ class AssetBulkDownloadWorkflow:
                 original_filename="attachments.zip",
                 display_name="Attachments export",
                 content_type="application/zip",
-                size_bytes=len(zip_buffer.getvalue()),
+                size_bytes=size_bytes,
                 content_hash_sha256=digest,
                 created_by=created_by,
             )
             repository.mark_asset_uploaded(conn, access.project_id, asset_id, r2_etag="")
         return asset_id
 
+    def _write_bundle(
+        self,
+        bundle: IO[bytes],
+        entries: list[_BundleEntry],
+        include_manifest_csv: bool,
+        report_progress: Callable[[int], None],
+    ) -> None:
+        manifest_rows: list[dict[str, object]] = []
+        reported = 0
+        reported_at = time.monotonic()
+        with zipfile.ZipFile(bundle, "w", zipfile.ZIP_DEFLATED) as zf:
+            for written, (entry, body) in enumerate(self._fetched_in_order(entries), start=1):
+                with body:
+                    _write_entry(zf, entry, body)
+                manifest_rows.append(
+                    {
+                        **entry.ref,
+                        "original_filename": entry.asset.original_filename,
+                        "content_type": entry.asset.content_type,
+                        "size_bytes": entry.asset.size_bytes,
+                        "zip_path": entry.path,
+                    }
+                )
+                # 100 is written with the result; stop one short of it.
+                progress = min(99, written * 100 // len(entries))
+                # Repeat an unchanged value now and then: it is the job's heartbeat.
+                if progress > reported or time.monotonic() - reported_at >= _HEARTBEAT_SECONDS:
+                    report_progress(progress)
+                    reported, reported_at = progress, time.monotonic()
+            if include_manifest_csv:
+                manifest = io.StringIO()
+                writer = csv.DictWriter(manifest, fieldnames=_MANIFEST_FIELDS)
+                writer.writeheader()
+                writer.writerows(manifest_rows)
+                zf.writestr("MANIFEST.csv", manifest.getvalue())
+
+    def _fetched_in_order(self, entries: list[_BundleEntry]) -> Iterator[tuple[_BundleEntry, IO[bytes]]]:
+        """Yield each entry with its spooled body, in entry order.
+
+        At most ``asset_bulk_download_fetch_workers`` fetches are in flight
+        or waiting to be written, which bounds memory and temp-file use.
+        """
+        workers = max(1, settings.asset_bulk_download_fetch_workers)
+        queued = iter(entries)
+        window: deque[tuple[_BundleEntry, Future[IO[bytes]]]] = deque()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-bulk-download") as pool:
+
+            def submit_next() -> None:
+                entry = next(queued, None)
+                if entry is not None:
+                    window.append((entry, pool.submit(self._spooled_object, entry.asset.object_key)))
+
+            try:
+                for _ in range(workers):
+                    submit_next()
+                while window:
+                    entry, future = window.popleft()
+                    submit_next()
+                    yield entry, future.result()
+            finally:
+                for _entry, future in window:
+                    if not future.cancel() and future.exception() is None:
+                        future.result().close()
+
+    def _spooled_object(self, object_key: str) -> IO[bytes]:
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.asset_bulk_download_spool_bytes)
+        try:
+            for chunk in self.r2.iter_object_chunks(object_key, _CHUNK_BYTES):
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+
+def _write_entry(zf: zipfile.ZipFile, entry: _BundleEntry, body: IO[bytes]) -> None:
+    # Same timestamp and permissions `ZipFile.writestr` gives a named entry.
+    info = zipfile.ZipInfo(entry.path, date_time=time.localtime(time.time())[:6])
+    info.external_attr = 0o600 << 16
+    info.compress_type = zipfile.ZIP_STORED if _is_precompressed(entry.asset.content_type) else zipfile.ZIP_DEFLATED
+    with zf.open(info, "w") as target:
+        shutil.copyfileobj(body, target, _CHUNK_BYTES)
+
+
+def _is_precompressed(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in _STORED_CONTENT_TYPES or media_type.startswith(_STORED_CONTENT_TYPE_PREFIXES)
+
 
 def _sanitize_path_part(value: object) -> str:
     text = str(value or "unnamed").strip()
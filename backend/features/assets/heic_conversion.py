@@ -3,23 +3,17 @@
 from __future__ import annotations
 
 import hashlib
-import io
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FutureTimeout
 from dataclasses import dataclass
 from uuid import UUID
 
-from PIL import Image, ImageOps
-from pillow_heif import register_heif_opener
-
 from config import settings
 from features.assets.base import AssetStorage
 from features.assets.heic_types import HEIC_CONTENT_TYPES, HEIC_FTYP_BRANDS
 from features.assets.models import AssetRow
+from features.assets.render_pool import RenderPriority, RenderTimeoutError, run_in_render_worker, submit_render
+from features.assets.rendering import convert_heic_to_jpeg
 from features.assets.storage_r2 import asset_object_key
 
-register_heif_opener()
-
 
 class AssetConversionError(RuntimeError):
     """Raised when a validated HEIC upload cannot be converted to JPEG."""
@@ -42,20 +36,21 @@ def prefix_looks_like_heic(prefix: bytes) -> bool:
 
 
 def convert_heic_upload_to_jpeg(asset: AssetRow, r2: AssetStorage) -> tuple[ConvertedAssetObject, str]:
-    source = r2.get_object(asset.object_key)
-    executor = ThreadPoolExecutor(max_workers=1)
-    future = executor.submit(_convert_to_jpeg, source)
+    """Convert an uploaded HEIC original to JPEG on the render pool, ahead of any backfill.
+
+    The request waits at most the queue allowance plus the conversion's own
+    time limit; a job still queued by then is cancelled.
+    """
+    job = submit_render(RenderPriority.INTERACTIVE, f"heic:{asset.id}", lambda: _convert(asset, r2))
+    wait_seconds = settings.asset_heic_conversion_queue_wait_seconds + settings.asset_heic_conversion_timeout_seconds
     try:
-        jpeg = future.result(timeout=settings.asset_heic_conversion_timeout_seconds)
-    except FutureTimeout as exc:
-        future.cancel()
-        executor.shutdown(wait=False, cancel_futures=True)
+        jpeg = job.result(timeout=wait_seconds)
+    except (RenderTimeoutError, TimeoutError) as exc:
+        # TimeoutError (concurrent.futures' alias of it) is this wait running out.
+        job.cancel()
         raise AssetConversionError("heic_conversion_timeout") from exc
     except Exception as exc:
-        executor.shutdown(wait=True, cancel_futures=True)
         raise AssetConversionError("heic_conversion_failed") from exc
-    else:
-        executor.shutdown(wait=True, cancel_futures=True)
     object_key = asset_object_key(UUID(asset.project_id), asset.id, "jpg")
     r2_etag = r2.put_object(object_key, jpeg, "image/jpeg")
     return (
@@ -69,11 +64,8 @@ def convert_heic_upload_to_jpeg(asset: AssetRow, r2: AssetStorage) -> tuple[Conv
     )
 
 
-def _convert_to_jpeg(source: bytes) -> bytes:
-    with Image.open(io.BytesIO(source)) as image:
-        normalized = ImageOps.exif_transpose(image)
-        if normalized.mode not in {"RGB", "L"}:
-            normalized = normalized.convert("RGB")
-        output = io.BytesIO()
-        normalized.save(output, format="JPEG", quality=92, optimize=True)
-        return output.getvalue()
+def _convert(asset: AssetRow, r2: AssetStorage) -> bytes:
+    source = r2.get_object(asset.object_key)
+    return run_in_render_worker(
+        convert_heic_to_jpeg, source, timeout_seconds=settings.asset_heic_conversion_timeout_seconds
+    )
@@ -161,6 +161,7 @@ class JobResponse(BaseModel):
     created_by: str
     created_at: datetime
     started_at: datetime | None = None
+    heartbeat_at: datetime | None = None
     finished_at: datetime | None = None
     result_asset_id: str | None = None
     error_code: str | None = None
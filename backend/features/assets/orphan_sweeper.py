@@ -3,20 +3,15 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from typing import Any
 from uuid import UUID
 
-from psycopg import Connection
-
 from database import connection, transaction
 from features.assets import repository
 from features.assets.base import AssetStorage, location_asset_ids_for_project
 from features.assets.mapping import asset_row, asset_rows
 from features.assets.models import AssetRow
-from features.assets.registry import list_asset_references
+from features.assets.reference_index import referenced_asset_ids_for_project
 from features.assets.storage_r2 import orphaned_asset_object_key
-from features.project_document import repository as document_repository
-from features.project_document.validation import validate_document
 
 
 class AssetOrphanSweepWorkflow:
@@ -40,7 +35,8 @@ class AssetOrphanSweepWorkflow:
                     pending_expired_before=pending_expired_before,
                 )
             )
-            referenced_ids = self._referenced_asset_ids_for_project(conn, project_id)
+            referenced_ids = referenced_asset_ids_for_project(conn, project_id)
+            referenced_ids.update(location_asset_ids_for_project(conn, project_id))
 
         results: list[dict[str, object]] = []
         errors: list[dict[str, object]] = []
@@ -85,21 +81,13 @@ class AssetOrphanSweepWorkflow:
                 errors.append({"asset_id": asset.id, "reason": reason, "error": str(exc)})
         return {"dry_run": dry_run, "moved": results, "errors": errors}
 
-    def _referenced_asset_ids_for_project(self, conn: Connection[Any], project_id: UUID) -> set[str]:
-        referenced: set[str] = set()
-        for row in document_repository.list_bodies_for_project(conn, project_id):
-            body = validate_document(row["body"])
-            referenced.update(str(ref["asset_id"]) for ref in list_asset_references(body))
-        referenced.update(location_asset_ids_for_project(conn, project_id))
-        return referenced
-
     def _move_asset_object_to_orphan_prefix(self, asset: AssetRow, target_key: str) -> str | None:
         self.r2.copy_object(asset.object_key, target_key)
         self.r2.delete_object(asset.object_key)
         thumbnail_key = asset.metadata.thumbnail_object_key
         if not thumbnail_key:
             return None
-        target_thumbnail_key = target_key.rsplit("/", maxsplit=1)[0] + "/thumb.png"
+        target_thumbnail_key = target_key.rsplit("/", maxsplit=1)[0] + "/" + thumbnail_key.rsplit("/", maxsplit=1)[-1]
         self.r2.copy_object(thumbnail_key, target_thumbnail_key)
         self.r2.delete_object(thumbnail_key)
         return target_thumbnail_key
@@ -0,0 +1,294 @@
+"""The materialized index of attachment references held by document bodies.
+
+``project_asset_references`` keeps one row per attachment reference in every
+saved and draft body, so "which assets does this project reference" is a
+query rather than a parse of every body. The document write paths call
+:func:`index_body_references` inside the transaction that persists a body;
+it diffs the body's references against the stored rows and writes only the
+difference, then stamps the body row with the revision it indexed.
+
+A body whose stamp lags its ``body_revision`` was written by something that
+does not maintain the index (a script, hand-run SQL, rows older than the
+index). Readers treat such a body as unindexed and parse it instead, so the
+index can lag but never hide a reference. :func:`rebuild_project_asset_references`
+reports and repairs that drift (``scripts/rebuild_asset_references.py``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from psycopg import Connection
+
+from features.assets import repository
+from features.assets.registry import (
+    ATTACHMENT_FIELDS,
+    iter_table_asset_references,
+    list_asset_references,
+    matching_attachment_fields,
+)
+from features.assets.table_adapters import get_attachment_table_adapter
+from features.project_document import repository as document_repository
+from features.project_document.document import ProjectDocumentV1
+from features.project_document.validation import SectionPath, validate_document
+
+# table_key, field_key, row_id, row_name, row_index, position, asset_id
+IndexedReference = tuple[str, str, str | None, str | None, int, int, str]
+
+_ATTACHMENT_TABLE_KEYS: tuple[str, ...] = tuple(dict.fromkeys(field.table_key for field in ATTACHMENT_FIELDS))
+_TABLE_RANK = {table_key: rank for rank, table_key in enumerate(_ATTACHMENT_TABLE_KEYS)}
+_FIELD_RANK = {(field.table_key, field.field_key): rank for rank, field in enumerate(ATTACHMENT_FIELDS)}
+
+
+@dataclass(frozen=True)
+class ReferenceIndexDrift:
+    """How far one project's index is from its bodies (see ``rebuild_project_asset_references``)."""
+
+    bodies_checked: int
+    bodies_drifted: int
+    references_added: int
+    references_removed: int
+    applied: bool
+
+
+def attachment_tables_in_sections(paths: Iterable[SectionPath]) -> frozenset[str]:
+    """Attachment tables whose rows live in any of the given document sections.
+
+    ``paths`` are section paths from ``serialize_document`` such as
+    ``("tables", "equipment")``; a table is touched when its path and a
+    section path overlap in either direction.
+    """
+    touched: set[str] = set()
+    for path in paths:
+        for table_key in _ATTACHMENT_TABLE_KEYS:
+            adapter = get_attachment_table_adapter(table_key)
+            if adapter is None:
+                continue
+            table_path = ("tables", *adapter.table_path)
+            overlap = min(len(path), len(table_path))
+            if path[:overlap] == table_path[:overlap]:
+                touched.add(table_key)
+    return frozenset(touched)
+
+
+def document_indexed_references(
+    body: ProjectDocumentV1, table_keys: Collection[str] | None = None
+) -> set[IndexedReference]:
+    """The references of ``body`` (limited to ``table_keys``) in index form."""
+    field_configs = [field for field in ATTACHMENT_FIELDS if table_keys is None or field.table_key in table_keys]
+    if not field_configs:
+        return set()
+    # Dump only the top-level tables the wanted fields live under.
+    top_level = set()
+    for field in field_configs:
+        adapter = get_attachment_table_adapter(field.table_key)
+        if adapter is not None:
+            top_level.add(adapter.table_path[0])
+    tables = body.tables.model_dump(mode="json", include=top_level)
+    return {
+        (
+            ref["table_key"],
+            ref["field_key"],
+            _text_or_none(ref["row_id"]),
+            _text_or_none(ref["row_name"]),
+            row_index,
+            ref["index"],
+            ref["asset_id"],
+        )
+        for row_index, ref in iter_table_asset_references(tables, field_configs)
+    }
+
+
+def index_body_references(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    body: ProjectDocumentV1,
+    body_revision: int | None = None,
+    table_keys: Collection[str] | None = None,
+) -> None:
+    """Bring the index for one stored body up to date with ``body``.
+
+    Call it in the transaction that wrote the body. ``draft_user_id`` is None
+    for a saved version body, and ``body_revision`` may be None when the
+    writer did not get the new revision back. Pass ``table_keys`` only when
+    the index already matched the body this one was derived from and only
+    those tables changed; everything else is diffed in full.
+    """
+    _sync_references(
+        conn,
+        version_id=version_id,
+        draft_user_id=draft_user_id,
+        current=document_indexed_references(body, table_keys),
+        table_keys=table_keys,
+    )
+    document_repository.mark_asset_references_indexed(conn, version_id, draft_user_id, body_revision)
+
+
+def referenced_asset_ids_for_project(conn: Connection[Any], project_id: UUID) -> set[str]:
+    """Asset ids referenced by any saved or draft body of the project.
+
+    Index rows of a stale body can only over-report (they protect an asset
+    its newer body may have dropped), and the stale bodies themselves are
+    parsed, so the result is never missing a reference.
+    """
+    referenced = repository.list_indexed_asset_ids(conn, project_id)
+    for row in document_repository.list_bodies_for_asset_references(conn, project_id, stale_only=True):
+        body = validate_document(row["body"])
+        referenced.update(str(ref["asset_id"]) for ref in list_asset_references(body))
+    return referenced
+
+
+def saved_body_asset_references(
+    conn: Connection[Any],
+    version_id: UUID,
+    *,
+    asset_ids: set[str] | None = None,
+    table_key: str | None = None,
+    column_key: str | None = None,
+    kind: str | None = None,
+) -> list[dict[str, Any]] | None:
+    """``list_asset_references`` for a saved body, answered from the index.
+
+    Same filters, shape and order. Returns None while the body's index is
+    stale; the caller parses the body instead.
+    """
+    stamp = document_repository.get_asset_references_stamp(conn, version_id, None)
+    if stamp is None or stamp["asset_references_revision"] != stamp["body_revision"]:
+        return None
+    fields = {
+        (field.table_key, field.field_key)
+        for field in matching_attachment_fields(table_key=table_key, column_key=column_key, kind=kind)
+    }
+    rows = [
+        row
+        for row in repository.list_body_asset_references(conn, version_id=version_id, draft_user_id=None)
+        if (row["table_key"], row["field_key"]) in fields and (asset_ids is None or row["asset_id"] in asset_ids)
+    ]
+    rows.sort(
+        key=lambda row: (
+            _TABLE_RANK.get(row["table_key"], len(_TABLE_RANK)),
+            row["row_index"],
+            _FIELD_RANK.get((row["table_key"], row["field_key"]), len(_FIELD_RANK)),
+            row["position"],
+        )
+    )
+    return [
+        {
+            "table_key": row["table_key"],
+            "field_key": row["field_key"],
+            "row_id": row["row_id"],
+            "row_name": row["row_name"],
+            "asset_id": row["asset_id"],
+            "index": row["position"],
+        }
+        for row in rows
+    ]
+
+
+def rebuild_project_asset_references(
+    conn: Connection[Any], project_id: UUID, *, apply: bool = False
+) -> ReferenceIndexDrift:
+    """Compare every body of the project with its index rows, optionally repairing them.
+
+    Every body is re-parsed, stale stamp or not, so this also catches rows
+    edited behind the index's back. ``apply`` rewrites the drifted rows and
+    stamps each body; without it nothing is written. Every version row is
+    locked first, which serializes the rebuild with the write paths.
+    """
+    document_repository.list_project_versions_for_update(conn, project_id)
+    checked = drifted = added = removed = 0
+    for row in document_repository.list_bodies_for_asset_references(conn, project_id, stale_only=False):
+        version_id = UUID(str(row["version_id"]))
+        draft_user_id = UUID(str(row["draft_user_id"])) if row["draft_user_id"] is not None else None
+        current = document_indexed_references(validate_document(row["body"]))
+        indexed = _indexed_references(conn, version_id, draft_user_id, None)
+        checked += 1
+        body_added, body_removed = len(current - indexed), len(indexed - current)
+        stale = row["asset_references_revision"] != row["body_revision"]
+        if body_added or body_removed or stale:
+            drifted += 1
+        added += body_added
+        removed += body_removed
+        if apply:
+            _sync_references(conn, version_id=version_id, draft_user_id=draft_user_id, current=current, table_keys=None)
+            document_repository.mark_asset_references_indexed(conn, version_id, draft_user_id, row["body_revision"])
+    return ReferenceIndexDrift(
+        bodies_checked=checked,
+        bodies_drifted=drifted,
+        references_added=added,
+        references_removed=removed,
+        applied=apply,
+    )
+
+
+def _sync_references(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    current: set[IndexedReference],
+    table_keys: Collection[str] | None,
+) -> None:
+    if table_keys is not None and not table_keys:
+        return
+    indexed = _indexed_references(conn, version_id, draft_user_id, table_keys)
+    removed = indexed - current
+    added = current - indexed
+    if removed:
+        repository.delete_body_asset_references(
+            conn, version_id=version_id, draft_user_id=draft_user_id, references=_reference_rows(removed)
+        )
+    if added:
+        repository.insert_body_asset_references(
+            conn, version_id=version_id, draft_user_id=draft_user_id, references=_reference_rows(added)
+        )
+
+
+def _indexed_references(
+    conn: Connection[Any],
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    table_keys: Collection[str] | None,
+) -> set[IndexedReference]:
+    rows = repository.list_body_asset_references(
+        conn,
+        version_id=version_id,
+        draft_user_id=draft_user_id,
+        table_keys=sorted(table_keys) if table_keys is not None else None,
+    )
+    return {
+        (
+            row["table_key"],
+            row["field_key"],
+            row["row_id"],
+            row["row_name"],
+            row["row_index"],
+            row["position"],
+            row["asset_id"],
+        )
+        for row in rows
+    }
+
+
+def _reference_rows(references: Iterable[IndexedReference]) -> list[dict[str, Any]]:
+    return [
+        {
+            "table_key": table_key,
+            "field_key": field_key,
+            "row_id": row_id,
+            "row_name": row_name,
+            "row_index": row_index,
+            "position": position,
+            "asset_id": asset_id,
+        }
+        for table_key, field_key, row_id, row_name, row_index, position, asset_id in references
+    ]
+
+
+def _text_or_none(value: object) -> str | None:
+    return None if value is None else str(value)
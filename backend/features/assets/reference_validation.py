@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Collection
 from uuid import UUID
 
 from psycopg import Connection
@@ -19,11 +20,16 @@ def validate_document_asset_references(
     *,
     project_id: UUID,
     body: ProjectDocumentV1,
+    table_keys: Collection[str] | None = None,
 ) -> None:
-    """Reject attachment ids that do not resolve to valid project assets."""
+    """Reject attachment ids that do not resolve to valid project assets.
+
+    ``table_keys`` limits the check to those attachment tables, for writes
+    that leave the others untouched.
+    """
 
     fields_by_key = {field.key: field for field in ATTACHMENT_FIELDS}
-    references = list_asset_references(body)
+    references = list_asset_references(body, table_keys=table_keys)
     for field in ATTACHMENT_FIELDS:
         field_references = [
             ref for ref in references if ref["table_key"] == field.table_key and ref["field_key"] == field.field_key
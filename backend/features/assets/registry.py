@@ -6,6 +6,7 @@ only backend source for which document paths may hold asset id arrays.
 
 from __future__ import annotations
 
+from collections.abc import Collection, Iterator
 from dataclasses import dataclass
 from typing import Any, Literal
 
@@ -253,21 +254,52 @@ def list_asset_references(
     table_key: str | None = None,
     column_key: str | None = None,
     kind: str | None = None,
+    table_keys: Collection[str] | None = None,
 ) -> list[dict[str, Any]]:
-    references: list[dict[str, Any]] = []
+    field_configs = matching_attachment_fields(
+        table_key=table_key, column_key=column_key, kind=kind, table_keys=table_keys
+    )
     tables = body.model_dump(mode="json")["tables"]
-    field_configs = [
+    return [
+        reference
+        for _row_index, reference in iter_table_asset_references(tables, field_configs)
+        if asset_ids is None or reference["asset_id"] in asset_ids
+    ]
+
+
+def matching_attachment_fields(
+    *,
+    table_key: str | None = None,
+    column_key: str | None = None,
+    kind: str | None = None,
+    table_keys: Collection[str] | None = None,
+) -> list[AttachmentFieldConfig]:
+    """The registered fields a ``list_asset_references`` filter selects."""
+    return [
         field
         for field in ATTACHMENT_FIELDS
         if (table_key is None or field.table_key == table_key)
+        and (table_keys is None or field.table_key in table_keys)
         and (column_key is None or field.field_key == column_key)
         and (kind is None or kind in field.asset_kinds)
     ]
+
+
+def iter_table_asset_references(
+    tables: dict[str, Any],
+    field_configs: Collection[AttachmentFieldConfig] = ATTACHMENT_FIELDS,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield each reference with the ordinal of its row within its table.
+
+    ``tables`` is the JSON-mode dump of the document's ``tables``. References
+    are grouped by table in registry order, then come in row order, field
+    order and array order.
+    """
     fields_by_table: dict[str, list[AttachmentFieldConfig]] = {}
     for field in field_configs:
         fields_by_table.setdefault(field.table_key, []).append(field)
     for table, fields in fields_by_table.items():
-        for row in iter_attachment_rows(tables, table):
+        for row_index, row in enumerate(iter_attachment_rows(tables, table)):
             for field in fields:
                 values = row.get(field.field_key)
                 if not isinstance(values, list):
@@ -275,9 +307,8 @@ def list_asset_references(
                 for index, value in enumerate(values):
                     if not isinstance(value, str):
                         continue
-                    if asset_ids is not None and value not in asset_ids:
-                        continue
-                    references.append(
+                    yield (
+                        row_index,
                         {
                             "table_key": field.table_key,
                             "field_key": field.field_key,
@@ -285,6 +316,5 @@ def list_asset_references(
                             "row_name": row.get("name") or row.get("number") or row.get("id"),
                             "asset_id": value,
                             "index": index,
-                        }
+                        },
                     )
-    return references
@@ -0,0 +1,295 @@
+"""The long-lived render service behind thumbnails and HEIC conversion.
+
+Thumbnails and HEIC conversions used to spin up a one-thread executor per
+asset in whichever thread asked, so a bulk upload rendered as many images at
+once as it had requests in flight. Here every render goes through one
+priority queue drained by ``asset_render_workers`` dispatcher threads. Each
+dispatcher does its job's storage and database I/O itself and hands the
+decode/encode step to a spawned worker process
+(:class:`~features.shared.process_pool.SpawnedProcessPool`), so at most that
+many renders run at once.
+
+Interactive work (an upload that just completed) always goes ahead of
+backfill work. Backfill submissions block while ``asset_render_queue_max``
+backfill jobs are already waiting, which keeps a large backfill from
+filling memory with queued jobs. Interactive submissions are never refused:
+their volume is bounded by request concurrency.
+
+Each worker job runs under a wall-clock alarm and raises
+:class:`RenderTimeoutError` when it expires. Queue depth and render latency
+are counted per priority (``render_queue_stats``, served on the admin API)
+and every job logs ``assets.render.finished``.
+
+With ``asset_render_workers`` at 0 there is no queue or pool: jobs run in
+the submitting thread, without the time limit.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Literal, TypeVar
+
+import structlog
+from pydantic import BaseModel, ConfigDict
+
+from config import settings
+from features.shared.process_pool import SpawnedProcessPool, run_with_alarm
+
+log = structlog.get_logger(__name__)
+
+_T = TypeVar("_T")
+
+
+class RenderPriority(IntEnum):
+    INTERACTIVE = 0
+    BACKFILL = 1
+
+
+class RenderTimeoutError(RuntimeError):
+    """A render exceeded its wall-clock limit in the worker."""
+
+
+class RenderQueueStats(BaseModel):
+    """One priority's counters in this process since start."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    priority: Literal["interactive", "backfill"]
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    # Means over finished jobs; null before the first one.
+    mean_wait_ms: float | None
+    mean_render_ms: float | None
+    max_render_ms: float
+
+
+@dataclass
+class _Counters:
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    wait_ms: float = 0.0
+    render_ms: float = 0.0
+    max_render_ms: float = 0.0
+
+
+@dataclass(order=True)
+class _Job:
+    priority: RenderPriority
+    sequence: int
+    name: str = field(compare=False)
+    fn: Callable[[], Any] = field(compare=False)
+    future: Future[Any] = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+def submit_render(priority: RenderPriority, name: str, fn: Callable[[], _T]) -> Future[_T]:
+    """Queue ``fn`` to run on a render dispatcher and return its future.
+
+    ``fn`` runs in a dispatcher thread of this process, and should do its
+    CPU-heavy step through :func:`run_in_render_worker`. ``name`` labels the
+    job in logs. A backfill submission blocks while the backfill queue is
+    full.
+    """
+    if settings.asset_render_workers < 1:
+        future: Future[_T] = Future()
+        _STATS.enqueued(priority)
+        _execute(_Job(priority, 0, name, fn, future, time.perf_counter()))
+        return future
+    return _render_queue().submit(priority, name, fn)
+
+
+def run_in_render_worker(fn: Callable[..., _T], *args: Any, timeout_seconds: float) -> _T:
+    """Run a pure, picklable ``fn(*args)`` in a render worker process.
+
+    Inline, without the time limit, when the pool is disabled.
+    """
+    if settings.asset_render_workers < 1:
+        return fn(*args)
+    timeout_error = RenderTimeoutError(f"Render exceeded the {timeout_seconds:g} s time limit.")
+    return _POOL.run(run_with_alarm, fn, args, timeout_seconds, timeout_error)
+
+
+def render_queue_stats() -> list[RenderQueueStats]:
+    return _STATS.snapshot()
+
+
+def shutdown_render_pool() -> None:
+    """Stop the dispatchers and worker processes (application shutdown and tests).
+
+    Jobs still queued are cancelled.
+    """
+    global _QUEUE
+    with _QUEUE_LOCK:
+        queue, _QUEUE = _QUEUE, None
+    if queue is not None:
+        queue.close()
+    _POOL.discard()
+
+
+class _RenderQueue:
+    def __init__(self, dispatchers: int, max_backfill: int):
+        self._heap: list[_Job] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._max_backfill = max_backfill
+        self._backfill_queued = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._dispatch, name=f"asset-render-{index}", daemon=True)
+            for index in range(dispatchers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, priority: RenderPriority, name: str, fn: Callable[[], _T]) -> Future[_T]:
+        future: Future[_T] = Future()
+        with self._condition:
+            if priority is RenderPriority.BACKFILL and self._max_backfill > 0:
+                while not self._closed and self._backfill_queued >= self._max_backfill:
+                    self._condition.wait()
+            if self._closed:
+                raise RuntimeError("The asset render queue is shut down.")
+            heapq.heappush(self._heap, _Job(priority, next(self._sequence), name, fn, future, time.perf_counter()))
+            if priority is RenderPriority.BACKFILL:
+                self._backfill_queued += 1
+            _STATS.enqueued(priority)
+            self._condition.notify_all()
+        return future
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            pending, self._heap = self._heap, []
+            self._condition.notify_all()
+        for job in pending:
+            _STATS.dequeued(job.priority)
+            job.future.cancel()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                job = heapq.heappop(self._heap)
+                if job.priority is RenderPriority.BACKFILL:
+                    self._backfill_queued -= 1
+                    # Room for a backfill submitter waiting on a full queue.
+                    self._condition.notify_all()
+            _execute(job)
+
+
+def _execute(job: _Job) -> None:
+    started_at = time.perf_counter()
+    wait_ms = (started_at - job.enqueued_at) * 1000
+    _STATS.started(job.priority)
+    if not job.future.set_running_or_notify_cancel():
+        _STATS.finished(job.priority, wait_ms, 0.0, ok=False)
+        return
+    result: Any = None
+    error: BaseException | None = None
+    try:
+        result = job.fn()
+    except BaseException as exc:
+        error = exc
+    render_ms = (time.perf_counter() - started_at) * 1000
+    ok = error is None
+    _STATS.finished(job.priority, wait_ms, render_ms, ok=ok)
+    if error is None:
+        job.future.set_result(result)
+    else:
+        job.future.set_exception(error)
+    log.info(
+        "assets.render.finished",
+        job=job.name,
+        priority=job.priority.name.lower(),
+        ok=ok,
+        wait_ms=round(wait_ms, 1),
+        render_ms=round(render_ms, 1),
+        queued=_STATS.queued(job.priority),
+        error=None if error is None else repr(error),
+    )
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {priority: _Counters() for priority in RenderPriority}
+
+    def enqueued(self, priority: RenderPriority) -> None:
+        with self._lock:
+            self._counters[priority].queued += 1
+
+    def dequeued(self, priority: RenderPriority) -> None:
+        with self._lock:
+            self._counters[priority].queued -= 1
+
+    def started(self, priority: RenderPriority) -> None:
+        with self._lock:
+            counters = self._counters[priority]
+            counters.queued -= 1
+            counters.running += 1
+
+    def finished(self, priority: RenderPriority, wait_ms: float, render_ms: float, *, ok: bool) -> None:
+        with self._lock:
+            counters = self._counters[priority]
+            counters.running -= 1
+            if ok:
+                counters.completed += 1
+            else:
+                counters.failed += 1
+            counters.wait_ms += wait_ms
+            counters.render_ms += render_ms
+            counters.max_render_ms = max(counters.max_render_ms, render_ms)
+
+    def queued(self, priority: RenderPriority) -> int:
+        with self._lock:
+            return self._counters[priority].queued
+
+    def snapshot(self) -> list[RenderQueueStats]:
+        with self._lock:
+            rows = []
+            for priority, counters in self._counters.items():
+                finished = counters.completed + counters.failed
+                rows.append(
+                    RenderQueueStats(
+                        priority="interactive" if priority is RenderPriority.INTERACTIVE else "backfill",
+                        queued=counters.queued,
+                        running=counters.running,
+                        completed=counters.completed,
+                        failed=counters.failed,
+                        mean_wait_ms=round(counters.wait_ms / finished, 1) if finished else None,
+                        mean_render_ms=round(counters.render_ms / finished, 1) if finished else None,
+                        max_render_ms=round(counters.max_render_ms, 1),
+                    )
+                )
+            return rows
+
+
+_STATS = _Stats()
+
+_QUEUE: _RenderQueue | None = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def _render_queue() -> _RenderQueue:
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = _RenderQueue(settings.asset_render_workers, settings.asset_render_queue_max)
+        return _QUEUE
+
+
+_POOL = SpawnedProcessPool(lambda: settings.asset_render_workers)
@@ -0,0 +1,124 @@
+"""Pure thumbnail and HEIC renderers for uploaded project assets.
+
+Nothing here touches the database or object storage: each function takes the
+original bytes and returns encoded output, so it can run in a render worker
+process (``features.assets.render_pool``). Importing this module registers the
+HEIF opener with Pillow, which is why workers import it rather than relying
+on the API process having done so.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from typing import Literal
+
+import pypdfium2 as pdfium
+from PIL import Image, ImageOps
+from pillow_heif import register_heif_opener
+
+register_heif_opener()
+
+ThumbnailFormat = Literal["png", "webp"]
+
+THUMBNAIL_BOX = (320, 400)
+RASTER_THUMBNAIL_TYPES = frozenset({"image/png", "image/jpeg", "image/webp"})
+PDF_CONTENT_TYPE = "application/pdf"
+
+_FORMAT_CONTENT_TYPES: dict[ThumbnailFormat, str] = {"png": "image/png", "webp": "image/webp"}
+# EXIF orientations that rotate the image by 90 degrees one way or the other.
+_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+_EXIF_ORIENTATION = 0x0112
+
+
+@dataclass(frozen=True)
+class RenderedThumbnail:
+    image: bytes
+    content_type: str
+    extension: str
+    # Facts learned while rendering, merged into the asset's metadata.
+    metadata: dict[str, object] = field(default_factory=dict)
+
+
+def can_render_thumbnail(content_type: str) -> bool:
+    return content_type == PDF_CONTENT_TYPE or content_type in RASTER_THUMBNAIL_TYPES
+
+
+def render_thumbnail(content_type: str, source: bytes, output_format: ThumbnailFormat = "png") -> RenderedThumbnail:
+    """Render the thumbnail for an original of ``content_type``.
+
+    PDFs render their first page straight at the scale that fits the
+    thumbnail box. Rasters are decoded at a reduced size where the codec
+    allows it (JPEG DCT scaling) and shrunk before the EXIF rotation, so the
+    full-resolution image is never transposed.
+    """
+    if content_type == PDF_CONTENT_TYPE:
+        image, extra = _render_pdf_first_page(source)
+    elif content_type in RASTER_THUMBNAIL_TYPES:
+        image, extra = _decode_reduced_raster(source)
+    else:
+        raise ValueError(f"No thumbnail renderer for {content_type}.")
+    image.thumbnail(THUMBNAIL_BOX, Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    if output_format == "webp":
+        image.convert("RGBA").save(output, format="WEBP", quality=80, method=4)
+    else:
+        image.convert("RGBA").save(output, format="PNG")
+    return RenderedThumbnail(
+        image=output.getvalue(),
+        content_type=_FORMAT_CONTENT_TYPES[output_format],
+        extension=output_format,
+        metadata=extra,
+    )
+
+
+def convert_heic_to_jpeg(source: bytes) -> bytes:
+    """Re-encode a HEIC/HEIF original as an upright, full-resolution JPEG."""
+    with Image.open(io.BytesIO(source)) as image:
+        normalized = ImageOps.exif_transpose(image)
+        if normalized.mode not in {"RGB", "L"}:
+            normalized = normalized.convert("RGB")
+        output = io.BytesIO()
+        normalized.save(output, format="JPEG", quality=92, optimize=True)
+        return output.getvalue()
+
+
+def pdf_render_scale(page_width: float, page_height: float) -> float:
+    """pdfium scale (1 = 72 dpi) that fits the page in the thumbnail box.
+
+    Never above 1: small pages render at their natural size, as before, and
+    are not upscaled.
+    """
+    if page_width <= 0 or page_height <= 0:
+        return 1.0
+    box_width, box_height = THUMBNAIL_BOX
+    return min(1.0, box_width / page_width, box_height / page_height)
+
+
+def _render_pdf_first_page(source: bytes) -> tuple[Image.Image, dict[str, object]]:
+    document = pdfium.PdfDocument(source)
+    try:
+        page_count = len(document)
+        page = document[0]
+        width, height = page.get_size()
+        bitmap = page.render(scale=pdf_render_scale(width, height))
+        return bitmap.to_pil(), {"page_count": page_count}
+    finally:
+        document.close()
+
+
+def _decode_reduced_raster(source: bytes) -> tuple[Image.Image, dict[str, object]]:
+    with Image.open(io.BytesIO(source)) as image:
+        width, height = image.size
+        orientation = image.getexif().get(_EXIF_ORIENTATION)
+        if orientation in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # The box is not yet rotated, so reduce towards its longer side on
+        # both axes. ``draft`` only acts on JPEG, where it makes the decoder
+        # skip detail; other formats decode in full and ``thumbnail`` reduces.
+        longest = max(THUMBNAIL_BOX)
+        image.draft(None, (longest, longest))
+        reduced = image.copy()
+        reduced.thumbnail((longest, longest), Image.Resampling.LANCZOS)
+        upright = ImageOps.exif_transpose(reduced)
+    return upright, {"image_dimensions": (width, height)}
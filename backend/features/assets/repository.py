@@ -1,4 +1,4 @@
-"""Raw SQL persistence for project assets and asset jobs."""
+"""Raw SQL persistence for project assets, asset jobs and the asset-reference index."""
 
 from __future__ import annotations
 
@@ -17,7 +17,7 @@ created_at, created_by::text, uploaded_at, deleted_at, deleted_by::text, metadat
 
 JOB_COLUMNS = """
 id, project_id::text, job_type, status, progress, created_by::text, created_at,
-started_at, finished_at, result_asset_id, error_code, error_details, metadata
+started_at, heartbeat_at, finished_at, result_asset_id, error_code, error_details, metadata
 """
 
 
@@ -156,6 +156,32 @@ def list_asset_gc_candidates(
     return [dict(row) for row in rows]
 
 
+def list_thumbnail_backfill_candidates(
+    conn: Connection[Any],
+    *,
+    project_ids: list[UUID] | None,
+    statuses: list[str],
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Uploaded, live assets whose thumbnail status is one of ``statuses``, oldest first."""
+    project_clause = "AND project_id = ANY(%(project_ids)s::uuid[])" if project_ids is not None else ""
+    rows = conn.execute(
+        f"""
+        SELECT project_id, id
+        FROM project_assets
+        WHERE upload_status = 'uploaded'
+          AND deleted_at IS NULL
+          AND asset_kind <> 'epw'
+          AND COALESCE(metadata ->> 'thumbnail_status', 'pending') = ANY(%(statuses)s::text[])
+          {project_clause}
+        ORDER BY created_at ASC
+        LIMIT %(limit)s
+        """,
+        {"project_ids": project_ids, "statuses": statuses, "limit": limit},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
 def list_assets_by_ids(conn: Connection[Any], project_id: UUID, asset_ids: list[str]) -> list[dict[str, Any]]:
     if not asset_ids:
         return []
@@ -367,6 +393,7 @@ def update_job(
         SET status = %(status)s,
             progress = %(progress)s,
             started_at = COALESCE(started_at, now()),
+            heartbeat_at = now(),
             finished_at = CASE WHEN %(status)s IN ('completed', 'failed') THEN now() ELSE finished_at END,
             result_asset_id = %(result_asset_id)s,
             error_code = %(error_code)s,
@@ -390,6 +417,49 @@ def update_job(
     return dict(row)
 
 
+def set_job_progress(conn: Connection[Any], *, project_id: UUID, job_id: str, progress: int) -> None:
+    """Mark a job running, record how far along it is, and stamp its heartbeat.
+
+    A job already failed as stale stays failed.
+    """
+    conn.execute(
+        """
+        UPDATE project_jobs
+        SET status = 'running',
+            progress = %(progress)s,
+            started_at = COALESCE(started_at, now()),
+            heartbeat_at = now()
+        WHERE project_id = %(project_id)s
+          AND id = %(job_id)s
+          AND status IN ('pending', 'running')
+        """,
+        {"project_id": project_id, "job_id": job_id, "progress": progress},
+    )
+
+
+def fail_stale_job(conn: Connection[Any], project_id: UUID, job_id: str) -> None:
+    """Fail a job whose worker is gone: running without a recent heartbeat, or never started.
+
+    Background jobs run in the API process, so a restart or deploy drops
+    them without a trace. Ten minutes leaves room for the bundle upload,
+    the one step that does not beat.
+    """
+    conn.execute(
+        """
+        UPDATE project_jobs
+        SET status = 'failed',
+            finished_at = now(),
+            error_code = 'job_interrupted',
+            error_details = '{"message": "The job stopped before finishing; start it again."}'::jsonb
+        WHERE project_id = %(project_id)s
+          AND id = %(job_id)s
+          AND COALESCE(heartbeat_at, created_at) < now() - INTERVAL '10 minutes'
+          AND status IN ('pending', 'running')
+        """,
+        {"project_id": project_id, "job_id": job_id},
+    )
+
+
 def get_job(conn: Connection[Any], project_id: UUID, job_id: str) -> dict[str, Any] | None:
     row = conn.execute(
         f"""
@@ -401,3 +471,103 @@ def get_job(conn: Connection[Any], project_id: UUID, job_id: str) -> dict[str, A
         {"project_id": project_id, "job_id": job_id},
     ).fetchone()
     return dict(row) if row else None
+
+
+ASSET_REFERENCE_COLUMNS = "table_key, field_key, row_id, row_name, row_index, position, asset_id"
+
+
+def list_body_asset_references(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    table_keys: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Indexed references of one saved (``draft_user_id`` NULL) or draft body."""
+    rows = conn.execute(
+        f"""
+        SELECT {ASSET_REFERENCE_COLUMNS}
+        FROM project_asset_references
+        WHERE version_id = %(version_id)s
+          AND draft_user_id IS NOT DISTINCT FROM %(draft_user_id)s::uuid
+          AND (%(table_keys)s::text[] IS NULL OR table_key = ANY(%(table_keys)s::text[]))
+        """,
+        {"version_id": version_id, "draft_user_id": draft_user_id, "table_keys": table_keys},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def insert_body_asset_references(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    references: list[dict[str, Any]],
+) -> None:
+    conn.execute(
+        f"""
+        INSERT INTO project_asset_references (project_id, version_id, draft_user_id, {ASSET_REFERENCE_COLUMNS})
+        SELECT v.project_id, v.id, %(draft_user_id)s::uuid, added.*
+        FROM project_versions v
+        CROSS JOIN unnest(
+            %(table_keys)s::text[], %(field_keys)s::text[], %(row_ids)s::text[], %(row_names)s::text[],
+            %(row_indexes)s::integer[], %(positions)s::integer[], %(asset_ids)s::text[]
+        ) AS added ({ASSET_REFERENCE_COLUMNS})
+        WHERE v.id = %(version_id)s
+        ON CONFLICT DO NOTHING
+        """,
+        {"version_id": version_id, "draft_user_id": draft_user_id, **_reference_arrays(references)},
+    )
+
+
+def delete_body_asset_references(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    references: list[dict[str, Any]],
+) -> None:
+    conn.execute(
+        f"""
+        DELETE FROM project_asset_references r
+        USING unnest(
+            %(table_keys)s::text[], %(field_keys)s::text[], %(row_ids)s::text[], %(row_names)s::text[],
+            %(row_indexes)s::integer[], %(positions)s::integer[], %(asset_ids)s::text[]
+        ) AS gone ({ASSET_REFERENCE_COLUMNS})
+        WHERE r.version_id = %(version_id)s
+          AND r.draft_user_id IS NOT DISTINCT FROM %(draft_user_id)s::uuid
+          AND r.table_key = gone.table_key
+          AND r.field_key = gone.field_key
+          AND r.row_id IS NOT DISTINCT FROM gone.row_id
+          AND r.row_name IS NOT DISTINCT FROM gone.row_name
+          AND r.row_index = gone.row_index
+          AND r.position = gone.position
+          AND r.asset_id = gone.asset_id
+        """,
+        {"version_id": version_id, "draft_user_id": draft_user_id, **_reference_arrays(references)},
+    )
+
+
+def _reference_arrays(references: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    return {
+        "table_keys": [ref["table_key"] for ref in references],
+        "field_keys": [ref["field_key"] for ref in references],
+        "row_ids": [ref["row_id"] for ref in references],
+        "row_names": [ref["row_name"] for ref in references],
+        "row_indexes": [ref["row_index"] for ref in references],
+        "positions": [ref["position"] for ref in references],
+        "asset_ids": [ref["asset_id"] for ref in references],
+    }
+
+
+def list_indexed_asset_ids(conn: Connection[Any], project_id: UUID) -> set[str]:
+    """Every asset id any indexed saved or draft body of the project references."""
+    rows = conn.execute(
+        """
+        SELECT DISTINCT asset_id
+        FROM project_asset_references
+        WHERE project_id = %(project_id)s
+        """,
+        {"project_id": project_id},
+    ).fetchall()
+    return {str(row["asset_id"]) for row in rows}
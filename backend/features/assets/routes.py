@@ -95,8 +95,9 @@ def start_bulk_download(
     payload: BulkDownloadRequest,
     access: ProjectEditAccess,
     service: AssetServiceDep,
+    background_tasks: BackgroundTasks,
 ) -> JobResponse:
-    return service.start_bulk_download(access, payload)
+    return service.start_bulk_download(access, payload, background_tasks)
 
 
 @router.get("/{asset_id}", response_model=AssetRow)
@@ -40,6 +40,7 @@ from features.assets.models import (
     UploadIntentResponse,
 )
 from features.assets.orphan_sweeper import AssetOrphanSweepWorkflow
+from features.assets.reference_index import index_body_references, saved_body_asset_references
 from features.assets.registry import (
     DATASHEET_FIELD_KEY,
     PHOTO_FIELD_KEY,
@@ -55,6 +56,7 @@ from features.assets.registry import (
 )
 from features.assets.storage_r2 import asset_object_key
 from features.assets.table_adapters import find_attachment_row
+from features.catalogs.option_usage_index import index_body_option_usage
 from features.project_document import repository as document_repository
 from features.project_document.store import get_saved_document
 from features.project_document.validation import (
@@ -473,8 +475,11 @@ class AssetService(AssetBulkDownloadWorkflow, AssetOrphanSweepWorkflow):
         version_id = access.project.active_version_id
         if version_id is None:
             return []
-        body = get_saved_document(version_id, access)
-        return list_asset_references(body)
+        with connection() as conn:
+            references = saved_body_asset_references(conn, version_id)
+        if references is not None:
+            return references
+        return list_asset_references(get_saved_document(version_id, access))
 
     def _referenced_asset_ids_for_access(self, access: ProjectAccess) -> set[str]:
         asset_ids = {str(ref["asset_id"]) for ref in self._references_for_access(access)}
@@ -558,7 +563,7 @@ class AssetService(AssetBulkDownloadWorkflow, AssetOrphanSweepWorkflow):
             serialized_next = enforce_document_body_size(next_body)
             draft_etag = next_draft_etag_from_etag(serialized_next.etag)
 
-            document_repository.upsert_draft(
+            persisted = document_repository.upsert_draft_row(
                 conn,
                 UUID(payload.version_id),
                 user.id,
@@ -567,6 +572,25 @@ class AssetService(AssetBulkDownloadWorkflow, AssetOrphanSweepWorkflow):
                 draft_etag,
                 serialized_body=serialized_next,
             )
+            basis_indexed = draft is not None and draft.get("asset_references_revision") == draft["body_revision"]
+            index_body_references(
+                conn,
+                version_id=UUID(payload.version_id),
+                draft_user_id=user.id,
+                body=next_body,
+                body_revision=int(persisted["body_revision"]),
+                table_keys={payload.table_key} if basis_indexed else None,
+            )
+            # Attachment cells never hold catalog option labels.
+            option_usage_indexed = draft is not None and draft.get("option_usage_revision") == draft["body_revision"]
+            index_body_option_usage(
+                conn,
+                version_id=UUID(payload.version_id),
+                draft_user_id=user.id,
+                body=next_body,
+                body_revision=int(persisted["body_revision"]),
+                changed_sections=() if option_usage_indexed else None,
+            )
         return {
             "version_etag": version_etag,
             "draft_etag": draft_etag,
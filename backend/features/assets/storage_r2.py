@@ -6,8 +6,10 @@ point boto3 at Cloudflare R2 via endpoint_url.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from time import perf_counter
+from typing import IO
 from uuid import UUID
 
 import boto3
@@ -24,8 +26,8 @@ def asset_object_key(project_id: UUID, asset_id: str, ext: str) -> str:
     return f"projects/{project_id}/assets/{asset_id}/file.{clean_ext}"
 
 
-def asset_thumbnail_object_key(project_id: UUID, asset_id: str) -> str:
-    return f"projects/{project_id}/assets/{asset_id}/thumb.png"
+def asset_thumbnail_object_key(project_id: UUID, asset_id: str, extension: str = "png") -> str:
+    return f"projects/{project_id}/assets/{asset_id}/thumb.{extension}"
 
 
 def orphaned_asset_object_key(project_id: UUID, asset_id: str, object_key: str) -> str:
@@ -95,6 +97,21 @@ class R2Client:
         _log_r2_op("get", start, bytes_count=len(body))
         return body
 
+    def iter_object_chunks(self, object_key: str, chunk_size: int) -> Iterator[bytes]:
+        """Stream an object's body without holding all of it in memory."""
+        start = perf_counter()
+        response = self.client.get_object(Bucket=self.bucket, Key=object_key)
+        total = 0
+        for chunk in response["Body"].iter_chunks(chunk_size):
+            total += len(chunk)
+            yield chunk
+        _log_r2_op("get_stream", start, bytes_count=total)
+
+    def upload_fileobj(self, object_key: str, body: IO[bytes], content_type: str) -> None:
+        """Upload from a file object; boto3 switches to multipart for large bodies."""
+        with _timed_r2_op("upload"):
+            self.client.upload_fileobj(body, self.bucket, object_key, ExtraArgs={"ContentType": content_type})
+
     def put_object(self, object_key: str, body: bytes, content_type: str) -> str:
         with _timed_r2_op("put", bytes_count=len(body)):
             response = self.client.put_object(Bucket=self.bucket, Key=object_key, Body=body, ContentType=content_type)
@@ -2,82 +2,87 @@
 
 from __future__ import annotations
 
-import io
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import Future
+from contextlib import suppress
 from uuid import UUID
 
-import pypdfium2 as pdfium
 import structlog
-from PIL import Image, ImageOps
 
 from config import settings
 from database import transaction
 from features.assets import repository
+from features.assets.base import AssetStorage
 from features.assets.mapping import asset_row
 from features.assets.models import AssetRow
-from features.assets.storage_r2 import R2Client, asset_thumbnail_object_key
+from features.assets.render_pool import RenderPriority, RenderTimeoutError, run_in_render_worker, submit_render
+from features.assets.rendering import can_render_thumbnail, render_thumbnail
+from features.assets.storage_r2 import asset_thumbnail_object_key
 
 log = structlog.get_logger(__name__)
 
 
 class Thumbnailer:
-    def __init__(self, r2: R2Client):
+    def __init__(self, r2: AssetStorage):
         self.r2 = r2
 
     def render_for_asset(self, project_id: UUID, asset_id: str) -> None:
+        """Queue an interactive render; the asset's metadata records the outcome."""
+        self.queue_render(project_id, asset_id, RenderPriority.INTERACTIVE)
+
+    def queue_render(self, project_id: UUID, asset_id: str, priority: RenderPriority) -> Future[str | None]:
+        """Queue a render and return a future of the resulting ``thumbnail_status``.
+
+        The future holds None when the asset is gone. A backfill submission
+        blocks while the backfill queue is full.
+        """
+        return submit_render(priority, f"thumbnail:{asset_id}", lambda: self._render(project_id, asset_id))
+
+    def _render(self, project_id: UUID, asset_id: str) -> str | None:
         with transaction() as conn:
             asset_data = repository.get_asset_by_id(conn, project_id, asset_id)
         if asset_data is None:
             log.warning("assets.thumbnail.asset_missing", asset_id=asset_id)
-            return
+            return None
         asset = asset_row(asset_data)
 
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self._render_bytes, asset)
-            try:
-                patch = future.result(timeout=settings.asset_thumbnail_render_timeout_seconds)
-            except FutureTimeout:
-                patch = {"thumbnail_status": "failed", "thumbnail_failure_reason": "render_timeout"}
-            except Exception as exc:  # pragma: no cover - exact library failures are fixture-dependent.
-                log.warning("assets.thumbnail.render_failed", asset_id=asset_id, error=str(exc))
-                patch = {"thumbnail_status": "failed", "thumbnail_failure_reason": "render_error"}
+        try:
+            patch = self._render_patch(asset)
+        except RenderTimeoutError:
+            patch = {"thumbnail_status": "failed", "thumbnail_failure_reason": "render_timeout"}
+        except Exception as exc:  # pragma: no cover - exact library failures are fixture-dependent.
+            log.warning("assets.thumbnail.render_failed", asset_id=asset_id, error=str(exc))
+            patch = {"thumbnail_status": "failed", "thumbnail_failure_reason": "render_error"}
 
         with transaction() as conn:
             repository.set_asset_metadata(conn, project_id, asset_id, patch)
-
-    def _render_bytes(self, asset: AssetRow) -> dict[str, object]:
-        if asset.content_type == "application/pdf":
-            source = self.r2.get_object(asset.object_key)
-            document = pdfium.PdfDocument(source)
-            page_count = len(document)
-            page = document[0]
-            bitmap = page.render(scale=1)
-            pil_image = bitmap.to_pil()
-            return self._upload_png(asset, pil_image, {"page_count": page_count})
-
-        if asset.content_type in {"image/png", "image/jpeg", "image/webp"}:
-            source = self.r2.get_object(asset.object_key)
-            with Image.open(io.BytesIO(source)) as image:
-                image = ImageOps.exif_transpose(image)
-                dimensions = image.size
-                return self._upload_png(asset, image.copy(), {"image_dimensions": dimensions})
-
-        return {"thumbnail_status": "na", "thumbnail_failure_reason": None}
-
-    def _upload_png(self, asset: AssetRow, image: Image.Image, extra: dict[str, object]) -> dict[str, object]:
-        image.thumbnail((320, 400), Image.Resampling.LANCZOS)
-        output = io.BytesIO()
-        image.convert("RGBA").save(output, format="PNG")
-        thumb_key = asset_thumbnail_object_key(UUID(asset.project_id), asset.id)
-        self.r2.put_object(thumb_key, output.getvalue(), "image/png")
+        return str(patch["thumbnail_status"])
+
+    def _render_patch(self, asset: AssetRow) -> dict[str, object]:
+        if not can_render_thumbnail(asset.content_type):
+            return {"thumbnail_status": "na", "thumbnail_failure_reason": None}
+        source = self.r2.get_object(asset.object_key)
+        rendered = run_in_render_worker(
+            render_thumbnail,
+            asset.content_type,
+            source,
+            settings.asset_thumbnail_format,
+            timeout_seconds=settings.asset_thumbnail_render_timeout_seconds,
+        )
+        del source
+        thumb_key = asset_thumbnail_object_key(UUID(asset.project_id), asset.id, rendered.extension)
+        self.r2.put_object(thumb_key, rendered.image, rendered.content_type)
+        previous_key = asset.metadata.thumbnail_object_key
+        if previous_key and previous_key != thumb_key:
+            # Re-rendered in the other format; the old object is unreachable.
+            with suppress(Exception):
+                self.r2.delete_object(previous_key)
         return {
             "thumbnail_object_key": thumb_key,
             "thumbnail_status": "ready",
             "thumbnail_failure_reason": None,
-            **extra,
+            **rendered.metadata,
         }
 
 
-def get_thumbnailer(r2: R2Client) -> Thumbnailer:
+def get_thumbnailer(r2: AssetStorage) -> Thumbnailer:
     return Thumbnailer(r2)
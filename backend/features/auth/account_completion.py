@@ -19,11 +19,11 @@ from psycopg import Connection
 from starlette import status
 
 from database import transaction
-from features.auth import repository
+from features.auth import repository, session_cache
 from features.auth.account_tokens import AccountTokenType, hash_token
 from features.auth.models import UserPublic
 from features.auth.passwords import hash_password
-from features.auth.service import now_utc, public_user
+from features.auth.service import now_utc, public_user, run_argon2
 from features.mcp import repository as mcp_repository
 from features.shared.errors import api_error
 
@@ -73,7 +73,7 @@ def _complete(
     with transaction() as conn:
         user_id = _redeem_token(conn, raw_token=raw_token, expected_type=expected_type, now=now)
 
-        updated = repository.set_user_password(conn, user_id, hash_password(password))
+        updated = repository.set_user_password(conn, user_id, run_argon2(hash_password, password))
         # Invalidate any other outstanding link, every active session, and every
         # MCP token attributable to the user.
         repository.revoke_active_account_tokens(conn, user_id)
@@ -92,7 +92,9 @@ def _complete(
             target_user_id=user_id,
             target_email=email,
         )
-        return public_user(updated)
+    # The notification reaches every process; this closes the gap in this one.
+    session_cache.invalidate_user(user_id)
+    return public_user(updated)
 
 
 def complete_invite(*, raw_token: str, password: str, ip_address: str | None, user_agent: str | None) -> UserPublic:
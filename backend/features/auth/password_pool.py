@@ -0,0 +1,138 @@
+"""Bounded executor for Argon2 hashing and verification.
+
+Argon2 is deliberately slow and memory-hungry. Run in the request threadpool,
+a burst of sign-ins (or a credential-stuffing run) could occupy every worker
+thread and stall unrelated reads. Every hash and verification now runs on
+``password_hash_workers`` dedicated threads (argon2-cffi releases the GIL),
+and at most ``password_hash_queue_max`` more jobs may wait for one. A job
+past that is refused at once with :class:`PasswordHashingBusyError`, so no
+more than workers + queue request threads are ever parked on Argon2.
+
+Queue wait and run time are counted (``password_hashing_stats``, served on
+the admin API). With ``password_hash_workers`` at 0 jobs run in the calling
+thread, unbounded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel, ConfigDict
+
+from config import settings
+
+_T = TypeVar("_T")
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Every worker is busy and the wait queue is full."""
+
+
+class PasswordHashingStats(BaseModel):
+    """This process's Argon2 counters since start."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    workers: int
+    queue_max: int
+    in_flight: int
+    completed: int
+    rejected: int
+    # Averaged over every Argon2 call that ran, wrong-password verifications
+    # included; rejected jobs never ran. Null until the first sign-in or
+    # password change.
+    mean_wait_ms: float | None
+    mean_run_ms: float | None
+    max_run_ms: float
+
+
+@dataclass
+class _Counters:
+    in_flight: int = 0
+    completed: int = 0
+    rejected: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+    max_run_seconds: float = 0.0
+
+
+def run_password_job(fn: Callable[..., _T], *args: Any) -> _T:
+    """Run one Argon2 call on the pool and wait for its result.
+
+    Raises :class:`PasswordHashingBusyError` without waiting when the pool and
+    its queue are full. Exceptions from ``fn`` propagate.
+    """
+    workers = settings.password_hash_workers
+    if workers < 1:
+        return _timed(fn, args, time.perf_counter())
+    with _LOCK:
+        if _COUNTERS.in_flight >= workers + max(settings.password_hash_queue_max, 0):
+            _COUNTERS.rejected += 1
+            raise PasswordHashingBusyError("Password hashing is at capacity.")
+        _COUNTERS.in_flight += 1
+    try:
+        return cast(_T, _pool(workers).submit(_timed, fn, args, time.perf_counter()).result())
+    finally:
+        with _LOCK:
+            _COUNTERS.in_flight -= 1
+
+
+def password_hashing_stats() -> PasswordHashingStats:
+    with _LOCK:
+        counters = _COUNTERS
+        completed = counters.completed
+        return PasswordHashingStats(
+            workers=settings.password_hash_workers,
+            queue_max=settings.password_hash_queue_max,
+            in_flight=counters.in_flight,
+            completed=completed,
+            rejected=counters.rejected,
+            mean_wait_ms=counters.wait_seconds / completed * 1000 if completed else None,
+            mean_run_ms=counters.run_seconds / completed * 1000 if completed else None,
+            max_run_ms=counters.max_run_seconds * 1000,
+        )
+
+
+def shutdown_password_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_WORKERS = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _timed(fn: Callable[..., _T], args: tuple[Any, ...], submitted: float) -> _T:
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        finished = time.perf_counter()
+        with _LOCK:
+            _COUNTERS.completed += 1
+            _COUNTERS.wait_seconds += started - submitted
+            _COUNTERS.run_seconds += finished - started
+            _COUNTERS.max_run_seconds = max(_COUNTERS.max_run_seconds, finished - started)
+
+
+def _pool(workers: int) -> ThreadPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                # Jobs already submitted finish on the old pool.
+                _POOL.shutdown(wait=False)
+            _POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+_LOCK = threading.Lock()
+_COUNTERS = _Counters()
+_POOL: ThreadPoolExecutor | None = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from argon2 import PasswordHasher
-from argon2.exceptions import Argon2Error, VerifyMismatchError
+from argon2.exceptions import Argon2Error, InvalidHashError, VerifyMismatchError
 
 from config import settings
 
@@ -25,3 +25,11 @@ def verify_password(password: str, password_hash: str) -> bool:
         return _password_hasher().verify(password_hash, password)
     except (VerifyMismatchError, Argon2Error):
         return False
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """True when a hash was made with other Argon2 parameters than the current ones."""
+    try:
+        return _password_hasher().check_needs_rehash(password_hash)
+    except InvalidHashError:
+        return False
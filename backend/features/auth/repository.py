@@ -201,6 +201,19 @@ def set_user_password(conn: Connection[Any], user_id: UUID, password_hash: str)
     return row
 
 
+def replace_password_hash(conn: Connection[Any], user_id: UUID, password_hash: str) -> None:
+    """Swap in a re-hash of the same password; ``password_set_at`` is unchanged."""
+    conn.execute(
+        """
+        UPDATE users
+        SET password_hash = %(password_hash)s,
+            updated_at = now()
+        WHERE id = %(user_id)s
+        """,
+        {"user_id": user_id, "password_hash": password_hash},
+    )
+
+
 def update_user_units_preference(conn: Connection[Any], user_id: UUID, units_preference: str) -> dict[str, Any]:
     row = conn.execute(
         """
@@ -288,6 +301,12 @@ def insert_session(
 
 
 def get_session_with_user(conn: Connection[Any], session_id: UUID) -> dict[str, Any] | None:
+    """Return the session, its user, and the user's principal inputs in one row.
+
+    ``user_is_staff`` and ``user_global_capabilities`` (active global grants,
+    as ``active_global_capabilities_for_user`` reads them) ride along so the
+    request's capability resolution needs no further query.
+    """
     return conn.execute(
         """
         SELECT
@@ -301,7 +320,15 @@ def get_session_with_user(conn: Connection[Any], session_id: UUID) -> dict[str,
             u.email               AS user_email,
             u.display_name        AS user_display_name,
             (u.deleted_at IS NULL) AS user_is_active,
-            u.units_preference    AS user_units_preference
+            u.units_preference    AS user_units_preference,
+            u.is_staff            AS user_is_staff,
+            ARRAY(
+                SELECT DISTINCT g.capability
+                FROM user_grants AS g
+                WHERE g.user_id = u.id
+                  AND g.scope_type = 'global'
+                  AND g.revoked_at IS NULL
+            )                     AS user_global_capabilities
         FROM sessions AS s
         JOIN users AS u ON u.id = s.user_id
         WHERE s.id = %(session_id)s
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
+from typing import Any, TypeVar
 from uuid import UUID, uuid4
 
 import structlog
@@ -11,14 +13,19 @@ from starlette import status
 
 from config import settings
 from database import connection, transaction
-from features.auth import repository
+from features.auth import repository, session_cache
 from features.auth.cookies import queue_session_cookie_clear, queue_session_cookie_refresh
 from features.auth.models import AuthSessionResponse, UnitSystem, UserPublic
-from features.auth.passwords import hash_password, verify_password
-from features.auth.rate_limit import enforce_login_attempt_budget, reserve_login_verification_slot
+from features.auth.password_pool import PasswordHashingBusyError, run_password_job
+from features.auth.passwords import hash_password, password_needs_rehash, verify_password
+from features.auth.rate_limit import enforce_login_attempt_budget
 from features.shared.errors import api_error
 from features.shared.http import client_ip
 
+log = structlog.get_logger(__name__)
+
+_T = TypeVar("_T")
+
 GENERIC_LOGIN_ERROR = "Email or password is incorrect."
 DUMMY_PASSWORD_HASH = (
     "$argon2id$v=19$m=65536,t=3,p=4$FUyOba6xeqONvsEcgfV1zQ$Y6Znw5ZZKF/XhK4xrPvXCLkcEwxAzYXt+Njjj/2LpLo"
@@ -61,13 +68,46 @@ def public_user(row: dict[str, object]) -> UserPublic:
     )
 
 
+def run_argon2(fn: Callable[..., _T], *args: Any) -> _T:
+    """Run an Argon2 hash or verification on the password pool.
+
+    A saturated pool answers 503 ``password_hashing_busy`` rather than
+    queueing the request.
+    """
+    try:
+        return run_password_job(fn, *args)
+    except PasswordHashingBusyError as exc:
+        raise api_error(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "password_hashing_busy",
+            "Sign-in is busy right now. Wait a moment and try again.",
+        ) from exc
+
+
 def create_or_update_user(email: str, display_name: str, password: str) -> UserPublic:
-    password_hash = hash_password(password)
+    password_hash = run_argon2(hash_password, password)
     with transaction() as conn:
         user = repository.upsert_user(conn, email=email, display_name=display_name, password_hash=password_hash)
+    session_cache.invalidate_user(user["id"])
     return public_user(user)
 
 
+def _rehash_if_outdated(password: str, password_hash: str) -> str | None:
+    """A hash of ``password`` at the current costs, when the stored one differs.
+
+    Best-effort: a saturated pool skips the re-hash until a later sign-in
+    instead of failing this one.
+    """
+    if not password_needs_rehash(password_hash):
+        return None
+    try:
+        rehashed = run_password_job(hash_password, password)
+    except PasswordHashingBusyError:
+        return None
+    log.info("auth.password.rehashed")
+    return rehashed
+
+
 def authenticate(email: str, password: str, request: Request) -> tuple[UserPublic, UUID, datetime]:
     """Verify credentials and start a new session for ``email``.
 
@@ -81,6 +121,10 @@ def authenticate(email: str, password: str, request: Request) -> tuple[UserPubli
     failures raise ``api_error(401, "invalid_credentials")`` with the
     generic message so the response is identical for unknown email,
     inactive user, and wrong password.
+
+    Argon2 runs on the password pool (``run_argon2``). A verified password
+    whose stored hash used other cost parameters is re-hashed before the
+    second transaction, which swaps the new hash in.
     """
     ip_address = client_ip(request)
     agent = user_agent(request)
@@ -95,9 +139,9 @@ def authenticate(email: str, password: str, request: Request) -> tuple[UserPubli
     # they cannot sign in.
     can_authenticate = has_usable_password(user_row)
     password_hash = str(user_row["password_hash"]) if (can_authenticate and user_row) else DUMMY_PASSWORD_HASH
-    with reserve_login_verification_slot():
-        password_valid = verify_password(password, password_hash) and can_authenticate
+    password_valid = run_argon2(verify_password, password, password_hash) and can_authenticate
     user_is_active = bool(user_row and user_row["is_active"])
+    rehashed = _rehash_if_outdated(password, password_hash) if password_valid and user_is_active else None
 
     if user_row is None or not user_is_active or not password_valid:
         with transaction() as conn:
@@ -150,6 +194,11 @@ def authenticate(email: str, password: str, request: Request) -> tuple[UserPubli
                     user_agent=agent,
                 )
 
+            if rehashed is not None:
+                # The row lock and the hash comparison above make this a
+                # re-hash of the password that was just verified.
+                repository.replace_password_hash(conn, user_id, rehashed)
+
             session_id = uuid4()
             expires_at = session_expires_at(now)
             repository.insert_session(
@@ -173,6 +222,8 @@ def authenticate(email: str, password: str, request: Request) -> tuple[UserPubli
 
     if result is None:
         raise api_error(status.HTTP_401_UNAUTHORIZED, "invalid_credentials", GENERIC_LOGIN_ERROR)
+    # Superseded sessions; the notification reaches other processes.
+    session_cache.invalidate_user(result[0].id)
     structlog.contextvars.bind_contextvars(user_id=str(result[0].id))
     return result
 
@@ -188,6 +239,11 @@ def current_user_from_request(request: Request) -> tuple[UserPublic, datetime]:
     ``invalid_session``, ``session_invalidated``, or ``session_expired``
     depending on which gate fails; the route layer turns these into the
     standard 401 envelope.
+
+    A session validated within ``auth_session_cache_ttl_seconds`` is served
+    from ``session_cache`` without a query, unless it is due a touch or past
+    its stored expiry. The cold-path query also reads the user's principal
+    inputs, so ``build_user_principal`` finds them cached.
     """
     raw_session_id = request.cookies.get(settings.session_cookie_name)
     if not raw_session_id:
@@ -200,8 +256,17 @@ def current_user_from_request(request: Request) -> tuple[UserPublic, datetime]:
         raise api_error(status.HTTP_401_UNAUTHORIZED, "invalid_session", "Sign-in required.") from exc
 
     now = now_utc()
+    cached = session_cache.get_session(session_id)
+    if cached is not None and _cached_session_usable(cached, now):
+        expires_at = session_expires_at(now)
+        queue_session_cookie_refresh(request, session_id, expires_at)
+        structlog.contextvars.bind_contextvars(user_id=str(cached.user.id))
+        return cached.user, expires_at
+
+    generation = session_cache.cache_generation()
     session_expired = False
     result: tuple[UserPublic, datetime] | None = None
+    fresh: session_cache.CachedSession | None = None
     with transaction() as conn:
         row = repository.get_session_with_user(conn, session_id)
         if row is None:
@@ -229,8 +294,10 @@ def current_user_from_request(request: Request) -> tuple[UserPublic, datetime]:
             expires_at = session_expires_at(now)
             throttle = settings.session_touch_throttle_seconds
             last_seen_at = row["session_last_seen_at"]
+            db_expires_at = row["session_expires_at"]
             if throttle <= 0 or (now - last_seen_at).total_seconds() >= throttle:
                 repository.touch_session(conn, session_id, expires_at)
+                db_expires_at, last_seen_at = expires_at, now
             user = public_user(
                 {
                     "id": row["user_id"],
@@ -240,6 +307,19 @@ def current_user_from_request(request: Request) -> tuple[UserPublic, datetime]:
                 }
             )
             result = (user, expires_at)
+            fresh = session_cache.CachedSession(
+                user=user,
+                expires_at=db_expires_at,
+                last_seen_at=last_seen_at,
+                principal=session_cache.PrincipalInputs(
+                    is_staff=bool(row["user_is_staff"]),
+                    global_capabilities=frozenset(row["user_global_capabilities"]),
+                ),
+            )
+
+    if fresh is not None:
+        # After commit: a touch that rolled back must not be remembered.
+        session_cache.put_session(session_id, fresh, generation)
 
     if session_expired:
         queue_session_cookie_clear(request)
@@ -257,6 +337,16 @@ def current_user_from_request(request: Request) -> tuple[UserPublic, datetime]:
     return result
 
 
+def _cached_session_usable(cached: session_cache.CachedSession, now: datetime) -> bool:
+    """Whether a cached session may answer without the cold path.
+
+    The cold path owns expiry and the throttled touch, so a session that is
+    past its stored expiry or due a touch goes back through it.
+    """
+    throttle = settings.session_touch_throttle_seconds
+    return cached.expires_at > now and throttle > 0 and (now - cached.last_seen_at).total_seconds() < throttle
+
+
 def update_units_preference(
     user: UserPublic,
     expires_at: datetime,
@@ -279,6 +369,7 @@ def update_units_preference(
             user_agent=user_agent(request),
             details={"before": before, "after": units_preference},
         )
+    session_cache.invalidate_user(user.id)
     return AuthSessionResponse(user=public_user(updated), expires_at=expires_at)
 
 
@@ -317,3 +408,5 @@ def sign_out(request: Request) -> None:
             ip_address=client_ip(request),
             user_agent=user_agent(request),
         )
+    # The notification reaches every process; this only closes the gap here.
+    session_cache.invalidate_session(session_id)
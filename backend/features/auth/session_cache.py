@@ -0,0 +1,235 @@
+"""Short-lived per-process cache of validated sessions and principal inputs.
+
+Every authenticated request used to join the session and user rows, and every
+project request then loaded ``is_staff`` and the user's global grants. This
+cache holds both for ``auth_session_cache_ttl_seconds`` so a warm request
+resolves its caller without a query.
+
+Entries are invalidated by the ``auth_principal_changed`` notifications from
+migration 0018: session invalidation, user updates and deactivation, and grant
+changes publish the user id, whichever process or script commits them. A
+background thread LISTENs on a dedicated connection. The cache only serves
+while that listener is connected, and it is cleared whenever the listener
+(re)connects, so a missed notification can never leave a stale entry in use.
+Notifications arrive asynchronously, so the writers in this codebase (sign-in,
+sign-out, password set/reset, admin user and grant changes) also invalidate
+their own process's entries right after they commit.
+
+A request snapshots :func:`cache_generation` before its cold-path query and
+passes it to ``put_*``; an invalidation that arrives in between bumps the
+generation and the now-stale row is not cached.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+from uuid import UUID
+
+import psycopg
+import structlog
+
+from config import settings
+from features.auth.models import UserPublic
+
+log = structlog.get_logger(__name__)
+
+CHANNEL = "auth_principal_changed"
+_RECONNECT_SECONDS = 5.0
+_POLL_SECONDS = 1.0
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+@dataclass(frozen=True)
+class PrincipalInputs:
+    """The resolver inputs beyond the user: ``is_staff`` and global grants."""
+
+    is_staff: bool
+    global_capabilities: frozenset[str]
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    user: UserPublic
+    expires_at: datetime
+    last_seen_at: datetime
+    principal: PrincipalInputs
+
+
+def cache_generation() -> int | None:
+    """The generation to pass to ``put_*``, or None while the cache is off."""
+    return _CACHE.generation()
+
+
+def get_session(session_id: UUID) -> CachedSession | None:
+    with _CACHE.lock:
+        return _CACHE.sessions.get(session_id) if _CACHE.serving() else None
+
+
+def put_session(session_id: UUID, entry: CachedSession, generation: int | None) -> None:
+    """Cache a validated session, and its user's principal inputs with it."""
+    with _CACHE.lock:
+        if generation is None or generation != _CACHE.current_generation:
+            return
+        _CACHE.sessions.put(session_id, entry)
+        _CACHE.principals.put(entry.user.id, entry.principal)
+
+
+def get_principal_inputs(user_id: UUID) -> PrincipalInputs | None:
+    with _CACHE.lock:
+        return _CACHE.principals.get(user_id) if _CACHE.serving() else None
+
+
+def put_principal_inputs(user_id: UUID, inputs: PrincipalInputs, generation: int | None) -> None:
+    with _CACHE.lock:
+        if generation is None or generation != _CACHE.current_generation:
+            return
+        _CACHE.principals.put(user_id, inputs)
+
+
+def invalidate_session(session_id: UUID) -> None:
+    """Drop one session now, ahead of its notification (sign-out)."""
+    with _CACHE.lock:
+        _CACHE.current_generation += 1
+        _CACHE.sessions.pop(session_id)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    with _CACHE.lock:
+        _CACHE.current_generation += 1
+        _CACHE.principals.pop(user_id)
+        _CACHE.sessions.pop_where(lambda entry: entry.user.id == user_id)
+
+
+def clear_session_cache() -> None:
+    with _CACHE.lock:
+        _CACHE.current_generation += 1
+        _CACHE.sessions.clear()
+        _CACHE.principals.clear()
+
+
+def start_session_cache_listener() -> None:
+    """Start the notification listener; a no-op when the cache is disabled."""
+    global _LISTENER
+    if settings.auth_session_cache_ttl_seconds <= 0:
+        return
+    with _LISTENER_LOCK:
+        if _LISTENER is not None and _LISTENER.is_alive():
+            return
+        _STOP.clear()
+        _LISTENER = threading.Thread(target=_listen, name="auth-session-cache-listener", daemon=True)
+        _LISTENER.start()
+
+
+def stop_session_cache_listener() -> None:
+    global _LISTENER
+    with _LISTENER_LOCK:
+        listener, _LISTENER = _LISTENER, None
+        _STOP.set()
+    if listener is not None:
+        listener.join(timeout=_POLL_SECONDS * 5)
+    _CACHE.set_listening(False)
+
+
+def session_cache_listening() -> bool:
+    return _CACHE.listening
+
+
+def _listen() -> None:
+    while not _STOP.is_set():
+        try:
+            with psycopg.connect(settings.database_url, autocommit=True) as conn:
+                conn.execute(f"LISTEN {CHANNEL}")
+                # Anything cached before this LISTEN may have missed its
+                # notification.
+                _CACHE.set_listening(True)
+                log.info("auth.session_cache.listening")
+                while not _STOP.is_set():
+                    for notify in conn.notifies(timeout=_POLL_SECONDS):
+                        _apply(notify.payload)
+        except Exception as exc:
+            log.warning("auth.session_cache.listener_failed", error=str(exc))
+        finally:
+            _CACHE.set_listening(False)
+        _STOP.wait(_RECONNECT_SECONDS)
+
+
+def _apply(payload: str) -> None:
+    try:
+        user_id = UUID(payload)
+    except ValueError:
+        # TRUNCATE (empty payload) or anything unexpected: drop everything.
+        clear_session_cache()
+        return
+    invalidate_user(user_id)
+
+
+class _Lru(Generic[_K, _V]):
+    """Insertion-ordered entries with a shared TTL and entry bound.
+
+    Not locked itself: the owning cache serializes access.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+
+    def get(self, key: _K) -> _V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at >= settings.auth_session_cache_ttl_seconds:
+            return None
+        return value
+
+    def put(self, key: _K, value: _V) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        while len(self._entries) > max(settings.auth_session_cache_max_entries, 0):
+            self._entries.popitem(last=False)
+
+    def pop(self, key: _K) -> None:
+        self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[_V], bool]) -> None:
+        for key in [key for key, (_, value) in self._entries.items() if predicate(value)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _SessionCache:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sessions: _Lru[UUID, CachedSession] = _Lru()
+        self.principals: _Lru[UUID, PrincipalInputs] = _Lru()
+        self.current_generation = 0
+        self.listening = False
+
+    def serving(self) -> bool:
+        return self.listening and settings.auth_session_cache_ttl_seconds > 0
+
+    def generation(self) -> int | None:
+        with self.lock:
+            return self.current_generation if self.serving() else None
+
+    def set_listening(self, listening: bool) -> None:
+        with self.lock:
+            self.listening = listening
+            self.current_generation += 1
+            self.sessions.clear()
+            self.principals.clear()
+
+
+_CACHE = _SessionCache()
+_LISTENER: threading.Thread | None = None
+_LISTENER_LOCK = threading.Lock()
+_STOP = threading.Event()
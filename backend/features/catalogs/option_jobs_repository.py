@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import Any
 from uuid import UUID
 
@@ -16,6 +17,9 @@ from features.catalogs.option_jobs_models import (
     CatalogOptionTable,
 )
 
+# Bodies fetched per round trip by ``iter_active_project_bodies``.
+ACTIVE_BODIES_FETCH_SIZE = 16
+
 JOB_COLUMNS = """
     id, catalog_table, field_key, status, progress, created_by, operations,
     total_projects, processed_projects, current_project_id,
@@ -228,7 +232,11 @@ def claim_project(conn: Connection[Any], job_id: str, project_id: UUID) -> bool:
     if row is None:
         return False
     conn.execute(
-        "UPDATE catalog_option_jobs SET current_project_id = %(project_id)s WHERE id = %(job_id)s",
+        """
+        UPDATE catalog_option_jobs
+        SET current_project_id = %(project_id)s, heartbeat_at = now()
+        WHERE id = %(job_id)s
+        """,
         {"job_id": job_id, "project_id": project_id},
     )
     return True
@@ -319,34 +327,154 @@ def finish_job(
     return _with_project_results(conn, dict(row))
 
 
-def list_active_project_bodies(conn: Connection[Any]) -> list[dict[str, Any]]:
-    """Return current project bodies plus drafts of each current active version.
+def iter_active_project_bodies(
+    conn: Connection[Any], *, option_usage_stale_only: bool = False
+) -> Iterator[dict[str, Any]]:
+    """Stream current project bodies plus drafts of each current active version.
 
     A catalog relabel is forward-only: historical saved versions and drafts
     attached to historical versions remain an accurate record of their point in
     time.  Only the active working surface participates in the cascade.
+    ``option_usage_stale_only`` keeps just the bodies whose option-usage index
+    lags their ``body_revision``.
+
+    Rows come from a server-side cursor a few bodies at a time, so a scan of
+    the whole fleet never holds every body in memory. Consume the iterator
+    inside the caller's transaction.
+    """
+
+    with conn.cursor(name="catalog_option_active_bodies") as cursor:
+        cursor.itersize = ACTIVE_BODIES_FETCH_SIZE
+        cursor.execute(
+            """
+            SELECT p.id, p.name, p.active_version_id, v.body
+            FROM projects p
+            JOIN project_versions v ON v.id = p.active_version_id
+            WHERE p.deleted_at IS NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM project_version_drafts d WHERE d.version_id = p.active_version_id
+              )
+              AND (NOT %(stale_only)s OR v.option_usage_revision IS DISTINCT FROM v.body_revision)
+            UNION ALL
+            SELECT p.id, p.name, p.active_version_id, d.body
+            FROM projects p
+            JOIN project_version_drafts d ON d.version_id = p.active_version_id
+            WHERE p.deleted_at IS NULL AND p.active_version_id IS NOT NULL
+              AND (NOT %(stale_only)s OR d.option_usage_revision IS DISTINCT FROM d.body_revision)
+            ORDER BY id
+            """,
+            {"stale_only": option_usage_stale_only},
+        )
+        for row in cursor:
+            yield dict(row)
+
+
+def list_projects_with_option_usage(
+    conn: Connection[Any],
+    *,
+    catalog_table: CatalogOptionTable,
+    field_key: str,
+    ref_labels: list[str],
+    filter_labels: list[str],
+) -> list[dict[str, Any]]:
+    """Active projects whose indexed working-surface bodies hold any of the labels.
+
+    Same working surface as ``iter_active_project_bodies``; bodies whose index
+    is stale are left to the caller.
     """
 
     rows = conn.execute(
         """
-        SELECT p.id, p.name, p.active_version_id, v.body
-        FROM projects p
-        JOIN project_versions v ON v.id = p.active_version_id
+        SELECT DISTINCT p.id, p.name
+        FROM project_catalog_option_usage u
+        JOIN projects p ON p.id = u.project_id AND p.active_version_id = u.version_id
+        LEFT JOIN project_versions v ON u.draft_user_id IS NULL AND v.id = u.version_id
+        LEFT JOIN project_version_drafts d ON d.version_id = u.version_id AND d.user_id = u.draft_user_id
         WHERE p.deleted_at IS NULL
-          AND NOT EXISTS (
-              SELECT 1 FROM project_version_drafts d WHERE d.version_id = p.active_version_id
+          AND u.catalog_table = %(catalog_table)s
+          AND u.field_key = %(field_key)s
+          AND u.label = ANY(
+              CASE WHEN u.table_key = 'manufacturer_filters'
+                   THEN %(filter_labels)s::text[] ELSE %(ref_labels)s::text[] END
           )
-        UNION ALL
-        SELECT p.id, p.name, p.active_version_id, d.body
-        FROM projects p
-        JOIN project_version_drafts d ON d.version_id = p.active_version_id
-        WHERE p.deleted_at IS NULL AND p.active_version_id IS NOT NULL
-        ORDER BY id
-        """
+          AND CASE
+              WHEN u.draft_user_id IS NULL THEN
+                  v.option_usage_revision = v.body_revision
+                  AND NOT EXISTS (SELECT 1 FROM project_version_drafts x WHERE x.version_id = u.version_id)
+              ELSE d.option_usage_revision = d.body_revision
+          END
+        ORDER BY p.id
+        """,
+        {
+            "catalog_table": catalog_table,
+            "field_key": field_key,
+            "ref_labels": ref_labels,
+            "filter_labels": filter_labels,
+        },
     ).fetchall()
     return [dict(row) for row in rows]
 
 
+OPTION_USAGE_COLUMNS = "table_key, catalog_table, field_key, label, row_count"
+
+
+def list_body_option_usage(
+    conn: Connection[Any], *, version_id: UUID, draft_user_id: UUID | None
+) -> list[dict[str, Any]]:
+    """Indexed option usage of one saved (``draft_user_id`` NULL) or draft body."""
+
+    rows = conn.execute(
+        f"""
+        SELECT {OPTION_USAGE_COLUMNS}
+        FROM project_catalog_option_usage
+        WHERE version_id = %(version_id)s
+          AND draft_user_id IS NOT DISTINCT FROM %(draft_user_id)s::uuid
+        """,
+        {"version_id": version_id, "draft_user_id": draft_user_id},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def replace_body_option_usage(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    usage: list[dict[str, Any]],
+) -> None:
+    conn.execute(
+        """
+        DELETE FROM project_catalog_option_usage
+        WHERE version_id = %(version_id)s
+          AND draft_user_id IS NOT DISTINCT FROM %(draft_user_id)s::uuid
+        """,
+        {"version_id": version_id, "draft_user_id": draft_user_id},
+    )
+    if not usage:
+        return
+    conn.execute(
+        f"""
+        INSERT INTO project_catalog_option_usage (project_id, version_id, draft_user_id, {OPTION_USAGE_COLUMNS})
+        SELECT v.project_id, v.id, %(draft_user_id)s::uuid, added.*
+        FROM project_versions v
+        CROSS JOIN unnest(
+            %(table_keys)s::text[], %(catalog_tables)s::text[], %(field_keys)s::text[],
+            %(labels)s::text[], %(row_counts)s::integer[]
+        ) AS added ({OPTION_USAGE_COLUMNS})
+        WHERE v.id = %(version_id)s
+        """,
+        {
+            "version_id": version_id,
+            "draft_user_id": draft_user_id,
+            "table_keys": [row["table_key"] for row in usage],
+            "catalog_tables": [row["catalog_table"] for row in usage],
+            "field_keys": [row["field_key"] for row in usage],
+            "labels": [row["label"] for row in usage],
+            "row_counts": [row["row_count"] for row in usage],
+        },
+    )
+
+
 def get_project_for_update(conn: Connection[Any], project_id: UUID) -> dict[str, Any] | None:
     row = conn.execute(
         """
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, cast
 from uuid import UUID
 
 from psycopg import Connection
 from starlette import status
 
+from config import settings
 from database import connection, transaction
+from features.assets.reference_index import index_body_references
 from features.catalogs import option_jobs_repository as repository
 from features.catalogs._option_seeds import (
     FRAME_TYPE_SINGLE_SELECT_FIELDS,
@@ -22,8 +26,9 @@ from features.catalogs.option_jobs_models import (
     CatalogOptionProjectResult,
     CatalogOptionTable,
 )
+from features.catalogs.option_usage_index import index_body_option_usage, projects_using_options
 from features.project_document import repository as document_repository
-from features.project_document.document import ProjectDocumentV1
+from features.project_document.document import CURRENT_PROJECT_DOCUMENT_SCHEMA_VERSION, ProjectDocumentV1
 from features.project_document.validation import (
     enforce_document_body_size,
     next_draft_etag_from_etag,
@@ -282,32 +287,119 @@ def rewrite_document_options(
     return next_body, stats
 
 
+def _rewrite_raw_document_options(
+    raw: dict[str, Any],
+    *,
+    catalog_table: CatalogOptionTable,
+    field_key: str,
+    rename_map: dict[str, str],
+    filter_map: dict[str, str],
+) -> tuple[dict[str, Any], DocumentRewriteStats]:
+    """``rewrite_document_options`` on a stored current-schema body, as JSON.
+
+    Only string values the model rewrite would touch are replaced, with
+    strings, so the result keeps the body's shape. Containers on the way to
+    a change are copied; everything else is shared with ``raw``.
+    """
+
+    tables = raw.get("tables")
+    if not isinstance(tables, dict):
+        return raw, DocumentRewriteStats()
+    refs_key = "project_frames" if catalog_table == "frame_types" else "project_glazings"
+    refs = tables.get(refs_key)
+    next_refs: list[Any] | None = None
+    refs_rewritten = 0
+    for index, ref in enumerate(refs if isinstance(refs, list) else ()):
+        origin = ref.get("catalog_origin") if isinstance(ref, dict) else None
+        value = ref.get(field_key) if isinstance(ref, dict) else None
+        if not isinstance(origin, dict) or origin.get("catalog_table") != catalog_table:
+            continue
+        if not isinstance(value, str) or value not in rename_map:
+            continue
+        if next_refs is None:
+            next_refs = list(refs)
+        next_refs[index] = {**ref, field_key: rename_map[value]}
+        refs_rewritten += 1
+
+    filters = tables.get("manufacturer_filters")
+    filter_attribute = (
+        "frame_manufacturers_enabled" if catalog_table == "frame_types" else "glazing_manufacturers_enabled"
+    )
+    values = filters.get(filter_attribute) if field_key == "manufacturer" and isinstance(filters, dict) else None
+    filters_rewritten = sum(value in filter_map for value in values) if isinstance(values, list) else 0
+    stats = DocumentRewriteStats(refs_rewritten, filters_rewritten)
+    if not stats.changed:
+        return raw, stats
+
+    next_tables = dict(tables)
+    if next_refs is not None:
+        next_tables[refs_key] = next_refs
+    if isinstance(filters, dict) and isinstance(values, list):
+        # Same mapping and de-duplication as the model rewrite, which also
+        # runs whenever anything in the body changed.
+        rewritten: list[Any] = []
+        seen: set[Any] = set()
+        for value in values:
+            replacement = filter_map.get(value, value)
+            if replacement not in seen:
+                rewritten.append(replacement)
+                seen.add(replacement)
+        next_tables["manufacturer_filters"] = {**filters, filter_attribute: rewritten}
+    return {**raw, "tables": next_tables}, stats
+
+
+def rewrite_stored_document_options(
+    raw_body: object,
+    *,
+    catalog_table: CatalogOptionTable,
+    field_key: str,
+    operations: list[CatalogOptionOperation],
+) -> tuple[ProjectDocumentV1 | None, DocumentRewriteStats]:
+    """Rewrite one stored body; None when the cascade leaves it unchanged.
+
+    A body already at the current schema is rewritten as JSON and parsed
+    once, only if it changed, since its ETag, size and indexes come from the
+    model. Older bodies take the model path (``validate_document`` upgrades
+    them first).
+    """
+
+    raw = cast(dict[str, Any], raw_body) if isinstance(raw_body, dict) else None
+    if raw is not None and raw.get("schema_version") == CURRENT_PROJECT_DOCUMENT_SCHEMA_VERSION:
+        rename_map, filter_map = _operation_maps(operations)
+        next_raw, stats = _rewrite_raw_document_options(
+            raw,
+            catalog_table=catalog_table,
+            field_key=field_key,
+            rename_map=rename_map,
+            filter_map=filter_map,
+        )
+        return (validate_document(next_raw) if stats.changed else None), stats
+    next_body, stats = rewrite_document_options(
+        validate_document(raw_body),
+        catalog_table=catalog_table,
+        field_key=field_key,
+        operations=operations,
+    )
+    return (next_body if stats.changed else None), stats
+
+
 def _target_projects_for(
     *,
     catalog_table: CatalogOptionTable,
     field_key: str,
     operations: list[CatalogOptionOperation],
 ) -> list[dict[str, Any]]:
-    with connection() as conn:
-        rows = repository.list_active_project_bodies(conn)
-    targets: dict[UUID, dict[str, Any]] = {}
+    # The usage index answers for every indexed body; only bodies it has
+    # not caught up with are parsed (see ``option_usage_index``).
     rename_map, filter_map = _operation_maps(operations)
-    for row in rows:
-        body = validate_document(row["body"])
-        if not _rewrite_stats(
-            body,
+    with connection() as conn:
+        return projects_using_options(
+            conn,
             catalog_table=catalog_table,
             field_key=field_key,
-            rename_map=rename_map,
-            filter_map=filter_map,
-        ).changed:
-            continue
-        project_id = UUID(str(row["id"]))
-        targets[project_id] = {
-            "id": project_id,
-            "name": str(row["name"]),
-        }
-    return list(targets.values())
+            ref_labels=rename_map.keys(),
+            filter_labels=filter_map.keys(),
+        )
 
 
 def preview_cascade(
@@ -380,17 +472,16 @@ def _process_project(
         active_has_draft = bool(drafts)
 
         for draft in drafts:
-            body = validate_document(draft["body"])
-            next_body, stats = rewrite_document_options(
-                body,
+            next_body, stats = rewrite_stored_document_options(
+                draft["body"],
                 catalog_table=catalog_table,
                 field_key=field_key,
                 operations=operations,
             )
-            if not stats.changed:
+            if next_body is None:
                 continue
             serialized = enforce_document_body_size(next_body)
-            document_repository.rewrite_draft_body(
+            rewritten = document_repository.rewrite_draft_body(
                 conn,
                 UUID(str(draft["version_id"])),
                 UUID(str(draft["user_id"])),
@@ -398,22 +489,35 @@ def _process_project(
                 next_draft_etag_from_etag(serialized.etag),
                 serialized_body=serialized,
             )
+            index_body_references(
+                conn,
+                version_id=UUID(str(draft["version_id"])),
+                draft_user_id=UUID(str(draft["user_id"])),
+                body=next_body,
+                body_revision=rewritten["body_revision"],
+            )
+            index_body_option_usage(
+                conn,
+                version_id=UUID(str(draft["version_id"])),
+                draft_user_id=UUID(str(draft["user_id"])),
+                body=next_body,
+                body_revision=rewritten["body_revision"],
+            )
             refs_rewritten += stats.refs_rewritten
             filters_rewritten += stats.filters_rewritten
             drafts_rewritten += 1
 
         if not active_has_draft:
-            body = validate_document(active["body"])
-            next_body, stats = rewrite_document_options(
-                body,
+            next_body, stats = rewrite_stored_document_options(
+                active["body"],
                 catalog_table=catalog_table,
                 field_key=field_key,
                 operations=operations,
             )
-            if stats.changed:
+            if next_body is not None:
                 serialized = enforce_document_body_size(next_body)
                 base_name = _version_name(field_key, operations)
-                document_repository.insert_version_from_body(
+                inserted = document_repository.insert_version_from_body(
                     conn,
                     project_id,
                     active_version_id,
@@ -425,6 +529,8 @@ def _process_project(
                     serialized.size_bytes,
                     serialized_body=serialized,
                 )
+                index_body_references(conn, version_id=inserted["id"], draft_user_id=None, body=next_body)
+                index_body_option_usage(conn, version_id=inserted["id"], draft_user_id=None, body=next_body)
                 refs_rewritten += stats.refs_rewritten
                 filters_rewritten += stats.filters_rewritten
                 version_created = True
@@ -452,6 +558,79 @@ def _totals(results: list[CatalogOptionProjectResult]) -> CatalogOptionCascadeTo
     )
 
 
+class _JobCheckpoint:
+    """Records finished projects of one running job, one at a time.
+
+    Each project result is saved with the job's running totals as soon as it
+    is known, so a job that dies resumes with exactly the unfinished
+    projects still pending. Saves are serialized so the stored totals and
+    progress never move backwards while projects finish concurrently.
+    """
+
+    def __init__(self, job: CatalogOptionJob) -> None:
+        self.job_id = job.id
+        self.results = {result.project_id: result for result in job.project_results}
+        self._lock = threading.Lock()
+
+    def save(self, project_result: CatalogOptionProjectResult) -> None:
+        with self._lock:
+            self.results[project_result.project_id] = project_result
+            totals = _totals(list(self.results.values()))
+            with transaction() as conn:
+                repository.save_project_result(
+                    conn,
+                    job_id=self.job_id,
+                    project_result=project_result,
+                    totals=totals,
+                )
+
+
+def _run_project(job: CatalogOptionJob, project: dict[str, Any], checkpoint: _JobCheckpoint) -> None:
+    project_id = UUID(str(project["id"]))
+    with transaction() as conn:
+        if not repository.claim_project(conn, job.id, project_id):
+            return
+    try:
+        project_result = _process_project(
+            project,
+            catalog_table=job.catalog_table,
+            field_key=job.field_key,
+            operations=job.operations,
+            created_by=job.created_by,
+        )
+    except Exception as exc:
+        project_result = CatalogOptionProjectResult(
+            project_id=project_id,
+            project_name=str(project["name"]),
+            status="failed",
+            error=str(exc),
+        )
+    checkpoint.save(project_result)
+
+
+def _run_projects(job: CatalogOptionJob, projects: list[dict[str, Any]], checkpoint: _JobCheckpoint) -> None:
+    """Process every still-pending project, on up to ``catalog_option_job_workers`` threads.
+
+    Projects share no rows, so each runs in its own transaction; the
+    per-project claim keeps a resumed job from redoing finished work.
+    """
+
+    workers = min(settings.catalog_option_job_workers, len(projects))
+    if workers < 2:
+        for project in projects:
+            _run_project(job, project, checkpoint)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="catalog-cascade") as pool:
+        futures = [pool.submit(_run_project, job, project, checkpoint) for project in projects]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
 def run_job(job_id: str) -> CatalogOptionJob:
     """Run or resume a cascade; already-completed projects remain durable."""
 
@@ -469,37 +648,9 @@ def run_job(job_id: str) -> CatalogOptionJob:
         projects = _target_projects(job)
         with transaction() as conn:
             repository.register_projects(conn, job_id, projects)
-        results_by_project = {result.project_id: result for result in job.project_results}
-        for project in projects:
-            project_id = UUID(str(project["id"]))
-            with transaction() as conn:
-                if not repository.claim_project(conn, job_id, project_id):
-                    continue
-            try:
-                project_result = _process_project(
-                    project,
-                    catalog_table=job.catalog_table,
-                    field_key=job.field_key,
-                    operations=job.operations,
-                    created_by=job.created_by,
-                )
-            except Exception as exc:
-                project_result = CatalogOptionProjectResult(
-                    project_id=project_id,
-                    project_name=str(project["name"]),
-                    status="failed",
-                    error=str(exc),
-                )
-            results_by_project[project_id] = project_result
-            totals = _totals(list(results_by_project.values()))
-            with transaction() as conn:
-                repository.save_project_result(
-                    conn,
-                    job_id=job_id,
-                    project_result=project_result,
-                    totals=totals,
-                )
-        totals = _totals(list(results_by_project.values()))
+        checkpoint = _JobCheckpoint(job)
+        _run_projects(job, projects, checkpoint)
+        totals = _totals(list(checkpoint.results.values()))
         final_status = "failed" if totals.failures else "completed"
         with transaction() as conn:
             return _job(
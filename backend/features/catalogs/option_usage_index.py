@@ -0,0 +1,225 @@
+"""The materialized index of catalog option labels held by document bodies.
+
+``project_catalog_option_usage`` keeps, per saved and draft body, how many
+catalog-origin frame/glazing rows carry each option label and which labels
+the manufacturer filters list. Cascade previews and target lists
+(``option_jobs_service``) query it instead of parsing every active body.
+The document write paths call :func:`index_body_option_usage` in the
+transaction that persists a body, next to ``index_body_references``, and it
+stamps the body row with the revision it indexed.
+
+Like the asset-reference index, a body whose stamp lags its
+``body_revision`` was written by something that does not maintain the index.
+:func:`projects_using_options` parses such bodies instead of trusting their
+rows, so the index can lag but never hide a project from a cascade.
+:func:`rebuild_project_option_usage` reports and repairs drift
+(``scripts/rebuild_catalog_option_usage.py``).
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from psycopg import Connection
+
+from features.catalogs import option_jobs_repository as repository
+from features.catalogs._option_seeds import (
+    FRAME_TYPE_SINGLE_SELECT_FIELDS,
+    GLAZING_TYPE_SINGLE_SELECT_FIELDS,
+)
+from features.catalogs.option_jobs_models import CatalogOptionTable
+from features.project_document import repository as document_repository
+from features.project_document.document import ProjectDocumentV1
+from features.project_document.validation import SectionPath, validate_document
+
+# table_key, catalog_table, field_key, label -> row_count
+OptionUsage = dict[tuple[str, str, str, str], int]
+
+MANUFACTURER_FILTERS = "manufacturer_filters"
+_REF_TABLE_BY_CATALOG: dict[CatalogOptionTable, str] = {
+    "frame_types": "project_frames",
+    "glazing_types": "project_glazings",
+}
+_FIELDS_BY_CATALOG: dict[CatalogOptionTable, tuple[str, ...]] = {
+    "frame_types": FRAME_TYPE_SINGLE_SELECT_FIELDS,
+    "glazing_types": GLAZING_TYPE_SINGLE_SELECT_FIELDS,
+}
+_FILTER_ATTRIBUTE_BY_CATALOG: dict[CatalogOptionTable, str] = {
+    "frame_types": "frame_manufacturers_enabled",
+    "glazing_types": "glazing_manufacturers_enabled",
+}
+_INDEXED_TABLE_PATHS: tuple[SectionPath, ...] = tuple(
+    ("tables", table_key) for table_key in (*_REF_TABLE_BY_CATALOG.values(), MANUFACTURER_FILTERS)
+)
+
+
+@dataclass(frozen=True)
+class OptionUsageDrift:
+    """How far one project's usage index is from its bodies (see ``rebuild_project_option_usage``)."""
+
+    bodies_checked: int
+    bodies_drifted: int
+    rows_added: int
+    rows_removed: int
+    applied: bool
+
+
+def document_option_usage(body: ProjectDocumentV1) -> OptionUsage:
+    """Count the option labels ``body`` holds, exactly as a cascade would match them.
+
+    A ref row counts under its catalog only when its ``catalog_origin`` points
+    at that catalog; filter values count once per occurrence.
+    """
+    usage: Counter[tuple[str, str, str, str]] = Counter()
+    for catalog_table, table_key in _REF_TABLE_BY_CATALOG.items():
+        for ref in getattr(body.tables, table_key):
+            if ref.catalog_origin is None or ref.catalog_origin.catalog_table != catalog_table:
+                continue
+            for field_key in _FIELDS_BY_CATALOG[catalog_table]:
+                value = getattr(ref, field_key, None)
+                if isinstance(value, str):
+                    usage[(table_key, catalog_table, field_key, value)] += 1
+    filters = body.tables.manufacturer_filters
+    if filters is not None:
+        for catalog_table, attribute in _FILTER_ATTRIBUTE_BY_CATALOG.items():
+            for value in getattr(filters, attribute) or ():
+                usage[(MANUFACTURER_FILTERS, catalog_table, "manufacturer", value)] += 1
+    return dict(usage)
+
+
+def option_usage_in_sections(paths: Iterable[SectionPath]) -> bool:
+    """Whether any of the given document sections can hold indexed option labels."""
+    for path in paths:
+        for table_path in _INDEXED_TABLE_PATHS:
+            overlap = min(len(path), len(table_path))
+            if path[:overlap] == table_path[:overlap]:
+                return True
+    return False
+
+
+def index_body_option_usage(
+    conn: Connection[Any],
+    *,
+    version_id: UUID,
+    draft_user_id: UUID | None,
+    body: ProjectDocumentV1,
+    body_revision: int | None = None,
+    changed_sections: Iterable[SectionPath] | None = None,
+) -> None:
+    """Bring the usage index for one stored body up to date with ``body``.
+
+    Call it in the transaction that wrote the body; ``draft_user_id`` and
+    ``body_revision`` are as for ``index_body_references``. Pass
+    ``changed_sections`` only when the index already matched the body this
+    one was derived from: if none of them can hold option labels the rows
+    are kept and only the stamp moves.
+    """
+    if changed_sections is None or option_usage_in_sections(changed_sections):
+        _sync_usage(conn, version_id=version_id, draft_user_id=draft_user_id, current=document_option_usage(body))
+    document_repository.mark_option_usage_indexed(conn, version_id, draft_user_id, body_revision)
+
+
+def projects_using_options(
+    conn: Connection[Any],
+    *,
+    catalog_table: CatalogOptionTable,
+    field_key: str,
+    ref_labels: Collection[str],
+    filter_labels: Collection[str],
+) -> list[dict[str, Any]]:
+    """Active projects whose working surface holds any of the given labels.
+
+    The working surface is the active version's drafts, or the active
+    version itself when it has none (``iter_active_project_bodies``). Rows
+    with ``ref_labels`` match catalog-origin refs; ``filter_labels`` match
+    manufacturer filters, which are only indexed under ``manufacturer``.
+    Indexed bodies are answered by the index, stale ones are parsed.
+    """
+    targets = {
+        UUID(str(row["id"])): {"id": UUID(str(row["id"])), "name": str(row["name"])}
+        for row in repository.list_projects_with_option_usage(
+            conn,
+            catalog_table=catalog_table,
+            field_key=field_key,
+            ref_labels=sorted(ref_labels),
+            filter_labels=sorted(filter_labels),
+        )
+    }
+    for row in repository.iter_active_project_bodies(conn, option_usage_stale_only=True):
+        project_id = UUID(str(row["id"]))
+        if project_id in targets:
+            continue
+        usage = document_option_usage(validate_document(row["body"]))
+        if any(
+            usage_catalog == catalog_table
+            and usage_field == field_key
+            and label in (filter_labels if table_key == MANUFACTURER_FILTERS else ref_labels)
+            for table_key, usage_catalog, usage_field, label in usage
+        ):
+            targets[project_id] = {"id": project_id, "name": str(row["name"])}
+    return sorted(targets.values(), key=lambda project: str(project["id"]))
+
+
+def rebuild_project_option_usage(conn: Connection[Any], project_id: UUID, *, apply: bool = False) -> OptionUsageDrift:
+    """Compare every body of the project with its usage rows, optionally repairing them.
+
+    Same contract as ``rebuild_project_asset_references``: every body is
+    re-parsed, ``apply`` rewrites drifted rows and stamps each body, and the
+    version rows are locked first to serialize with the write paths.
+    """
+    document_repository.list_project_versions_for_update(conn, project_id)
+    checked = drifted = added = removed = 0
+    for row in document_repository.list_bodies_for_option_usage(conn, project_id, stale_only=False):
+        version_id = UUID(str(row["version_id"]))
+        draft_user_id = UUID(str(row["draft_user_id"])) if row["draft_user_id"] is not None else None
+        current = set(document_option_usage(validate_document(row["body"])).items())
+        indexed = set(_indexed_usage(conn, version_id, draft_user_id).items())
+        checked += 1
+        body_added, body_removed = len(current - indexed), len(indexed - current)
+        if body_added or body_removed or row["option_usage_revision"] != row["body_revision"]:
+            drifted += 1
+        added += body_added
+        removed += body_removed
+        if apply:
+            _sync_usage(conn, version_id=version_id, draft_user_id=draft_user_id, current=dict(current))
+            document_repository.mark_option_usage_indexed(conn, version_id, draft_user_id, row["body_revision"])
+    return OptionUsageDrift(
+        bodies_checked=checked,
+        bodies_drifted=drifted,
+        rows_added=added,
+        rows_removed=removed,
+        applied=apply,
+    )
+
+
+def _sync_usage(conn: Connection[Any], *, version_id: UUID, draft_user_id: UUID | None, current: OptionUsage) -> None:
+    # A body holds a handful of labels, so a changed body's rows are replaced
+    # wholesale rather than diffed row by row.
+    if _indexed_usage(conn, version_id, draft_user_id) == current:
+        return
+    repository.replace_body_option_usage(
+        conn,
+        version_id=version_id,
+        draft_user_id=draft_user_id,
+        usage=[
+            {
+                "table_key": table_key,
+                "catalog_table": catalog_table,
+                "field_key": field_key,
+                "label": label,
+                "row_count": row_count,
+            }
+            for (table_key, catalog_table, field_key, label), row_count in current.items()
+        ],
+    )
+
+
+def _indexed_usage(conn: Connection[Any], version_id: UUID, draft_user_id: UUID | None) -> OptionUsage:
+    return {
+        (row["table_key"], row["catalog_table"], row["field_key"], row["label"]): int(row["row_count"])
+        for row in repository.list_body_option_usage(conn, version_id=version_id, draft_user_id=draft_user_id)
+    }
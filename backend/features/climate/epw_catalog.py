@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import io
 import re
+import threading
 import zipfile
 from dataclasses import dataclass
 from dataclasses import replace as dataclass_replace
@@ -13,10 +14,12 @@ from urllib.parse import urljoin
 
 import certifi
 import httpx
+import numpy as np
 from openpyxl import load_workbook
 
 from config import settings
 from features.climate.proximity import haversine_miles
+from features.climate.spatial_index import Mask, SphereIndex
 
 ONEBUILDING_BASE_URL = "https://climate.onebuilding.org/"
 DEFAULT_CATALOG_URLS = (
@@ -62,16 +65,12 @@ class EpwZipPayload:
 
 
 def nearest_epw_entry(latitude: float, longitude: float) -> EpwCatalogEntry | None:
-    entries = load_epw_catalog(catalog_urls())
-    if not entries:
+    index = _catalog_index(load_epw_catalog(catalog_urls()))
+    if not index.entries:
         return None
-    nearest = min(
-        entries,
-        key=lambda entry: (
-            round(haversine_miles(latitude, longitude, entry.latitude, entry.longitude), 6),
-            _recency_rank(entry),
-        ),
-    )
+    distances = np.round(index.entry_points.distances_mi(latitude, longitude), 6)
+    tied = np.flatnonzero(distances == distances.min())
+    nearest = min((index.entries[position] for position in tied), key=_recency_rank)
     return dataclass_replace(
         nearest,
         distance_mi=haversine_miles(latitude, longitude, nearest.latitude, nearest.longitude),
@@ -87,8 +86,8 @@ def nearest_epw_entries(
     = no cap); an optional ``country`` narrows the search (the any-state weather
     picker mode).
     """
-    entries = [entry for entry in load_epw_catalog(catalog_urls()) if _matches(entry.country, country)]
-    return _rank_nearest(entries, latitude, longitude, limit)
+    index = _catalog_index(load_epw_catalog(catalog_urls()))
+    return index.rank_nearest(latitude, longitude, limit, mask=index.matching(country=country))
 
 
 def epw_entries_for_region(
@@ -98,17 +97,13 @@ def epw_entries_for_region(
 
     ``limit`` of ``None`` returns the whole state (the picker shows every dataset
     version, so a state's full roster is the intent)."""
-    entries = [
-        entry
-        for entry in load_epw_catalog(catalog_urls())
-        if _matches(entry.country, country) and _matches(entry.region, region)
-    ]
-    return _rank_nearest(entries, latitude, longitude, limit)
+    index = _catalog_index(load_epw_catalog(catalog_urls()))
+    return index.rank_nearest(latitude, longitude, limit, mask=index.matching(country=country, region=region))
 
 
 def find_entry_by_url(url: str) -> EpwCatalogEntry | None:
     """Resolve a catalog entry from its zip URL (for a from-catalog attach)."""
-    return next((entry for entry in load_epw_catalog(catalog_urls()) if entry.url == url), None)
+    return _catalog_index(load_epw_catalog(catalog_urls())).by_url.get(url)
 
 
 def epw_version_label(url: str) -> str:
@@ -126,30 +121,94 @@ def epw_version_label(url: str) -> str:
     return f"{dataset_type} {period.replace('-', '–')}" if period else dataset_type
 
 
-def _rank_nearest(
-    entries: list[EpwCatalogEntry], latitude: float, longitude: float, limit: int | None
-) -> list[EpwCatalogEntry]:
-    """Order catalog entries for the picker and stamp each with its great-circle
-    ``distance_mi``.
-
-    First reduce to one row per (station, dataset type) — keeping the most recent
-    period when a type is dated (``TMYx 2007-2021``/``2009-2023``/``2011-2025`` →
-    just ``2011-2025``) while preserving distinct methodologies (TMYx, TMY3, …).
-    Then order stations nearest-first, keeping a station's remaining versions
-    adjacent and most-recent-first rather than interleaved with a neighbour in
-    the same distance band. ``limit`` caps the row count; ``None`` means no cap
-    (region mode shows a whole state)."""
-    reduced = _collapse_to_recent_per_type(entries)
-    decorated = [
-        (haversine_miles(latitude, longitude, entry.latitude, entry.longitude), _station_key(entry), entry)
-        for entry in reduced
-    ]
-    nearest_per_station: dict[tuple[str, str, str], float] = {}
-    for distance, key, _entry in decorated:
-        nearest_per_station[key] = min(distance, nearest_per_station.get(key, distance))
-    decorated.sort(key=lambda row: (round(nearest_per_station[row[1]], 6), row[1], _recency_rank(row[2])))
-    capped = decorated if limit is None else decorated[: max(limit, 0)]
-    return [dataclass_replace(entry, distance_mi=distance) for distance, _key, entry in capped]
+class _CatalogIndex:
+    """Spatial index over one loaded catalog, built once and reused per request.
+
+    The (station, dataset type) collapse, the station-key and recency orders,
+    and the unit-vector coordinates do not depend on the query point, so they
+    are computed here rather than on every picker request. A query is then one
+    vectorized distance pass plus a ``lexsort``; exact ``haversine_miles`` is
+    only evaluated for the rows returned.
+    """
+
+    def __init__(self, entries: tuple[EpwCatalogEntry, ...]) -> None:
+        self.entries = entries
+        self.entry_points = SphereIndex([entry.latitude for entry in entries], [entry.longitude for entry in entries])
+        self.by_url: dict[str, EpwCatalogEntry] = {}
+        for entry in entries:
+            self.by_url.setdefault(entry.url, entry)
+
+        self.collapsed = _collapse_to_recent_per_type(list(entries))
+        self.collapsed_points = SphereIndex(
+            [entry.latitude for entry in self.collapsed], [entry.longitude for entry in self.collapsed]
+        )
+        station_keys = [_station_key(entry) for entry in self.collapsed]
+        station_ordinals = {key: ordinal for ordinal, key in enumerate(sorted(set(station_keys)))}
+        self.station_count = len(station_ordinals)
+        self.station = np.array([station_ordinals[key] for key in station_keys], dtype=np.intp)
+        self.recency = np.empty(len(self.collapsed), dtype=np.intp)
+        recency_order = sorted(range(len(self.collapsed)), key=lambda position: _recency_rank(self.collapsed[position]))
+        self.recency[recency_order] = np.arange(len(self.collapsed), dtype=np.intp)
+        self._countries = np.array([_folded(entry.country) for entry in self.collapsed], dtype=object)
+        self._regions = np.array([_folded(entry.region) for entry in self.collapsed], dtype=object)
+
+    def matching(self, *, country: str | None, region: str | None = None) -> Mask | None:
+        """Mask of collapsed entries whose country/region equal the targets, case-
+        and whitespace-insensitively; a ``None`` target is no filter, and
+        ``None`` overall means every entry."""
+        mask: Mask | None = None
+        for values, target in ((self._countries, country), (self._regions, region)):
+            if target is not None:
+                matched = values == _folded(target)
+                mask = matched if mask is None else mask & matched
+        return mask
+
+    def rank_nearest(
+        self, latitude: float, longitude: float, limit: int | None, *, mask: Mask | None
+    ) -> list[EpwCatalogEntry]:
+        """Order catalog entries for the picker and stamp each with its
+        great-circle ``distance_mi``.
+
+        Rows are one per (station, dataset type) — keeping the most recent
+        period when a type is dated (``TMYx 2007-2021``/``2009-2023``/``2011-2025``
+        → just ``2011-2025``) while preserving distinct methodologies (TMYx,
+        TMY3, …). Stations are ordered nearest-first, keeping a station's
+        remaining versions adjacent and most-recent-first rather than
+        interleaved with a neighbour in the same distance band. ``limit`` caps
+        the row count; ``None`` means no cap (region mode shows a whole state)."""
+        positions = np.arange(len(self.collapsed), dtype=np.intp) if mask is None else np.flatnonzero(mask)
+        if len(positions) == 0 or (limit is not None and limit <= 0):
+            return []
+        distances = self.collapsed_points.distances_mi(latitude, longitude)[positions]
+        stations = self.station[positions]
+        nearest_per_station = np.full(self.station_count, np.inf)
+        np.minimum.at(nearest_per_station, stations, distances)
+        order = np.lexsort((self.recency[positions], stations, np.round(nearest_per_station[stations], 6)))
+        capped = order if limit is None else order[:limit]
+        return [
+            dataclass_replace(
+                entry,
+                distance_mi=haversine_miles(latitude, longitude, entry.latitude, entry.longitude),
+            )
+            for entry in (self.collapsed[positions[row]] for row in capped)
+        ]
+
+
+_CATALOG_INDEX: _CatalogIndex | None = None
+_CATALOG_INDEX_LOCK = threading.Lock()
+
+
+def _catalog_index(entries: tuple[EpwCatalogEntry, ...]) -> _CatalogIndex:
+    """The index for ``entries``, rebuilt only when the loaded catalog changes.
+
+    :func:`load_epw_catalog` returns the same tuple until its TTL bucket rolls
+    over, so identity is the cache key."""
+    global _CATALOG_INDEX
+    with _CATALOG_INDEX_LOCK:
+        index = _CATALOG_INDEX
+        if index is None or index.entries is not entries:
+            index = _CATALOG_INDEX = _CatalogIndex(entries)
+        return index
 
 
 def _collapse_to_recent_per_type(entries: list[EpwCatalogEntry]) -> list[EpwCatalogEntry]:
@@ -185,11 +244,9 @@ def _dataset_type(url: str) -> str:
     return match.group("type").casefold() if match else ""
 
 
-def _matches(value: str | None, target: str | None) -> bool:
-    """Case-insensitive equality; a ``None`` target matches anything (no filter)."""
-    if target is None:
-        return True
-    return value is not None and value.strip().casefold() == target.strip().casefold()
+def _folded(value: str | None) -> str | None:
+    """Case- and whitespace-insensitive form of a catalog country/region."""
+    return value.strip().casefold() if value is not None else None
 
 
 def download_epw_zip(entry: EpwCatalogEntry) -> EpwZipPayload:
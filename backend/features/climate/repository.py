@@ -249,36 +249,35 @@ def search_locations(
     )
 
 
-def nearest_locations(
-    conn: Connection[Any],
-    dataset_id: UUID,
-    *,
-    latitude: float,
-    longitude: float,
-    limit: int,
-) -> list[dict[str, Any]]:
-    """Return the ``limit`` locations closest to a coordinate.
+def located_location_coordinates(conn: Connection[Any], dataset_id: UUID) -> list[dict[str, Any]]:
+    """Return ``id, latitude, longitude`` for every located row, id-ordered.
 
-    Ordering is by squared planar distance with a cos(latitude)
-    correction on the longitude term — accurate enough for ranking
-    weather stations within a country, and cheap (no PostGIS). Rows with
-    null coordinates are excluded.
+    This is the input to the in-process nearest-station index
+    (``spatial_index``); rows with null coordinates are excluded.
     """
     return list(
         conn.execute(
-            f"""
-            SELECT {_LOCATION_COLUMNS}
+            """
+            SELECT id, latitude, longitude
             FROM climate_dataset_location
             WHERE dataset_id = %(dataset_id)s
               AND latitude IS NOT NULL
               AND longitude IS NOT NULL
-            ORDER BY
-                power(latitude - %(latitude)s, 2)
-                + power((longitude - %(longitude)s) * cos(radians(%(latitude)s)), 2) ASC,
-                id ASC
-            LIMIT %(limit)s
+            ORDER BY id ASC
             """,
-            {"dataset_id": dataset_id, "latitude": latitude, "longitude": longitude, "limit": limit},
+            {"dataset_id": dataset_id},
+        ).fetchall()
+    )
+
+
+def get_location_summaries(conn: Connection[Any], location_ids: list[UUID]) -> list[dict[str, Any]]:
+    """Return the list columns for ``location_ids``, in no particular order."""
+    if not location_ids:
+        return []
+    return list(
+        conn.execute(
+            f"SELECT {_LOCATION_COLUMNS} FROM climate_dataset_location WHERE id = ANY(%(ids)s)",
+            {"ids": location_ids},
         ).fetchall()
     )
 
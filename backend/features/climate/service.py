@@ -26,6 +26,7 @@ from features.climate.models import (
     ClimateLocationSummary,
 )
 from features.climate.record import ClimateRecord
+from features.climate.spatial_index import nearest_dataset_locations
 from features.shared.errors import api_error
 
 # Hard cap on a single location-search page, mirroring the catalog list
@@ -72,7 +73,7 @@ def search_climate_locations(
             raise api_error(status.HTTP_404_NOT_FOUND, "climate_dataset_not_found", "Climate dataset was not found.")
         if near is not None:
             latitude, longitude = near
-            rows = repository.nearest_locations(
+            rows = nearest_dataset_locations(
                 conn, dataset_id, latitude=latitude, longitude=longitude, limit=bounded_limit
             )
             total = len(rows)
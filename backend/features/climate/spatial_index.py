@@ -0,0 +1,153 @@
+"""Nearest-station and radius queries over a fixed set of coordinates.
+
+Points are stored once as unit vectors, so a query is one vectorized chord
+computation and a partial sort, not a Python ``haversine_miles`` call per
+point or a full ``ORDER BY`` over a dataset partition. At the sizes this app
+indexes (a few thousand PH stations, a few tens of thousands of EPW catalog
+rows) that scan runs in well under a millisecond, faster than walking a
+Python-level tree would be.
+
+:class:`SphereIndex` is pure. :func:`nearest_dataset_locations` keeps one
+index per reference dataset. A dataset's locations are written only in the
+transaction that creates it, and a re-seed creates a new dataset id, so an
+index never needs invalidating; it is only evicted to bound memory.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+from psycopg import Connection
+
+from features.climate import repository
+from features.climate.proximity import EARTH_RADIUS_MI
+
+# Reference datasets whose location index stays resident. Only the latest
+# Phius and PHI releases are normally queried.
+DATASET_INDEX_MAX_ENTRIES = 8
+
+Positions = npt.NDArray[np.intp]
+Mask = npt.NDArray[np.bool_]
+
+
+def _unit_vectors(latitudes: npt.ArrayLike, longitudes: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+class SphereIndex:
+    """Great-circle queries over points given as latitude/longitude degrees.
+
+    Results are positions into the constructor's sequences, nearest first,
+    with equal distances in position order. An optional boolean ``mask``
+    restricts a query to a subset (a country, a state) without building a
+    second index.
+    """
+
+    def __init__(self, latitudes: npt.ArrayLike, longitudes: npt.ArrayLike) -> None:
+        self._points = _unit_vectors(latitudes, longitudes).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def distances_mi(self, latitude: float, longitude: float) -> npt.NDArray[np.float64]:
+        """Great-circle distance in miles from the query to every point."""
+
+        # Chord length from the vector difference stays accurate at short
+        # range, where 1 - dot product would cancel to zero.
+        delta = self._points - _unit_vectors(latitude, longitude)
+        half_chord = np.sqrt(np.einsum("ij,ij->i", delta, delta)) / 2
+        return 2 * EARTH_RADIUS_MI * np.arcsin(np.minimum(half_chord, 1.0))
+
+    def nearest(self, latitude: float, longitude: float, k: int, *, mask: Mask | None = None) -> Positions:
+        """The ``k`` nearest positions."""
+
+        distances, candidates = self._candidates(latitude, longitude, mask)
+        if k <= 0 or len(candidates) == 0:
+            return np.empty(0, dtype=np.intp)
+        if k < len(candidates):
+            # Keep every point tied with the k-th so position order decides.
+            kth = np.partition(distances[candidates], k - 1)[k - 1]
+            candidates = candidates[distances[candidates] <= kth]
+        return self._ordered(distances, candidates)[:k]
+
+    def within(self, latitude: float, longitude: float, radius_mi: float, *, mask: Mask | None = None) -> Positions:
+        """Every position at most ``radius_mi`` away."""
+
+        distances, candidates = self._candidates(latitude, longitude, mask)
+        return self._ordered(distances, candidates[distances[candidates] <= radius_mi])
+
+    def _candidates(
+        self, latitude: float, longitude: float, mask: Mask | None
+    ) -> tuple[npt.NDArray[np.float64], Positions]:
+        distances = self.distances_mi(latitude, longitude)
+        candidates = np.arange(len(distances), dtype=np.intp) if mask is None else np.flatnonzero(mask)
+        return distances, candidates
+
+    @staticmethod
+    def _ordered(distances: npt.NDArray[np.float64], positions: Positions) -> Positions:
+        return positions[np.lexsort((positions, distances[positions]))]
+
+
+class _DatasetLocationIndex:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.location_ids: list[UUID] = [row["id"] for row in rows]
+        self.points = SphereIndex([row["latitude"] for row in rows], [row["longitude"] for row in rows])
+
+
+_DATASET_INDEXES: OrderedDict[UUID, _DatasetLocationIndex] = OrderedDict()
+_DATASET_INDEXES_LOCK = threading.Lock()
+
+
+def _dataset_index(conn: Connection[Any], dataset_id: UUID) -> _DatasetLocationIndex:
+    with _DATASET_INDEXES_LOCK:
+        index = _DATASET_INDEXES.get(dataset_id)
+        if index is not None:
+            _DATASET_INDEXES.move_to_end(dataset_id)
+            return index
+    index = _DatasetLocationIndex(repository.located_location_coordinates(conn, dataset_id))
+    with _DATASET_INDEXES_LOCK:
+        _DATASET_INDEXES[dataset_id] = index
+        while len(_DATASET_INDEXES) > DATASET_INDEX_MAX_ENTRIES:
+            _DATASET_INDEXES.popitem(last=False)
+    return index
+
+
+def nearest_dataset_locations(
+    conn: Connection[Any],
+    dataset_id: UUID,
+    *,
+    latitude: float,
+    longitude: float,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Return the ``limit`` located stations nearest a coordinate, nearest first.
+
+    Ranking is by great-circle distance, ties by location id. Rows without
+    coordinates are never candidates.
+    """
+
+    index = _dataset_index(conn, dataset_id)
+    location_ids = [index.location_ids[position] for position in index.points.nearest(latitude, longitude, limit)]
+    rows = {row["id"]: row for row in repository.get_location_summaries(conn, location_ids)}
+    if len(rows) < len(location_ids):
+        # The dataset was deleted under a resident index; drop it.
+        reset_dataset_location_indexes(dataset_id)
+    return [rows[location_id] for location_id in location_ids if location_id in rows]
+
+
+def reset_dataset_location_indexes(dataset_id: UUID | None = None) -> None:
+    """Forget one dataset's resident index, or all of them (tests)."""
+
+    with _DATASET_INDEXES_LOCK:
+        if dataset_id is None:
+            _DATASET_INDEXES.clear()
+        else:
+            _DATASET_INDEXES.pop(dataset_id, None)
@@ -0,0 +1,325 @@
+"""Two-tier cache for pure thermal and condensation results.
+
+Both calculations are pure functions of their input hash, so an assembly
+that is identical across a version and its draft, or across projects, only
+needs computing once. The first tier is a per-process LRU. The second is the
+shared ``envelope_calculation_results`` table, so a result computed by one
+worker is served to every other one and survives deploys.
+
+Shared rows are stamped with the module's ``CALCULATION_VERSION``. A lookup
+only accepts its own version, so a physics change never serves a stale
+answer; the next write overwrites the old row in place. The table is kept
+under ``calculation_cache_max_bytes`` by least-recently-used eviction, run
+every ``EVICTION_WRITE_INTERVAL`` writes rather than on each one.
+
+The shared tier is an optimization. A database error is logged and treated
+as a miss, and the caller computes the result as it would without a cache.
+A stored row that no longer validates is a miss too, and is deleted.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Collection
+from typing import Generic, Literal, TypeVar
+from uuid import UUID
+
+import structlog
+from psycopg import Error as DatabaseError
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+
+from config import settings
+from database import transaction
+from features.envelope import condensation, repository, thermal
+from features.envelope.condensation import CondensationResult
+from features.envelope.thermal import ThermalResult
+
+log = structlog.get_logger(__name__)
+
+CalculationKind = Literal["condensation", "thermal"]
+
+# Shared-tier writes between two eviction passes, per process.
+EVICTION_WRITE_INTERVAL = 64
+
+ResultT = TypeVar("ResultT")
+
+
+class CalculationCacheStats(BaseModel):
+    """One calculation kind: this process's counters and the shared table's size."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: CalculationKind
+    calculation_version: int
+    memory_entries: int
+    memory_hits: int
+    shared_hits: int
+    misses: int
+    # Hits over lookups in this process since start (or the last reset);
+    # null before the first lookup.
+    hit_rate: float | None
+    shared_entries: int
+    shared_bytes: int
+
+
+class CalculationCachePurge(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    kind: CalculationKind | None
+    purged_entries: int
+
+
+class _ResultCache(Generic[ResultT]):
+    def __init__(
+        self,
+        kind: CalculationKind,
+        calculation_version: Callable[[], int],
+        adapter: TypeAdapter[ResultT],
+        input_hash: Callable[[ResultT], str],
+    ) -> None:
+        self.kind: CalculationKind = kind
+        # Read through a callable so tests can move the module constant.
+        self._calculation_version = calculation_version
+        self._adapter = adapter
+        self._input_hash = input_hash
+        self._memory: OrderedDict[str, ResultT] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = self.shared_hits = self.misses = 0
+
+    @property
+    def calculation_version(self) -> int:
+        return self._calculation_version()
+
+    def get_many(self, input_hashes: Collection[str]) -> dict[str, ResultT]:
+        """Return the cached results among ``input_hashes``; absent ones are misses."""
+
+        found: dict[str, ResultT] = {}
+        missing: list[str] = []
+        with self._lock:
+            for input_hash in dict.fromkeys(input_hashes):
+                result = self._memory.get(input_hash)
+                if result is None:
+                    missing.append(input_hash)
+                else:
+                    self._memory.move_to_end(input_hash)
+                    found[input_hash] = result
+        shared = self._shared_get(missing) if missing else {}
+        with self._lock:
+            for input_hash, result in shared.items():
+                self._remember(input_hash, result)
+            self.memory_hits += len(found)
+            self.shared_hits += len(shared)
+            self.misses += len(missing) - len(shared)
+        return found | shared
+
+    def get(self, input_hash: str) -> ResultT | None:
+        return self.get_many([input_hash]).get(input_hash)
+
+    def put(self, result: ResultT) -> None:
+        input_hash = self._input_hash(result)
+        with self._lock:
+            self._remember(input_hash, result)
+        if settings.calculation_cache_max_bytes > 0:
+            self._shared_put(input_hash, result)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.shared_hits = self.misses = 0
+
+    def stats(self, shared_entries: int, shared_bytes: int) -> CalculationCacheStats:
+        with self._lock:
+            lookups = self.memory_hits + self.shared_hits + self.misses
+            return CalculationCacheStats(
+                kind=self.kind,
+                calculation_version=self.calculation_version,
+                memory_entries=len(self._memory),
+                memory_hits=self.memory_hits,
+                shared_hits=self.shared_hits,
+                misses=self.misses,
+                hit_rate=round((self.memory_hits + self.shared_hits) / lookups, 4) if lookups else None,
+                shared_entries=shared_entries,
+                shared_bytes=shared_bytes,
+            )
+
+    def _remember(self, input_hash: str, result: ResultT) -> None:
+        # Caller holds the lock.
+        self._memory[input_hash] = result
+        self._memory.move_to_end(input_hash)
+        while len(self._memory) > max(settings.calculation_cache_memory_entries, 0):
+            self._memory.popitem(last=False)
+
+    def _shared_get(self, input_hashes: list[str]) -> dict[str, ResultT]:
+        if settings.calculation_cache_max_bytes <= 0:
+            return {}
+        try:
+            with transaction() as conn:
+                rows = repository.touch_calculation_results(
+                    conn,
+                    kind=self.kind,
+                    calculation_version=self.calculation_version,
+                    input_hashes=input_hashes,
+                )
+        except DatabaseError as error:
+            log.warning("calculation_cache_read_failed", kind=self.kind, error_type=type(error).__name__)
+            return {}
+        found: dict[str, ResultT] = {}
+        unreadable: list[str] = []
+        for row in rows:
+            try:
+                found[row["input_hash"]] = self._adapter.validate_json(row["result_json"])
+            except ValidationError:
+                unreadable.append(row["input_hash"])
+        if unreadable:
+            self._shared_discard(unreadable)
+        return found
+
+    def _shared_discard(self, input_hashes: list[str]) -> None:
+        # A row that no longer validates (the result model changed without a
+        # CALCULATION_VERSION bump) is a miss; drop it so the recomputed
+        # result can take its place instead of failing every lookup.
+        log.warning("calculation_cache_row_unreadable", kind=self.kind, rows=len(input_hashes))
+        try:
+            with transaction() as conn:
+                repository.delete_unreadable_calculation_results(
+                    conn,
+                    kind=self.kind,
+                    calculation_version=self.calculation_version,
+                    input_hashes=input_hashes,
+                )
+        except DatabaseError as error:
+            log.warning("calculation_cache_discard_failed", kind=self.kind, error_type=type(error).__name__)
+
+    def _shared_put(self, input_hash: str, result: ResultT) -> None:
+        try:
+            with transaction() as conn:
+                repository.upsert_calculation_result(
+                    conn,
+                    kind=self.kind,
+                    calculation_version=self.calculation_version,
+                    input_hash=input_hash,
+                    result_json=self._adapter.dump_json(result).decode(),
+                )
+        except DatabaseError as error:
+            log.warning("calculation_cache_write_failed", kind=self.kind, error_type=type(error).__name__)
+            return
+        _count_shared_write()
+
+
+_CONDENSATION = _ResultCache[CondensationResult](
+    "condensation",
+    lambda: condensation.CALCULATION_VERSION,
+    TypeAdapter(CondensationResult),
+    lambda result: result.input_hash,
+)
+_THERMAL = _ResultCache[ThermalResult](
+    "thermal",
+    lambda: thermal.CALCULATION_VERSION,
+    TypeAdapter(ThermalResult),
+    lambda result: result.input_hash,
+)
+_CACHES: dict[CalculationKind, _ResultCache[CondensationResult] | _ResultCache[ThermalResult]] = {
+    "condensation": _CONDENSATION,
+    "thermal": _THERMAL,
+}
+
+_writes_since_eviction = 0
+_eviction_lock = threading.Lock()
+
+
+def _count_shared_write() -> None:
+    global _writes_since_eviction
+    with _eviction_lock:
+        _writes_since_eviction += 1
+        if _writes_since_eviction < EVICTION_WRITE_INTERVAL:
+            return
+        _writes_since_eviction = 0
+    evict_shared_calculation_results()
+
+
+def condensation_cache_get(input_hash: str) -> CondensationResult | None:
+    """Return the condensation result for an exact pure-input hash, if cached."""
+
+    return _CONDENSATION.get(input_hash)
+
+
+def condensation_cache_get_many(input_hashes: Collection[str]) -> dict[str, CondensationResult]:
+    """Batch form of :func:`condensation_cache_get`: one shared-tier query for all misses."""
+
+    return _CONDENSATION.get_many(input_hashes)
+
+
+def condensation_cache_put(result: CondensationResult) -> None:
+    _CONDENSATION.put(result)
+
+
+def thermal_cache_get(input_hash: str) -> ThermalResult | None:
+    """Return the thermal result for an exact pure-input hash, if cached."""
+
+    return _THERMAL.get(input_hash)
+
+
+def thermal_cache_get_many(input_hashes: Collection[str]) -> dict[str, ThermalResult]:
+    return _THERMAL.get_many(input_hashes)
+
+
+def thermal_cache_put(result: ThermalResult) -> None:
+    _THERMAL.put(result)
+
+
+def evict_shared_calculation_results() -> int:
+    """Trim the shared table to ``calculation_cache_max_bytes``; return rows deleted."""
+
+    if settings.calculation_cache_max_bytes <= 0:
+        return 0
+    try:
+        with transaction() as conn:
+            evicted = repository.evict_calculation_results(conn, max_bytes=settings.calculation_cache_max_bytes)
+    except DatabaseError as error:
+        log.warning("calculation_cache_eviction_failed", error_type=type(error).__name__)
+        return 0
+    if evicted:
+        log.info("calculation_cache_evicted", rows=evicted, max_bytes=settings.calculation_cache_max_bytes)
+    return evicted
+
+
+def calculation_cache_stats() -> list[CalculationCacheStats]:
+    """Per-kind counters for this process, with the shared table's totals."""
+
+    with transaction() as conn:
+        totals = repository.calculation_result_totals(conn)
+    return [cache.stats(*totals.get(kind, (0, 0))) for kind, cache in _CACHES.items()]
+
+
+def purge_calculation_cache(
+    kind: CalculationKind | None = None,
+    *,
+    actor_user_id: UUID | None = None,
+) -> CalculationCachePurge:
+    """Empty the shared table and this process's LRU, for one kind or all.
+
+    Other workers keep their process-local entries until they evict them or
+    restart. That is safe: every entry is still the exact result for its
+    input hash under the running calculation version.
+    """
+
+    with transaction() as conn:
+        purged = repository.delete_calculation_results(conn, kind=kind)
+    for cache_kind, cache in _CACHES.items():
+        if kind is None or kind == cache_kind:
+            cache.reset()
+    log.info(
+        "calculation_cache_purged",
+        kind=kind,
+        rows=purged,
+        actor_user_id=str(actor_user_id) if actor_user_id is not None else None,
+    )
+    return CalculationCachePurge(kind=kind, purged_entries=purged)
+
+
+def reset_calculation_cache() -> None:
+    """Clear the process-local tier and counters (tests and explicit operational resets)."""
+
+    for cache in _CACHES.values():
+        cache.reset()
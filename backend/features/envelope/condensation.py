@@ -12,6 +12,11 @@ Layer sets are deliberately explicit:
 * ordinary layers contribute thermal resistance and resolve ``sd`` from the
   material's direct value, then ``mu * thickness``, then the ISO 13788 air-layer
   convention.
+
+Every path is simulated from every start month at once in NumPy
+(``_simulate_batch``), bit-identical to the per-node month model. Only the
+reported worst path is re-run through that model to build its monthly
+profiles.
 """
 
 from __future__ import annotations
@@ -25,6 +30,8 @@ from itertools import product
 from typing import Literal
 from uuid import UUID
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel, ConfigDict, Field
 
 from features.climate.record import ClimateRecord
@@ -101,7 +108,12 @@ AIR_CATEGORIES = frozenset(
 # ISO 13788:2012 Annex E / PHI workbook method parameters.
 STILL_AIR_VAPOR_PERMEABILITY_KG_M_S_PA = 2.0e-10
 AIR_LAYER_SD_M = 0.01
-PATH_ENUMERATION_LIMIT = 64
+# Paths are simulated together (`_simulate_batch`); 512 of them take less
+# time than 64 did one path at a time.
+PATH_ENUMERATION_LIMIT = 512
+# Stamped on shared cache rows (`calculation_cache`). Bump it with any change
+# that moves a result for unchanged inputs.
+CALCULATION_VERSION = 1
 _MASS_TOLERANCE_G_M2 = 1.0e-6
 _PRESSURE_TOLERANCE_PA = 1.0e-7
 _SD_TOLERANCE_M = 1.0e-12
@@ -303,18 +315,50 @@ class _Cycle:
     months: tuple[CondensationMonth, ...]
     peak_mass_g_m2: float
     final_mass_g_m2: float
-    closes: bool
     interface_summaries: tuple[CondensationInterfaceSummary, ...]
 
 
 @dataclass(frozen=True)
-class _PathRun:
+class _ReportedPath:
     definition: _PathDefinition
     cycle: _Cycle
     verdict: CondensationVerdict
     criteria: CondensationCriteria
 
 
+@dataclass(frozen=True)
+class _PathRun:
+    """Batch summary of one path's selected cycle.
+
+    ``simulated_start_month_index`` is the start the cycle was run from;
+    ``start_month_index`` is the reported one, which differs for a
+    non-closing cycle (see :func:`_select_cycle`).
+    """
+
+    definition: _PathDefinition
+    simulated_start_month_index: int
+    start_month_index: int
+    verdict: CondensationVerdict
+    peak_mass_g_m2: float
+    final_mass_g_m2: float
+    interface_count: int
+    max_condensing_interface_count: int
+
+
+@dataclass(frozen=True)
+class _BatchCycles:
+    """Every path run from every start month, indexed ``[path, start]``.
+
+    ``month_mass_g_m2`` is in calendar order, like ``_Cycle.months``.
+    """
+
+    month_mass_g_m2: npt.NDArray[np.float64]
+    final_mass_g_m2: npt.NDArray[np.float64]
+    ever_condensed: npt.NDArray[np.bool_]
+    interface_count: npt.NDArray[np.int64]
+    max_condensing_interface_count: npt.NDArray[np.int64]
+
+
 def saturation_pressure_pa(temperature_c: float) -> float:
     """ISO 13788 saturation vapour pressure over water or ice."""
 
@@ -462,22 +506,23 @@ def calculate_assembly_condensation(
     if climate_was_clamped:
         caveats.append(CondensationCaveat(code="climate_rh_clamped"))
 
-    path_runs = [
-        _calculate_path(definition, boundary_months, films.rsi_m2k_w, films.rse_m2k_w, resolved_settings)
-        for definition in path_definitions
-    ]
-    worst = max(
+    path_runs = _calculate_paths(
+        path_definitions,
+        boundary_months,
+        films.rsi_m2k_w,
+        films.rse_m2k_w,
+        resolved_settings,
+    )
+    worst_run = max(
         path_runs,
         key=lambda run: (
             _verdict_severity(run.verdict),
-            run.cycle.peak_mass_g_m2,
+            run.peak_mass_g_m2,
             run.definition.path_id,
         ),
     )
-    max_interface_count = max(
-        (max(month.condensing_interface_count for month in run.cycle.months) for run in path_runs),
-        default=0,
-    )
+    worst = _reported_run(worst_run, boundary_months, films.rsi_m2k_w, films.rse_m2k_w, resolved_settings)
+    max_interface_count = max((run.max_condensing_interface_count for run in path_runs), default=0)
     if max_interface_count >= 2:
         caveats.append(CondensationCaveat(code="multiple_condensing_interfaces"))
 
@@ -487,9 +532,9 @@ def calculate_assembly_condensation(
             label=run.definition.label,
             area_fraction=run.definition.area_fraction,
             verdict=run.verdict,
-            peak_accumulated_moisture_g_m2=run.cycle.peak_mass_g_m2,
-            final_accumulated_moisture_g_m2=run.cycle.final_mass_g_m2,
-            interface_count=len(run.cycle.interface_summaries),
+            peak_accumulated_moisture_g_m2=run.peak_mass_g_m2,
+            final_accumulated_moisture_g_m2=run.final_mass_g_m2,
+            interface_count=run.interface_count,
         )
         for run in sorted(path_runs, key=lambda run: run.definition.path_id)
     ]
@@ -809,53 +854,261 @@ def _interior_conditions(
     return interior_temp_c, interior_rh * saturation_pressure_pa(interior_temp_c)
 
 
-def _calculate_path(
-    definition: _PathDefinition,
+def _calculate_paths(
+    definitions: Sequence[_PathDefinition],
     boundary_months: tuple[_BoundaryMonth, ...],
     rsi_m2k_w: float,
     rse_m2k_w: float,
     settings: CondensationSettings,
-) -> _PathRun:
-    cycles = [
-        _simulate_cycle(
-            definition,
-            boundary_months,
-            rsi_m2k_w,
-            rse_m2k_w,
-            start_month_index,
+) -> list[_PathRun]:
+    batch = _simulate_batch(definitions, boundary_months, rsi_m2k_w, rse_m2k_w)
+    runs: list[_PathRun] = []
+    for path_index, definition in enumerate(definitions):
+        simulated_start, start = _select_cycle(batch, path_index)
+        ever_condensed = bool(batch.ever_condensed[path_index, simulated_start])
+        final_mass = float(batch.final_mass_g_m2[path_index, simulated_start])
+        peak_mass = float(batch.month_mass_g_m2[path_index, simulated_start].max())
+        runs.append(
+            _PathRun(
+                definition=definition,
+                simulated_start_month_index=simulated_start,
+                start_month_index=start,
+                verdict=_verdict_from(ever_condensed, final_mass, peak_mass, settings.ma_limit_g_m2),
+                peak_mass_g_m2=peak_mass,
+                final_mass_g_m2=final_mass,
+                interface_count=int(batch.interface_count[path_index, simulated_start]),
+                max_condensing_interface_count=int(batch.max_condensing_interface_count[path_index, simulated_start]),
+            )
         )
-        for start_month_index in range(12)
-    ]
-    closing_cycles = [cycle for cycle in cycles if cycle.closes]
-    if closing_cycles:
-        cycle = min(
-            closing_cycles,
-            key=lambda candidate: (
-                candidate.start_month_index != _canonical_start_month(candidate.months),
-                candidate.start_month_index,
-            ),
+    return runs
+
+
+def _select_cycle(batch: _BatchCycles, path_index: int) -> tuple[int, int]:
+    """Return ``(simulated start, reported start)`` for one path."""
+
+    final_masses = batch.final_mass_g_m2[path_index].tolist()
+    month_masses = batch.month_mass_g_m2[path_index].tolist()
+    closing_starts = [start for start in range(12) if final_masses[start] <= _MASS_TOLERANCE_G_M2]
+    if closing_starts:
+        start = min(
+            closing_starts,
+            key=lambda candidate: (candidate != _canonical_start_month(month_masses[candidate]), candidate),
         )
-    else:
-        provisional = min(cycles, key=lambda candidate: (candidate.final_mass_g_m2, candidate.start_month_index))
-        canonical_start = _canonical_start_month(provisional.months)
-        # A non-closing cycle has no periodic steady-state start: re-running
-        # from the month after the minimum can simply move that minimum again
-        # (constant year-round accumulation is the degenerate example). Keep
-        # the deterministic least-final-mass candidate and attach the derived
-        # canonical *display* month to it instead of chasing a nonexistent
-        # fixed point.
-        cycle = replace(provisional, start_month_index=canonical_start)
+        return start, start
+    provisional = min(range(12), key=lambda candidate: (final_masses[candidate], candidate))
+    # A non-closing cycle has no periodic steady-state start: re-running
+    # from the month after the minimum can simply move that minimum again
+    # (constant year-round accumulation is the degenerate example). Keep
+    # the deterministic least-final-mass candidate and attach the derived
+    # canonical *display* month to it instead of chasing a nonexistent
+    # fixed point.
+    return provisional, _canonical_start_month(month_masses[provisional])
+
+
+def _reported_run(
+    run: _PathRun,
+    boundary_months: tuple[_BoundaryMonth, ...],
+    rsi_m2k_w: float,
+    rse_m2k_w: float,
+    settings: CondensationSettings,
+) -> _ReportedPath:
+    """Re-run the selected cycle through the scalar month model.
+
+    The batch keeps only what path selection needs; the reported path's
+    monthly profiles, interfaces and criteria come from the per-node
+    scalar calculation, which the batch reproduces bit for bit.
+    """
 
+    cycle = _simulate_cycle(
+        run.definition,
+        boundary_months,
+        rsi_m2k_w,
+        rse_m2k_w,
+        run.simulated_start_month_index,
+    )
+    cycle = replace(cycle, start_month_index=run.start_month_index)
     verdict = _verdict(cycle, settings.ma_limit_g_m2)
-    criteria = _criteria(cycle, verdict, settings.ma_limit_g_m2)
-    return _PathRun(
-        definition=definition,
+    return _ReportedPath(
+        definition=run.definition,
         cycle=cycle,
         verdict=verdict,
-        criteria=criteria,
+        criteria=_criteria(cycle, verdict, settings.ma_limit_g_m2),
+    )
+
+
+def _simulate_batch(
+    definitions: Sequence[_PathDefinition],
+    boundary_months: tuple[_BoundaryMonth, ...],
+    rsi_m2k_w: float,
+    rse_m2k_w: float,
+) -> _BatchCycles:
+    """Run every path from every start month as one ``(path x start, node)`` array.
+
+    This is :func:`_simulate_cycle` / :func:`_calculate_month` with the
+    path and start-month loops moved into array rows. Every array operation
+    is the same IEEE add, subtract, multiply, divide or compare in the same
+    order as the scalar code, and saturation pressures go through
+    :func:`saturation_pressure_pa` itself, so the results are bit-identical
+    rather than merely close.
+    """
+
+    path_count = len(definitions)
+    node_count = len(definitions[0].cumulative_sd_m)
+    cumulative_r = np.array([definition.cumulative_layer_r_m2k_w for definition in definitions])
+    cumulative_sd = np.array([definition.cumulative_sd_m for definition in definitions])
+    total_layer_r = np.array([definition.total_layer_r_m2k_w for definition in definitions])
+    exterior_temp = np.array([month.exterior_profile_temp_c for month in boundary_months])
+    interior_temp = np.array([month.interior_temp_c for month in boundary_months])
+    exterior_pressure = np.array([month.exterior_vapor_pressure_pa for month in boundary_months])
+    interior_pressure = np.array([month.interior_vapor_pressure_pa for month in boundary_months])
+    month_seconds = np.array([MONTH_DAYS[month.month_index] * 24 * 60 * 60 for month in boundary_months])
+
+    # (path, month, node), like the ``temperatures`` list per month.
+    total_r = rse_m2k_w + total_layer_r + rsi_m2k_w
+    temperature_delta = interior_temp - exterior_temp
+    temperatures = (
+        exterior_temp[None, :, None]
+        + (rse_m2k_w + cumulative_r)[:, None, :] / total_r[:, None, None] * temperature_delta[None, :, None]
+    )
+    saturation = np.array([saturation_pressure_pa(value) for value in temperatures.ravel().tolist()]).reshape(
+        temperatures.shape
+    )
+
+    # Row ``path * 12 + start``: the cycle of ``path`` started in ``start``.
+    row_path = np.repeat(np.arange(path_count), 12)
+    row_start = np.tile(np.arange(12), path_count)
+    row_count = path_count * 12
+    rows = np.arange(row_count)
+    row_sd = cumulative_sd[row_path]
+    interior_nodes = np.zeros(node_count, dtype=np.bool_)
+    interior_nodes[1:-1] = True
+
+    mass = np.zeros((row_count, node_count))
+    month_mass = np.zeros((row_count, 12))
+    ever_condensed = np.zeros(row_count, dtype=np.bool_)
+    interface_seen = np.zeros((row_count, node_count), dtype=np.bool_)
+    max_condensing = np.zeros(row_count, dtype=np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for offset in range(12):
+            month = (row_start + offset) % 12
+            node_saturation = saturation[row_path, month]
+            row_exterior = exterior_pressure[month]
+            row_interior = interior_pressure[month]
+
+            active = interior_nodes & (mass > _MASS_TOLERANCE_G_M2)
+            while True:
+                pressures = _batch_pressures(row_sd, node_saturation, active, row_exterior, row_interior)
+                violating = interior_nodes & ~active & (pressures > node_saturation + _PRESSURE_TOLERANCE_PA)
+                violating_rows = violating.any(axis=1)
+                if not violating_rows.any():
+                    break
+                worst_node = np.argmax(np.where(violating, pressures - node_saturation, -np.inf), axis=1)
+                active[rows[violating_rows], worst_node[violating_rows]] = True
+
+            left, right = _neighbouring_anchors(active)
+            left_sd = np.take_along_axis(row_sd, left, axis=1)
+            right_sd = np.take_along_axis(row_sd, right, axis=1)
+            valid = active & ~(row_sd - left_sd <= _SD_TOLERANCE_M) & ~(right_sd - row_sd <= _SD_TOLERANCE_M)
+            incoming_from_inside = (np.take_along_axis(pressures, right, axis=1) - node_saturation) / (
+                right_sd - row_sd
+            )
+            outgoing_to_outside = (node_saturation - np.take_along_axis(pressures, left, axis=1)) / (row_sd - left_sd)
+            rate = STILL_AIR_VAPOR_PERMEABILITY_KG_M_S_PA * (incoming_from_inside - outgoing_to_outside)
+            raw_change = rate * month_seconds[month][:, None] * 1000.0
+            # ``max(a, b)`` keeps ``a`` unless ``b > a``; np.maximum differs on
+            # signed zeros.
+            effective_change = np.where(raw_change > -mass, raw_change, -mass)
+            summed = mass + effective_change
+            next_mass = np.where(summed > 0.0, summed, 0.0)
+            recorded = valid & (
+                (np.abs(raw_change) > _MASS_TOLERANCE_G_M2)
+                | (mass > _MASS_TOLERANCE_G_M2)
+                | (next_mass > _MASS_TOLERANCE_G_M2)
+            )
+            mass = np.where(valid & (next_mass > _MASS_TOLERANCE_G_M2), next_mass, 0.0)
+
+            month_mass[rows, month] = _sum_nodes_in_order(mass)
+            ever_condensed |= (recorded & (rate > 0)).any(axis=1)
+            interface_seen |= recorded
+            np.maximum(max_condensing, recorded.sum(axis=1), out=max_condensing)
+
+    return _BatchCycles(
+        month_mass_g_m2=month_mass.reshape(path_count, 12, 12),
+        final_mass_g_m2=_sum_nodes_in_order(mass).reshape(path_count, 12),
+        ever_condensed=ever_condensed.reshape(path_count, 12),
+        interface_count=interface_seen.sum(axis=1).reshape(path_count, 12),
+        max_condensing_interface_count=max_condensing.reshape(path_count, 12),
     )
 
 
+def _batch_pressures(
+    cumulative_sd: npt.NDArray[np.float64],
+    saturation_pressures: npt.NDArray[np.float64],
+    active: npt.NDArray[np.bool_],
+    exterior_pressure_pa: npt.NDArray[np.float64],
+    interior_pressure_pa: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Row-wise :func:`_piecewise_pressures`.
+
+    The scalar loop writes each anchor twice and keeps the segment on its
+    inside, and writes the interior node from the last segment's formula.
+    Reading every node from that same segment keeps the bits equal.
+    """
+
+    last_index = cumulative_sd.shape[1] - 1
+    nodes = np.arange(last_index + 1)
+    anchors = active.copy()
+    anchors[:, [0, last_index]] = True
+    at_or_before = np.maximum.accumulate(np.where(anchors, nodes, 0), axis=1)
+    at_or_after = np.minimum.accumulate(np.where(anchors, nodes, last_index)[:, ::-1], axis=1)[:, ::-1]
+    left = at_or_before.copy()
+    left[:, last_index] = at_or_before[:, last_index - 1]
+    right = np.full_like(left, last_index)
+    right[:, :last_index] = at_or_after[:, 1:]
+
+    anchor_pressures = saturation_pressures.copy()
+    anchor_pressures[:, 0] = exterior_pressure_pa
+    anchor_pressures[:, last_index] = interior_pressure_pa
+    left_pressure = np.take_along_axis(anchor_pressures, left, axis=1)
+    right_pressure = np.take_along_axis(anchor_pressures, right, axis=1)
+    left_sd = np.take_along_axis(cumulative_sd, left, axis=1)
+    span = np.take_along_axis(cumulative_sd, right, axis=1) - left_sd
+    fraction = (cumulative_sd - left_sd) / span
+    return np.where(
+        span <= _SD_TOLERANCE_M,
+        np.where(right_pressure < left_pressure, right_pressure, left_pressure),
+        left_pressure + fraction * (right_pressure - left_pressure),
+    )
+
+
+def _neighbouring_anchors(
+    active: npt.NDArray[np.bool_],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Nearest anchor strictly outside and strictly inside every node."""
+
+    last_index = active.shape[1] - 1
+    nodes = np.arange(last_index + 1)
+    anchors = active.copy()
+    anchors[:, [0, last_index]] = True
+    at_or_before = np.maximum.accumulate(np.where(anchors, nodes, 0), axis=1)
+    at_or_after = np.minimum.accumulate(np.where(anchors, nodes, last_index)[:, ::-1], axis=1)[:, ::-1]
+    left = np.zeros_like(at_or_before)
+    left[:, 1:] = at_or_before[:, :-1]
+    right = np.full_like(at_or_after, last_index)
+    right[:, :-1] = at_or_after[:, 1:]
+    return left, right
+
+
+def _sum_nodes_in_order(mass: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # ``sum(dict.values())`` adds outside-to-inside; np.sum's pairwise
+    # reduction can round differently.
+    total = np.zeros(mass.shape[0])
+    for node_index in range(mass.shape[1]):
+        total = total + mass[:, node_index]
+    return total
+
+
 def _simulate_cycle(
     definition: _PathDefinition,
     boundary_months: tuple[_BoundaryMonth, ...],
@@ -905,7 +1158,6 @@ def _simulate_cycle(
         months=months,
         peak_mass_g_m2=peak_mass,
         final_mass_g_m2=final_mass,
-        closes=final_mass <= _MASS_TOLERANCE_G_M2,
         interface_summaries=tuple(summaries),
     )
 
@@ -1098,11 +1350,20 @@ def _verdict(cycle: _Cycle, ma_limit_g_m2: float) -> CondensationVerdict:
     ever_condensed = any(
         interface.condensation_rate_kg_m2_s > 0 for month in cycle.months for interface in month.interfaces
     )
+    return _verdict_from(ever_condensed, cycle.final_mass_g_m2, cycle.peak_mass_g_m2, ma_limit_g_m2)
+
+
+def _verdict_from(
+    ever_condensed: bool,
+    final_mass_g_m2: float,
+    peak_mass_g_m2: float,
+    ma_limit_g_m2: float,
+) -> CondensationVerdict:
     if not ever_condensed:
         return "d1"
-    if not cycle.closes:
+    if final_mass_g_m2 > _MASS_TOLERANCE_G_M2:
         return "d4"
-    if cycle.peak_mass_g_m2 > ma_limit_g_m2:
+    if peak_mass_g_m2 > ma_limit_g_m2:
         return "d3"
     return "d2"
 
@@ -1157,17 +1418,14 @@ def _criteria(
     )
 
 
-def _canonical_start_month(months: Sequence[CondensationMonth]) -> int:
-    minimum = min(month.accumulated_moisture_g_m2 for month in months)
+def _canonical_start_month(month_masses_g_m2: Sequence[float]) -> int:
+    """Month after the last calendar month holding the cycle's minimum mass."""
+
+    minimum = min(month_masses_g_m2)
     minimum_months = [
-        month.month - 1
-        for month in months
-        if math.isclose(
-            month.accumulated_moisture_g_m2,
-            minimum,
-            rel_tol=0.0,
-            abs_tol=_MASS_TOLERANCE_G_M2,
-        )
+        month_index
+        for month_index, mass in enumerate(month_masses_g_m2)
+        if math.isclose(mass, minimum, rel_tol=0.0, abs_tol=_MASS_TOLERANCE_G_M2)
     ]
     return (max(minimum_months) + 1) % 12
 
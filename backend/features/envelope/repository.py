@@ -1,5 +1,141 @@
 """Envelope persistence boundary.
 
-Envelope data is stored inside the project document JSONB, so Phase 1
-does not need envelope-owned SQL helpers.
+Envelope data is stored inside the project document JSONB. The only
+envelope-owned table is ``envelope_calculation_results``, the shared tier of
+``calculation_cache``.
 """
+
+from __future__ import annotations
+
+from typing import Any
+
+from psycopg import Connection
+
+
+def touch_calculation_results(
+    conn: Connection[Any],
+    *,
+    kind: str,
+    calculation_version: int,
+    input_hashes: list[str],
+) -> list[dict[str, Any]]:
+    """Return the current-version rows for ``input_hashes`` and mark them used.
+
+    One statement both reads and refreshes ``last_used_at``, so a hit costs a
+    single round trip and keeps the row away from eviction.
+    """
+
+    return conn.execute(
+        """
+        UPDATE envelope_calculation_results
+        SET last_used_at = now(), hit_count = hit_count + 1
+        WHERE kind = %(kind)s
+          AND input_hash = ANY(%(input_hashes)s)
+          AND calculation_version = %(calculation_version)s
+        RETURNING input_hash, result_json
+        """,
+        {"kind": kind, "input_hashes": input_hashes, "calculation_version": calculation_version},
+    ).fetchall()
+
+
+def upsert_calculation_result(
+    conn: Connection[Any],
+    *,
+    kind: str,
+    calculation_version: int,
+    input_hash: str,
+    result_json: str,
+) -> None:
+    """Store one result, replacing any row another calculation version wrote."""
+
+    conn.execute(
+        """
+        INSERT INTO envelope_calculation_results (
+            kind, input_hash, calculation_version, result_json, size_bytes
+        )
+        VALUES (
+            %(kind)s, %(input_hash)s, %(calculation_version)s,
+            %(result_json)s, octet_length(%(result_json)s)
+        )
+        ON CONFLICT (kind, input_hash) DO UPDATE
+        SET calculation_version = EXCLUDED.calculation_version,
+            result_json = EXCLUDED.result_json,
+            size_bytes = EXCLUDED.size_bytes,
+            hit_count = 0,
+            created_at = now(),
+            last_used_at = now()
+        """,
+        {
+            "kind": kind,
+            "input_hash": input_hash,
+            "calculation_version": calculation_version,
+            "result_json": result_json,
+        },
+    )
+
+
+def delete_unreadable_calculation_results(
+    conn: Connection[Any],
+    *,
+    kind: str,
+    calculation_version: int,
+    input_hashes: list[str],
+) -> int:
+    """Delete current-version rows whose stored JSON no longer parses."""
+
+    return conn.execute(
+        """
+        DELETE FROM envelope_calculation_results
+        WHERE kind = %(kind)s
+          AND input_hash = ANY(%(input_hashes)s)
+          AND calculation_version = %(calculation_version)s
+        """,
+        {"kind": kind, "input_hashes": input_hashes, "calculation_version": calculation_version},
+    ).rowcount
+
+
+def evict_calculation_results(conn: Connection[Any], *, max_bytes: int) -> int:
+    """Delete least recently used rows until the table fits ``max_bytes``."""
+
+    return conn.execute(
+        """
+        WITH ranked AS (
+            SELECT kind, input_hash,
+                   sum(size_bytes) OVER (
+                       ORDER BY last_used_at DESC, kind, input_hash
+                   ) AS retained_bytes
+            FROM envelope_calculation_results
+        )
+        DELETE FROM envelope_calculation_results AS results
+        USING ranked
+        WHERE results.kind = ranked.kind
+          AND results.input_hash = ranked.input_hash
+          AND ranked.retained_bytes > %(max_bytes)s
+        """,
+        {"max_bytes": max_bytes},
+    ).rowcount
+
+
+def calculation_result_totals(conn: Connection[Any]) -> dict[str, tuple[int, int]]:
+    """Return ``{kind: (entries, bytes)}`` across every calculation version."""
+
+    rows = conn.execute(
+        """
+        SELECT kind, count(*) AS entries, coalesce(sum(size_bytes), 0) AS bytes
+        FROM envelope_calculation_results
+        GROUP BY kind
+        """
+    ).fetchall()
+    return {row["kind"]: (int(row["entries"]), int(row["bytes"])) for row in rows}
+
+
+def delete_calculation_results(conn: Connection[Any], *, kind: str | None) -> int:
+    """Delete every stored result, or only those of one kind."""
+
+    return conn.execute(
+        """
+        DELETE FROM envelope_calculation_results
+        WHERE %(kind)s::text IS NULL OR kind = %(kind)s
+        """,
+        {"kind": kind},
+    ).rowcount
@@ -7,6 +7,7 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, Header, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from starlette import status
 
 from features.access.capabilities import (
@@ -38,6 +39,7 @@ from features.envelope.service import (
     get_phpp_export_preflight,
     get_project_material_drift_report,
     get_thermal_standards_model,
+    prepare_envelope_screening,
     preview_envelope_hbjson_import,
 )
 from features.project_document.models import ProjectDocumentSource
@@ -52,6 +54,7 @@ from features.shared.errors import api_error
 from features.shared.responses import (
     download_filename_part,
     json_download_response,
+    ndjson_stream_response,
     pdf_download_response,
     zip_download_response,
 )
@@ -94,6 +97,19 @@ def get_assembly_condensation(
     return get_assembly_condensation_model(version_id, access, assembly_id, source)
 
 
+@router.get(
+    "/envelope/screening",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def stream_envelope_screening(
+    version_id: UUID,
+    access: ProjectViewAccess,
+    source: Annotated[ProjectDocumentSource, Query()] = "draft",
+) -> StreamingResponse:
+    return ndjson_stream_response(prepare_envelope_screening(version_id, access, source).lines())
+
+
 @router.get("/envelope/thermal-standards", response_model=ThermalStandardsResponse)
 def get_thermal_standards(
     version_id: UUID,
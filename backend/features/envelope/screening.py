@@ -0,0 +1,372 @@
+"""Project-wide thermal and condensation screening.
+
+The per-assembly routes each reload the document, surface-film table and
+climate basis, so an envelope page with N assemblies pays for N loads.
+Screening resolves those once, then fans the pure
+``calculate_assembly_thermal`` / ``calculate_assembly_condensation`` calls
+across a process pool and yields results in completion order.
+
+The calculations are CPU-bound Python, so threads would serialize on the
+GIL. The pool is a spawned
+:class:`~features.shared.process_pool.SpawnedProcessPool`, created on first
+use and kept for the life of the process.
+
+Both results go through the same input-hash cache as the per-assembly
+routes (``calculation_cache``), in both directions, with one batched
+lookup per kind. Only condensation misses are sent to the pool.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import Future, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Literal
+from uuid import UUID
+
+import structlog
+from pydantic import BaseModel, ConfigDict
+
+from config import settings
+from features.climate.record import ClimateRecord
+from features.envelope.boundary_conditions import SurfaceFilmTable
+from features.envelope.calculation_cache import (
+    condensation_cache_get_many,
+    condensation_cache_put,
+    thermal_cache_get_many,
+    thermal_cache_put,
+)
+from features.envelope.condensation import (
+    AssemblyCondensationResponse,
+    CondensationClimateSource,
+    CondensationResult,
+    calculate_assembly_condensation,
+    condensation_input_hash,
+)
+from features.envelope.models import AssemblyThermalResponse
+from features.envelope.thermal import ThermalResult, calculate_assembly_thermal, thermal_input_hash
+from features.project_document.document import Assembly, CondensationSettings, ProjectMaterial
+from features.project_document.models import ProjectDocumentSource
+from features.shared.process_pool import SpawnedProcessPool
+
+log = structlog.get_logger(__name__)
+
+_UNSCREENED_EXTERIORS = frozenset({"ground", "unconditioned_space"})
+
+
+class EnvelopeScreeningStart(BaseModel):
+    """First NDJSON line: what is being screened, against which climate."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["start"] = "start"
+    project_id: UUID
+    version_id: UUID
+    source: ProjectDocumentSource
+    assembly_count: int
+    climate_source: CondensationClimateSource | None
+
+
+class EnvelopeScreeningAssembly(BaseModel):
+    """One assembly: the same payloads as the two per-assembly routes."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["assembly"] = "assembly"
+    assembly_id: str
+    thermal: AssemblyThermalResponse
+    condensation: AssemblyCondensationResponse
+
+
+class EnvelopeScreeningFailure(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["error"] = "error"
+    assembly_id: str
+    code: Literal["screening_failed"] = "screening_failed"
+    message: str = "This assembly could not be screened."
+
+
+class EnvelopeScreeningEnd(BaseModel):
+    """Last NDJSON line. Its absence means the stream was cut short."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["end"] = "end"
+    screened: int
+    failed: int
+    condensation_cache_hits: int
+
+
+EnvelopeScreeningLine = (
+    EnvelopeScreeningStart | EnvelopeScreeningAssembly | EnvelopeScreeningFailure | EnvelopeScreeningEnd
+)
+
+
+@dataclass(frozen=True)
+class ScreeningClimate:
+    """The condensation climate basis, resolved once for the whole screen."""
+
+    record: ClimateRecord
+    identity: Mapping[str, str | None]
+    source: CondensationClimateSource
+
+
+@dataclass(frozen=True)
+class _ScreeningJob:
+    """Everything one worker needs. Pickled, so it carries only the
+    assembly's own materials rather than the whole document."""
+
+    assembly: Assembly
+    materials_by_id: dict[str, ProjectMaterial]
+    film_table: SurfaceFilmTable
+    climate_record: ClimateRecord | None
+    climate_identity: Mapping[str, str | None] | None
+    settings: CondensationSettings
+    # None when that result came from the cache.
+    condensation_input_hash: str | None
+    thermal_input_hash: str | None
+
+
+@dataclass(frozen=True)
+class _ScreenedAssembly:
+    assembly_id: str
+    thermal: ThermalResult | None
+    condensation: CondensationResult | None
+
+
+@dataclass(frozen=True)
+class EnvelopeScreening:
+    """Inputs resolved at the storage edge; :meth:`lines` does the work.
+
+    Building this raises the usual HTTP errors (access, missing version,
+    unavailable film table) before a streaming response has committed to
+    a 200.
+    """
+
+    project_id: UUID
+    version_id: UUID
+    source: ProjectDocumentSource
+    assemblies: Sequence[Assembly]
+    materials_by_id: Mapping[str, ProjectMaterial]
+    film_table: SurfaceFilmTable
+    settings: CondensationSettings
+    climate: ScreeningClimate | None
+
+    def lines(self) -> Iterator[EnvelopeScreeningLine]:
+        """Yield the start line, one line per assembly as it completes, then the end line."""
+
+        started = time.perf_counter()
+        yield EnvelopeScreeningStart(
+            project_id=self.project_id,
+            version_id=self.version_id,
+            source=self.source,
+            assembly_count=len(self.assemblies),
+            climate_source=self.climate.source if self.climate is not None else None,
+        )
+        jobs = [self._job(assembly) for assembly in self.assemblies]
+        cached_condensation = condensation_cache_get_many([job.condensation_input_hash or "" for job in jobs])
+        cached_thermal = thermal_cache_get_many([job.thermal_input_hash or "" for job in jobs])
+        cached: dict[str, CondensationResult] = {}
+        thermal_by_id: dict[str, ThermalResult] = {}
+        for index, job in enumerate(jobs):
+            assembly_id = job.assembly.id
+            condensation = cached_condensation.get(job.condensation_input_hash or "")
+            thermal = cached_thermal.get(job.thermal_input_hash or "")
+            if condensation is not None:
+                cached[assembly_id] = condensation
+            if thermal is not None:
+                thermal_by_id[assembly_id] = thermal
+            jobs[index] = replace(
+                job,
+                condensation_input_hash=None if condensation is not None else job.condensation_input_hash,
+                thermal_input_hash=None if thermal is not None else job.thermal_input_hash,
+            )
+
+        screened = failed = 0
+        for assembly_id, outcome in _run_jobs(jobs):
+            if isinstance(outcome, BaseException):
+                failed += 1
+                log.warning(
+                    "envelope_screening_assembly_failed",
+                    assembly_id=assembly_id,
+                    error_type=type(outcome).__name__,
+                )
+                yield EnvelopeScreeningFailure(assembly_id=assembly_id)
+                continue
+            condensation = outcome.condensation or cached[assembly_id]
+            thermal = outcome.thermal or thermal_by_id[assembly_id]
+            if outcome.condensation is not None:
+                condensation_cache_put(outcome.condensation)
+            if outcome.thermal is not None:
+                thermal_cache_put(outcome.thermal)
+            screened += 1
+            yield self._assembly_line(assembly_id, thermal, condensation)
+
+        log.info(
+            "envelope_screening_completed",
+            project_id=str(self.project_id),
+            version_id=str(self.version_id),
+            assemblies=len(jobs),
+            screened=screened,
+            failed=failed,
+            condensation_cache_hits=len(cached),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        yield EnvelopeScreeningEnd(screened=screened, failed=failed, condensation_cache_hits=len(cached))
+
+    @cached_property
+    def _assemblies_by_id(self) -> dict[str, Assembly]:
+        return {assembly.id: assembly for assembly in self.assemblies}
+
+    def _job(self, assembly: Assembly) -> _ScreeningJob:
+        materials = {
+            segment.project_material_id: self.materials_by_id[segment.project_material_id]
+            for layer in assembly.layers
+            for segment in layer.segments
+            if segment.project_material_id is not None and segment.project_material_id in self.materials_by_id
+        }
+        climate = None if assembly.exterior_condition in _UNSCREENED_EXTERIORS else self.climate
+        climate_record = climate.record if climate is not None else None
+        climate_identity = climate.identity if climate is not None else None
+        return _ScreeningJob(
+            assembly=assembly,
+            materials_by_id=materials,
+            film_table=self.film_table,
+            climate_record=climate_record,
+            climate_identity=climate_identity,
+            settings=self.settings,
+            condensation_input_hash=condensation_input_hash(
+                assembly,
+                self.materials_by_id,
+                climate_record,
+                self.film_table,
+                self.settings,
+                climate_identity,
+            ),
+            thermal_input_hash=thermal_input_hash(assembly, materials, self.film_table.standard),
+        )
+
+    def _assembly_line(
+        self,
+        assembly_id: str,
+        thermal: ThermalResult,
+        condensation: CondensationResult,
+    ) -> EnvelopeScreeningAssembly:
+        assembly = self._assemblies_by_id[assembly_id]
+        return EnvelopeScreeningAssembly(
+            assembly_id=assembly_id,
+            thermal=AssemblyThermalResponse(
+                project_id=self.project_id,
+                version_id=self.version_id,
+                source=self.source,
+                assembly_id=assembly_id,
+                input_hash=thermal.input_hash,
+                status=thermal.status,
+                r_parallel_path_m2k_w=thermal.r_parallel_path_m2k_w,
+                r_isothermal_planes_m2k_w=thermal.r_isothermal_planes_m2k_w,
+                r_construction_m2k_w=thermal.r_construction_m2k_w,
+                u_construction_w_m2k=thermal.u_construction_w_m2k,
+                r_effective_m2k_w=thermal.r_effective_m2k_w,
+                u_effective_w_m2k=thermal.u_effective_w_m2k,
+                rsi_m2k_w=thermal.rsi_m2k_w,
+                rse_m2k_w=thermal.rse_m2k_w,
+                heat_flow_direction=thermal.heat_flow_direction,
+                thermal_standard=thermal.thermal_standard,
+                warnings=thermal.warnings,
+            ),
+            condensation=AssemblyCondensationResponse(
+                **condensation.model_dump(),
+                project_id=self.project_id,
+                version_id=self.version_id,
+                source=self.source,
+                assembly_id=assembly_id,
+                climate_source=(
+                    self.climate.source
+                    if self.climate is not None and assembly.exterior_condition not in _UNSCREENED_EXTERIORS
+                    else None
+                ),
+            ),
+        )
+
+
+def _screen_assembly(job: _ScreeningJob) -> _ScreenedAssembly:
+    """Worker entry point. Pure: no database, cache or settings access."""
+
+    condensation = None
+    if job.condensation_input_hash is not None:
+        condensation = calculate_assembly_condensation(
+            job.assembly,
+            job.materials_by_id,
+            job.climate_record,
+            job.film_table,
+            job.settings,
+            climate_source_identity=job.climate_identity,
+        )
+    thermal = None
+    if job.thermal_input_hash is not None:
+        thermal = calculate_assembly_thermal(job.assembly, job.materials_by_id, job.film_table)
+    return _ScreenedAssembly(assembly_id=job.assembly.id, thermal=thermal, condensation=condensation)
+
+
+def _run_jobs(jobs: Sequence[_ScreeningJob]) -> Iterator[tuple[str, _ScreenedAssembly | BaseException]]:
+    """Yield ``(assembly_id, result or exception)`` in completion order.
+
+    Assemblies whose condensation result is cached need at most the cheap
+    thermal calculation and are run inline first. The pool is skipped when it is disabled or when at most
+    one condensation calculation is left, where shipping the job would
+    cost more than it saves.
+    """
+
+    pending = [job for job in jobs if job.condensation_input_hash is not None]
+    inline = [job for job in jobs if job.condensation_input_hash is None]
+    if len(pending) < 2 or settings.envelope_screening_workers < 1:
+        inline.extend(pending)
+        pending = []
+    for job in inline:
+        yield job.assembly.id, _outcome(job)
+    if not pending:
+        return
+
+    futures: dict[Future[_ScreenedAssembly], str] = {}
+    try:
+        pool = _POOL.executor()
+        for job in pending:
+            futures[pool.submit(_screen_assembly, job)] = job.assembly.id
+    except BrokenProcessPool:
+        _POOL.discard()
+        for job in pending:
+            yield job.assembly.id, _outcome(job)
+        return
+    broken = False
+    try:
+        for future in as_completed(futures):
+            error = future.exception()
+            broken = broken or isinstance(error, BrokenProcessPool)
+            yield futures[future], error if error is not None else future.result()
+    finally:
+        # A client that disconnects mid-stream closes this generator; do
+        # not leave its remaining jobs occupying the shared workers.
+        for future in futures:
+            future.cancel()
+        if broken:
+            _POOL.discard()
+
+
+def _outcome(job: _ScreeningJob) -> _ScreenedAssembly | BaseException:
+    try:
+        return _screen_assembly(job)
+    except Exception as error:
+        return error
+
+
+_POOL = SpawnedProcessPool(lambda: settings.envelope_screening_workers)
+
+
+def shutdown_screening_pool() -> None:
+    """Stop the worker processes (application shutdown and tests)."""
+
+    _POOL.discard()
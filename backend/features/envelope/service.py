@@ -23,6 +23,12 @@ from starlette import status
 from database import transaction
 from features.envelope import drift, ops
 from features.envelope.boundary_conditions import SurfaceFilmTable
+from features.envelope.calculation_cache import (
+    condensation_cache_get,
+    condensation_cache_put,
+    thermal_cache_get,
+    thermal_cache_put,
+)
 from features.envelope.commands.registry import apply_command as dispatch_envelope_command
 from features.envelope.condensation import (
     AssemblyCondensationResponse,
@@ -30,7 +36,6 @@ from features.envelope.condensation import (
     calculate_assembly_condensation,
     condensation_input_hash,
 )
-from features.envelope.condensation_cache import condensation_cache_get, condensation_cache_put
 from features.envelope.hbjson_import import parse_or_422
 from features.envelope.import_models import ImportConstructionsPreviewResponse
 from features.envelope.import_planning import build_import_plan
@@ -45,9 +50,10 @@ from features.envelope.models import (
     ThermalStandardsResponse,
 )
 from features.envelope.phpp_export import phpp_preflight
+from features.envelope.screening import EnvelopeScreening, ScreeningClimate
 from features.envelope.selectors import build_envelope_read_parts
 from features.envelope.surface_film_store import SurfaceFilmTableUnavailableError, surface_film_table
-from features.envelope.thermal import calculate_assembly_thermal
+from features.envelope.thermal import calculate_assembly_thermal, thermal_input_hash
 from features.project_climate_source.service import resolve_condensation_climate_record
 from features.project_document.audit import log_document_action
 from features.project_document.document import (
@@ -122,11 +128,16 @@ def get_assembly_thermal_model(
     issue flags HBJSON export uses for blocking validation.
     """
     context = _assembly_calculation_context(version_id, access, assembly_id, source)
-    result = calculate_assembly_thermal(
-        context.assembly,
-        context.materials_by_id,
-        context.film_table,
+    result = thermal_cache_get(
+        thermal_input_hash(context.assembly, context.materials_by_id, context.film_table.standard)
     )
+    if result is None:
+        result = calculate_assembly_thermal(
+            context.assembly,
+            context.materials_by_id,
+            context.film_table,
+        )
+        thermal_cache_put(result)
     return AssemblyThermalResponse(
         project_id=access.project_id,
         version_id=version_id,
@@ -214,18 +225,68 @@ def _assembly_calculation_context(
 ) -> _AssemblyCalculationContext:
     """Resolve the shared pure-calculation inputs at the storage edge."""
 
+    body, response_source = _calculation_document(version_id, access, source)
+    assembly = ops.find_assembly(body.tables.assemblies, assembly_id)
+    return _AssemblyCalculationContext(
+        body=body,
+        source=response_source,
+        assembly=assembly,
+        materials_by_id={material.id: material for material in body.tables.project_materials},
+        film_table=_calculation_film_table(body),
+    )
+
+
+def prepare_envelope_screening(
+    version_id: UUID,
+    access: ProjectAccess,
+    source: ProjectDocumentSource,
+) -> EnvelopeScreening:
+    """Resolve every assembly's calculation inputs with one load of each.
+
+    The document, surface-film table and condensation climate basis are
+    read here, before any result is produced, so storage and access
+    errors still surface as ordinary HTTP errors.
+    """
+
+    body, response_source = _calculation_document(version_id, access, source)
+    assemblies = list(body.tables.assemblies)
+    film_table = _calculation_film_table(body)
+    climate = None
+    if any(assembly.exterior_condition not in {"ground", "unconditioned_space"} for assembly in assemblies):
+        resolved = resolve_condensation_climate_record(access.project_id, access.project.cert_programs)
+        if resolved is not None:
+            climate = ScreeningClimate(
+                record=resolved.record,
+                identity=resolved.identity,
+                source=CondensationClimateSource(id=resolved.source_id, kind=resolved.kind, label=resolved.label),
+            )
+    return EnvelopeScreening(
+        project_id=access.project_id,
+        version_id=version_id,
+        source=response_source,
+        assemblies=assemblies,
+        materials_by_id={material.id: material for material in body.tables.project_materials},
+        film_table=film_table,
+        settings=body.tables.resolved_assumptions().resolved_condensation_settings(),
+        climate=climate,
+    )
+
+
+def _calculation_document(
+    version_id: UUID,
+    access: ProjectAccess,
+    source: ProjectDocumentSource,
+) -> tuple[ProjectDocumentV1, ProjectDocumentSource]:
     if source == "version":
-        body = get_saved_document(version_id, access)
-        response_source: ProjectDocumentSource = "version"
-    else:
-        view = get_current_document_view(version_id, access)
-        body = view.body
-        response_source = view.source
+        return get_saved_document(version_id, access), "version"
+    view = get_current_document_view(version_id, access)
+    return view.body, view.source
 
-    assembly = ops.find_assembly(body.tables.assemblies, assembly_id)
+
+def _calculation_film_table(body: ProjectDocumentV1) -> SurfaceFilmTable:
     standard = body.tables.resolved_assumptions().thermal_standard
     try:
-        film_table = surface_film_table(standard)
+        return surface_film_table(standard)
     except SurfaceFilmTableUnavailableError as error:
         raise api_error(
             status.HTTP_409_CONFLICT,
@@ -233,13 +294,6 @@ def _assembly_calculation_context(
             "This project's thermal standard has no published surface-film table on this deployment.",
             {"thermal_standard": standard},
         ) from error
-    return _AssemblyCalculationContext(
-        body=body,
-        source=response_source,
-        assembly=assembly,
-        materials_by_id={material.id: material for material in body.tables.project_materials},
-        film_table=film_table,
-    )
 
 
 def get_project_material_drift_report(
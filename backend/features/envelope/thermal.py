@@ -38,6 +38,10 @@ from features.project_document.document import (
     ThermalStandard,
 )
 
+# Stamped on shared cache rows (`calculation_cache`). Bump it with any change
+# that moves a result for unchanged inputs.
+CALCULATION_VERSION = 1
+
 
 @dataclass(frozen=True)
 class ConstructionThermalResult:
@@ -0,0 +1,253 @@
+"""Conditional GET and cached payloads for the GH data routes.
+
+Grasshopper definitions poll these routes, and every poll used to reload,
+revalidate and re-export the saved body. A saved version's body only changes
+when a draft is saved over it, and every such write re-draws its
+``body_revision`` (the trigger from migration 0014). ``(version_id,
+body_revision)`` therefore pins the exact body an export was built from.
+
+Each response carries a strong ETag hashed from that stamp, the route and its
+query parameters, :data:`EXPORTER_VERSION`, and the project fields the
+envelope repeats. A request whose ``If-None-Match`` matches gets a 304 after
+the one metadata query that resolves the version. ``Last-Modified`` is the
+version's save time. It is informational only: a project rename changes the
+envelope without touching the version, so ``If-Modified-Since`` is not
+honoured.
+
+Otherwise the payload (everything but the envelope) comes from a two-tier
+cache with the same key. The first tier is a byte-bounded per-process LRU of
+the payload's JSON. The second is a gzip object in the object store, so a
+new worker or a deploy does not re-export. Only a miss in both loads,
+validates and exports the body. Export errors (a 422 for duplicate names,
+say) are not cached. The object-store tier is best-effort: its failures are
+logged and treated as misses. Objects for superseded revisions are never
+read again and are left to a bucket lifecycle rule on the prefix.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC
+from email.utils import format_datetime
+from functools import cache
+from typing import Any
+from uuid import UUID
+
+import structlog
+from fastapi import Response
+from starlette import status
+
+from config import settings
+from features.assets.base import AssetStorage
+from features.assets.storage_r2 import R2Client
+from features.gh_api.models import GH_SCHEMA_VERSION, GhEnvelope
+from features.gh_api.service import (
+    ResolvedVersion,
+    build_envelope_fields,
+    resolve_version,
+    resolve_version_and_body,
+)
+from features.project_document.document import ProjectDocumentV1
+from features.projects.access import ProjectAccess
+
+log = structlog.get_logger(__name__)
+
+# Bump when any GH exporter's output changes for the same body, so cached
+# payloads and client ETags from the old exporter stop matching.
+EXPORTER_VERSION = 1
+
+_ENVELOPE_KEYS = frozenset(GhEnvelope.model_fields) - {"warnings"}
+_CACHE_CONTROL = "no-cache"
+
+ExportPayload = Callable[[ProjectDocumentV1], dict[str, Any]]
+
+
+def serve_gh_export(
+    access: ProjectAccess,
+    version: UUID | None,
+    *,
+    route: str,
+    params: Mapping[str, str],
+    response_model: type[GhEnvelope],
+    export: ExportPayload,
+    storage: AssetStorage | None,
+    if_none_match: str | None,
+) -> Response:
+    """Answer one GH data route: 304, a cached payload, or a fresh export.
+
+    ``export`` returns the route's payload fields for a body; they are
+    validated through ``response_model`` together with the envelope, as the
+    route's declared response would be.
+    """
+    resolved = resolve_version(access, version)
+    etag = _etag(access, resolved, route, params)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(etag, resolved))
+
+    payload = _cached_payload(access.project_id, _payload_key(resolved, route, params), storage)
+    if payload is None:
+        # Re-resolve with the body: a save between the two reads must not be
+        # cached under the older revision.
+        resolved, body = resolve_version_and_body(access, version)
+        etag = _etag(access, resolved, route, params)
+        response = response_model(**build_envelope_fields(access, resolved), **export(body))
+        payload = response.model_dump_json(exclude=set(_ENVELOPE_KEYS)).encode()
+        _store_payload(access.project_id, _payload_key(resolved, route, params), payload, storage)
+
+    envelope = GhEnvelope(**build_envelope_fields(access, resolved)).model_dump_json(exclude={"warnings"}).encode()
+    return Response(
+        content=_join_objects(envelope, payload),
+        media_type="application/json",
+        headers=_headers(etag, resolved),
+    )
+
+
+def get_gh_export_storage() -> AssetStorage | None:
+    """The object-store tier, or None when it is disabled.
+
+    One client per process, built on first use: the 304 path should not pay
+    for a storage client it never calls.
+    """
+    if not settings.gh_export_cache_object_store:
+        return None
+    return _object_store()
+
+
+@cache
+def _object_store() -> R2Client:
+    return R2Client(settings)
+
+
+def gh_export_object_key(project_id: UUID, version_id: UUID, digest: str) -> str:
+    return f"projects/{project_id}/gh-exports/{version_id}/{digest}.json.gz"
+
+
+def reset_gh_export_cache() -> None:
+    _MEMORY.clear()
+
+
+@dataclass(frozen=True)
+class _PayloadKey:
+    version_id: UUID
+    digest: str
+
+
+def _payload_key(resolved: ResolvedVersion, route: str, params: Mapping[str, str]) -> _PayloadKey:
+    material = json.dumps(
+        {
+            "version_id": str(resolved.version_id),
+            "body_revision": resolved.body_revision,
+            "route": route,
+            "params": sorted(params.items()),
+            "exporter_version": EXPORTER_VERSION,
+            "schema_version": GH_SCHEMA_VERSION,
+        },
+        sort_keys=True,
+    )
+    return _PayloadKey(resolved.version_id, hashlib.sha256(material.encode()).hexdigest())
+
+
+def _etag(access: ProjectAccess, resolved: ResolvedVersion, route: str, params: Mapping[str, str]) -> str:
+    project = access.project
+    material = "\n".join(
+        [_payload_key(resolved, route, params).digest, str(project.id), project.bt_number or "", project.name]
+    )
+    return f'"{hashlib.sha256(material.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _headers(etag: str, resolved: ResolvedVersion) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(resolved.last_modified.astimezone(UTC), usegmt=True),
+        "Cache-Control": _CACHE_CONTROL,
+    }
+
+
+def _join_objects(head: bytes, tail: bytes) -> bytes:
+    """Concatenate two serialized JSON objects' members into one object."""
+    if tail == b"{}":
+        return head
+    return head[:-1] + b"," + tail[1:]
+
+
+def _cached_payload(project_id: UUID, key: _PayloadKey, storage: AssetStorage | None) -> bytes | None:
+    payload = _MEMORY.get(key.digest)
+    if payload is not None or storage is None:
+        return payload
+    try:
+        payload = gzip.decompress(storage.get_object(gh_export_object_key(project_id, key.version_id, key.digest)))
+    except Exception:
+        # Absent (the common case for a first poll) or unreadable.
+        return None
+    _MEMORY.put(key.digest, payload)
+    return payload
+
+
+def _store_payload(project_id: UUID, key: _PayloadKey, payload: bytes, storage: AssetStorage | None) -> None:
+    _MEMORY.put(key.digest, payload)
+    if storage is None:
+        return
+    try:
+        storage.put_object(
+            gh_export_object_key(project_id, key.version_id, key.digest),
+            gzip.compress(payload, mtime=0),
+            "application/gzip",
+        )
+    except Exception as exc:
+        log.warning("gh_api.export_cache.store_failed", version_id=str(key.version_id), error=str(exc))
+
+
+class _PayloadLru:
+    """Byte-bounded LRU of payload JSON, shared by the request threadpool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, digest: str) -> bytes | None:
+        if settings.gh_export_cache_max_bytes <= 0:
+            return None
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is not None:
+                self._entries.move_to_end(digest)
+            return payload
+
+    def put(self, digest: str, payload: bytes) -> None:
+        max_bytes = settings.gh_export_cache_max_bytes
+        if len(payload) > max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[digest] = payload
+            self._bytes += len(payload)
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_MEMORY = _PayloadLru()
@@ -42,10 +42,12 @@ def get_saved_version_meta(conn: Connection[Any], project_id: UUID, version_id:
     Serves both `?version=` pinning and the active-version default. Rows here are
     always saved versions — drafts live in `project_version_drafts` and are never
     read. Returns ``None`` when the version doesn't belong to the project.
+    ``body_revision`` identifies the body for conditional GETs and the export
+    cache, so a poll that is answered from either never reads the body.
     """
     return conn.execute(
         f"""
-        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}
+        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body_revision
         FROM project_versions
         WHERE project_id = %(project_id)s
           AND id = %(version_id)s
@@ -4,19 +4,22 @@
 versions only. Phase 01 ships the foundation: the access dependency, version
 resolution, the response envelope, and the resolver/metadata route. Phases 2–3
 add data payloads by declaring the same `GhAccess` dependency and calling into
-`service.py`.
+`service.py`. The data routes go through `export_cache.serve_gh_export`, which
+adds conditional GET and caches each export per saved-body revision.
 """
 
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 
 from features.aperture_hbjson_export.service import export_aperture_window_constructions
+from features.assets.base import AssetStorage
 from features.gh_api.aperture_types_export import export_aperture_types
 from features.gh_api.constructions_export import OnMissingThermal, export_rich_constructions
+from features.gh_api.export_cache import get_gh_export_storage, serve_gh_export
 from features.gh_api.models import (
     GhApertureConstructionsResponse,
     GhApertureTypesResponse,
@@ -25,13 +28,9 @@ from features.gh_api.models import (
     GhTableResponse,
 )
 from features.gh_api.rate_limit import enforce_gh_rate_limit
-from features.gh_api.service import (
-    build_envelope_fields,
-    build_resolver_response,
-    resolve_gh_access,
-    resolve_version_and_body,
-)
+from features.gh_api.service import build_resolver_response, resolve_gh_access
 from features.gh_api.tables_export import export_table
+from features.project_document.document import ProjectDocumentV1
 from features.projects.access import ProjectAccess
 
 router = APIRouter(
@@ -53,6 +52,10 @@ VersionQuery = Annotated[UUID | None, Query(alias="version")]
 # 422ing. Default `strict` preserves the original hard-fail contract.
 OnMissingThermalQuery = Annotated[OnMissingThermal, Query(alias="on_missing_thermal")]
 
+# Data routes answer a matching `If-None-Match` with 304 (see `export_cache.py`).
+IfNoneMatchHeader = Annotated[str | None, Header()]
+GhExportStorage = Annotated[AssetStorage | None, Depends(get_gh_export_storage)]
+
 
 @router.get("", response_model=GhResolverResponse)
 def get_project_metadata(access: GhAccess) -> GhResolverResponse:
@@ -62,39 +65,80 @@ def get_project_metadata(access: GhAccess) -> GhResolverResponse:
 @router.get("/constructions/hbjson", response_model=GhConstructionsResponse)
 def get_constructions_hbjson(
     access: GhAccess,
+    storage: GhExportStorage,
     version: VersionQuery = None,
     on_missing_thermal: OnMissingThermalQuery = "strict",
-) -> GhConstructionsResponse:
-    resolved, body = resolve_version_and_body(access, version)
-    hb_constructions, warnings = export_rich_constructions(body, on_missing_thermal)
-    return GhConstructionsResponse(
-        **build_envelope_fields(access, resolved),
-        hb_constructions=hb_constructions,
-        warnings=warnings,
+    if_none_match: IfNoneMatchHeader = None,
+) -> Response:
+    def export(body: ProjectDocumentV1) -> dict[str, Any]:
+        hb_constructions, warnings = export_rich_constructions(body, on_missing_thermal)
+        return {"hb_constructions": hb_constructions, "warnings": warnings}
+
+    return serve_gh_export(
+        access,
+        version,
+        route="constructions/hbjson",
+        params={"on_missing_thermal": on_missing_thermal},
+        response_model=GhConstructionsResponse,
+        export=export,
+        storage=storage,
+        if_none_match=if_none_match,
     )
 
 
 @router.get("/aperture-types", response_model=GhApertureTypesResponse)
-def get_aperture_types(access: GhAccess, version: VersionQuery = None) -> GhApertureTypesResponse:
-    resolved, body = resolve_version_and_body(access, version)
-    return GhApertureTypesResponse(
-        **build_envelope_fields(access, resolved),
-        aperture_types=export_aperture_types(body),
+def get_aperture_types(
+    access: GhAccess,
+    storage: GhExportStorage,
+    version: VersionQuery = None,
+    if_none_match: IfNoneMatchHeader = None,
+) -> Response:
+    return serve_gh_export(
+        access,
+        version,
+        route="aperture-types",
+        params={},
+        response_model=GhApertureTypesResponse,
+        export=lambda body: {"aperture_types": export_aperture_types(body)},
+        storage=storage,
+        if_none_match=if_none_match,
     )
 
 
 @router.get("/aperture-constructions/hbjson", response_model=GhApertureConstructionsResponse)
 def get_aperture_constructions_hbjson(
-    access: GhAccess, version: VersionQuery = None
-) -> GhApertureConstructionsResponse:
-    resolved, body = resolve_version_and_body(access, version)
-    return GhApertureConstructionsResponse(
-        **build_envelope_fields(access, resolved),
-        hb_constructions=export_aperture_window_constructions(body),
+    access: GhAccess,
+    storage: GhExportStorage,
+    version: VersionQuery = None,
+    if_none_match: IfNoneMatchHeader = None,
+) -> Response:
+    return serve_gh_export(
+        access,
+        version,
+        route="aperture-constructions/hbjson",
+        params={},
+        response_model=GhApertureConstructionsResponse,
+        export=lambda body: {"hb_constructions": export_aperture_window_constructions(body)},
+        storage=storage,
+        if_none_match=if_none_match,
     )
 
 
 @router.get("/tables/{table_name}", response_model=GhTableResponse)
-def get_table(access: GhAccess, table_name: str, version: VersionQuery = None) -> GhTableResponse:
-    resolved, body = resolve_version_and_body(access, version)
-    return GhTableResponse(**build_envelope_fields(access, resolved), **export_table(body, table_name))
+def get_table(
+    access: GhAccess,
+    table_name: str,
+    storage: GhExportStorage,
+    version: VersionQuery = None,
+    if_none_match: IfNoneMatchHeader = None,
+) -> Response:
+    return serve_gh_export(
+        access,
+        version,
+        route="tables",
+        params={"table_name": table_name},
+        response_model=GhTableResponse,
+        export=lambda body: export_table(body, table_name),
+        storage=storage,
+        if_none_match=if_none_match,
+    )
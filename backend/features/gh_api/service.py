@@ -41,6 +41,9 @@ class ResolvedVersion:
 
     version_id: UUID
     last_modified: datetime
+    # Re-drawn on every write of the version's body, so it pins the exact
+    # body an export was built from (see ``export_cache``).
+    body_revision: int
 
 
 def resolve_gh_access(bt_number: str, request: Request) -> ProjectAccess:
@@ -90,7 +93,7 @@ def _resolve_version(conn: Connection[Any], access: ProjectAccess, version: UUID
     row = repository.get_saved_version_meta(conn, access.project_id, target)
     if row is None:
         raise _project_version_not_found()
-    return ResolvedVersion(version_id=row["id"], last_modified=row["updated_at"])
+    return _resolved_version(row)
 
 
 def resolve_version_and_body(access: ProjectAccess, version: UUID | None) -> tuple[ResolvedVersion, ProjectDocumentV1]:
@@ -106,8 +109,13 @@ def resolve_version_and_body(access: ProjectAccess, version: UUID | None) -> tup
         row = document_repository.get_project_version(conn, access.project_id, target)
     if row is None:
         raise _project_version_not_found()
-    resolved = ResolvedVersion(version_id=row["id"], last_modified=row["updated_at"])
-    return resolved, validate_document(row["body"])
+    return _resolved_version(row), validate_document(row["body"])
+
+
+def _resolved_version(row: dict[str, Any]) -> ResolvedVersion:
+    return ResolvedVersion(
+        version_id=row["id"], last_modified=row["updated_at"], body_revision=int(row["body_revision"])
+    )
 
 
 def _target_version_id(access: ProjectAccess, version: UUID | None) -> UUID:
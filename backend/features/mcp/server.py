@@ -85,6 +85,7 @@ from features.mcp.tools import (
     tool_restore_project,
     tool_save_draft,
     tool_save_draft_as,
+    tool_screen_envelope_assemblies,
     tool_search_climate_locations,
     tool_set_custom_field_description,
     tool_set_custom_field_formula,
@@ -409,6 +410,24 @@ def build_mcp_server(allow_env_token: bool = False) -> FastMCP:
             source="version" if source == "version" else "draft",
         )
 
+    @mcp.tool()
+    def screen_envelope_assemblies(
+        project_id: str,
+        version_id: str,
+        ctx: Context,
+        source: str = "draft",
+        include_monthly: bool = False,
+    ) -> dict[str, object]:
+        """Return thermal and ISO 13788 condensation results for every assembly in one call."""
+        return tool_screen_envelope_assemblies(
+            project_id,
+            version_id,
+            ctx,
+            allow_env_token=allow_env_token,
+            source="version" if source == "version" else "draft",
+            include_monthly=include_monthly,
+        )
+
     @mcp.tool()
     def list_assets(
         project_id: str,
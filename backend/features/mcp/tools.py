@@ -45,6 +45,7 @@ from features.mcp.tools_envelope import (
     tool_query_unfinished_envelope_work,
     tool_report_material_catalog_drift,
     tool_report_missing_envelope_evidence,
+    tool_screen_envelope_assemblies,
 )
 from features.mcp.tools_model_viewer import (
     tool_create_hbjson_file,
@@ -122,6 +123,7 @@ __all__ = [
     "tool_restore_project",
     "tool_save_draft_as",
     "tool_save_draft",
+    "tool_screen_envelope_assemblies",
     "tool_search_climate_locations",
     "tool_set_custom_field_description",
     "tool_set_custom_field_formula",
@@ -9,10 +9,12 @@ from mcp.server.fastmcp import Context
 from pydantic import ValidationError
 
 from features.envelope.models import EnvelopeCommandRequest
+from features.envelope.screening import EnvelopeScreeningAssembly, EnvelopeScreeningFailure, EnvelopeScreeningStart
 from features.envelope.service import (
     apply_envelope_command,
     get_envelope_read_model,
     get_project_material_drift_report,
+    prepare_envelope_screening,
 )
 from features.mcp.helpers import (
     current_token,
@@ -31,6 +33,7 @@ __all__ = [
     "tool_query_unfinished_envelope_work",
     "tool_report_material_catalog_drift",
     "tool_report_missing_envelope_evidence",
+    "tool_screen_envelope_assemblies",
 ]
 
 
@@ -254,6 +257,63 @@ def tool_query_unfinished_envelope_work(
     }
 
 
+def tool_screen_envelope_assemblies(
+    project_id: str,
+    version_id: str,
+    ctx: Context,
+    *,
+    allow_env_token: bool,
+    source: ProjectDocumentSource = "draft",
+    include_monthly: bool = False,
+) -> dict[str, object]:
+    """Thermal and condensation results for every assembly in one call.
+
+    Monthly node profiles are a dozen rows of per-layer numbers per
+    assembly; they are dropped unless asked for so a whole-project screen
+    stays readable.
+    """
+    parsed_project_id = parse_uuid(project_id, "project_id", ctx)
+    parsed_version_id = parse_uuid(version_id, "version_id", ctx)
+    token = current_token(ctx, allow_env_token)
+    access = project_access_or_error(token, parsed_project_id, "project:read", ctx)
+    try:
+        screening = prepare_envelope_screening(parsed_version_id, access, source)
+    except HTTPException as exc:
+        raise_http_exception_as_mcp_error(
+            exc,
+            ctx,
+            default_code="envelope_screening_failed",
+            default_message="Envelope assemblies could not be screened.",
+            default_recoverability="refresh",
+            recoverability_by_code=_ENVELOPE_RECOVERABILITY,
+        )
+    response: dict[str, object] = {}
+    assemblies: list[dict[str, object]] = []
+    failures: list[dict[str, object]] = []
+    for line in screening.lines():
+        if isinstance(line, EnvelopeScreeningStart):
+            response = line.model_dump(mode="json", exclude={"kind"})
+        elif isinstance(line, EnvelopeScreeningAssembly):
+            assemblies.append(
+                {
+                    "assembly_id": line.assembly_id,
+                    "thermal": line.thermal.model_dump(mode="json"),
+                    "condensation": line.condensation.model_dump(
+                        mode="json",
+                        exclude=None if include_monthly else {"monthly"},
+                    ),
+                }
+            )
+        elif isinstance(line, EnvelopeScreeningFailure):
+            failures.append(line.model_dump(mode="json", exclude={"kind"}))
+    order = {assembly.id: index for index, assembly in enumerate(screening.assemblies)}
+    return {
+        **response,
+        "assemblies": sorted(assemblies, key=lambda item: order[str(item["assembly_id"])]),
+        "failures": failures,
+    }
+
+
 def tool_apply_envelope_command(
     project_id: str,
     version_id: str,
@@ -10,6 +10,7 @@ the per-feature subsets; the bulk payload is also available).
 from __future__ import annotations
 
 from typing import NoReturn
+from uuid import UUID
 
 from fastapi import HTTPException
 from mcp.server.fastmcp import Context
@@ -33,6 +34,7 @@ from features.model_viewer.service import (
     list_files,
     update_file,
 )
+from features.projects.access import ProjectAccess
 
 __all__ = [
     "tool_create_hbjson_file",
@@ -158,14 +160,20 @@ def tool_get_hbjson_file_download_url(
         _raise_hbjson_error(exc, ctx)
 
 
-def _read_model_data_payload(
+def _model_data_access(
     project_id: str, file_id: str, ctx: Context, *, allow_env_token: bool
-) -> dict[str, object]:
-    """Shared auth + artifact load for all six model-data read tools."""
+) -> tuple[UUID, ProjectAccess]:
+    """Shared auth for all six model-data read tools."""
     parsed_project_id = parse_uuid(project_id, "project_id", ctx)
     parsed_file_id = parse_uuid(file_id, "file_id", ctx)
     token = current_token(ctx, allow_env_token)
-    access = project_access_or_error(token, parsed_project_id, "asset:read", ctx)
+    return parsed_file_id, project_access_or_error(token, parsed_project_id, "asset:read", ctx)
+
+
+def _read_model_data_payload(
+    project_id: str, file_id: str, ctx: Context, *, allow_env_token: bool
+) -> dict[str, object]:
+    parsed_file_id, access = _model_data_access(project_id, file_id, ctx, allow_env_token=allow_env_token)
     try:
         return model_data.read_model_data_payload(parsed_file_id, access, get_asset_service().r2)
     except HTTPException as exc:
@@ -192,8 +200,12 @@ def _tool_model_data_subset(
     allow_env_token: bool,
     key: str,
 ) -> dict[str, object]:
-    payload = _read_model_data_payload(project_id, file_id, ctx, allow_env_token=allow_env_token)
-    return {"items": payload[key]}
+    """One section, range-read from the sectioned artifact."""
+    parsed_file_id, access = _model_data_access(project_id, file_id, ctx, allow_env_token=allow_env_token)
+    try:
+        return {"items": model_data.read_model_data_subset(parsed_file_id, access, get_asset_service().r2, key)}
+    except HTTPException as exc:
+        _raise_hbjson_error(exc, ctx)
 
 
 def tool_list_hbjson_faces(project_id: str, file_id: str, ctx: Context, *, allow_env_token: bool) -> dict[str, object]:
@@ -0,0 +1,329 @@
+"""Sectioned `/model_data` artifact: per-section chunks behind an offset table.
+
+The gzip JSON artifact has to be fetched, decompressed and parsed whole even
+when a caller wants one key. This container stores each top-level
+`CombinedModelData` key as its own gzip chunk, so a reader can fetch a
+fixed-size head, look up one section's byte span, and range-read only that.
+
+Layout (all integers little-endian)::
+
+    b"PHNMODEL" | u32 header length | header JSON | chunk | chunk | ...
+
+The header maps section names to ``{"content", "offset", "length"}``.
+Offsets are absolute. Mesh geometry is not kept as nested JSON point lists.
+Every triangulated ``mesh`` in a section goes into two packed buffers:
+``<key>.vertices`` holds float64 xyz triples and ``<key>.indices`` holds
+uint32 triangle corners. In the JSON, the mesh is replaced by
+``{"vertex_range": [start, stop], "face_range": [start, stop]}``, counted in
+vertices and triangles. A viewer can then wrap the buffers in typed arrays
+directly.
+
+Vertices stay float64 rather than float32, so decoding a section gives back
+bit-identical coordinates. The JSON routes and MCP tools read from this
+container, and they must not drift from the gzip JSON compatibility
+encoding. A section's buffers sit directly after its JSON chunk, so one
+ranged read covers the section.
+
+Sections holding a mesh over the level-of-detail triangle budget also get
+``<key>.lod.vertices`` / ``<key>.lod.indices``. They carry a decimated copy
+of every mesh in the section (:mod:`features.model_viewer.mesh_lod`;
+meshes within budget are copied as-is), referenced by ``lod_vertex_range``
+and ``lod_face_range``. They are written between the JSON chunk and the
+full buffers, so a level-of-detail read is one short range.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from features.model_viewer.mesh_lod import decimate_mesh
+
+ARTIFACT_MEDIA_TYPE = "application/vnd.phn.model-data+sections"
+ARTIFACT_FORMAT_VERSION = 1
+# Enough to hold the preamble and header of any real model (a few hundred
+# bytes per section) in one ranged read.
+HEADER_PREFETCH_BYTES = 8192
+
+_MAGIC = b"PHNMODEL"
+_PREAMBLE = struct.Struct("<8sI")
+_VERTICES_DTYPE = np.dtype(np.float64).newbyteorder("<")
+_INDICES_DTYPE = np.dtype(np.uint32).newbyteorder("<")
+_UINT32_LIMIT = 2**32
+_MESH_REFERENCE_KEYS = {"vertex_range", "face_range"}
+_LOD_MESH_REFERENCE_KEYS = {"vertex_range", "face_range", "lod_vertex_range", "lod_face_range"}
+
+SectionContent = Literal["json", "float64", "uint32"]
+
+
+class ArtifactFormatError(ValueError):
+    """The bytes are not a sectioned artifact this code can read."""
+
+
+@dataclass(frozen=True)
+class ArtifactSection:
+    content: SectionContent
+    offset: int
+    length: int
+
+
+@dataclass(frozen=True)
+class ArtifactIndex:
+    sections: dict[str, ArtifactSection]
+
+    def keys(self) -> list[str]:
+        """Top-level payload keys, in the order they were written."""
+        return [name for name, section in self.sections.items() if section.content == "json"]
+
+    def span(self, key: str, *, level_of_detail: bool = False) -> tuple[int, int]:
+        """Inclusive byte range of ``key``'s JSON chunk and geometry buffers.
+
+        With ``level_of_detail``, the range stops after the decimated
+        buffers when the section has them.
+        """
+        names = _section_names(key)
+        if level_of_detail and _lod_section_names(key)[1] in self.sections:
+            names = (key, *_lod_section_names(key))
+        parts = [self.sections[name] for name in names if name in self.sections]
+        if not parts:
+            raise KeyError(key)
+        return parts[0].offset, parts[-1].offset + parts[-1].length - 1
+
+
+def encode_artifact(payload: dict[str, Any], *, lod_triangle_budget: int = 0) -> bytes:
+    """Serialize a `CombinedModelData` JSON dict into the sectioned container.
+
+    Deterministic for a given payload and budget (``mtime=0`` on every
+    chunk), so its hash is a stable ETag like the gzip JSON artifact's.
+    ``lod_triangle_budget`` of 0 writes no level-of-detail sections.
+    """
+    chunks: list[tuple[str, SectionContent, bytes]] = []
+    for key, value in payload.items():
+        with_lod = 0 < lod_triangle_budget < _largest_mesh(value)
+        packer = _MeshPacker(lod_triangle_budget if with_lod else 0)
+        packed = packer.pack(value)
+        chunks.append((key, "json", json.dumps(packed, separators=(",", ":")).encode()))
+        if with_lod:
+            lod_vertices_name, lod_indices_name = _lod_section_names(key)
+            chunks.append((lod_vertices_name, "float64", packer.lod.vertex_bytes()))
+            chunks.append((lod_indices_name, "uint32", packer.lod.index_bytes()))
+        if packer.full.mesh_count:
+            vertices_name, indices_name = _section_names(key)[1:]
+            chunks.append((vertices_name, "float64", packer.full.vertex_bytes()))
+            chunks.append((indices_name, "uint32", packer.full.index_bytes()))
+
+    compressed = [(name, content, gzip.compress(raw, mtime=0)) for name, content, raw in chunks]
+    relative: dict[str, dict[str, Any]] = {}
+    position = 0
+    for name, content, blob in compressed:
+        relative[name] = {"content": content, "offset": position, "length": len(blob)}
+        position += len(blob)
+    # Offsets are absolute, so they depend on the header's own length. The
+    # length only grows with the base offset, so this settles in a pass or two.
+    header_length = 0
+    while True:
+        base = _PREAMBLE.size + header_length
+        sections = {name: {**entry, "offset": entry["offset"] + base} for name, entry in relative.items()}
+        header = json.dumps({"format": ARTIFACT_FORMAT_VERSION, "sections": sections}, separators=(",", ":")).encode()
+        if len(header) == header_length:
+            break
+        header_length = len(header)
+    return b"".join([_PREAMBLE.pack(_MAGIC, len(header)), header, *(blob for _name, _content, blob in compressed)])
+
+
+def artifact_head_length(prefix: bytes) -> int:
+    """Bytes needed to parse the index: the preamble plus the header JSON."""
+    if len(prefix) < _PREAMBLE.size:
+        raise ArtifactFormatError("artifact_truncated")
+    magic, header_length = _PREAMBLE.unpack_from(prefix)
+    if magic != _MAGIC:
+        raise ArtifactFormatError("artifact_magic_mismatch")
+    return _PREAMBLE.size + header_length
+
+
+def parse_artifact_index(head: bytes) -> ArtifactIndex:
+    """Parse the offset table from at least :func:`artifact_head_length` bytes."""
+    end = artifact_head_length(head)
+    if len(head) < end:
+        raise ArtifactFormatError("artifact_truncated")
+    header = json.loads(head[_PREAMBLE.size : end])
+    if header.get("format") != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactFormatError(f"artifact_format_unsupported: {header.get('format')}")
+    return ArtifactIndex(
+        sections={
+            name: ArtifactSection(content=entry["content"], offset=entry["offset"], length=entry["length"])
+            for name, entry in header["sections"].items()
+        }
+    )
+
+
+def decode_section(
+    index: ArtifactIndex, key: str, data: bytes, data_offset: int = 0, *, level_of_detail: bool = False
+) -> Any:
+    """Decode one top-level key, with meshes restored as nested point lists.
+
+    ``data`` holds the artifact bytes from ``data_offset`` on and must cover
+    :meth:`ArtifactIndex.span` for ``key`` (with the same
+    ``level_of_detail``). With ``level_of_detail``, meshes come from the
+    decimated buffers when the section has them.
+    """
+    json_name, vertices_name, indices_name = _section_names(key)
+    use_lod = level_of_detail and _lod_section_names(key)[0] in index.sections
+    if use_lod:
+        vertices_name, indices_name = _lod_section_names(key)
+
+    def chunk(name: str) -> bytes:
+        section = index.sections[name]
+        start = section.offset - data_offset
+        return gzip.decompress(data[start : start + section.length])
+
+    value = json.loads(chunk(json_name))
+    if vertices_name not in index.sections:
+        return value
+    vertices = np.frombuffer(chunk(vertices_name), dtype=_VERTICES_DTYPE).reshape(-1, 3)
+    indices = np.frombuffer(chunk(indices_name), dtype=_INDICES_DTYPE).reshape(-1, 3)
+    return _inflate_meshes(value, vertices, indices, "lod_" if use_lod else "")
+
+
+def decode_artifact(data: bytes) -> dict[str, Any]:
+    """The whole payload, equal to the dict the artifact was encoded from."""
+    index = parse_artifact_index(data)
+    return {key: decode_section(index, key, data) for key in index.keys()}
+
+
+def _section_names(key: str) -> tuple[str, str, str]:
+    return key, f"{key}.vertices", f"{key}.indices"
+
+
+def _lod_section_names(key: str) -> tuple[str, str]:
+    return f"{key}.lod.vertices", f"{key}.lod.indices"
+
+
+def _largest_mesh(value: Any) -> int:
+    """Triangle count of the largest packable mesh in a JSON tree."""
+    if isinstance(value, list):
+        return max((_largest_mesh(item) for item in value), default=0)
+    if not isinstance(value, dict):
+        return 0
+    return max(
+        (
+            len(item["faces"]) if name == "mesh" and _is_packable_mesh(item) else _largest_mesh(item)
+            for name, item in value.items()
+        ),
+        default=0,
+    )
+
+
+class _MeshBuffers:
+    """Flat vertex and index buffers that meshes are appended to."""
+
+    def __init__(self) -> None:
+        self._vertices: list[npt.NDArray[np.float64]] = []
+        self._indices: list[npt.NDArray[np.uint32]] = []
+        self.mesh_count = 0
+        self.vertex_count = 0
+        self.face_count = 0
+
+    def append(self, vertices: npt.NDArray[np.float64], indices: npt.NDArray[np.uint32]) -> dict[str, list[int]]:
+        self._vertices.append(vertices)
+        self._indices.append(indices)
+        reference = {
+            "vertex_range": [self.vertex_count, self.vertex_count + len(vertices)],
+            "face_range": [self.face_count, self.face_count + len(indices)],
+        }
+        self.mesh_count += 1
+        self.vertex_count += len(vertices)
+        self.face_count += len(indices)
+        return reference
+
+    def vertex_bytes(self) -> bytes:
+        return np.concatenate(self._vertices).astype(_VERTICES_DTYPE, copy=False).tobytes()
+
+    def index_bytes(self) -> bytes:
+        return np.concatenate(self._indices).astype(_INDICES_DTYPE, copy=False).tobytes()
+
+
+class _MeshPacker:
+    """Moves packable ``mesh`` objects out of a JSON tree into flat buffers.
+
+    With a ``lod_triangle_budget``, every mesh also goes into the ``lod``
+    buffers, decimated when it is over the budget.
+    """
+
+    def __init__(self, lod_triangle_budget: int = 0) -> None:
+        self.full = _MeshBuffers()
+        self.lod = _MeshBuffers()
+        self._lod_triangle_budget = lod_triangle_budget
+
+    def pack(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.pack(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        packed: dict[str, Any] = {}
+        for name, item in value.items():
+            if name == "mesh" and _is_packable_mesh(item):
+                packed[name] = self._reference(item)
+            else:
+                packed[name] = self.pack(item)
+        return packed
+
+    def _reference(self, mesh: dict[str, Any]) -> dict[str, list[int]]:
+        vertices = np.asarray(mesh["vertices"], dtype=np.float64).reshape(-1, 3)
+        indices = np.asarray(mesh["faces"], dtype=np.uint32).reshape(-1, 3)
+        reference = self.full.append(vertices, indices)
+        if self._lod_triangle_budget:
+            lod = self.lod.append(*decimate_mesh(vertices, indices, self._lod_triangle_budget))
+            reference.update({f"lod_{name}": span for name, span in lod.items()})
+        return reference
+
+
+def _is_packable_mesh(value: Any) -> bool:
+    """Triangulated xyz meshes only; anything else stays inline JSON.
+
+    The type checks keep decoding exact: an int coordinate would come back
+    as a float, and a non-triangle face has no fixed stride.
+    """
+    if not isinstance(value, dict) or value.keys() != {"vertices", "faces"}:
+        return False
+    vertices, faces = value["vertices"], value["faces"]
+    if not isinstance(vertices, list) or not isinstance(faces, list):
+        return False
+    return all(
+        isinstance(vertex, list) and len(vertex) == 3 and all(type(coordinate) is float for coordinate in vertex)
+        for vertex in vertices
+    ) and all(
+        isinstance(face, list)
+        and len(face) == 3
+        and all(type(corner) is int and 0 <= corner < _UINT32_LIMIT for corner in face)
+        for face in faces
+    )
+
+
+def _is_mesh_reference(value: Any) -> bool:
+    return isinstance(value, dict) and value.keys() in (_MESH_REFERENCE_KEYS, _LOD_MESH_REFERENCE_KEYS)
+
+
+def _inflate_meshes(value: Any, vertices: npt.NDArray[Any], indices: npt.NDArray[Any], prefix: str = "") -> Any:
+    if isinstance(value, list):
+        return [_inflate_meshes(item, vertices, indices, prefix) for item in value]
+    if not isinstance(value, dict):
+        return value
+    inflated: dict[str, Any] = {}
+    for name, item in value.items():
+        if name == "mesh" and _is_mesh_reference(item):
+            vertex_start, vertex_stop = item[f"{prefix}vertex_range"]
+            face_start, face_stop = item[f"{prefix}face_range"]
+            inflated[name] = {
+                "vertices": vertices[vertex_start:vertex_stop].tolist(),
+                "faces": indices[face_start:face_stop].tolist(),
+            }
+        else:
+            inflated[name] = _inflate_meshes(item, vertices, indices, prefix)
+    return inflated
@@ -16,7 +16,7 @@ The upload-job / artifact workflow lives in `model_data.py`.
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 from importlib import metadata
@@ -24,10 +24,11 @@ from math import isfinite
 from numbers import Real
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
 import structlog
 from honeybee.boundarycondition import Ground, Outdoors
 from honeybee.model import Model
-from ladybug_geometry.geometry3d.mesh import Mesh3D
 from ladybug_geometry.geometry3d.pointvector import Point3D
 from pydantic import ValidationError
 
@@ -432,45 +433,158 @@ def _shade_groups_from_model(model: Model) -> list[ShadeGroupSchema]:
         face_vertices = (
             vertices for shade in shade_group for vertices in shade.geometry.triangulated_mesh3d.face_vertices
         )
-        merged = _join_mesh_faces(face_vertices)
-        shade_dto.geometry.mesh = Mesh3DSchema(**merged.to_dict())
+        shade_dto.geometry.mesh = _join_mesh_faces(face_vertices)
         group_dtos.append(ShadeGroupSchema(shades=[shade_dto]))
     return group_dtos
 
 
-def _join_mesh_faces(mesh_faces: Iterable[tuple[Point3D, ...]]) -> Mesh3D:
-    """Join triangle faces into one Mesh3D, merging coincident vertices.
+def _join_mesh_faces(mesh_faces: Iterable[tuple[Point3D, ...]]) -> Mesh3DSchema:
+    """Join triangle faces into one mesh, merging coincident vertices.
 
     Tolerance-aware replacement for `Mesh3D.from_face_vertices` (which
-    only merges exactly-equal vertices). Vertices are bucketed by rounded
-    coordinates so lookup is O(1) per vertex instead of V1's linear scan —
-    the 253-shade Hillandale group made the O(n²) original impractical.
-    Checking the 27 neighboring buckets preserves the is_equivalent
-    semantics for points that round across a bucket edge.
+    only merges exactly-equal vertices); V1's O(n²) scan was impractical
+    for the 253-shade Hillandale group. See :func:`_weld_vertices` for how
+    the merge keeps V1's `is_equivalent` result.
     """
-    vertices: list[Point3D] = []
-    buckets: dict[tuple[int, int, int], list[int]] = defaultdict(list)
-    faces: list[tuple[int, ...]] = []
+    faces = [tuple(face) for face in mesh_faces]
+    points = np.array([(point.x, point.y, point.z) for face in faces for point in face], dtype=np.float64)
+    created, vertex_of = _weld_vertices(points.reshape(-1, 3), _SHADE_MERGE_TOLERANCE)
+    corners = vertex_of.tolist()
+    joined: list[list[int]] = []
+    position = 0
+    for face in faces:
+        joined.append(corners[position : position + len(face)])
+        position += len(face)
+    return Mesh3DSchema(vertices=points.reshape(-1, 3)[created].tolist(), faces=joined)
+
+
+_Positions = npt.NDArray[np.intp]
+_CELL_DTYPE = np.dtype([("x", "<i8"), ("y", "<i8"), ("z", "<i8")])
+# Distinct cells at which rank codes (count³) would no longer fit in int64.
+_RANK_CODE_LIMIT = 2**21
+_NEIGHBOUR_OFFSETS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if (dx, dy, dz) != (0, 0, 0)],
+    dtype=np.int64,
+)
 
-    def bucket_key(point: Point3D) -> tuple[int, int, int]:
-        return (
-            round(point.x / _SHADE_MERGE_TOLERANCE),
-            round(point.y / _SHADE_MERGE_TOLERANCE),
-            round(point.z / _SHADE_MERGE_TOLERANCE),
-        )
 
-    def find_or_add(point: Point3D) -> int:
-        key = bucket_key(point)
-        for dx in (-1, 0, 1):
-            for dy in (-1, 0, 1):
-                for dz in (-1, 0, 1):
-                    for index in buckets[(key[0] + dx, key[1] + dy, key[2] + dz)]:
-                        if point.is_equivalent(vertices[index], _SHADE_MERGE_TOLERANCE):
-                            return index
-        vertices.append(point)
-        buckets[key].append(len(vertices) - 1)
-        return len(vertices) - 1
-
-    for mesh_face in mesh_faces:
-        faces.append(tuple(find_or_add(point) for point in mesh_face))
-    return Mesh3D(tuple(vertices), tuple(faces))
+def _weld_vertices(
+    points: npt.NDArray[np.float64], tolerance: float
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Merge points within ``tolerance`` per axis, first come first served.
+
+    Returns the positions of the points that became vertices (in creation
+    order) and each point's vertex number. The result equals the
+    sequential rule: a point joins the first earlier vertex it
+    `is_equivalent` to, searching the 27 rounded-coordinate cells around
+    it, or else becomes a new vertex.
+
+    Most cells are isolated: no other occupied cell touches them, and every
+    point in them is within tolerance of the cell's first point. The
+    sequential rule reduces to "the first point in the cell" there, which
+    ``np.unique`` computes in one pass. The other cells form closed
+    clusters, since their occupied neighbours are never isolated. They are
+    replayed point by point.
+    """
+    count = len(points)
+    if count == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    cells = np.round(points / tolerance).astype(np.int64)
+    cell_keys = np.ascontiguousarray(cells).view(_CELL_DTYPE).ravel()
+    unique_cells, first, inverse = np.unique(cell_keys, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+
+    crowded = _has_occupied_neighbour(unique_cells.view(np.int64).reshape(-1, 3))
+    # Rounding the quotient can put two points exactly one tolerance apart
+    # into one cell, where the float difference may exceed the tolerance.
+    far = np.any(np.abs(points - points[first[inverse]]) > tolerance, axis=1)
+    crowded[inverse[far]] = True
+
+    creator = first[inverse]
+    replayed = np.flatnonzero(crowded[inverse])
+    if len(replayed):
+        local = _weld_sequentially(points[replayed].tolist(), cells[replayed].tolist(), tolerance)
+        creator[replayed] = replayed[local]
+    created, vertex_of = np.unique(creator, return_inverse=True)
+    return created, vertex_of.ravel()
+
+
+def _has_occupied_neighbour(cells: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+    """For each distinct cell, whether any of its 26 neighbours is occupied.
+
+    Cells are re-coded as one integer over per-axis ranks, so each lookup
+    is a search in a sorted int64 array. A neighbour whose coordinate no
+    cell uses on some axis cannot be occupied.
+    """
+    count = len(cells)
+    crowded = np.zeros(count, dtype=np.bool_)
+    if count >= _RANK_CODE_LIMIT:
+        # Rank codes would overflow int64; compare whole rows instead.
+        keys = np.ascontiguousarray(cells).view(_CELL_DTYPE).ravel()
+        for offset in _NEIGHBOUR_OFFSETS:
+            shifted = np.ascontiguousarray(cells + offset).view(_CELL_DTYPE).ravel()
+            crowded |= keys[np.minimum(np.searchsorted(keys, shifted), count - 1)] == shifted
+        return crowded
+
+    # ranks[axis][step + 1] is (rank, present) of each cell's coordinate
+    # shifted by step along axis.
+    ranks: list[list[tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]]] = []
+    for axis in range(3):
+        values = np.unique(cells[:, axis])
+        shifted_ranks = []
+        for step in (-1, 0, 1):
+            shifted = cells[:, axis] + step
+            rank = np.minimum(np.searchsorted(values, shifted), len(values) - 1)
+            shifted_ranks.append((rank.astype(np.int64), values[rank] == shifted))
+        ranks.append(shifted_ranks)
+    strides = (count * count, count, 1)
+
+    def codes(offset: Sequence[int]) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+        code = np.zeros(count, dtype=np.int64)
+        present = np.ones(count, dtype=np.bool_)
+        for axis in range(3):
+            rank, axis_present = ranks[axis][int(offset[axis]) + 1]
+            code += rank * strides[axis]
+            present &= axis_present
+        return code, present
+
+    occupied = np.sort(codes((0, 0, 0))[0])
+    for offset in _NEIGHBOUR_OFFSETS:
+        code, present = codes(offset)
+        found = occupied[np.minimum(np.searchsorted(occupied, code), count - 1)] == code
+        crowded |= present & found
+    return crowded
+
+
+def _weld_sequentially(points: list[list[float]], cells: list[list[int]], tolerance: float) -> list[int]:
+    """The sequential merge rule; returns the position of each point's vertex."""
+    buckets: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    creators: list[int] = []
+    for position, (point, cell) in enumerate(zip(points, cells, strict=True)):
+        match = _find_vertex(point, cell, points, buckets, tolerance)
+        if match is None:
+            match = position
+            buckets[(cell[0], cell[1], cell[2])].append(position)
+        creators.append(match)
+    return creators
+
+
+def _find_vertex(
+    point: list[float],
+    cell: list[int],
+    points: list[list[float]],
+    buckets: dict[tuple[int, int, int], list[int]],
+    tolerance: float,
+) -> int | None:
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                for candidate in buckets.get((cell[0] + dx, cell[1] + dy, cell[2] + dz), ()):
+                    other = points[candidate]
+                    if (
+                        abs(point[0] - other[0]) <= tolerance
+                        and abs(point[1] - other[1]) <= tolerance
+                        and abs(point[2] - other[2]) <= tolerance
+                    ):
+                        return candidate
+    return None
@@ -0,0 +1,252 @@
+"""HBJSON extraction in bounded worker processes, one job per content hash.
+
+The extraction pass is the heaviest thing the API does. The parsed HBJSON
+dict, the honeybee ``Model``, the ``CombinedModelData`` schema and its JSON
+encodings are all alive at the same time, several times the size of the
+upload. Here that pass runs in a spawned worker process, so the API process
+holds only the raw upload and the compressed artifacts it gets back.
+The pool is a :class:`~features.shared.process_pool.SpawnedProcessPool`.
+
+Each worker caps its own address space at start-up, and each job runs under
+a wall-clock alarm. A job that hits either limit raises
+:class:`ModelExtractionLimitError`. It subclasses ``ModelParseError``, so
+the row is marked permanently failed: the same bytes would hit the same
+limit on every retry. A worker killed outright (the OS ran out of memory
+before the cap was reached) breaks the pool and fails every job in it, so
+a death is only held against a model whose job ran alone in the pool from
+start to finish. The first such death is transient; a second one on the
+same content hash counts as a limit failure, so a model that always gets
+killed is not re-extracted on every read. A job that shared the pool just
+fails transiently and is retried later.
+
+Jobs are single-flight per content hash. The link-time background task and
+a self-healing `/model_data` read can race on one upload, and so can two
+viewers opening it. The artifacts depend only on the bytes, so every
+concurrent caller waits on the one extraction and gets its result. This is
+per API process: a content hash has one active file per project, so there
+is no other row to look up, and a race across processes only repeats the
+same idempotent writes.
+"""
+
+from __future__ import annotations
+
+import json
+import resource
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from config import settings
+from features.model_viewer.artifact import encode_artifact
+from features.model_viewer.extraction import (
+    GeometrySummary,
+    ModelParseError,
+    extract_geometry_summary,
+    extract_model_data,
+    parse_hb_model,
+)
+from features.shared.process_pool import SpawnedProcessPool, run_with_alarm
+
+_JSON_SEPARATORS = (",", ":")
+
+
+class ModelExtractionLimitError(ModelParseError):
+    """The model is too large to extract within the worker's limits."""
+
+
+@dataclass(frozen=True)
+class ExtractedModel:
+    """What one extraction pass hands back to the API process."""
+
+    json_artifact: bytes
+    sectioned_artifact: bytes
+    summary: GeometrySummary
+    faces_extracted: int
+    spaces_extracted: int
+    air_boundaries_skipped: int
+
+
+def extract_artifacts(raw: bytes, *, lod_triangle_budget: int = 0) -> ExtractedModel:
+    """Parse HBJSON bytes and encode both `/model_data` artifacts.
+
+    Pure: no database or storage access, so it can run in a worker. Each
+    intermediate is dropped as soon as the next stage has been built from
+    it, so the peak is two stages rather than all of them.
+    """
+    try:
+        hbjson = json.loads(raw)
+    except ValueError as exc:
+        raise ModelParseError(f"Invalid JSON: {exc}") from exc
+    model = parse_hb_model(hbjson)
+    del hbjson
+    data = extract_model_data(model)
+    summary = extract_geometry_summary(model)
+    del model
+    load_summary = data.load_summary
+    # by_alias keeps V1's wire names (`properties.ph._v_sup` etc.).
+    payload = data.model_dump(mode="json", by_alias=True)
+    del data
+    return ExtractedModel(
+        json_artifact=gzip_json(payload),
+        sectioned_artifact=encode_artifact(payload, lod_triangle_budget=lod_triangle_budget),
+        summary=summary,
+        faces_extracted=load_summary.faces_extracted,
+        spaces_extracted=load_summary.spaces_extracted,
+        air_boundaries_skipped=load_summary.air_boundaries_skipped,
+    )
+
+
+def gzip_json(payload: dict[str, Any]) -> bytes:
+    """Compact JSON, gzip-compressed as it is encoded.
+
+    Byte-identical to ``gzip.compress(json.dumps(...), mtime=0)``, so the
+    ETag is deterministic, but the full JSON string never exists: only one
+    list item of a top-level key is encoded at a time.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    chunks = [compressor.compress(fragment.encode()) for fragment in _iter_json(payload)]
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+def _iter_json(payload: dict[str, Any]) -> Iterator[str]:
+    yield "{"
+    for position, (key, value) in enumerate(payload.items()):
+        yield ("," if position else "") + json.dumps(key) + ":"
+        if isinstance(value, list):
+            yield "["
+            for item_position, item in enumerate(value):
+                yield ("," if item_position else "") + json.dumps(item, separators=_JSON_SEPARATORS)
+            yield "]"
+        else:
+            yield json.dumps(value, separators=_JSON_SEPARATORS)
+    yield "}"
+
+
+def run_extraction(content_hash: str, load_raw: Callable[[], bytes]) -> ExtractedModel:
+    """Extract the model, sharing one run among concurrent callers.
+
+    Only the caller that starts the job calls ``load_raw``. The others wait
+    for its result or its exception.
+    """
+    with _IN_FLIGHT_LOCK:
+        future = _IN_FLIGHT.get(content_hash)
+        owner = future is None
+        if future is None:
+            future = _IN_FLIGHT[content_hash] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = _extract(content_hash, load_raw())
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT.pop(content_hash, None)
+
+
+_IN_FLIGHT: dict[str, Future[ExtractedModel]] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+class _PoolRun:
+    """One job in the pool; ``alone`` until another job overlaps it."""
+
+    __slots__ = ("alone",)
+
+    def __init__(self) -> None:
+        self.alone = True
+
+
+_RUNNING: set[_PoolRun] = set()
+# Content hashes whose job died alone once, least recent first.
+_WORKER_DEATHS: OrderedDict[str, int] = OrderedDict()
+_RUNS_LOCK = threading.Lock()
+# Deaths of a job running alone before its content hash fails permanently.
+_WORKER_DEATH_LIMIT = 2
+# Content hashes remembered with one death; the oldest is forgotten first.
+_WORKER_DEATHS_MAX_ENTRIES = 256
+
+
+def _extract(content_hash: str, raw: bytes) -> ExtractedModel:
+    lod_triangle_budget = settings.model_data_lod_triangle_budget
+    if settings.model_extraction_workers < 1:
+        return extract_artifacts(raw, lod_triangle_budget=lod_triangle_budget)
+    timeout_seconds = settings.model_extraction_timeout_seconds
+    run = _PoolRun()
+    with _RUNS_LOCK:
+        if _RUNNING:
+            run.alone = False
+            for other in _RUNNING:
+                other.alone = False
+        _RUNNING.add(run)
+    try:
+        result = _POOL.run(
+            run_with_alarm,
+            _extract_in_worker,
+            (raw, lod_triangle_budget),
+            timeout_seconds,
+            ModelExtractionLimitError(f"Model extraction exceeded the {timeout_seconds:g} s time limit."),
+        )
+    except BrokenProcessPool as exc:
+        if not _held_against(content_hash, run):
+            raise
+        raise ModelExtractionLimitError(
+            "Model extraction was killed repeatedly, most likely for running out of memory."
+        ) from exc
+    finally:
+        with _RUNS_LOCK:
+            _RUNNING.discard(run)
+    with _RUNS_LOCK:
+        _WORKER_DEATHS.pop(content_hash, None)
+    return result
+
+
+def _held_against(content_hash: str, run: _PoolRun) -> bool:
+    """Record a worker death; True once ``content_hash`` has reached the limit."""
+    with _RUNS_LOCK:
+        if not run.alone:
+            return False
+        deaths = _WORKER_DEATHS.pop(content_hash, 0) + 1
+        if deaths >= _WORKER_DEATH_LIMIT:
+            return True
+        _WORKER_DEATHS[content_hash] = deaths
+        while len(_WORKER_DEATHS) > _WORKER_DEATHS_MAX_ENTRIES:
+            _WORKER_DEATHS.popitem(last=False)
+        return False
+
+
+def _extract_in_worker(raw: bytes, lod_triangle_budget: int) -> ExtractedModel:
+    """Worker entry point: :func:`extract_artifacts`, with the address-space cap mapped to a limit error."""
+    try:
+        return extract_artifacts(raw, lod_triangle_budget=lod_triangle_budget)
+    except MemoryError:
+        raise ModelExtractionLimitError("Model extraction ran out of memory in its worker.") from None
+
+
+def _limit_worker_memory(limit_mb: int) -> None:
+    """Pool initializer: cap the worker's address space."""
+    if limit_mb > 0:
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+_POOL = SpawnedProcessPool(
+    lambda: settings.model_extraction_workers,
+    initializer=_limit_worker_memory,
+    initargs=lambda: (settings.model_extraction_memory_limit_mb,),
+)
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the worker processes (application shutdown and tests)."""
+    _POOL.discard()
@@ -0,0 +1,80 @@
+"""Level-of-detail meshes for the sectioned `/model_data` artifact.
+
+Site models can carry shade groups and faces with tens of thousands of
+triangles that the viewer draws at a size where most of them are
+sub-pixel. :func:`decimate_mesh` builds a coarse stand-in by vertex
+clustering. Vertices are snapped to a uniform grid, and every cell becomes
+one vertex at the mean of its members. Triangles that collapse are
+dropped. The grid coarsens until the mesh fits the triangle budget.
+
+Clustering is not shape-preserving the way edge-collapse simplification
+is, but it is a handful of vectorized passes, deterministic, and never
+moves a vertex outside its cell. That is enough for an overview render
+that the full mesh replaces on zoom.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+
+# Each retry widens the grid by this factor. Triangle count falls with
+# roughly the square of the cell size on surface meshes.
+_GRID_GROWTH = 1.5
+
+
+def decimate_mesh(
+    vertices: npt.NDArray[np.float64], triangles: npt.NDArray[np.uint32], triangle_budget: int
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.uint32]]:
+    """A mesh of at most ``triangle_budget`` triangles approximating the input.
+
+    ``vertices`` is ``(n, 3)`` and ``triangles`` is ``(m, 3)`` vertex
+    indices. Triangle winding is preserved. A mesh already within budget
+    is returned unchanged.
+    """
+    if len(triangles) <= triangle_budget:
+        return vertices, triangles
+    if triangle_budget < 1:
+        return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.uint32)
+    used = vertices[np.unique(triangles)]
+    origin = used.min(axis=0)
+    extent = float((used.max(axis=0) - origin).max())
+    # Start from the grid that leaves about `triangle_budget` cells on a
+    # square surface, then coarsen until the budget holds.
+    cell = extent / math.sqrt(triangle_budget) if extent > 0 else 1.0
+    while True:
+        clustered, kept = _cluster(vertices, triangles, origin, cell)
+        if len(kept) <= triangle_budget:
+            return clustered, kept
+        cell *= _GRID_GROWTH
+
+
+def _cluster(
+    vertices: npt.NDArray[np.float64],
+    triangles: npt.NDArray[np.uint32],
+    origin: npt.NDArray[np.float64],
+    cell: float,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.uint32]]:
+    cells = np.floor((vertices - origin) / cell).astype(np.int64)
+    _, cluster_of = np.unique(cells, axis=0, return_inverse=True)
+    cluster_of = cluster_of.ravel()
+
+    corners = cluster_of[triangles]
+    collapsed = (corners[:, 0] == corners[:, 1]) | (corners[:, 1] == corners[:, 2]) | (corners[:, 0] == corners[:, 2])
+    corners = corners[~collapsed]
+    # Triangles that land on the same three clusters are duplicates whatever
+    # their winding; keep the first.
+    _, first = np.unique(np.sort(corners, axis=1), axis=0, return_index=True)
+    corners = corners[np.sort(first)]
+
+    # Renumber the clusters that are still referenced and place each at
+    # the mean of its member vertices.
+    referenced, renumbered = np.unique(corners.ravel(), return_inverse=True)
+    members = np.isin(cluster_of, referenced)
+    slot = np.searchsorted(referenced, cluster_of[members])
+    totals = np.zeros((len(referenced), 3), dtype=np.float64)
+    np.add.at(totals, slot, vertices[members])
+    counts = np.bincount(slot, minlength=len(referenced)).reshape(-1, 1)
+    return totals / counts, renumbered.reshape(-1, 3).astype(np.uint32)
@@ -2,10 +2,15 @@
 
 One parse does both jobs: the link-step background task parses the HBJSON
 once, writes the geometry-summary columns, and persists the full
-`CombinedModelData` JSON to R2 gzip'd under a derived key. `/model_data`
-streams that artifact with immutable cache headers — there is no
-per-request parse and no in-process model cache (US-VIEW-7 crit. 9 as
-amended by D-15).
+`CombinedModelData` to R2 under two derived keys: the gzip JSON artifact
+and the sectioned container (:mod:`features.model_viewer.artifact`). The
+parse itself runs in a bounded worker process
+(:mod:`features.model_viewer.extraction_jobs`).
+`/model_data` streams one of them with immutable cache headers — gzip JSON
+by default, the container when the client's `Accept` asks for it — and the
+per-feature routes range-read a single section of the container. There is
+no per-request parse of the whole model and no in-process model cache
+(US-VIEW-7 crit. 9 as amended by D-15).
 
 Error taxonomy (D-16): `ModelParseError` is permanent (the bytes can
 never parse; `extraction_status` flips to 'failed' and Retry is hidden);
@@ -18,22 +23,30 @@ from __future__ import annotations
 import gzip
 import hashlib
 import json
+from collections.abc import Callable
 from typing import Any
 from uuid import UUID
 
 import structlog
+from botocore.exceptions import ClientError
 from fastapi import HTTPException, Response
 from starlette import status
 
+from config import settings
 from database import connection, transaction
 from features.assets.service import AssetStorage
 from features.model_viewer import repository
-from features.model_viewer.extraction import (
-    ModelParseError,
-    extract_geometry_summary,
-    extract_model_data,
-    parse_hb_model,
+from features.model_viewer.artifact import (
+    ARTIFACT_MEDIA_TYPE,
+    HEADER_PREFETCH_BYTES,
+    ArtifactFormatError,
+    artifact_head_length,
+    decode_section,
+    encode_artifact,
+    parse_artifact_index,
 )
+from features.model_viewer.extraction import ModelParseError
+from features.model_viewer.extraction_jobs import run_extraction
 from features.projects.access import ProjectAccess
 from features.shared.errors import api_error
 
@@ -47,6 +60,11 @@ def model_data_object_key(asset_id: str) -> str:
     return f"derived/{asset_id}/model_data.json.gz"
 
 
+def sectioned_artifact_object_key(asset_id: str) -> str:
+    """Sibling of :func:`model_data_object_key` for the sectioned container."""
+    return f"derived/{asset_id}/model_data.sections"
+
+
 def run_extraction_job(storage: AssetStorage, project_id: UUID, file_id: UUID) -> None:
     """Background task scheduled by the link step (D-13).
 
@@ -60,7 +78,7 @@ def run_extraction_job(storage: AssetStorage, project_id: UUID, file_id: UUID) -
     if target is None or target["extraction_status"] != "pending":
         return
     try:
-        _extract_and_persist(storage, project_id, file_id, target["asset_id"], target["object_key"])
+        _extract_and_persist(storage, project_id, file_id, target)
     except ModelParseError:
         pass  # Row already marked 'failed'; /model_data reports it (D-16).
     except Exception as exc:
@@ -72,19 +90,32 @@ def serve_model_data(
     access: ProjectAccess,
     storage: AssetStorage,
     if_none_match: str | None = None,
+    accept: str | None = None,
 ) -> Response:
     """Stream the precomputed artifact with immutable caching (D-15).
 
-    Self-healing: a missing/unreadable artifact on a non-failed row is
-    re-extracted synchronously, persisted, and served — this also covers
+    The gzip JSON encoding stays the default for compatibility; a client
+    that lists :data:`ARTIFACT_MEDIA_TYPE` in `Accept` gets the sectioned
+    container instead. Both share the URL, hence `Vary: Accept`.
+
+    Self-healing: a missing artifact on a non-failed row is re-extracted
+    synchronously, persisted, and served — this also covers
     rows the background job never reached (e.g. MCP-created links).
     """
-    artifact = _load_artifact(file_id, access, storage)
+    sectioned = _accepts_sectioned_artifact(accept)
+    object_key = sectioned_artifact_object_key if sectioned else model_data_object_key
+    artifact = _load_artifact(file_id, access, storage, object_key)
     etag = f'"{hashlib.sha256(artifact).hexdigest()[:32]}"'
-    headers = {"Cache-Control": _CACHE_CONTROL, "ETag": etag, "Content-Encoding": "gzip"}
+    headers = {"Cache-Control": _CACHE_CONTROL, "ETag": etag, "Vary": "Accept"}
+    if not sectioned:
+        headers["Content-Encoding"] = "gzip"
     if if_none_match == etag:
         return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
-    return Response(content=artifact, media_type="application/json", headers=headers)
+    return Response(
+        content=artifact,
+        media_type=ARTIFACT_MEDIA_TYPE if sectioned else "application/json",
+        headers=headers,
+    )
 
 
 def read_model_data_payload(file_id: UUID, access: ProjectAccess, storage: AssetStorage) -> dict[str, Any]:
@@ -94,93 +125,204 @@ def read_model_data_payload(file_id: UUID, access: ProjectAccess, storage: Asset
     written) — re-validating thousands of faces per request would
     re-introduce the per-request parse cost D-15 removed.
     """
-    return dict(json.loads(gzip.decompress(_load_artifact(file_id, access, storage))))
+    artifact = _load_artifact(file_id, access, storage, model_data_object_key)
+    return dict(json.loads(gzip.decompress(artifact)))
 
 
-def read_model_data_subset(file_id: UUID, access: ProjectAccess, storage: AssetStorage, key: str) -> list[Any]:
-    """One section of the artifact, for the per-feature MCP-facing routes."""
-    return list(read_model_data_payload(file_id, access, storage)[key])
+def read_model_data_subset(
+    file_id: UUID,
+    access: ProjectAccess,
+    storage: AssetStorage,
+    key: str,
+    *,
+    level_of_detail: bool = False,
+) -> list[Any]:
+    """One section of the artifact, for the per-feature routes and MCP tools.
+
+    Ranged reads of the sectioned container: its head, then only the
+    section's byte span (skipped when the head already covers it). With
+    ``level_of_detail``, meshes over the triangle budget come back
+    decimated and the span stops before the full-detail buffers.
+
+    Models extracted before the container existed only have the gzip JSON
+    artifact: a missing or unreadable container is rebuilt from that
+    artifact and persisted, so the HBJSON is only re-parsed when the
+    derived objects are confirmed gone. Any other storage failure is a 503.
+    """
+    target = _extraction_target(file_id, access)
+    object_key = sectioned_artifact_object_key(target["asset_id"])
+    container = None
+    if target["extraction_status"] == "success":
+        try:
+            return list(_read_artifact_section(storage, object_key, key, level_of_detail))
+        except (ArtifactFormatError, KeyError) as exc:
+            log.warning("model_viewer.model_data.artifact_unreadable", file_id=str(file_id), error=str(exc))
+            container = _backfill_container(storage, file_id, target)
+        except Exception as exc:
+            if not _is_missing_object(exc):
+                raise _transient_error(file_id, exc) from exc
+            log.info("model_viewer.model_data.artifact_missing", file_id=str(file_id), object_key=object_key)
+            container = _backfill_container(storage, file_id, target)
+    if container is None:
+        container = _reextract(storage, access, file_id, target)[object_key]
+    return list(decode_section(parse_artifact_index(container), key, container, level_of_detail=level_of_detail))
+
+
+def _backfill_container(storage: AssetStorage, file_id: UUID, target: dict[str, Any]) -> bytes | None:
+    """Rebuild the sectioned container from the gzip JSON artifact.
+
+    Returns None when the JSON artifact is missing too (the caller
+    re-extracts). The rebuilt container is persisted best-effort: failing
+    to write it only means the next read rebuilds it again.
+    """
+    json_key = model_data_object_key(target["asset_id"])
+    try:
+        payload = json.loads(gzip.decompress(storage.get_object(json_key)))
+    except Exception as exc:
+        if _is_missing_object(exc):
+            log.info("model_viewer.model_data.artifact_missing", file_id=str(file_id), object_key=json_key)
+            return None
+        raise _transient_error(file_id, exc) from exc
+    container = encode_artifact(payload, lod_triangle_budget=settings.model_data_lod_triangle_budget)
+    try:
+        storage.put_object(sectioned_artifact_object_key(target["asset_id"]), container, ARTIFACT_MEDIA_TYPE)
+    except Exception as exc:
+        log.warning("model_viewer.model_data.backfill_failed", file_id=str(file_id), error=str(exc))
+    else:
+        log.info("model_viewer.model_data.container_backfilled", file_id=str(file_id), bytes=len(container))
+    return container
 
 
-def _load_artifact(file_id: UUID, access: ProjectAccess, storage: AssetStorage) -> bytes:
+def _is_missing_object(exc: Exception) -> bool:
+    """True for the object store's 404, the only failure that warrants re-extraction."""
+    if not isinstance(exc, ClientError):
+        return False
+    return str(exc.response.get("Error", {}).get("Code", "")) in {"404", "NoSuchKey", "NotFound"}
+
+
+def _read_artifact_section(storage: AssetStorage, object_key: str, key: str, level_of_detail: bool) -> Any:
+    head = storage.get_object_prefix(object_key, (0, HEADER_PREFETCH_BYTES - 1))
+    head_length = artifact_head_length(head)
+    if len(head) < head_length:
+        head = storage.get_object_prefix(object_key, (0, head_length - 1))
+    index = parse_artifact_index(head)
+    start, end = index.span(key, level_of_detail=level_of_detail)
+    if end < len(head):
+        return decode_section(index, key, head, level_of_detail=level_of_detail)
+    data = storage.get_object_prefix(object_key, (start, end))
+    return decode_section(index, key, data, start, level_of_detail=level_of_detail)
+
+
+def _accepts_sectioned_artifact(accept: str | None) -> bool:
+    """True when `Accept` names the container media type with a non-zero q."""
+    for media_range in (accept or "").split(","):
+        media_type, _, params = media_range.partition(";")
+        if media_type.strip().lower() != ARTIFACT_MEDIA_TYPE:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+def _extraction_target(file_id: UUID, access: ProjectAccess) -> dict[str, Any]:
     with connection() as conn:
         target = repository.get_extraction_target(conn, access.project_id, file_id)
     if target is None:
         raise api_error(status.HTTP_404_NOT_FOUND, "hbjson_file_not_found", "HBJSON file not found.")
     if target["extraction_status"] == "failed":
         raise _permanent_error(target["extraction_error"])
+    return target
+
 
+def _load_artifact(
+    file_id: UUID,
+    access: ProjectAccess,
+    storage: AssetStorage,
+    object_key: Callable[[str], str],
+) -> bytes:
+    target = _extraction_target(file_id, access)
     if target["extraction_status"] == "success":
         try:
-            return storage.get_object(model_data_object_key(target["asset_id"]))
+            return storage.get_object(object_key(target["asset_id"]))
         except Exception as exc:
+            if not _is_missing_object(exc):
+                raise _transient_error(file_id, exc) from exc
             log.warning("model_viewer.model_data.artifact_missing", file_id=str(file_id), error=str(exc))
+    return _reextract(storage, access, file_id, target)[object_key(target["asset_id"])]
+
 
+def _reextract(storage: AssetStorage, access: ProjectAccess, file_id: UUID, target: dict[str, Any]) -> dict[str, bytes]:
+    """Synchronous self-healing extraction, with D-16's error mapping."""
     try:
-        return _extract_and_persist(storage, access.project_id, file_id, target["asset_id"], target["object_key"])
+        return _extract_and_persist(storage, access.project_id, file_id, target)
     except ModelParseError as exc:
         raise _permanent_error(str(exc)) from exc
     except HTTPException:
         raise
     except Exception as exc:
-        log.warning("model_viewer.model_data.transient_failure", file_id=str(file_id), error=str(exc))
-        raise api_error(
-            status.HTTP_503_SERVICE_UNAVAILABLE,
-            "model_data_unavailable",
-            "Model data is temporarily unavailable. Try again.",
-            {"kind": "transient"},
-        ) from exc
+        raise _transient_error(file_id, exc) from exc
 
 
 def _extract_and_persist(
-    storage: AssetStorage,
-    project_id: UUID,
-    file_id: UUID,
-    asset_id: str,
-    object_key: str,
-) -> bytes:
-    """The single extraction pass (D-15): summary columns + R2 artifact.
+    storage: AssetStorage, project_id: UUID, file_id: UUID, target: dict[str, Any]
+) -> dict[str, bytes]:
+    """The single extraction pass (D-15): summary columns + R2 artifacts.
 
-    Raises `ModelParseError` after marking the row 'failed' (permanent);
-    any other exception is transient and leaves the row untouched.
+    The parse runs in the extraction worker pool, once per content hash
+    however many callers race on it (:mod:`extraction_jobs`). Returns the
+    artifacts it wrote, keyed by object key. Raises `ModelParseError` after
+    marking the row 'failed' (permanent); any other exception is transient
+    and leaves the row untouched.
     """
-    raw = storage.get_object(object_key)
     try:
-        try:
-            hbjson = json.loads(raw)
-        except ValueError as exc:
-            raise ModelParseError(f"Invalid JSON: {exc}") from exc
-        model = parse_hb_model(hbjson)
+        extracted = run_extraction(target["content_hash_sha256"], lambda: storage.get_object(target["object_key"]))
     except ModelParseError as exc:
         with transaction() as conn:
             repository.set_extraction_failed(conn, project_id, file_id, error=str(exc))
         log.warning("model_viewer.extraction.parse_failed", file_id=str(file_id), error=str(exc))
         raise
 
-    data = extract_model_data(model)
-    summary = extract_geometry_summary(model)
-    # by_alias keeps V1's wire names (`properties.ph._v_sup` etc.);
-    # mtime=0 keeps the gzip bytes — and therefore the ETag — deterministic.
-    payload = json.dumps(data.model_dump(mode="json", by_alias=True), separators=(",", ":"))
-    artifact = gzip.compress(payload.encode(), mtime=0)
-    storage.put_object(model_data_object_key(asset_id), artifact, "application/json")
+    asset_id = target["asset_id"]
+    artifacts = {
+        model_data_object_key(asset_id): extracted.json_artifact,
+        sectioned_artifact_object_key(asset_id): extracted.sectioned_artifact,
+    }
+    storage.put_object(model_data_object_key(asset_id), extracted.json_artifact, "application/json")
+    storage.put_object(sectioned_artifact_object_key(asset_id), extracted.sectioned_artifact, ARTIFACT_MEDIA_TYPE)
     with transaction() as conn:
         repository.set_extraction_success(
             conn,
             project_id,
             file_id,
-            volume_m3=summary.volume_m3,
-            envelope_area_m2=summary.envelope_area_m2,
-            floor_area_m2=summary.floor_area_m2,
+            volume_m3=extracted.summary.volume_m3,
+            envelope_area_m2=extracted.summary.envelope_area_m2,
+            floor_area_m2=extracted.summary.floor_area_m2,
         )
     log.info(
         "model_viewer.extraction.succeeded",
         file_id=str(file_id),
-        faces=data.load_summary.faces_extracted,
-        spaces=data.load_summary.spaces_extracted,
-        air_boundaries_skipped=data.load_summary.air_boundaries_skipped,
+        faces=extracted.faces_extracted,
+        spaces=extracted.spaces_extracted,
+        air_boundaries_skipped=extracted.air_boundaries_skipped,
+    )
+    return artifacts
+
+
+def _transient_error(file_id: UUID, exc: Exception) -> HTTPException:
+    log.warning("model_viewer.model_data.transient_failure", file_id=str(file_id), error=str(exc))
+    return api_error(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "model_data_unavailable",
+        "Model data is temporarily unavailable. Try again.",
+        {"kind": "transient"},
     )
-    return artifact
 
 
 def _permanent_error(message: str | None) -> HTTPException:
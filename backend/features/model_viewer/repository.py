@@ -203,8 +203,8 @@ def get_extraction_target(conn: Connection[Any], project_id: UUID, file_id: UUID
     """
     return conn.execute(
         """
-        SELECT h.id, h.asset_id, h.extraction_status, h.extraction_error,
-               a.object_key
+        SELECT h.id, h.asset_id, h.content_hash_sha256, h.extraction_status,
+               h.extraction_error, a.object_key
         FROM project_hbjson_files h
         JOIN project_assets a ON a.id = h.asset_id
         WHERE h.project_id = %(project_id)s
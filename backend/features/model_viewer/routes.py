@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Header, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Response
 from fastapi.responses import JSONResponse, RedirectResponse
 from starlette import status
 
@@ -38,6 +38,8 @@ router = APIRouter(prefix="/api/v1/projects/{project_id}/hbjson-files", tags=["m
 ProjectViewAccess = Annotated[ProjectAccess, Depends(require_project_view_access)]
 ProjectEditAccess = Annotated[ProjectAccess, Depends(require_project_edit_access)]
 AssetServiceDep = Annotated[AssetService, Depends(get_asset_service)]
+# `?lod=true`: decimated meshes where the artifact has them (overview renders).
+LevelOfDetailQuery = Annotated[bool, Query()]
 
 
 @router.get("", response_model=HbjsonFileListResponse)
@@ -86,25 +88,33 @@ def get_model_data(
     access: ProjectViewAccess,
     service: AssetServiceDep,
     if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
 ) -> Response:
-    """The viewer's only data call: the precomputed gzip'd artifact (D-15)."""
-    return model_data.serve_model_data(file_id, access, service.r2, if_none_match)
+    """The viewer's only data call: the precomputed artifact (D-15), gzip
+    JSON or the sectioned container depending on `Accept`."""
+    return model_data.serve_model_data(file_id, access, service.r2, if_none_match, accept)
 
 
-def _subset_route(file_id: UUID, access: ProjectAccess, service: AssetService, key: str) -> JSONResponse:
+def _subset_route(
+    file_id: UUID, access: ProjectAccess, service: AssetService, key: str, lod: bool = False
+) -> JSONResponse:
     # Raw JSON passthrough by design: the artifact was schema-shaped when
     # written; re-validating thousands of faces would undo D-15.
-    return JSONResponse(model_data.read_model_data_subset(file_id, access, service.r2, key))
+    return JSONResponse(model_data.read_model_data_subset(file_id, access, service.r2, key, level_of_detail=lod))
 
 
 @router.get("/{file_id}/faces")
-def get_faces(file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep) -> JSONResponse:
-    return _subset_route(file_id, access, service, "faces")
+def get_faces(
+    file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep, lod: LevelOfDetailQuery = False
+) -> JSONResponse:
+    return _subset_route(file_id, access, service, "faces", lod)
 
 
 @router.get("/{file_id}/spaces")
-def get_spaces(file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep) -> JSONResponse:
-    return _subset_route(file_id, access, service, "spaces")
+def get_spaces(
+    file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep, lod: LevelOfDetailQuery = False
+) -> JSONResponse:
+    return _subset_route(file_id, access, service, "spaces", lod)
 
 
 @router.get("/{file_id}/ventilation_systems")
@@ -118,5 +128,7 @@ def get_hot_water_systems(file_id: UUID, access: ProjectViewAccess, service: Ass
 
 
 @router.get("/{file_id}/shading_elements")
-def get_shading_elements(file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep) -> JSONResponse:
-    return _subset_route(file_id, access, service, "shading_elements")
+def get_shading_elements(
+    file_id: UUID, access: ProjectViewAccess, service: AssetServiceDep, lod: LevelOfDetailQuery = False
+) -> JSONResponse:
+    return _subset_route(file_id, access, service, "shading_elements", lod)
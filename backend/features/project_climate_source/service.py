@@ -42,6 +42,7 @@ from features.climate.proximity import (
     elevation_delta_ft,
 )
 from features.climate.record import ClimateRecord
+from features.climate.spatial_index import nearest_dataset_locations
 from features.climate.weather_source import build_weather_source_from_upload, build_weather_source_payload
 from features.project_climate_source import repository
 from features.project_climate_source.models import (
@@ -182,7 +183,7 @@ def get_project_dataset_roster(
             return ClimateDatasetRosterResponse(dataset=None, project=site, items=[], total=0)
 
         if near:
-            rows = climate_repository.nearest_locations(
+            rows = nearest_dataset_locations(
                 conn, dataset["id"], latitude=site.latitude, longitude=site.longitude, limit=limit
             )
             total = len(rows)
@@ -0,0 +1,178 @@
+"""Process-wide LRU of validated project documents.
+
+Every saved-version and draft read used to re-run ``upgrade_project_document``
+plus full ``ProjectDocumentV1`` validation on the JSONB body, even when a
+sibling request parsed the same body milliseconds earlier. On large projects
+that parse is the dominant cost of every GET and of the write spine's basis
+load, so the parsed model is kept here between requests.
+
+Keys are content stamps the caller can read without fetching the body:
+``(version_id, body_revision)`` for saved versions and ``(version_id, user_id,
+draft_etag, body_revision)`` for drafts. ``body_revision`` is re-drawn from a
+shared sequence by a trigger on every ``body`` write, so a changed body can
+never be served from a stale entry; the repository's ``invalidate_*`` calls
+only release memory early. An invalidation racing a reader that re-inserts an
+older revision is therefore harmless — the entry is unreachable and ages out.
+
+Cached documents are shared across threads. Callers must treat them as
+immutable, which the write spine already requires (it detects no-ops by
+comparing the mutation result against the unmodified basis); mutations work on
+``model_copy(deep=True)`` copies or build new models.
+
+The byte budget is accounted in serialized JSON bytes, not Python heap size;
+the live object graph is a small multiple of that. An entry that also carries
+its section-by-section serialization (see ``validation.serialize_document``)
+is charged twice, since the fragments hold a second copy of the text.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from config import settings
+from features.project_document.document import ProjectDocumentV1
+from features.project_document.validation import SerializedProjectDocument
+
+SavedDocumentKey = tuple[UUID, int]
+DraftDocumentKey = tuple[UUID, UUID, str, int]
+DocumentCacheKey = SavedDocumentKey | DraftDocumentKey
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    """A validated body plus the facts derived from it while it was parsed.
+
+    ``etag`` is the content ETag for saved versions (so reads skip the
+    re-serialization ``document_etag`` costs) and the row's draft ETag for
+    drafts, which is already part of the key. ``serialized`` is present when
+    the body was serialized on its way into the cache (a write, or an ETag
+    backfill); the next write against this basis reuses its unchanged sections.
+    """
+
+    document: ProjectDocumentV1
+    size_bytes: int
+    etag: str
+    serialized: SerializedProjectDocument | None = None
+
+    @property
+    def cost_bytes(self) -> int:
+        return self.size_bytes * 2 if self.serialized is not None else self.size_bytes
+
+
+class _DocumentCache:
+    """Byte-bounded LRU guarded by one lock; requests run on a threadpool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[DocumentCacheKey, CachedDocument] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: DocumentCacheKey) -> CachedDocument | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: DocumentCacheKey, entry: CachedDocument, max_bytes: int) -> None:
+        # A body larger than the whole budget would evict everything and then
+        # itself; skip it rather than thrash.
+        if entry.cost_bytes > max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.cost_bytes
+            self._entries[key] = entry
+            self._bytes += entry.cost_bytes
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.cost_bytes
+                self.evictions += 1
+
+    def discard(self, version_id: UUID, user_id: UUID | None, *, drafts: bool) -> None:
+        with self._lock:
+            doomed = [key for key in self._entries if _matches(key, version_id, user_id, drafts=drafts)]
+            for key in doomed:
+                self._bytes -= self._entries.pop(key).cost_bytes
+
+    def stats(self, max_bytes: int) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": max_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+def _matches(key: DocumentCacheKey, version_id: UUID, user_id: UUID | None, *, drafts: bool) -> bool:
+    if key[0] != version_id:
+        return False
+    if len(key) == 2:
+        return not drafts
+    return drafts and (user_id is None or key[1] == user_id)
+
+
+_CACHE = _DocumentCache()
+
+
+def saved_document_key(version_id: UUID, body_revision: int) -> SavedDocumentKey:
+    return (version_id, int(body_revision))
+
+
+def draft_document_key(version_id: UUID, user_id: UUID, draft_etag: str, body_revision: int) -> DraftDocumentKey:
+    return (version_id, user_id, draft_etag, int(body_revision))
+
+
+def document_cache_get(key: DocumentCacheKey) -> CachedDocument | None:
+    if settings.project_document_cache_max_bytes <= 0:
+        return None
+    return _CACHE.get(key)
+
+
+def document_cache_put(key: DocumentCacheKey, entry: CachedDocument) -> None:
+    if settings.project_document_cache_max_bytes <= 0:
+        return
+    _CACHE.put(key, entry, settings.project_document_cache_max_bytes)
+
+
+def invalidate_saved_document(version_id: UUID) -> None:
+    """Drop every cached revision of a saved version (it was rewritten or deleted)."""
+
+    _CACHE.discard(version_id, None, drafts=False)
+
+
+def invalidate_draft_document(version_id: UUID, user_id: UUID | None = None) -> None:
+    """Drop cached drafts of a version — one user's, or all when ``user_id`` is None."""
+
+    _CACHE.discard(version_id, user_id, drafts=True)
+
+
+def document_cache_stats() -> dict[str, int]:
+    """Return hit/miss/eviction counters and byte usage for readiness output."""
+
+    return _CACHE.stats(settings.project_document_cache_max_bytes)
+
+
+def reset_document_cache() -> None:
+    """Clear entries and counters (tests and explicit operational resets)."""
+
+    _CACHE.clear()
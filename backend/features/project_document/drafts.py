@@ -13,10 +13,13 @@ from pydantic import BaseModel
 from starlette import status
 
 from database import transaction
+from features.assets.reference_index import index_body_references
 from features.assets.reference_validation import validate_document_asset_references
+from features.catalogs.option_usage_index import index_body_option_usage
 from features.project_document import repository
 from features.project_document.audit import log_document_action
 from features.project_document.document import ProjectDocumentV1
+from features.project_document.document_cache import CachedDocument
 from features.project_document.models import (
     AUTO_LOCKED_VERSION_KINDS,
     DiscardDraftResponse,
@@ -27,7 +30,12 @@ from features.project_document.schema_mutations import (
     AUDIT_KIND_BY_MUTATION,
     FieldSchemaMutation,
 )
-from features.project_document.store import raise_project_version_not_found
+from features.project_document.store import (
+    DocumentLoad,
+    load_draft_document,
+    load_saved_document,
+    raise_project_version_not_found,
+)
 from features.project_document.tables import get_table_contract
 from features.project_document.tables.contracts import (
     CascadePreviewRef,
@@ -36,12 +44,11 @@ from features.project_document.tables.contracts import (
 )
 from features.project_document.tables.dependent_links import preview_dependent_link_cascade
 from features.project_document.validation import (
-    document_etag,
     enforce_document_body_size,
-    validate_document,
+    raise_invalid_project_document,
 )
 from features.project_document.versions import raise_version_name_taken
-from features.project_document.write_metrics import DocumentWriteMetrics
+from features.project_document.write_metrics import DocumentWriteMetrics, active_write_metrics
 from features.project_document.write_spine import apply_document_write, load_draft_context
 from features.projects.access import ProjectAccess, require_editor_user
 from features.projects.service import version_public
@@ -74,7 +81,7 @@ def replace_table_slice(
         validate_asset_references=True,
         metrics=metrics,
     )
-    with metrics.measure("response_build_ms"):
+    with metrics.measure("response_build_ms"), active_write_metrics(metrics):
         response = contract.build_response(
             access.project_id,
             version_id,
@@ -240,7 +247,7 @@ def save_draft(
             conn,
             access.project_id,
             version_id,
-            include_body=True,
+            include_body=False,
         )
         if project is None:
             raise_project_version_not_found()
@@ -253,8 +260,7 @@ def save_draft(
                 "Locked versions cannot be saved.",
             )
 
-        version_body = validate_document(version["body"])
-        version_etag = document_etag(version_body)
+        version_etag = _parsed_or_raise(load_saved_document(conn, access.project_id, version)).etag
         if if_match != version_etag:
             raise api_error(
                 status.HTTP_409_CONFLICT,
@@ -263,13 +269,16 @@ def save_draft(
                 {"expected": version_etag},
             )
 
-        draft = repository.get_draft_for_update(conn, version_id, user.id)
+        draft = repository.get_draft_stamp_for_update(conn, version_id, user.id)
         if draft is None:
             raise api_error(status.HTTP_409_CONFLICT, "draft_not_found", "No draft exists to save.")
 
-        draft_body = validate_document(draft["body"])
+        draft_load = _parsed_or_raise(load_draft_document(conn, draft))
+        draft_body = draft_load.document
         validate_document_asset_references(conn, project_id=access.project_id, body=draft_body)
-        serialized_draft = enforce_document_body_size(draft_body)
+        # A draft last written through the write spine is cached with its
+        # serialization, so Save persists it without serializing again.
+        serialized_draft = enforce_document_body_size(draft_body, draft_load.serialized)
         saved_row = repository.save_draft_to_version(
             conn,
             access.project_id,
@@ -279,6 +288,8 @@ def save_draft(
             serialized_draft.size_bytes,
             serialized_body=serialized_draft,
         )
+        index_body_references(conn, version_id=version_id, draft_user_id=None, body=draft_body)
+        index_body_option_usage(conn, version_id=version_id, draft_user_id=None, body=draft_body)
         repository.delete_draft(conn, version_id, user.id)
         log_document_action(
             conn,
@@ -320,17 +331,18 @@ def save_draft_as(
                 conn,
                 access.project_id,
                 version_id,
-                include_body=True,
+                include_body=False,
             )
             if project is None:
                 raise_project_version_not_found()
             if version is None:
                 raise_project_version_not_found()
-            version_body = validate_document(version["body"])
-            draft = repository.get_draft_for_update(conn, version_id, user.id)
-            source_body = validate_document(draft["body"]) if draft is not None else version_body
+            version_load = _parsed_or_raise(load_saved_document(conn, access.project_id, version))
+            draft = repository.get_draft_stamp_for_update(conn, version_id, user.id)
+            source = _parsed_or_raise(load_draft_document(conn, draft)) if draft is not None else version_load
+            source_body = source.document
             validate_document_asset_references(conn, project_id=access.project_id, body=source_body)
-            serialized_source = enforce_document_body_size(source_body)
+            serialized_source = enforce_document_body_size(source_body, source.serialized)
             saved_row = repository.insert_version_from_body(
                 conn,
                 access.project_id,
@@ -343,6 +355,8 @@ def save_draft_as(
                 serialized_source.size_bytes,
                 serialized_body=serialized_source,
             )
+            index_body_references(conn, version_id=saved_row["id"], draft_user_id=None, body=source_body)
+            index_body_option_usage(conn, version_id=saved_row["id"], draft_user_id=None, body=source_body)
             repository.delete_draft(conn, version_id, user.id)
             log_document_action(
                 conn,
@@ -368,3 +382,9 @@ def discard_draft(version_id: UUID, access: ProjectAccess) -> DiscardDraftRespon
     with transaction() as conn:
         discarded = repository.delete_draft(conn, version_id, user.id)
     return DiscardDraftResponse(project_id=access.project_id, version_id=version_id, discarded=discarded)
+
+
+def _parsed_or_raise(load: DocumentLoad) -> CachedDocument:
+    if load.parsed is None:
+        raise_invalid_project_document(load.errors)
+    return load.parsed
@@ -31,6 +31,7 @@ from features.project_document.formula.ast_nodes import (
     ast_to_json,
 )
 from features.project_document.formula.document_evaluator import (
+    bind_document_etag,
     evaluate_table_formulas,
     overlay_cell_value,
     reset_formula_overlay_cache,
@@ -102,6 +103,7 @@ __all__ = [
     "UnaryOp",
     "ast_from_json",
     "ast_to_json",
+    "bind_document_etag",
     "build_field_registry",
     "count_ast_nodes",
     "detect_cycles",
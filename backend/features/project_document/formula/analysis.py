@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from features.project_document.formula.ast_nodes import (
     BinaryOp,
     FieldAccess,
@@ -14,7 +16,36 @@ from features.project_document.formula.ast_nodes import (
     UnaryOp,
 )
 
-__all__ = ["count_ast_nodes", "infer_result_type"]
+__all__ = [
+    "FormulaInputs",
+    "LinkedInput",
+    "collect_formula_inputs",
+    "count_ast_nodes",
+    "infer_result_type",
+    "is_vectorizable",
+]
+
+_ARITHMETIC_OPS = frozenset({"+", "-", "*", "/", "%"})
+
+
+@dataclass(frozen=True, slots=True)
+class LinkedInput:
+    """One linked row set a formula reads, and which fields it reads from it.
+
+    ``field_keys`` is empty when only the set's membership matters
+    (``count(linked(...))``).
+    """
+
+    rows: LinkedRef | LinkedFromRef
+    field_keys: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class FormulaInputs:
+    """Everything a stored AST reads when evaluated for one row."""
+
+    field_keys: frozenset[str]
+    links: tuple[LinkedInput, ...]
 
 
 def count_ast_nodes(node: object) -> int:
@@ -35,6 +66,73 @@ def count_ast_nodes(node: object) -> int:
     return 1
 
 
+def collect_formula_inputs(node: object) -> FormulaInputs:
+    """Collect same-row field keys and linked row sets read by `node`.
+
+    Unlike `resolver.collect_field_refs`, this reads the stored `field_id`s the
+    evaluator will actually look up, and keeps `FieldAccess` keys with the row
+    set they are read from.
+    """
+    field_keys: set[str] = set()
+    links: dict[LinkedRef | LinkedFromRef, set[str]] = {}
+
+    def walk(child: object) -> None:
+        if isinstance(child, FieldRef):
+            if child.field_id is not None:
+                field_keys.add(child.field_id)
+        elif isinstance(child, (LinkedRef, LinkedFromRef)):
+            links.setdefault(child, set())
+        elif isinstance(child, FieldAccess):
+            walk(child.target)
+            if isinstance(child.target, (LinkedRef, LinkedFromRef)):
+                links[child.target].add(child.field_key)
+        elif isinstance(child, UnaryOp):
+            walk(child.operand)
+        elif isinstance(child, BinaryOp):
+            walk(child.left)
+            walk(child.right)
+        elif isinstance(child, IfExpr):
+            walk(child.condition)
+            walk(child.then_branch)
+            walk(child.else_branch)
+        elif isinstance(child, FuncCall):
+            for arg in child.args:
+                walk(arg)
+
+    walk(node)
+    return FormulaInputs(
+        field_keys=frozenset(field_keys),
+        links=tuple(LinkedInput(rows=rows, field_keys=frozenset(keys)) for rows, keys in links.items()),
+    )
+
+
+def is_vectorizable(node: object) -> bool:
+    """True when `node` is same-row numeric arithmetic a whole column can be
+    evaluated from float arrays (`vectorized.py`).
+
+    The root must produce a number — arithmetic, unary minus, or `number()` —
+    so the result never passes a raw field value through. Operands are field
+    refs, numeric or null literals, and further numeric nodes; anything
+    reading text, booleans, branches, or links stays on the scalar path.
+    """
+    return _is_numeric_node(node) and not isinstance(node, (FieldRef, Literal_))
+
+
+def _is_numeric_node(node: object) -> bool:
+    if isinstance(node, FieldRef):
+        return node.field_id is not None
+    if isinstance(node, Literal_):
+        value = node.value
+        return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+    if isinstance(node, UnaryOp):
+        return node.op == "-" and _is_numeric_node(node.operand)
+    if isinstance(node, BinaryOp):
+        return node.op in _ARITHMETIC_OPS and _is_numeric_node(node.left) and _is_numeric_node(node.right)
+    if isinstance(node, FuncCall):
+        return node.name == "number" and len(node.args) == 1 and _is_numeric_node(node.args[0])
+    return False
+
+
 def infer_result_type(node: object) -> str:
     """Best-effort static result type used for downstream filter operators."""
     if isinstance(node, Literal_):
@@ -0,0 +1,482 @@
+"""Compile resolved formula ASTs into nested Python closures.
+
+The tree-walking interpreter in `evaluator.py` re-dispatches on node type
+(an `isinstance` chain) and re-bumps the fuse for every node of every row.
+Tables evaluate the same handful of formulas across thousands of rows, so
+each AST is compiled once into a closure per node — dispatch happens at
+compile time — and the compiled form is cached process-wide. Stored
+formulas are keyed by their canonical JSON plus a fingerprint of the
+table's field registry (compilation bakes in which keys are formulas);
+`evaluate` callers pass AST objects, which are keyed by identity.
+
+Semantics are the interpreter's, branch for branch: the corpus parity test
+runs every case through both. Two variants are compiled per formula:
+
+* ``run_counted`` bumps ``env.fuse`` before every node exactly like the
+  interpreter, so a shared or nearly spent fuse trips at the same node.
+* ``run`` skips the bookkeeping. No node is evaluated more than once per
+  evaluation (the grammar has no loops), so a fresh fuse whose budget is at
+  least ``node_count`` cannot trip; callers pick ``run`` only then.
+
+The gain is modest: about 1.5x over the interpreter per row (see
+``tests/test_formula_compiler_perf.py``). Most of what remains is value
+coercion and formatting (`_to_number`, `_to_text`, string functions) that
+both paths share, so per-row compilation cannot reach an order of
+magnitude. Whole-column speedups for same-row arithmetic come from the
+vectorized path (``CompiledFormula.vectorized``).
+
+Environments are duck-typed: ``fuse`` plus ``row_accessor`` for single-row
+evaluation, or ``formula_value`` / ``stored_value`` / ``linked_rows`` /
+``field_values`` for document evaluation (see `document_evaluator.py`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from features.project_document.formula.analysis import FormulaInputs, collect_formula_inputs, count_ast_nodes
+from features.project_document.formula.ast_nodes import (
+    BinaryOp,
+    FieldAccess,
+    FieldRef,
+    FormulaAST,
+    FuncCall,
+    IfExpr,
+    LinkedFromRef,
+    LinkedRef,
+    Literal_,
+    UnaryOp,
+    ast_from_json,
+)
+from features.project_document.formula.evaluator import (
+    _coerce_string_arg,
+    _compare,
+    _eq,
+    _EvalErrorSignal,
+    _fmod,
+    _substring,
+    _to_concat_text,
+    _to_number,
+    _to_text,
+    _truthy,
+)
+from features.project_document.formula.vectorized import VectorizedFormula, vectorize_formula
+
+CompileMode = Literal["row", "document"]
+Evaluator = Callable[[Any], object]
+
+# Distinct (formula, registry) pairs kept compiled. Each entry is a few
+# closures per AST node; stored ASTs are capped at AST_NODE_COUNT_MAX nodes.
+COMPILED_FORMULA_CACHE_MAX_ENTRIES = 2048
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledFormula:
+    run: Evaluator
+    run_counted: Evaluator
+    node_count: int
+    # What one evaluation reads; incremental recomputation diffs only these.
+    inputs: FormulaInputs
+    # Whole-column form for same-row arithmetic; None when it must run per row.
+    vectorized: VectorizedFormula | None
+
+
+_cache_lock = threading.Lock()
+# Values pair the compiled form with the object its key was derived from:
+# row-mode keys use `id(ast)`, and holding the AST keeps that id from being
+# recycled while the entry lives (the identity check on read rejects any
+# collision). AST equality is not a usable key — the frozen dataclasses
+# compare `True == 1.0`. Document-mode keys are canonical text, anchor None.
+_compiled_by_key: OrderedDict[tuple[object, ...], tuple[object, CompiledFormula]] = OrderedDict()
+
+
+def compile_formula(ast: FormulaAST) -> CompiledFormula:
+    """Compile an AST for single-row evaluation (`evaluator.evaluate`)."""
+    return _cached(("row", id(ast)), ast, lambda: _compile_formula(ast, "row", frozenset()))
+
+
+def compile_stored_formula(
+    ast_payload: object,
+    *,
+    registry_fingerprint: str,
+    formula_field_keys: frozenset[str],
+) -> CompiledFormula:
+    """Compile a stored `config["ast"]` payload for document evaluation.
+
+    Raises ``ValueError``/``TypeError`` for a malformed payload, like
+    `ast_from_json`. ``formula_field_keys`` must be the formula fields of the
+    registry ``registry_fingerprint`` was computed from.
+    """
+    canonical = json.dumps(ast_payload, sort_keys=True, separators=(",", ":"))
+    return _cached(
+        ("document", canonical, registry_fingerprint),
+        None,
+        lambda: _compile_formula(ast_from_json(ast_payload), "document", formula_field_keys),
+    )
+
+
+def registry_fingerprint(fields: Iterable[tuple[str, str]]) -> str:
+    """Fingerprint a table's `(field_key, field_type)` pairs for the code cache."""
+    return hashlib.sha256("\n".join(sorted(f"{key}:{kind}" for key, kind in fields)).encode("utf-8")).hexdigest()
+
+
+def compiled_formula_cache_size() -> int:
+    with _cache_lock:
+        return len(_compiled_by_key)
+
+
+def reset_compiled_formula_cache() -> None:
+    with _cache_lock:
+        _compiled_by_key.clear()
+
+
+def _cached(key: tuple[object, ...], anchor: object, build: Callable[[], CompiledFormula]) -> CompiledFormula:
+    with _cache_lock:
+        entry = _compiled_by_key.get(key)
+        if entry is not None and entry[0] is anchor:
+            _compiled_by_key.move_to_end(key)
+            return entry[1]
+    compiled = build()
+    with _cache_lock:
+        _compiled_by_key[key] = (anchor, compiled)
+        _compiled_by_key.move_to_end(key)
+        while len(_compiled_by_key) > COMPILED_FORMULA_CACHE_MAX_ENTRIES:
+            _compiled_by_key.popitem(last=False)
+    return compiled
+
+
+def _compile_formula(ast: FormulaAST, mode: CompileMode, formula_field_keys: frozenset[str]) -> CompiledFormula:
+    return CompiledFormula(
+        run=_Compiler(mode, formula_field_keys, counted=False).compile(ast),
+        run_counted=_Compiler(mode, formula_field_keys, counted=True).compile(ast),
+        node_count=count_ast_nodes(ast),
+        inputs=collect_formula_inputs(ast),
+        vectorized=vectorize_formula(ast),
+    )
+
+
+# --------------------------------------------------------------------------
+# Compiler
+# --------------------------------------------------------------------------
+
+
+class _Compiler:
+    def __init__(self, mode: CompileMode, formula_field_keys: frozenset[str], *, counted: bool) -> None:
+        self.mode = mode
+        self.formula_field_keys = formula_field_keys
+        self.counted = counted
+
+    def compile(self, node: FormulaAST) -> Evaluator:
+        body = self._compile_node(node)
+        return _with_fuse(body) if self.counted else body
+
+    def _compile_node(self, node: FormulaAST) -> Evaluator:
+        if self.mode == "document":
+            if isinstance(node, (LinkedRef, LinkedFromRef)):
+                return _linked_rows(node)
+            if isinstance(node, FieldAccess):
+                return _field_access(self.compile(node.target), node.field_key)
+        if isinstance(node, Literal_):
+            return _constant(node.value)
+        if isinstance(node, FieldRef):
+            return self._field_ref(node)
+        if isinstance(node, UnaryOp):
+            return _unary(node.op, self.compile(node.operand))
+        if isinstance(node, BinaryOp):
+            return _binary(node.op, self.compile(node.left), self.compile(node.right))
+        if isinstance(node, IfExpr):
+            return _if(self.compile(node.condition), self.compile(node.then_branch), self.compile(node.else_branch))
+        if isinstance(node, FuncCall):
+            return self._call(node)
+        # Row mode has no link context; the interpreter rejects these nodes
+        # without evaluating their children.
+        return _raise("type_mismatch")
+
+    def _field_ref(self, node: FieldRef) -> Evaluator:
+        field_id = node.field_id
+        if field_id is None:
+            return _raise("missing_ref")
+        if self.mode == "row":
+
+            def read_row(env: Any) -> object:
+                return env.row_accessor(field_id)
+
+            return read_row
+        if field_id in self.formula_field_keys:
+
+            def read_formula(env: Any) -> object:
+                return env.formula_value(field_id)
+
+            return read_formula
+
+        def read_stored(env: Any) -> object:
+            return env.stored_value(field_id)
+
+        return read_stored
+
+    def _call(self, node: FuncCall) -> Evaluator:
+        if self.mode == "document" and node.name in ("count", "sum", "avg"):
+            return _aggregate(node.name, self.compile(node.args[0]))
+        args = tuple(self.compile(arg) for arg in node.args)
+        function = _FUNCTIONS.get(node.name, _unknown_function)
+        if len(args) == 1:
+            (only,) = args
+
+            def call_one(env: Any) -> object:
+                return function([only(env)])
+
+            return call_one
+
+        def call(env: Any) -> object:
+            return function([arg(env) for arg in args])
+
+        return call
+
+
+def _with_fuse(inner: Evaluator) -> Evaluator:
+    def counted(env: Any) -> object:
+        fuse = env.fuse
+        fuse.nodes_evaluated += 1
+        if fuse.nodes_evaluated > fuse.max_nodes:
+            raise _EvalErrorSignal("fuse_tripped")
+        return inner(env)
+
+    return counted
+
+
+def _raise(code: Literal["missing_ref", "type_mismatch"]) -> Evaluator:
+    def fail(_env: Any) -> object:
+        raise _EvalErrorSignal(code)
+
+    return fail
+
+
+def _constant(value: object) -> Evaluator:
+    def constant(_env: Any) -> object:
+        return value
+
+    return constant
+
+
+def _finite(value: float) -> float:
+    if math.isfinite(value):
+        return value
+    raise _EvalErrorSignal("type_mismatch")
+
+
+def _number_operand(value: object) -> float:
+    if isinstance(value, float):
+        return value
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise _EvalErrorSignal("type_mismatch")
+    return float(value)
+
+
+# --------------------------------------------------------------------------
+# Operators
+# --------------------------------------------------------------------------
+
+
+def _unary(op: str, operand: Evaluator) -> Evaluator:
+    if op == "-":
+
+        def negate(env: Any) -> object:
+            value = operand(env)
+            if value is None:
+                return None
+            return _finite(-_number_operand(value))
+
+        return negate
+    if op == "not":
+
+        def invert(env: Any) -> object:
+            value = operand(env)
+            if value is None:
+                return None
+            return not _truthy(value)
+
+        return invert
+
+    def unknown(env: Any) -> object:
+        operand(env)
+        raise _EvalErrorSignal("type_mismatch")
+
+    return unknown
+
+
+def _divide(a: float, b: float) -> float:
+    if b == 0.0:
+        raise _EvalErrorSignal("div_by_zero")
+    return a / b
+
+
+def _modulo(a: float, b: float) -> float:
+    if b == 0.0:
+        raise _EvalErrorSignal("div_by_zero")
+    return _fmod(a, b)
+
+
+_ARITHMETIC: dict[str, Callable[[float, float], float]] = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": _divide,
+    "%": _modulo,
+}
+
+
+def _binary(op: str, left: Evaluator, right: Evaluator) -> Evaluator:
+    if op == "and":
+
+        def conjunction(env: Any) -> object:
+            lhs = left(env)
+            if lhs is None:
+                return None
+            if not _truthy(lhs):
+                return False
+            rhs = right(env)
+            return None if rhs is None else _truthy(rhs)
+
+        return conjunction
+    if op == "or":
+
+        def disjunction(env: Any) -> object:
+            lhs = left(env)
+            if lhs is None:
+                return None
+            if _truthy(lhs):
+                return True
+            rhs = right(env)
+            return None if rhs is None else _truthy(rhs)
+
+        return disjunction
+    if op == "=":
+        return lambda env: _eq(left(env), right(env))
+    if op == "!=":
+        return lambda env: not _eq(left(env), right(env))
+    if op == "&":
+        return lambda env: _to_concat_text(left(env)) + _to_concat_text(right(env))
+    arithmetic = _ARITHMETIC.get(op)
+    if arithmetic is not None:
+
+        def apply(env: Any) -> object:
+            lhs = left(env)
+            rhs = right(env)
+            if lhs is None or rhs is None:
+                return None
+            return _finite(arithmetic(_number_operand(lhs), _number_operand(rhs)))
+
+        return apply
+    if op in ("<", "<=", ">", ">="):
+
+        def compare(env: Any) -> object:
+            lhs = left(env)
+            rhs = right(env)
+            if lhs is None or rhs is None:
+                return None
+            return _compare(lhs, rhs, op)
+
+        return compare
+
+    def unknown(env: Any) -> object:
+        lhs = left(env)
+        rhs = right(env)
+        if lhs is None or rhs is None:
+            return None
+        raise _EvalErrorSignal("type_mismatch")
+
+    return unknown
+
+
+def _if(condition: Evaluator, then_branch: Evaluator, else_branch: Evaluator) -> Evaluator:
+    def branch(env: Any) -> object:
+        value = condition(env)
+        if value is None:
+            return None
+        if _truthy(value):
+            return then_branch(env)
+        return else_branch(env)
+
+    return branch
+
+
+# --------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------
+
+
+def _replace(args: list[object]) -> str:
+    haystack = _coerce_string_arg(args[0])
+    needle = _coerce_string_arg(args[1])
+    replacement = _coerce_string_arg(args[2])
+    return haystack if needle == "" else haystack.replace(needle, replacement)
+
+
+def _unknown_function(_args: list[object]) -> object:
+    raise _EvalErrorSignal("type_mismatch")
+
+
+_FUNCTIONS: dict[str, Callable[[list[object]], object]] = {
+    "concat": lambda args: "".join(_coerce_string_arg(arg) for arg in args),
+    "upper": lambda args: _coerce_string_arg(args[0]).upper(),
+    "lower": lambda args: _coerce_string_arg(args[0]).lower(),
+    "trim": lambda args: _coerce_string_arg(args[0]).strip(),
+    "len": lambda args: float(len(_coerce_string_arg(args[0]))),
+    "replace": _replace,
+    "substring": _substring,
+    "number": lambda args: _to_number(args[0]),
+    "text": lambda args: _to_text(args[0]),
+}
+
+
+def _aggregate(name: str, target: Evaluator) -> Evaluator:
+    def aggregate(env: Any) -> object:
+        values = target(env)
+        if not isinstance(values, list):
+            raise _EvalErrorSignal("type_mismatch")
+        if name == "count":
+            return float(len(values))
+        total = 0.0
+        numeric_count = 0
+        for value in values:
+            number = _to_number(value)
+            if number is None:
+                continue
+            total += number
+            numeric_count += 1
+        if name == "sum":
+            return _finite(total)
+        if numeric_count == 0:
+            return None
+        return _finite(total / numeric_count)
+
+    return aggregate
+
+
+# --------------------------------------------------------------------------
+# Document links
+# --------------------------------------------------------------------------
+
+
+def _linked_rows(node: LinkedRef | LinkedFromRef) -> Evaluator:
+    def linked(env: Any) -> object:
+        return env.linked_rows(node)
+
+    return linked
+
+
+def _field_access(target: Evaluator, field_key: str) -> Evaluator:
+    def access(env: Any) -> object:
+        rows = target(env)
+        if not isinstance(rows, list):
+            raise _EvalErrorSignal("type_mismatch")
+        return env.field_values(rows, field_key)
+
+    return access
@@ -1,49 +1,59 @@
-"""Document-graph formula overlays for project document tables."""
+"""Document-graph formula overlays for project document tables.
+
+A cell's value is a function of its inputs only: same-row fields, linked row
+sets, and the fields read from those rows. Overlays are therefore stored per
+document ETag (`overlay_store.py`), and a body derived from a stored one — the
+next draft write — re-evaluates only the cells whose inputs changed, walking
+formula fields in the document's topological order so a dirty upstream
+formula dirties its dependents, across links included.
+"""
 
 from __future__ import annotations
 
+import json
+from collections.abc import Mapping
 from contextvars import ContextVar
 from dataclasses import dataclass
+from dataclasses import field as dataclass_field
 from typing import TYPE_CHECKING
 
 from features.project_document.custom_fields import CustomFieldType
-from features.project_document.formula.ast_nodes import (
-    BinaryOp,
-    FieldAccess,
-    FieldRef,
-    FormulaAST,
-    FuncCall,
-    IfExpr,
-    LinkedFromRef,
-    LinkedRef,
-    Literal_,
-    UnaryOp,
-    ast_from_json,
+from features.project_document.formula.analysis import LinkedInput
+from features.project_document.formula.ast_nodes import LinkedFromRef, LinkedRef
+from features.project_document.formula.compiler import (
+    CompiledFormula,
+    compile_stored_formula,
+    registry_fingerprint,
+)
+from features.project_document.formula.errors import (
+    FormulaCycleError,
+    FormulaMissingRefError,
+    FormulaTargetFieldNotLinkedError,
+    FormulaUnknownTargetTableError,
 )
 from features.project_document.formula.evaluator import (
     OUTPUT_LENGTH_MAX,
+    PER_ROW_FUSE_MAX,
     EvalFuse,
-    _bump_eval_fuse,
-    _coerce_string_arg,
-    _compare,
-    _eq,
     _EvalErrorSignal,
-    _fmod,
-    _guard_finite,
-    _substring,
-    _to_concat_text,
-    _to_number,
-    _to_text,
-    _truthy,
 )
-from features.project_document.formula.resolver import iter_formula_registries
+from features.project_document.formula.overlay_store import (
+    DocumentOverlays,
+    StoredFormulaOverlay,
+    formula_overlay_get,
+    formula_overlay_put,
+)
+from features.project_document.formula.resolver import iter_formula_registries, validate_document_formula_graph
+from features.project_document.formula.vectorized import MISSING_REF, VECTORIZE_MIN_ROWS
 from features.project_document.inverse_view import (
+    InverseLinks,
     build_inverse_links,
     build_snapshot_row_ids,
     row_link_ids_for_field,
     source_link_key,
     target_table_path_for_link_field,
 )
+from features.project_document.write_metrics import record_formula_cells
 
 if TYPE_CHECKING:
     from features.project_document.custom_fields import TableFieldDef
@@ -56,13 +66,35 @@ if TYPE_CHECKING:
 # `body` keeps it alive for the cache's lifetime (the request, reset by
 # middleware) so its id cannot be reused, and the identity check on read rejects
 # any collision that slips through.
-_DOCUMENT_FORMULA_CACHE: ContextVar[
-    dict[int, tuple[ProjectDocumentV1, dict[tuple[str, ...], dict[str, dict[str, object]]]]] | None
-] = ContextVar("document_formula_cache", default=None)
+_DOCUMENT_FORMULA_CACHE: ContextVar[dict[int, tuple[ProjectDocumentV1, DocumentOverlays]] | None] = ContextVar(
+    "document_formula_cache", default=None
+)
+
+# Which ETag names a body in this request, and the ETag of the body it was
+# derived from (for a body a write just produced). Document loaders bind what
+# they read and the write spine binds what it wrote; identity-checked like the
+# cache above.
+_DOCUMENT_ETAGS: ContextVar[dict[int, tuple[ProjectDocumentV1, str, str | None]] | None] = ContextVar(
+    "formula_document_etags", default=None
+)
 
 
 def reset_formula_overlay_cache() -> None:
     _DOCUMENT_FORMULA_CACHE.set({})
+    _DOCUMENT_ETAGS.set({})
+
+
+def bind_document_etag(body: ProjectDocumentV1, etag: str, *, basis_etag: str | None = None) -> None:
+    """Record that ``etag`` names ``body`` for the rest of this request.
+
+    Overlays for a bound body are read from and written to the process-wide
+    store. ``basis_etag`` names the body a write derived ``body`` from; when
+    that body's overlay is stored, only the cells the write touched are
+    re-evaluated. Outside a request this is a no-op.
+    """
+    bindings = _DOCUMENT_ETAGS.get()
+    if bindings is not None:
+        bindings[id(body)] = (body, etag, basis_etag)
 
 
 def overlay_cell_value(cell: object) -> object:
@@ -92,7 +124,7 @@ def evaluate_table_formulas(
     return evaluate_document_formulas(body).get(capability.table_path, {})
 
 
-def evaluate_document_formulas(body: ProjectDocumentV1) -> dict[tuple[str, ...], dict[str, dict[str, object]]]:
+def evaluate_document_formulas(body: ProjectDocumentV1) -> DocumentOverlays:
     """Return computed formula overlays for every formula-capable table."""
     body_key = id(body)
     cache = _DOCUMENT_FORMULA_CACHE.get()
@@ -100,23 +132,78 @@ def evaluate_document_formulas(body: ProjectDocumentV1) -> dict[tuple[str, ...],
         cached = cache.get(body_key)
         if cached is not None and cached[0] is body:
             return cached[1]
+    overlays = _stored_or_evaluated_overlays(body)
+    if cache is not None:
+        cache[body_key] = (body, overlays)
+    return overlays
+
+
+def _stored_or_evaluated_overlays(body: ProjectDocumentV1) -> DocumentOverlays:
+    bindings = _DOCUMENT_ETAGS.get()
+    binding = bindings.get(id(body)) if bindings is not None else None
+    if binding is None or binding[0] is not body:
+        return _evaluate_overlays(body, previous=None).overlays
+    _body, etag, basis_etag = binding
+    stored = formula_overlay_get(etag)
+    if stored is not None:
+        record_formula_cells(recomputed=0, reused=_cell_count(stored.overlays))
+        return stored.overlays
+    previous = formula_overlay_get(basis_etag) if basis_etag is not None else None
+    evaluation = _evaluate_overlays(body, previous)
+    record_formula_cells(recomputed=evaluation.recomputed, reused=evaluation.reused)
+    formula_overlay_put(
+        etag,
+        StoredFormulaOverlay(
+            body=body,
+            overlays=evaluation.overlays,
+            snapshot_row_ids=evaluation.snapshot_row_ids,
+            inverse_links=evaluation.inverse_links,
+        ),
+    )
+    return evaluation.overlays
+
 
+@dataclass(frozen=True, slots=True)
+class _OverlayEvaluation:
+    overlays: DocumentOverlays
+    snapshot_row_ids: dict[tuple[str, ...], frozenset[str]]
+    inverse_links: InverseLinks
+    recomputed: int
+    reused: int
+
+
+def _evaluate_overlays(body: ProjectDocumentV1, previous: StoredFormulaOverlay | None) -> _OverlayEvaluation:
     contexts = _formula_contexts(body)
     if not any(ctx.formula_fields for ctx in contexts.values()):
         empty = {table_path: {row_id: {} for row_id in ctx.rows_by_id} for table_path, ctx in contexts.items()}
-        if cache is not None:
-            cache[body_key] = (body, empty)
-        return empty
-    out: dict[tuple[str, ...], dict[str, dict[str, object]]] = {
-        table_path: {row_id: {} for row_id in ctx.rows_by_id} for table_path, ctx in contexts.items()
+        return _OverlayEvaluation(overlays=empty, snapshot_row_ids={}, inverse_links={}, recomputed=0, reused=0)
+    snapshot_row_ids = build_snapshot_row_ids(body)
+    inverse_links = build_inverse_links(body, snapshot_row_ids=snapshot_row_ids)
+    order = _formula_order(body)
+    reusable = (
+        _reusable_cells(previous, order, contexts, snapshot_row_ids, inverse_links)
+        if previous is not None and order is not None
+        else None
+    )
+    out: DocumentOverlays = {
+        table_path: {
+            row_id: reusable[table_path].get(row_id, {}) if reusable is not None else {} for row_id in ctx.rows_by_id
+        }
+        for table_path, ctx in contexts.items()
     }
     state = _DocumentEvalState(
         contexts=contexts,
-        snapshot_row_ids=build_snapshot_row_ids(body),
-        inverse_links=build_inverse_links(body),
+        snapshot_row_ids=snapshot_row_ids,
+        inverse_links=inverse_links,
         computed=out,
         in_progress=set(),
     )
+    reused = _cell_count(out)
+    if order is not None:
+        # Upstream of everything that reads them, whole columns of same-row
+        # arithmetic first; the per-cell sweep then finds them computed.
+        for table_path, field_key in order:
+            _compute_formula_column(state, table_path, field_key)
     for table_path, ctx in contexts.items():
         for row_id in ctx.rows_by_id:
             for field_key in ctx.formula_fields:
@@ -124,9 +211,23 @@ def evaluate_document_formulas(body: ProjectDocumentV1) -> dict[tuple[str, ...],
                     _compute_formula_cell(state, table_path, row_id, field_key)
                 except _EvalErrorSignal:
                     continue
-    if cache is not None:
-        cache[body_key] = (body, out)
-    return out
+    # Cells land in evaluation order, which depends on what was reused; give
+    # each evaluated row its field-def order so responses do not depend on
+    # history.
+    for table_path, row_id in state.touched_rows:
+        cells = out[table_path][row_id]
+        out[table_path][row_id] = {field_key: cells[field_key] for field_key in contexts[table_path].formula_fields}
+    return _OverlayEvaluation(
+        overlays=out,
+        snapshot_row_ids=snapshot_row_ids,
+        inverse_links=inverse_links,
+        recomputed=state.evaluated,
+        reused=reused,
+    )
+
+
+def _cell_count(overlays: DocumentOverlays) -> int:
+    return sum(len(cells) for rows in overlays.values() for cells in rows.values())
 
 
 def _read_envelope_rows(capability: TableFieldRegistry, body: ProjectDocumentV1) -> list[object]:
@@ -145,7 +246,7 @@ class _FormulaTableContext:
     rows_by_id: dict[str, object]
     field_defs_by_key: dict[str, TableFieldDef]
     formula_fields: dict[str, TableFieldDef]
-    ast_by_key: dict[str, FormulaAST]
+    compiled_by_key: dict[str, CompiledFormula]
     parse_error_keys: set[str]
 
 
@@ -163,6 +264,8 @@ class _DocumentEvalState:
     inverse_links: dict[tuple[str, ...], dict[str, dict[str, list[str]]]]
     computed: dict[tuple[str, ...], dict[str, dict[str, object]]]
     in_progress: set[tuple[tuple[str, ...], str, str]]
+    evaluated: int = 0
+    touched_rows: set[tuple[tuple[str, ...], str]] = dataclass_field(default_factory=set)
 
 
 def _formula_contexts(body: ProjectDocumentV1) -> dict[tuple[str, ...], _FormulaTableContext]:
@@ -173,7 +276,9 @@ def _formula_contexts(body: ProjectDocumentV1) -> dict[tuple[str, ...], _Formula
         field_defs = capability.read_field_defs(body)
         field_defs_by_key = {field.field_key: field for field in field_defs}
         formula_fields = {field.field_key: field for field in field_defs if field.field_type is CustomFieldType.formula}
-        ast_by_key: dict[str, FormulaAST] = {}
+        fingerprint = registry_fingerprint((field.field_key, field.field_type.value) for field in field_defs)
+        formula_keys = frozenset(formula_fields)
+        compiled_by_key: dict[str, CompiledFormula] = {}
         parse_error_keys: set[str] = set()
         for field_key, field in formula_fields.items():
             ast_payload = field.config.get("ast")
@@ -181,7 +286,11 @@ def _formula_contexts(body: ProjectDocumentV1) -> dict[tuple[str, ...], _Formula
                 parse_error_keys.add(field_key)
                 continue
             try:
-                ast_by_key[field_key] = ast_from_json(ast_payload)
+                compiled_by_key[field_key] = compile_stored_formula(
+                    ast_payload,
+                    registry_fingerprint=fingerprint,
+                    formula_field_keys=formula_keys,
+                )
             except (ValueError, TypeError):
                 parse_error_keys.add(field_key)
         contexts[capability.table_path] = _FormulaTableContext(
@@ -189,7 +298,7 @@ def _formula_contexts(body: ProjectDocumentV1) -> dict[tuple[str, ...], _Formula
             rows_by_id=rows_by_id,
             field_defs_by_key=field_defs_by_key,
             formula_fields=formula_fields,
-            ast_by_key=ast_by_key,
+            compiled_by_key=compiled_by_key,
             parse_error_keys=parse_error_keys,
         )
     return contexts
@@ -205,12 +314,21 @@ def _compute_formula_cell(
     row_id: str,
     field_key: str,
 ) -> object:
+    """Return one cell's value, evaluating it on first use.
+
+    An errored cell stores its own code, but a formula reading it always sees
+    `missing_ref` — whether the dependency was evaluated just now or earlier in
+    the sweep. That keeps every cell a function of its inputs, independent of
+    evaluation order, which is what lets stored cells be reused.
+    """
     computed = state.computed.setdefault(table_path, {}).setdefault(row_id, {})
     if field_key in computed:
         stored = computed[field_key]
         if isinstance(stored, dict) and "error" in stored:
             raise _EvalErrorSignal("missing_ref")
         return stored
+    state.evaluated += 1
+    state.touched_rows.add((table_path, row_id))
     cell_key = (table_path, row_id, field_key)
     if cell_key in state.in_progress:
         computed[field_key] = {"error": "missing_ref"}
@@ -219,184 +337,117 @@ def _compute_formula_cell(
     if field_key in ctx.parse_error_keys:
         computed[field_key] = {"error": "missing_ref"}
         raise _EvalErrorSignal("missing_ref")
-    ast = ctx.ast_by_key.get(field_key)
-    if ast is None:
+    compiled = ctx.compiled_by_key.get(field_key)
+    if compiled is None:
         computed[field_key] = {"error": "missing_ref"}
         raise _EvalErrorSignal("missing_ref")
-    row = ctx.rows_by_id[row_id]
+    env = _CellEnv(state, _RowRef(table_path=table_path, row_id=row_id, row=ctx.rows_by_id[row_id]), EvalFuse())
+    # Each cell owns a fresh fuse; one that covers every node cannot trip.
+    run = compiled.run if compiled.node_count <= env.fuse.max_nodes else compiled.run_counted
     state.in_progress.add(cell_key)
     try:
-        value = _eval_doc_node(ast, state, _RowRef(table_path=table_path, row_id=row_id, row=row), EvalFuse())
+        value = run(env)
     except _EvalErrorSignal as exc:
         computed[field_key] = {"error": exc.code}
-        raise
+        raise _EvalErrorSignal("missing_ref") from None
     finally:
         state.in_progress.discard(cell_key)
     if isinstance(value, str) and len(value) > OUTPUT_LENGTH_MAX:
         computed[field_key] = {"error": "output_too_long"}
-        raise _EvalErrorSignal("output_too_long")
+        raise _EvalErrorSignal("missing_ref")
     if not (value is None or isinstance(value, (str, int, float, bool))):
         computed[field_key] = {"error": "type_mismatch"}
-        raise _EvalErrorSignal("type_mismatch")
+        raise _EvalErrorSignal("missing_ref")
     computed[field_key] = value
     return value
 
 
-def _eval_doc_node(node: FormulaAST, state: _DocumentEvalState, current: _RowRef, fuse: EvalFuse) -> object:
-    _bump_eval_fuse(fuse)
-    if isinstance(node, (LinkedRef, LinkedFromRef)):
-        return _resolve_link_rows(node, state, current)
-    if isinstance(node, FieldAccess):
-        target = _eval_doc_node(node.target, state, current, fuse)
-        if not isinstance(target, list):
-            raise _EvalErrorSignal("type_mismatch")
-        row_refs = [item for item in target if isinstance(item, _RowRef)]
-        if len(row_refs) != len(target):
-            raise _EvalErrorSignal("type_mismatch")
-        return [_read_field_value(state, row_ref, node.field_key) for row_ref in row_refs]
-    if isinstance(node, FieldRef):
-        if node.field_id is None:
-            raise _EvalErrorSignal("missing_ref")
-        return _read_field_value(state, current, node.field_id)
-    if isinstance(node, Literal_):
-        return node.value
-    if isinstance(node, UnaryOp):
-        return _eval_doc_unary(node, state, current, fuse)
-    if isinstance(node, BinaryOp):
-        return _eval_doc_binary(node, state, current, fuse)
-    if isinstance(node, IfExpr):
-        cond = _eval_doc_node(node.condition, state, current, fuse)
-        if cond is None:
-            return None
-        branch = node.then_branch if _truthy(cond) else node.else_branch
-        return _eval_doc_node(branch, state, current, fuse)
-    if isinstance(node, FuncCall):
-        return _eval_doc_call(node, state, current, fuse)
-    raise _EvalErrorSignal("type_mismatch")
-
+def _compute_formula_column(state: _DocumentEvalState, table_path: tuple[str, ...], field_key: str) -> None:
+    """Evaluate a vectorizable formula for every row still missing it.
 
-def _eval_doc_unary(node: UnaryOp, state: _DocumentEvalState, current: _RowRef, fuse: EvalFuse) -> object:
-    operand = _eval_doc_node(node.operand, state, current, fuse)
-    if node.op == "-":
-        if operand is None:
-            return None
-        if isinstance(operand, bool) or not isinstance(operand, (int, float)):
-            raise _EvalErrorSignal("type_mismatch")
-        return _guard_finite(-float(operand))
-    if node.op == "not":
-        if operand is None:
-            return None
-        return not _truthy(operand)
-    raise _EvalErrorSignal("type_mismatch")
-
-
-def _eval_doc_binary(node: BinaryOp, state: _DocumentEvalState, current: _RowRef, fuse: EvalFuse) -> object:
-    op = node.op
-    if op == "and":
-        left = _eval_doc_node(node.left, state, current, fuse)
-        if left is None:
-            return None
-        if not _truthy(left):
-            return False
-        right = _eval_doc_node(node.right, state, current, fuse)
-        return None if right is None else _truthy(right)
-    if op == "or":
-        left = _eval_doc_node(node.left, state, current, fuse)
-        if left is None:
-            return None
-        if _truthy(left):
-            return True
-        right = _eval_doc_node(node.right, state, current, fuse)
-        return None if right is None else _truthy(right)
-
-    left = _eval_doc_node(node.left, state, current, fuse)
-    right = _eval_doc_node(node.right, state, current, fuse)
-    if op == "=":
-        return _eq(left, right)
-    if op == "!=":
-        return not _eq(left, right)
-    if op == "&":
-        return _to_concat_text(left) + _to_concat_text(right)
-    if left is None or right is None:
-        return None
-    if op in ("+", "-", "*", "/", "%"):
-        if isinstance(left, str) and op == "+":
-            raise _EvalErrorSignal("type_mismatch")
-        if isinstance(left, bool) or isinstance(right, bool):
-            raise _EvalErrorSignal("type_mismatch")
-        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
-            raise _EvalErrorSignal("type_mismatch")
-        a = float(left)
-        b = float(right)
-        if op == "+":
-            return _guard_finite(a + b)
-        if op == "-":
-            return _guard_finite(a - b)
-        if op == "*":
-            return _guard_finite(a * b)
-        if b == 0.0:
-            raise _EvalErrorSignal("div_by_zero")
-        if op == "/":
-            return _guard_finite(a / b)
-        return _guard_finite(_fmod(a, b))
-    if op in ("<", "<=", ">", ">="):
-        return _compare(left, right, op)
-    raise _EvalErrorSignal("type_mismatch")
-
-
-def _eval_doc_call(node: FuncCall, state: _DocumentEvalState, current: _RowRef, fuse: EvalFuse) -> object:
-    if node.name in ("count", "sum", "avg"):
-        arg = _eval_doc_node(node.args[0], state, current, fuse)
-        if not isinstance(arg, list):
+    Called in topological order, so formula inputs are computed (or computable
+    without recursion back into this field) when their columns are read.
+    """
+    ctx = state.contexts[table_path]
+    compiled = ctx.compiled_by_key.get(field_key)
+    # Per row, a formula over the fuse budget runs counted and may trip; the
+    # column pass has no fuse, so it only takes formulas that cannot.
+    if compiled is None or compiled.vectorized is None or compiled.node_count > PER_ROW_FUSE_MAX:
+        return
+    computed = state.computed[table_path]
+    row_ids = [row_id for row_id in ctx.rows_by_id if field_key not in computed[row_id]]
+    if len(row_ids) < VECTORIZE_MIN_ROWS:
+        return
+    columns = {key: _read_column(state, table_path, row_ids, key) for key in compiled.vectorized.field_keys}
+    for row_id, value in zip(row_ids, compiled.vectorized.evaluate(columns, len(row_ids)), strict=True):
+        computed[row_id][field_key] = value
+        state.touched_rows.add((table_path, row_id))
+    state.evaluated += len(row_ids)
+
+
+def _read_column(
+    state: _DocumentEvalState,
+    table_path: tuple[str, ...],
+    row_ids: list[str],
+    field_key: str,
+) -> list[object]:
+    ctx = state.contexts[table_path]
+    if field_key not in ctx.formula_fields:
+        return [_stored_field_value(ctx, ctx.rows_by_id[row_id], field_key) for row_id in row_ids]
+    values: list[object] = []
+    for row_id in row_ids:
+        try:
+            values.append(_compute_formula_cell(state, table_path, row_id, field_key))
+        except _EvalErrorSignal:
+            values.append(MISSING_REF)
+    return values
+
+
+class _CellEnv:
+    """Runtime hooks a compiled document formula calls for one cell."""
+
+    __slots__ = ("_custom_values", "current", "fuse", "state")
+
+    def __init__(self, state: _DocumentEvalState, current: _RowRef, fuse: EvalFuse) -> None:
+        self.state = state
+        self.current = current
+        self.fuse = fuse
+        self._custom_values: Mapping[str, object] | None = None
+
+    def formula_value(self, field_key: str) -> object:
+        return _compute_formula_cell(self.state, self.current.table_path, self.current.row_id, field_key)
+
+    def stored_value(self, field_key: str) -> object | None:
+        ctx = self.state.contexts[self.current.table_path]
+        custom_values = self._custom_values
+        if custom_values is None:
+            custom_values = self._custom_values = ctx.capability.read_row_custom_values(self.current.row)
+        if field_key in custom_values:
+            return custom_values[field_key]
+        return ctx.capability.field_value_for_formula(self.current.row, field_key)
+
+    def linked_rows(self, node: LinkedRef | LinkedFromRef) -> list[_RowRef]:
+        return _resolve_link_rows(node, self.state, self.current)
+
+    def field_values(self, rows: list[object], field_key: str) -> list[object | None]:
+        row_refs = [item for item in rows if isinstance(item, _RowRef)]
+        if len(row_refs) != len(rows):
             raise _EvalErrorSignal("type_mismatch")
-        if node.name == "count":
-            return float(len(arg))
-        total = 0.0
-        numeric_count = 0
-        for value in arg:
-            numeric_value = _to_number(value)
-            if numeric_value is None:
-                continue
-            total += numeric_value
-            numeric_count += 1
-        if node.name == "sum":
-            return _guard_finite(total)
-        if numeric_count == 0:
-            return None
-        return _guard_finite(total / numeric_count)
-    args = [_eval_doc_node(arg, state, current, fuse) for arg in node.args]
-    if node.name == "concat":
-        return "".join(_coerce_string_arg(arg) for arg in args)
-    if node.name == "upper":
-        return _coerce_string_arg(args[0]).upper()
-    if node.name == "lower":
-        return _coerce_string_arg(args[0]).lower()
-    if node.name == "trim":
-        return _coerce_string_arg(args[0]).strip()
-    if node.name == "len":
-        return float(len(_coerce_string_arg(args[0])))
-    if node.name == "replace":
-        haystack = _coerce_string_arg(args[0])
-        needle = _coerce_string_arg(args[1])
-        replacement = _coerce_string_arg(args[2])
-        return haystack if needle == "" else haystack.replace(needle, replacement)
-    if node.name == "substring":
-        return _substring(args)
-    if node.name == "number":
-        return _to_number(args[0])
-    if node.name == "text":
-        return _to_text(args[0])
-    raise _EvalErrorSignal("type_mismatch")
+        return [_read_field_value(self.state, row_ref, field_key) for row_ref in row_refs]
 
 
 def _read_field_value(state: _DocumentEvalState, row_ref: _RowRef, field_key: str) -> object | None:
     ctx = state.contexts[row_ref.table_path]
     if field_key in ctx.formula_fields:
         return _compute_formula_cell(state, row_ref.table_path, row_ref.row_id, field_key)
-    custom_values = ctx.capability.read_row_custom_values(row_ref.row)
+    return _stored_field_value(ctx, row_ref.row, field_key)
+
+
+def _stored_field_value(ctx: _FormulaTableContext, row: object, field_key: str) -> object | None:
+    custom_values = ctx.capability.read_row_custom_values(row)
     if field_key in custom_values:
         return custom_values[field_key]
-    return ctx.capability.field_value_for_formula(row_ref.row, field_key)
+    return ctx.capability.field_value_for_formula(row, field_key)
 
 
 def _resolve_link_rows(
@@ -404,42 +455,260 @@ def _resolve_link_rows(
     state: _DocumentEvalState,
     current: _RowRef,
 ) -> list[_RowRef]:
+    resolved = _linked_row_ids(
+        node,
+        state.contexts,
+        state.snapshot_row_ids,
+        state.inverse_links,
+        current.table_path,
+        current.row_id,
+        current.row,
+    )
+    if resolved is None:
+        raise _EvalErrorSignal("missing_ref")
+    target_path, row_ids = resolved
+    target_rows = state.contexts[target_path].rows_by_id
+    return [_RowRef(table_path=target_path, row_id=row_id, row=target_rows[row_id]) for row_id in row_ids]
+
+
+def _linked_row_ids(
+    node: LinkedRef | LinkedFromRef,
+    contexts: Mapping[tuple[str, ...], _FormulaTableContext],
+    snapshot_row_ids: Mapping[tuple[str, ...], frozenset[str]],
+    inverse_links: InverseLinks,
+    table_path: tuple[str, ...],
+    row_id: str,
+    row: object,
+) -> tuple[tuple[str, ...], list[str]] | None:
+    """Return the linked table and the row ids a link expression yields for one
+    row, or None when the expression cannot resolve (`missing_ref`)."""
     if isinstance(node, LinkedRef):
-        current_ctx = state.contexts[current.table_path]
+        current_ctx = contexts[table_path]
         field = current_ctx.field_defs_by_key.get(node.field_key)
         if field is None or field.field_type is not CustomFieldType.linked_record:
-            raise _EvalErrorSignal("missing_ref")
+            return None
         target_path = target_table_path_for_link_field(field)
         if target_path is None:
-            raise _EvalErrorSignal("missing_ref")
-        target_ctx = state.contexts.get(target_path)
+            return None
+        target_ctx = contexts.get(target_path)
         if target_ctx is None:
-            raise _EvalErrorSignal("missing_ref")
-        target_ids = state.snapshot_row_ids.get(target_path, frozenset())
-        links = row_link_ids_for_field(_row_link_mapping(current_ctx.capability, current.row), field)
-        return [
-            _RowRef(table_path=target_path, row_id=target_id, row=target_ctx.rows_by_id[target_id])
-            for target_id in links
-            if target_id in target_ids and target_id in target_ctx.rows_by_id
+            return None
+        target_ids = snapshot_row_ids.get(target_path, frozenset())
+        links = row_link_ids_for_field(_row_link_mapping(current_ctx.capability, row), field)
+        return target_path, [
+            target_id for target_id in links if target_id in target_ids and target_id in target_ctx.rows_by_id
         ]
 
-    source_ctx = state.contexts.get(node.source_table_path)
+    source_ctx = contexts.get(node.source_table_path)
     if source_ctx is None:
-        raise _EvalErrorSignal("missing_ref")
+        return None
     field = source_ctx.field_defs_by_key.get(node.source_field_key)
     if field is None or field.field_type is not CustomFieldType.linked_record:
-        raise _EvalErrorSignal("missing_ref")
-    if target_table_path_for_link_field(field) != current.table_path:
-        raise _EvalErrorSignal("missing_ref")
+        return None
+    if target_table_path_for_link_field(field) != table_path:
+        return None
     source_key = source_link_key(node.source_table_path, node.source_field_key)
-    source_ids = state.inverse_links.get(current.table_path, {}).get(current.row_id, {}).get(source_key, [])
-    snapshot_source_ids = state.snapshot_row_ids.get(node.source_table_path, frozenset())
-    return [
-        _RowRef(table_path=node.source_table_path, row_id=source_id, row=source_ctx.rows_by_id[source_id])
-        for source_id in source_ids
-        if source_id in snapshot_source_ids and source_id in source_ctx.rows_by_id
+    source_ids = inverse_links.get(table_path, {}).get(row_id, {}).get(source_key, [])
+    snapshot_source_ids = snapshot_row_ids.get(node.source_table_path, frozenset())
+    return node.source_table_path, [
+        source_id for source_id in source_ids if source_id in snapshot_source_ids and source_id in source_ctx.rows_by_id
     ]
 
 
 def _row_link_mapping(capability: TableFieldRegistry, row: object) -> dict[str, object]:
     return {"custom_links": capability.read_row_links(row)}
+
+
+# --------------------------------------------------------------------------
+# Incremental recomputation
+# --------------------------------------------------------------------------
+
+FormulaFieldId = tuple[tuple[str, ...], str]
+
+
+def _formula_order(body: ProjectDocumentV1) -> tuple[FormulaFieldId, ...] | None:
+    """Topological order of the document's formula fields, or None when the
+    graph does not validate (cycles, bad link targets): those documents are
+    evaluated cell by cell, where such cells surface as per-cell errors."""
+    try:
+        return validate_document_formula_graph(body)
+    except (
+        FormulaCycleError,
+        FormulaMissingRefError,
+        FormulaTargetFieldNotLinkedError,
+        FormulaUnknownTargetTableError,
+    ):
+        return None
+
+
+def _reusable_cells(
+    previous: StoredFormulaOverlay,
+    order: tuple[FormulaFieldId, ...],
+    contexts: dict[tuple[str, ...], _FormulaTableContext],
+    snapshot_row_ids: dict[tuple[str, ...], frozenset[str]],
+    inverse_links: InverseLinks,
+) -> DocumentOverlays | None:
+    """Return the previous overlay's cells whose inputs are unchanged in ``body``.
+
+    None means "evaluate everything": any change to a formula table's field
+    definitions (formulas, types, link targets). Otherwise each formula field is visited in topological
+    order and its dirty rows are those that are new, whose read fields changed
+    value or type (``True == 1``, so equality alone is not enough), whose
+    linked row sets changed, or whose linked rows' read fields changed —
+    including upstream formula cells already found dirty.
+    """
+    previous_contexts = _formula_contexts(previous.body)
+    if previous_contexts.keys() != contexts.keys():
+        return None
+    for table_path, ctx in contexts.items():
+        if _field_defs_signature(ctx) != _field_defs_signature(previous_contexts[table_path]):
+            return None
+    diff = _DocumentDiff(
+        previous=previous,
+        previous_contexts=previous_contexts,
+        contexts=contexts,
+        snapshot_row_ids=snapshot_row_ids,
+        inverse_links=inverse_links,
+    )
+    all_fields = [(table_path, key) for table_path, ctx in contexts.items() for key in ctx.formula_fields]
+    formula_field_ids = set(all_fields)
+    ordered = set(order)
+    # Fields the graph leaves out (unresolvable stored refs) are re-evaluated
+    # wholesale, first, so ordered fields can depend on their dirty sets.
+    for field_id in [*(field_id for field_id in all_fields if field_id not in ordered), *order]:
+        if field_id in diff.dirty or field_id not in formula_field_ids:
+            continue
+        diff.dirty[field_id] = diff.dirty_rows(field_id, ordered=field_id in ordered)
+
+    reusable: DocumentOverlays = {}
+    for table_path, ctx in contexts.items():
+        previous_rows = previous.overlays.get(table_path, {})
+        table_cells: dict[str, dict[str, object]] = {}
+        for row_id in ctx.rows_by_id:
+            previous_cells = previous_rows.get(row_id)
+            if not previous_cells:
+                continue
+            table_cells[row_id] = {
+                key: value
+                for key, value in previous_cells.items()
+                if key in ctx.formula_fields and row_id not in diff.dirty[(table_path, key)]
+            }
+        reusable[table_path] = table_cells
+    return reusable
+
+
+def _field_defs_signature(ctx: _FormulaTableContext) -> list[str]:
+    return [json.dumps(field.model_dump(mode="json"), sort_keys=True) for field in ctx.field_defs_by_key.values()]
+
+
+def _same_value(left: object, right: object) -> bool:
+    return type(left) is type(right) and left == right
+
+
+@dataclass(slots=True)
+class _DocumentDiff:
+    previous: StoredFormulaOverlay
+    previous_contexts: dict[tuple[str, ...], _FormulaTableContext]
+    contexts: dict[tuple[str, ...], _FormulaTableContext]
+    snapshot_row_ids: dict[tuple[str, ...], frozenset[str]]
+    inverse_links: InverseLinks
+    dirty: dict[FormulaFieldId, set[str]] = dataclass_field(default_factory=dict)
+    _changed_values: dict[FormulaFieldId, set[str]] = dataclass_field(default_factory=dict)
+    _linked_ids: dict[tuple[tuple[str, ...], LinkedRef | LinkedFromRef], dict[str, list[str]]] = dataclass_field(
+        default_factory=dict
+    )
+
+    def dirty_rows(self, field_id: FormulaFieldId, *, ordered: bool) -> set[str]:
+        table_path, field_key = field_id
+        ctx = self.contexts[table_path]
+        compiled = ctx.compiled_by_key.get(field_key)
+        if not ordered or compiled is None:
+            return set(ctx.rows_by_id)
+        previous_rows = self.previous_contexts[table_path].rows_by_id
+        rows = {row_id for row_id in ctx.rows_by_id if row_id not in previous_rows}
+        for key in compiled.inputs.field_keys:
+            changed = self._changed_field(table_path, key)
+            if changed is None:
+                return set(ctx.rows_by_id)
+            rows |= changed
+        for link in compiled.inputs.links:
+            changed_rows = self._rows_reading_changed_links(table_path, link)
+            if changed_rows is None:
+                return set(ctx.rows_by_id)
+            rows |= changed_rows
+        return rows
+
+    def _changed_field(self, table_path: tuple[str, ...], field_key: str) -> set[str] | None:
+        """Rows whose value for ``field_key`` may differ, or None if a formula
+        field's dirty set is not known yet."""
+        if field_key in self.contexts[table_path].formula_fields:
+            return self.dirty.get((table_path, field_key))
+        cached = self._changed_values.get((table_path, field_key))
+        if cached is not None:
+            return cached
+        ctx = self.contexts[table_path]
+        previous_ctx = self.previous_contexts[table_path]
+        changed: set[str] = set()
+        for row_id, row in ctx.rows_by_id.items():
+            previous_row = previous_ctx.rows_by_id.get(row_id)
+            if previous_row is None or previous_row is row:
+                continue
+            if not _same_value(
+                _stored_field_value(previous_ctx, previous_row, field_key),
+                _stored_field_value(ctx, row, field_key),
+            ):
+                changed.add(row_id)
+        self._changed_values[(table_path, field_key)] = changed
+        return changed
+
+    def _rows_reading_changed_links(self, table_path: tuple[str, ...], link: LinkedInput) -> set[str] | None:
+        current = self._linked_ids_by_row(table_path, link.rows, previous=False)
+        previous = self._linked_ids_by_row(table_path, link.rows, previous=True)
+        rows = {row_id for row_id, linked in current.items() if row_id in previous and previous[row_id] != linked}
+        target_path = self._link_target(table_path, link.rows)
+        if target_path is None or not link.field_keys:
+            return rows
+        changed_targets: set[str] = set()
+        for key in link.field_keys:
+            changed = self._changed_field(target_path, key)
+            if changed is None:
+                return None
+            changed_targets |= changed
+        if changed_targets:
+            rows.update(row_id for row_id, linked in current.items() if not changed_targets.isdisjoint(linked))
+        return rows
+
+    def _link_target(self, table_path: tuple[str, ...], node: LinkedRef | LinkedFromRef) -> tuple[str, ...] | None:
+        if isinstance(node, LinkedFromRef):
+            return node.source_table_path if node.source_table_path in self.contexts else None
+        field_def = self.contexts[table_path].field_defs_by_key.get(node.field_key)
+        if field_def is None or field_def.field_type is not CustomFieldType.linked_record:
+            return None
+        target_path = target_table_path_for_link_field(field_def)
+        return target_path if target_path in self.contexts else None
+
+    def _linked_ids_by_row(
+        self,
+        table_path: tuple[str, ...],
+        node: LinkedRef | LinkedFromRef,
+        *,
+        previous: bool,
+    ) -> dict[str, list[str]]:
+        if previous:
+            contexts = self.previous_contexts
+            snapshot_row_ids = self.previous.snapshot_row_ids
+            inverse_links = self.previous.inverse_links
+        else:
+            contexts = self.contexts
+            snapshot_row_ids = self.snapshot_row_ids
+            inverse_links = self.inverse_links
+            cached = self._linked_ids.get((table_path, node))
+            if cached is not None:
+                return cached
+        by_row: dict[str, list[str]] = {}
+        for row_id, row in contexts[table_path].rows_by_id.items():
+            resolved = _linked_row_ids(node, contexts, snapshot_row_ids, inverse_links, table_path, row_id, row)
+            by_row[row_id] = resolved[1] if resolved is not None else []
+        if not previous:
+            self._linked_ids[(table_path, node)] = by_row
+        return by_row
@@ -84,11 +84,42 @@ def evaluate(
     in the current row, or `None` when the field is unset or the id
     does not resolve (the latter surfaces as `missing_ref`).
     """
+    # Imported here: the compiler reuses this module's coercion helpers.
+    from features.project_document.formula.compiler import compile_formula
+
+    compiled = compile_formula(ast)
+    env = _State(row_accessor, fuse or EvalFuse(), output_length_max)
+    # A private fuse that covers every node cannot trip (no node runs twice),
+    # so only a caller-supplied or undersized fuse pays for the bookkeeping.
+    run = compiled.run if fuse is None and compiled.node_count <= env.fuse.max_nodes else compiled.run_counted
+    try:
+        value = run(env)
+    except _EvalErrorSignal as exc:
+        return EvalError(code=exc.code)
+    return _finish(value, output_length_max)
+
+
+def interpret(
+    ast: FormulaAST,
+    row_accessor: Callable[[str], object | None],
+    *,
+    fuse: EvalFuse | None = None,
+    output_length_max: int = OUTPUT_LENGTH_MAX,
+) -> EvalResult:
+    """Tree-walking reference for `evaluate`.
+
+    Kept as the specification the compiled path is diffed against (corpus
+    parity runs both) and as the benchmark baseline.
+    """
     state = _State(row_accessor, fuse or EvalFuse(), output_length_max)
     try:
         value = _eval_node(ast, state)
     except _EvalErrorSignal as exc:
         return EvalError(code=exc.code)
+    return _finish(value, output_length_max)
+
+
+def _finish(value: object, output_length_max: int) -> EvalResult:
     if isinstance(value, str) and len(value) > output_length_max:
         return EvalError(code="output_too_long")
     if not (value is None or isinstance(value, (str, int, float, bool))):
@@ -0,0 +1,106 @@
+"""Process-wide store of computed formula overlays, keyed by document ETag.
+
+Overlays used to live only in a request-scoped cache, so every table read and
+every write response re-evaluated every formula cell in the document. An ETag
+names exactly one body — the stored content ETag for saved versions, the
+per-write draft ETag for drafts — so the overlay computed for it stays valid
+for as long as anyone can still present that ETag. Entries also keep the body
+and the link indexes the overlay was computed from: the next draft write
+diffs against them and recomputes only the cells whose inputs changed (see
+`document_evaluator.evaluate_document_formulas`).
+
+Entries are shared across threads and must be treated as immutable; response
+models copy the per-table dicts when they validate them.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from config import settings
+
+if TYPE_CHECKING:
+    from features.project_document.document import ProjectDocumentV1
+    from features.project_document.inverse_view import InverseLinks
+
+DocumentOverlays = dict[tuple[str, ...], dict[str, dict[str, object]]]
+
+
+@dataclass(frozen=True)
+class StoredFormulaOverlay:
+    body: ProjectDocumentV1
+    overlays: DocumentOverlays
+    snapshot_row_ids: dict[tuple[str, ...], frozenset[str]]
+    inverse_links: InverseLinks
+
+
+class _OverlayStore:
+    """Entry-bounded LRU guarded by one lock; requests run on a threadpool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, StoredFormulaOverlay] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, etag: str) -> StoredFormulaOverlay | None:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return entry
+
+    def put(self, etag: str, entry: StoredFormulaOverlay, max_entries: int) -> None:
+        with self._lock:
+            self._entries[etag] = entry
+            self._entries.move_to_end(etag)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self, max_entries: int) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": max_entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_STORE = _OverlayStore()
+
+
+def formula_overlay_get(etag: str) -> StoredFormulaOverlay | None:
+    if settings.formula_overlay_store_max_entries <= 0:
+        return None
+    return _STORE.get(etag)
+
+
+def formula_overlay_put(etag: str, entry: StoredFormulaOverlay) -> None:
+    if settings.formula_overlay_store_max_entries <= 0:
+        return
+    _STORE.put(etag, entry, settings.formula_overlay_store_max_entries)
+
+
+def formula_overlay_stats() -> dict[str, int]:
+    return _STORE.stats(settings.formula_overlay_store_max_entries)
+
+
+def reset_formula_overlay_store() -> None:
+    """Clear entries and counters (tests and explicit operational resets)."""
+
+    _STORE.clear()
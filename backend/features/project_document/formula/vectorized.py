@@ -0,0 +1,239 @@
+"""Column-at-a-time evaluation of same-row arithmetic formulas.
+
+Most formulas on the big Rooms and Apertures tables are arithmetic over a
+row's own numeric fields (`analysis.is_vectorizable`). Rather than run the
+compiled closures once per row, those formulas are evaluated over float64
+arrays holding one column per referenced field.
+
+Per-row semantics are the scalar evaluator's, error precedence included.
+Every node yields values plus three masks:
+
+* ``error`` holds the code the scalar path would have raised while
+  evaluating the node (left operand first, then right).
+* ``null`` marks rows whose value is null.
+* ``not_number`` marks rows holding a raw non-number (text, bool). Raw
+  values only come from field refs, and an operator rejects them only after
+  its null check, so ``null + "x"`` stays null like it does per row.
+
+Arithmetic on IEEE doubles is the same in NumPy as in CPython, `%` is C
+`fmod` in both, and every result passes the same finite check.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from features.project_document.formula.analysis import is_vectorizable
+from features.project_document.formula.ast_nodes import BinaryOp, FieldRef, FormulaAST, FuncCall, Literal_, UnaryOp
+from features.project_document.formula.evaluator import EvalErrorCode, _EvalErrorSignal, _to_number
+
+# A column below this many rows is cheaper to evaluate per row.
+VECTORIZE_MIN_ROWS = 32
+
+# Input placeholder for a row whose field read raises `missing_ref` (an
+# errored upstream formula cell).
+MISSING_REF: object = object()
+
+_NO_ERROR = 0
+_ERROR_CODES: tuple[EvalErrorCode, ...] = ("type_mismatch", "div_by_zero", "missing_ref")
+_TYPE_MISMATCH = 1
+_DIV_BY_ZERO = 2
+_MISSING_REF = 3
+
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+CodeArray = npt.NDArray[np.int8]
+Columns = Mapping[str, Sequence[object]]
+
+
+@dataclass(frozen=True, slots=True)
+class _Column:
+    values: FloatArray
+    null: BoolArray
+    error: CodeArray
+    not_number: BoolArray
+
+
+_ColumnEvaluator = Callable[[Columns, int], _Column]
+
+
+@dataclass(frozen=True, slots=True)
+class VectorizedFormula:
+    """A formula compiled to whole-column array operations."""
+
+    # Field keys whose columns `evaluate` reads.
+    field_keys: frozenset[str]
+    _evaluate: _ColumnEvaluator
+
+    def evaluate(self, columns: Columns, row_count: int) -> list[object]:
+        """Return one encoded overlay cell per row: a float, None, or
+        ``{"error": code}``.
+
+        ``columns`` maps every key in ``field_keys`` to ``row_count`` raw
+        values; use `MISSING_REF` where reading the field raises.
+        """
+        with np.errstate(all="ignore"):
+            column = self._evaluate(columns, row_count)
+        out: list[object] = column.values.tolist()
+        for index in np.flatnonzero(column.null).tolist():
+            out[index] = None
+        for index in np.flatnonzero(column.error).tolist():
+            out[index] = {"error": _ERROR_CODES[int(column.error[index]) - 1]}
+        return out
+
+
+def vectorize_formula(ast: FormulaAST) -> VectorizedFormula | None:
+    """Compile `ast` for column evaluation, or None if it must run per row."""
+    if not is_vectorizable(ast):
+        return None
+    field_keys: set[str] = set()
+    evaluate = _compile(ast, field_keys)
+    return VectorizedFormula(field_keys=frozenset(field_keys), _evaluate=evaluate)
+
+
+def _compile(node: FormulaAST, field_keys: set[str]) -> _ColumnEvaluator:
+    if isinstance(node, FieldRef) and node.field_id is not None:
+        field_id = node.field_id
+        field_keys.add(field_id)
+        return lambda columns, _row_count: _operand_column(columns[field_id])
+    if isinstance(node, Literal_):
+        value = node.value
+        return lambda _columns, row_count: _literal_column(value, row_count)
+    if isinstance(node, UnaryOp):
+        return _negate(_compile(node.operand, field_keys))
+    if isinstance(node, BinaryOp):
+        return _arithmetic(node.op, _compile(node.left, field_keys), _compile(node.right, field_keys))
+    if isinstance(node, FuncCall):
+        (arg,) = node.args
+        if isinstance(arg, FieldRef) and arg.field_id is not None:
+            field_id = arg.field_id
+            field_keys.add(field_id)
+            return lambda columns, _row_count: _to_number_column(columns[field_id])
+        return _number_of(_compile(arg, field_keys))
+    raise AssertionError(f"not vectorizable: {type(node).__name__}")
+
+
+# --------------------------------------------------------------------------
+# Leaves
+# --------------------------------------------------------------------------
+
+
+def _operand_column(raw: Sequence[object]) -> _Column:
+    row_count = len(raw)
+    kinds = set(map(type, raw))
+    if kinds <= {float, int}:
+        # The common case: a fully populated numeric column.
+        return _Column(
+            values=np.array(raw, dtype=np.float64),
+            null=np.zeros(row_count, dtype=np.bool_),
+            error=np.zeros(row_count, dtype=np.int8),
+            not_number=np.zeros(row_count, dtype=np.bool_),
+        )
+    values = np.zeros(row_count, dtype=np.float64)
+    null = np.zeros(row_count, dtype=np.bool_)
+    error = np.zeros(row_count, dtype=np.int8)
+    not_number = np.zeros(row_count, dtype=np.bool_)
+    for index, value in enumerate(raw):
+        if value is None:
+            null[index] = True
+        elif value is MISSING_REF:
+            error[index] = _MISSING_REF
+        elif isinstance(value, float) or (isinstance(value, int) and not isinstance(value, bool)):
+            values[index] = float(value)
+        else:
+            not_number[index] = True
+    return _Column(values=values, null=null, error=error, not_number=not_number)
+
+
+def _to_number_column(raw: Sequence[object]) -> _Column:
+    """`number({Field})`: text is parsed, anything unparseable is null."""
+    row_count = len(raw)
+    values = np.zeros(row_count, dtype=np.float64)
+    null = np.zeros(row_count, dtype=np.bool_)
+    error = np.zeros(row_count, dtype=np.int8)
+    for index, value in enumerate(raw):
+        if value is MISSING_REF:
+            error[index] = _MISSING_REF
+            continue
+        try:
+            number = _to_number(value)
+        except _EvalErrorSignal:
+            error[index] = _TYPE_MISMATCH
+            continue
+        if number is None:
+            null[index] = True
+        else:
+            values[index] = number
+    return _Column(values=values, null=null, error=error, not_number=np.zeros(row_count, dtype=np.bool_))
+
+
+def _literal_column(value: object, row_count: int) -> _Column:
+    number = float(value) if isinstance(value, (int, float)) else 0.0
+    return _Column(
+        values=np.full(row_count, number, dtype=np.float64),
+        null=np.full(row_count, value is None, dtype=np.bool_),
+        error=np.zeros(row_count, dtype=np.int8),
+        not_number=np.zeros(row_count, dtype=np.bool_),
+    )
+
+
+# --------------------------------------------------------------------------
+# Operators
+# --------------------------------------------------------------------------
+
+
+def _negate(operand: _ColumnEvaluator) -> _ColumnEvaluator:
+    def negate(columns: Columns, row_count: int) -> _Column:
+        inner = operand(columns, row_count)
+        return _checked(-inner.values, inner.error, inner.null, inner.not_number)
+
+    return negate
+
+
+def _number_of(operand: _ColumnEvaluator) -> _ColumnEvaluator:
+    """`number(expr)` over a numeric expression is the expression itself."""
+
+    def number(columns: Columns, row_count: int) -> _Column:
+        inner = operand(columns, row_count)
+        return _checked(inner.values, inner.error, inner.null, inner.not_number)
+
+    return number
+
+
+def _arithmetic(op: str, left: _ColumnEvaluator, right: _ColumnEvaluator) -> _ColumnEvaluator:
+    def apply(columns: Columns, row_count: int) -> _Column:
+        lhs = left(columns, row_count)
+        rhs = right(columns, row_count)
+        error = np.where(lhs.error != _NO_ERROR, lhs.error, rhs.error).astype(np.int8)
+        null = lhs.null | rhs.null
+        not_number = lhs.not_number | rhs.not_number
+        if op == "+":
+            values = lhs.values + rhs.values
+        elif op == "-":
+            values = lhs.values - rhs.values
+        elif op == "*":
+            values = lhs.values * rhs.values
+        else:
+            values = lhs.values / rhs.values if op == "/" else np.fmod(lhs.values, rhs.values)
+            by_zero = (rhs.values == 0.0) & ~(null | not_number) & (error == _NO_ERROR)
+            error[by_zero] = _DIV_BY_ZERO
+        return _checked(values, error, null, not_number)
+
+    return apply
+
+
+def _checked(values: FloatArray, error: CodeArray, null: BoolArray, not_number: BoolArray) -> _Column:
+    """Finish an operator: errors win, then null, then the operand type
+    check, then the finite check — the scalar path's order."""
+    error = error.copy()
+    live = error == _NO_ERROR
+    null = null & live
+    error[live & ~null & not_number] = _TYPE_MISMATCH
+    live = error == _NO_ERROR
+    error[live & ~null & ~np.isfinite(values)] = _TYPE_MISMATCH
+    row_count = len(values)
+    return _Column(values=values, null=null, error=error, not_number=np.zeros(row_count, dtype=np.bool_))
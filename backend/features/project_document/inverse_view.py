@@ -74,21 +74,21 @@ def build_inverse_links(
         if not contract.table_path:
             continue
         linked_fields = _linked_record_fields(_table_field_defs(body, contract))
-        if not linked_fields:
+        # Resolve each field's target once per table, not once per row.
+        field_targets = [
+            (field, target_path, target_ids, source_link_key(contract.table_path, field.field_key))
+            for field in linked_fields
+            if (target_path := _target_table_path(field)) is not None
+            and (target_ids := row_ids_by_path.get(target_path, frozenset()))
+        ]
+        if not field_targets:
             continue
 
         for row in _table_rows(body, contract):
             source_row_id = _row_id(row)
             if not source_row_id:
                 continue
-            for field in linked_fields:
-                target_path = _target_table_path(field)
-                if target_path is None:
-                    continue
-                target_ids = row_ids_by_path.get(target_path, frozenset())
-                if not target_ids:
-                    continue
-                source_key = source_link_key(contract.table_path, field.field_key)
+            for field, target_path, target_ids, source_key in field_targets:
                 for target_row_id in _row_link_ids(row, field):
                     if target_row_id in target_ids:
                         inverse[target_path][target_row_id][source_key].append(source_row_id)
@@ -7,14 +7,25 @@ from typing import Any
 from uuid import UUID
 
 import structlog
-from psycopg import Connection
+from psycopg import Connection, sql
 from psycopg.types.json import Jsonb
 
 from features.project_document.document import ProjectDocumentV1
+from features.project_document.document_cache import invalidate_draft_document, invalidate_saved_document
 from features.project_document.validation import SerializedProjectDocument, serialize_document
 
 log = structlog.get_logger(__name__)
 
+
+def serialized_jsonb(serialized: SerializedProjectDocument) -> Jsonb:
+    """Bind an already-serialized body without psycopg dumping it a second time."""
+    return Jsonb(serialized.json_text, dumps=_already_serialized)
+
+
+def _already_serialized(json_text: str) -> str:
+    return json_text
+
+
 PROJECT_VERSION_PUBLIC_COLUMNS = """
     id, project_id, name, kind, locked, schema_version,
     body_size_bytes, created_at, updated_at
@@ -57,7 +68,7 @@ def get_project_version_public(
 def get_project_version(conn: Connection[Any], project_id: UUID, version_id: UUID) -> dict[str, Any] | None:
     return conn.execute(
         f"""
-        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body
+        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body, body_revision
         FROM project_versions
         WHERE project_id = %(project_id)s
           AND id = %(version_id)s
@@ -69,7 +80,7 @@ def get_project_version(conn: Connection[Any], project_id: UUID, version_id: UUI
 def get_project_version_for_update(conn: Connection[Any], project_id: UUID, version_id: UUID) -> dict[str, Any] | None:
     return conn.execute(
         f"""
-        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body
+        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body, body_revision
         FROM project_versions
         WHERE project_id = %(project_id)s
           AND id = %(version_id)s
@@ -79,6 +90,54 @@ def get_project_version_for_update(conn: Connection[Any], project_id: UUID, vers
     ).fetchone()
 
 
+def get_project_version_stamp(conn: Connection[Any], project_id: UUID, version_id: UUID) -> dict[str, Any] | None:
+    """Version metadata plus ``body_revision``, without shipping the JSONB body.
+
+    Readers check the parsed-document cache with the stamp first and only
+    fetch the body on a miss.
+    """
+    return conn.execute(
+        f"""
+        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body_revision, version_etag
+        FROM project_versions
+        WHERE project_id = %(project_id)s
+          AND id = %(version_id)s
+        """,
+        {"project_id": project_id, "version_id": version_id},
+    ).fetchone()
+
+
+def get_project_version_body(conn: Connection[Any], project_id: UUID, version_id: UUID) -> dict[str, Any] | None:
+    """Fetch the body with its own revision so a racing save is keyed correctly."""
+    return conn.execute(
+        """
+        SELECT body, body_revision, version_etag
+        FROM project_versions
+        WHERE project_id = %(project_id)s
+          AND id = %(version_id)s
+        """,
+        {"project_id": project_id, "version_id": version_id},
+    ).fetchone()
+
+
+def set_project_version_etag(conn: Connection[Any], version_id: UUID, body_revision: int, version_etag: str) -> None:
+    """Backfill the stored content ETag for a body revision that lacks one.
+
+    Guarded on ``body_revision`` so an ETag computed from a body that has since
+    been rewritten is never attached to the newer body.
+    """
+    conn.execute(
+        """
+        UPDATE project_versions
+        SET version_etag = %(version_etag)s
+        WHERE id = %(version_id)s
+          AND body_revision = %(body_revision)s
+          AND version_etag IS NULL
+        """,
+        {"version_id": version_id, "body_revision": body_revision, "version_etag": version_etag},
+    )
+
+
 def get_project_version_metadata_for_update(
     conn: Connection[Any],
     project_id: UUID,
@@ -86,7 +145,7 @@ def get_project_version_metadata_for_update(
 ) -> dict[str, Any] | None:
     return conn.execute(
         f"""
-        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}
+        SELECT {PROJECT_VERSION_PUBLIC_COLUMNS}, body_revision, version_etag
         FROM project_versions
         WHERE project_id = %(project_id)s
           AND id = %(version_id)s
@@ -130,7 +189,7 @@ def get_draft(conn: Connection[Any], version_id: UUID, user_id: UUID) -> dict[st
     return conn.execute(
         """
         SELECT version_id, user_id, body, schema_version, base_version_etag,
-               draft_etag, last_patched_at, updated_via
+               draft_etag, last_patched_at, updated_via, body_revision
         FROM project_version_drafts
         WHERE version_id = %(version_id)s
           AND user_id = %(user_id)s
@@ -143,7 +202,7 @@ def get_draft_for_update(conn: Connection[Any], version_id: UUID, user_id: UUID)
     return conn.execute(
         """
         SELECT version_id, user_id, body, schema_version, base_version_etag,
-               draft_etag, last_patched_at, updated_via
+               draft_etag, last_patched_at, updated_via, body_revision
         FROM project_version_drafts
         WHERE version_id = %(version_id)s
           AND user_id = %(user_id)s
@@ -153,6 +212,34 @@ def get_draft_for_update(conn: Connection[Any], version_id: UUID, user_id: UUID)
     ).fetchone()
 
 
+def get_draft_stamp_for_update(conn: Connection[Any], version_id: UUID, user_id: UUID) -> dict[str, Any] | None:
+    """Lock the draft row and return everything but its body (see ``get_draft_body``)."""
+    return conn.execute(
+        """
+        SELECT version_id, user_id, schema_version, base_version_etag,
+               draft_etag, last_patched_at, updated_via, body_revision,
+               asset_references_revision, option_usage_revision
+        FROM project_version_drafts
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+        FOR UPDATE
+        """,
+        {"version_id": version_id, "user_id": user_id},
+    ).fetchone()
+
+
+def get_draft_body(conn: Connection[Any], version_id: UUID, user_id: UUID) -> dict[str, Any] | None:
+    return conn.execute(
+        """
+        SELECT body, body_revision
+        FROM project_version_drafts
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+        """,
+        {"version_id": version_id, "user_id": user_id},
+    ).fetchone()
+
+
 def list_bodies_for_project(conn: Connection[Any], project_id: UUID) -> list[dict[str, Any]]:
     rows = conn.execute(
         """
@@ -170,6 +257,147 @@ def list_bodies_for_project(conn: Connection[Any], project_id: UUID) -> list[dic
     return [dict(row) for row in rows]
 
 
+def list_bodies_for_asset_references(
+    conn: Connection[Any], project_id: UUID, *, stale_only: bool
+) -> list[dict[str, Any]]:
+    """Saved and draft bodies with their asset-reference index stamps.
+
+    ``draft_user_id`` is NULL for saved version bodies. ``stale_only`` keeps
+    just the bodies whose index lags their ``body_revision``.
+    """
+    rows = conn.execute(
+        """
+        SELECT id AS version_id, NULL::uuid AS draft_user_id, body, body_revision,
+               asset_references_revision
+        FROM project_versions
+        WHERE project_id = %(project_id)s
+          AND (NOT %(stale_only)s OR asset_references_revision IS DISTINCT FROM body_revision)
+        UNION ALL
+        SELECT d.version_id, d.user_id AS draft_user_id, d.body, d.body_revision,
+               d.asset_references_revision
+        FROM project_version_drafts d
+        JOIN project_versions v ON v.id = d.version_id
+        WHERE v.project_id = %(project_id)s
+          AND (NOT %(stale_only)s OR d.asset_references_revision IS DISTINCT FROM d.body_revision)
+        """,
+        {"project_id": project_id, "stale_only": stale_only},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_asset_references_stamp(
+    conn: Connection[Any], version_id: UUID, draft_user_id: UUID | None
+) -> dict[str, Any] | None:
+    """The body revision of a saved or draft body and the revision its references were indexed at."""
+    if draft_user_id is None:
+        return conn.execute(
+            """
+            SELECT body_revision, asset_references_revision
+            FROM project_versions
+            WHERE id = %(version_id)s
+            """,
+            {"version_id": version_id},
+        ).fetchone()
+    return conn.execute(
+        """
+        SELECT body_revision, asset_references_revision
+        FROM project_version_drafts
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+        """,
+        {"version_id": version_id, "user_id": draft_user_id},
+    ).fetchone()
+
+
+def mark_asset_references_indexed(
+    conn: Connection[Any], version_id: UUID, draft_user_id: UUID | None, body_revision: int | None
+) -> None:
+    """Record that the reference index matches this body revision.
+
+    Guarded on ``body_revision`` like ``set_project_version_etag``: a body
+    rewritten since the references were read stays stale. None stamps the
+    current revision, for a body this transaction has just written. The
+    update does not assign ``body``, so it leaves the revision trigger alone.
+    """
+    if draft_user_id is None:
+        conn.execute(
+            """
+            UPDATE project_versions
+            SET asset_references_revision = body_revision
+            WHERE id = %(version_id)s
+              AND (%(body_revision)s::bigint IS NULL OR body_revision = %(body_revision)s::bigint)
+            """,
+            {"version_id": version_id, "body_revision": body_revision},
+        )
+        return
+    conn.execute(
+        """
+        UPDATE project_version_drafts
+        SET asset_references_revision = body_revision
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+          AND (%(body_revision)s::bigint IS NULL OR body_revision = %(body_revision)s::bigint)
+        """,
+        {"version_id": version_id, "user_id": draft_user_id, "body_revision": body_revision},
+    )
+
+
+def list_bodies_for_option_usage(conn: Connection[Any], project_id: UUID, *, stale_only: bool) -> list[dict[str, Any]]:
+    """Saved and draft bodies with their catalog option-usage index stamps.
+
+    The ``list_bodies_for_asset_references`` counterpart for
+    ``project_catalog_option_usage``.
+    """
+    rows = conn.execute(
+        """
+        SELECT id AS version_id, NULL::uuid AS draft_user_id, body, body_revision,
+               option_usage_revision
+        FROM project_versions
+        WHERE project_id = %(project_id)s
+          AND (NOT %(stale_only)s OR option_usage_revision IS DISTINCT FROM body_revision)
+        UNION ALL
+        SELECT d.version_id, d.user_id AS draft_user_id, d.body, d.body_revision,
+               d.option_usage_revision
+        FROM project_version_drafts d
+        JOIN project_versions v ON v.id = d.version_id
+        WHERE v.project_id = %(project_id)s
+          AND (NOT %(stale_only)s OR d.option_usage_revision IS DISTINCT FROM d.body_revision)
+        """,
+        {"project_id": project_id, "stale_only": stale_only},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def mark_option_usage_indexed(
+    conn: Connection[Any], version_id: UUID, draft_user_id: UUID | None, body_revision: int | None
+) -> None:
+    """Record that the option-usage index matches this body revision.
+
+    Guarded like ``mark_asset_references_indexed``.
+    """
+    if draft_user_id is None:
+        conn.execute(
+            """
+            UPDATE project_versions
+            SET option_usage_revision = body_revision
+            WHERE id = %(version_id)s
+              AND (%(body_revision)s::bigint IS NULL OR body_revision = %(body_revision)s::bigint)
+            """,
+            {"version_id": version_id, "body_revision": body_revision},
+        )
+        return
+    conn.execute(
+        """
+        UPDATE project_version_drafts
+        SET option_usage_revision = body_revision
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+          AND (%(body_revision)s::bigint IS NULL OR body_revision = %(body_revision)s::bigint)
+        """,
+        {"version_id": version_id, "user_id": draft_user_id, "body_revision": body_revision},
+    )
+
+
 def upsert_draft(
     conn: Connection[Any],
     version_id: UUID,
@@ -181,6 +409,31 @@ def upsert_draft(
     *,
     serialized_body: SerializedProjectDocument | None = None,
 ) -> str:
+    row = upsert_draft_row(
+        conn,
+        version_id,
+        user_id,
+        body,
+        base_version_etag,
+        draft_etag,
+        updated_via,
+        serialized_body=serialized_body,
+    )
+    return str(row["draft_etag"])
+
+
+def upsert_draft_row(
+    conn: Connection[Any],
+    version_id: UUID,
+    user_id: UUID,
+    body: ProjectDocumentV1,
+    base_version_etag: str,
+    draft_etag: str,
+    updated_via: str = "browser",
+    *,
+    serialized_body: SerializedProjectDocument | None = None,
+) -> dict[str, Any]:
+    """Upsert a draft and return its ``draft_etag`` and new ``body_revision``."""
     serialized = serialized_body or serialize_document(body)
     start = perf_counter()
     row = conn.execute(
@@ -199,12 +452,12 @@ def upsert_draft(
                       draft_etag = EXCLUDED.draft_etag,
                       last_patched_at = now(),
                       updated_via = EXCLUDED.updated_via
-        RETURNING draft_etag
+        RETURNING draft_etag, body_revision
         """,
         {
             "version_id": version_id,
             "user_id": user_id,
-            "body": Jsonb(serialized.json_value),
+            "body": serialized_jsonb(serialized),
             "schema_version": body.schema_version,
             "base_version_etag": base_version_etag,
             "draft_etag": draft_etag,
@@ -213,8 +466,75 @@ def upsert_draft(
     ).fetchone()
     if row is None:
         raise RuntimeError("Draft upsert did not return a row.")
+    invalidate_draft_document(version_id, user_id)
     _log_saved(version_id, "draft", body_size_bytes=serialized.size_bytes, db_ms=_duration_ms(start))
-    return str(row["draft_etag"])
+    return dict(row)
+
+
+def patch_draft_sections(
+    conn: Connection[Any],
+    version_id: UUID,
+    user_id: UUID,
+    *,
+    sections: list[tuple[tuple[str, ...], str]],
+    schema_version: int,
+    expected_body_revision: int,
+    draft_etag: str,
+    updated_via: str = "browser",
+) -> dict[str, Any] | None:
+    """Replace only the given top-level sections of a draft body in place.
+
+    ``sections`` pairs a document path (``("tables", "rooms")``) with its
+    serialized JSON. The update applies only while the row still holds
+    ``expected_body_revision`` — the exact body the sections were diffed
+    against — and returns None otherwise so the caller can fall back to a full
+    rewrite. Returns ``draft_etag`` and the new ``body_revision``.
+    """
+    body_expression: sql.Composable = sql.Identifier("body")
+    params: dict[str, Any] = {
+        "version_id": version_id,
+        "user_id": user_id,
+        "schema_version": schema_version,
+        "expected_body_revision": expected_body_revision,
+        "draft_etag": draft_etag,
+        "updated_via": updated_via,
+    }
+    for index, (path, json_text) in enumerate(sections):
+        body_expression = sql.SQL("jsonb_set({}, {}::text[], {}::jsonb)").format(
+            body_expression,
+            sql.Placeholder(f"path_{index}"),
+            sql.Placeholder(f"value_{index}"),
+        )
+        params[f"path_{index}"] = list(path)
+        params[f"value_{index}"] = json_text
+    start = perf_counter()
+    query = sql.SQL(
+        """
+        UPDATE project_version_drafts
+        SET body = {body},
+            schema_version = %(schema_version)s,
+            draft_etag = %(draft_etag)s,
+            last_patched_at = now(),
+            updated_via = %(updated_via)s
+        WHERE version_id = %(version_id)s
+          AND user_id = %(user_id)s
+          AND body_revision = %(expected_body_revision)s
+        RETURNING draft_etag, body_revision
+        """
+    ).format(body=body_expression)
+    row = conn.execute(query, params).fetchone()
+    if row is None:
+        return None
+    invalidate_draft_document(version_id, user_id)
+    log.info(
+        "project_document.saved",
+        version_id=str(version_id),
+        source="draft",
+        bytes=sum(len(json_text) for _path, json_text in sections),
+        sections=len(sections),
+        db_ms=_duration_ms(start),
+    )
+    return dict(row)
 
 
 def delete_draft(conn: Connection[Any], version_id: UUID, user_id: UUID) -> bool:
@@ -227,6 +547,7 @@ def delete_draft(conn: Connection[Any], version_id: UUID, user_id: UUID) -> bool
         """,
         {"version_id": version_id, "user_id": user_id},
     ).fetchone()
+    invalidate_draft_document(version_id, user_id)
     return row is not None
 
 
@@ -252,6 +573,8 @@ def delete_project_version(conn: Connection[Any], project_id: UUID, version_id:
         """,
         {"project_id": project_id, "version_id": version_id},
     ).fetchone()
+    invalidate_saved_document(version_id)
+    invalidate_draft_document(version_id)
     return row is not None
 
 
@@ -277,18 +600,19 @@ def rewrite_draft_body(
             last_patched_at = now()
         WHERE version_id = %(version_id)s
           AND user_id = %(user_id)s
-        RETURNING draft_etag, last_patched_at
+        RETURNING draft_etag, last_patched_at, body_revision
         """,
         {
             "version_id": version_id,
             "user_id": user_id,
-            "body": Jsonb(serialized.json_value),
+            "body": serialized_jsonb(serialized),
             "schema_version": body.schema_version,
             "draft_etag": draft_etag,
         },
     ).fetchone()
     if row is None:
         raise RuntimeError("Draft rewrite did not return a row.")
+    invalidate_draft_document(version_id, user_id)
     _log_saved(version_id, "draft", body_size_bytes=serialized.size_bytes, db_ms=_duration_ms(start))
     return dict(row)
 
@@ -309,6 +633,7 @@ def save_draft_to_version(
         f"""
         UPDATE project_versions
         SET body = %(body)s,
+            version_etag = %(version_etag)s,
             schema_version = %(schema_version)s,
             body_size_bytes = %(body_size_bytes)s,
             updated_at = now(),
@@ -321,13 +646,15 @@ def save_draft_to_version(
             "project_id": project_id,
             "version_id": version_id,
             "user_id": user_id,
-            "body": Jsonb(serialized.json_value),
+            "body": serialized_jsonb(serialized),
+            "version_etag": serialized.etag,
             "schema_version": body.schema_version,
             "body_size_bytes": body_size_bytes,
         },
     ).fetchone()
     if row is None:
         raise RuntimeError("Project version save did not return a row.")
+    invalidate_saved_document(version_id)
     conn.execute(
         """
         UPDATE projects
@@ -360,12 +687,13 @@ def insert_version_from_body(
         f"""
         INSERT INTO project_versions (
             project_id, parent_version_id, name, kind, locked, body,
-            schema_version, body_size_bytes, created_by, updated_by
+            version_etag, schema_version, body_size_bytes, created_by,
+            updated_by
         )
         VALUES (
             %(project_id)s, %(parent_version_id)s, %(name)s, %(kind)s,
-            %(locked)s, %(body)s, %(schema_version)s, %(body_size_bytes)s,
-            %(user_id)s, %(user_id)s
+            %(locked)s, %(body)s, %(version_etag)s, %(schema_version)s,
+            %(body_size_bytes)s, %(user_id)s, %(user_id)s
         )
         RETURNING {PROJECT_VERSION_PUBLIC_COLUMNS}
         """,
@@ -375,7 +703,8 @@ def insert_version_from_body(
             "name": name,
             "kind": kind,
             "locked": locked,
-            "body": Jsonb(serialized.json_value),
+            "body": serialized_jsonb(serialized),
+            "version_etag": serialized.etag,
             "schema_version": body.schema_version,
             "body_size_bytes": body_size_bytes,
             "user_id": user_id,
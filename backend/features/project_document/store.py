@@ -15,9 +15,18 @@ from pydantic import BaseModel
 from starlette import status
 
 from database import connection, transaction
+from features.assets.reference_index import index_body_references
+from features.catalogs.option_usage_index import index_body_option_usage
 from features.project_document import repository
 from features.project_document.document import ProjectDocumentV1
-from features.project_document.migrations import UpgradeResult
+from features.project_document.document_cache import (
+    CachedDocument,
+    document_cache_get,
+    document_cache_put,
+    draft_document_key,
+    saved_document_key,
+)
+from features.project_document.formula.document_evaluator import bind_document_etag
 from features.project_document.models import (
     ProjectDocumentReadSafeEnvelope,
     ProjectDocumentSource,
@@ -28,12 +37,11 @@ from features.project_document.tables import get_table_contract, iter_table_cont
 from features.project_document.tables.batch import BatchDraftTablesResponse
 from features.project_document.validation import (
     JsonValue,
-    document_etag,
     next_draft_etag_from_etag,
+    raise_invalid_project_document,
     raw_json_value,
     serialize_document,
     upgrade_document_with_errors,
-    validate_document,
     validate_document_with_errors,
 )
 from features.projects.access import ProjectAccess, require_editor_user
@@ -58,11 +66,24 @@ class CurrentDocumentParts:
     last_patched_at: datetime | None
 
 
+@dataclass(frozen=True)
+class DocumentLoad:
+    """One cache-aware body load: the parsed document, or why it failed.
+
+    ``raw_body`` is only populated when the body was actually fetched (a cache
+    miss); read-safe callers need it to echo an unparseable body back.
+    """
+
+    parsed: CachedDocument | None
+    errors: list[str]
+    raw_body: object | None
+    last_patched_at: datetime | None = None
+    cache_hit: bool = False
+
+
 def get_saved_document(version_id: UUID, access: ProjectAccess) -> ProjectDocumentV1:
-    version, db_ms = _load_saved_version_row(version_id, access)
-    body = validate_document(version["body"])
-    _log_loaded(access.project_id, version_id, "version", version["body"], db_ms)
-    return body
+    saved, _version = _load_saved_version(version_id, access)
+    return saved.document
 
 
 def get_saved_document_with_version(
@@ -70,23 +91,118 @@ def get_saved_document_with_version(
     access: ProjectAccess,
 ) -> tuple[ProjectDocumentV1, ProjectVersionPublic]:
     """Load a saved body and its public metadata from the same version row."""
-    version, db_ms = _load_saved_version_row(version_id, access)
-    body = validate_document(version["body"])
-    _log_loaded(access.project_id, version_id, "version", version["body"], db_ms)
+    saved, version = _load_saved_version(version_id, access)
     public = ProjectVersionPublic.model_validate({field: version[field] for field in ProjectVersionPublic.model_fields})
-    return body, public
+    return saved.document, public
 
 
-def _load_saved_version_row(
+def _load_saved_version(
     version_id: UUID,
     access: ProjectAccess,
-) -> tuple[dict[str, Any], float]:
+) -> tuple[CachedDocument, dict[str, Any]]:
     start = perf_counter()
     with connection() as conn:
-        version = repository.get_project_version(conn, access.project_id, version_id)
+        version = repository.get_project_version_stamp(conn, access.project_id, version_id)
         if version is None:
             raise_project_version_not_found()
-    return version, _duration_ms(start)
+        load = load_saved_document(conn, access.project_id, version)
+    if load.parsed is None:
+        raise_invalid_project_document(load.errors)
+    _log_loaded(access.project_id, version_id, "version", load.parsed.size_bytes, _duration_ms(start), load.cache_hit)
+    return load.parsed, version
+
+
+def load_saved_document(conn: Connection[Any], project_id: UUID, version: dict[str, Any]) -> DocumentLoad:
+    """Return the parsed saved body for a version stamp row, via the shared cache.
+
+    Saved bodies are immutable until the next Save, so the upgraded document
+    is parsed once per ``body_revision`` and reused by every reader and by the
+    write spine's basis load. The content ETag is the one stored with the row;
+    rows that predate it (or were rewritten out of band) get it computed and
+    stored here once.
+    """
+
+    version_id = UUID(str(version["id"]))
+    cached = document_cache_get(saved_document_key(version_id, version["body_revision"]))
+    if cached is not None:
+        bind_document_etag(cached.document, cached.etag)
+        return DocumentLoad(parsed=cached, errors=[], raw_body=None, cache_hit=True)
+    row = repository.get_project_version_body(conn, project_id, version_id)
+    if row is None:
+        raise_project_version_not_found()
+    document, errors = validate_document_with_errors(row["body"])
+    if document is None:
+        return DocumentLoad(parsed=None, errors=errors, raw_body=row["body"])
+    if row["version_etag"] is not None:
+        # The stored size was written with the body; re-dumping it just to
+        # account the cache entry would cost as much as the hash it replaces.
+        parsed = CachedDocument(document=document, size_bytes=int(version["body_size_bytes"]), etag=row["version_etag"])
+    else:
+        serialized = serialize_document(document)
+        repository.set_project_version_etag(conn, version_id, row["body_revision"], serialized.etag)
+        parsed = CachedDocument(
+            document=document,
+            size_bytes=serialized.size_bytes,
+            etag=serialized.etag,
+            serialized=serialized,
+        )
+    document_cache_put(saved_document_key(version_id, row["body_revision"]), parsed)
+    bind_document_etag(parsed.document, parsed.etag)
+    return DocumentLoad(parsed=parsed, errors=[], raw_body=row["body"])
+
+
+def load_draft_document(conn: Connection[Any], draft: dict[str, Any]) -> DocumentLoad:
+    """Return the parsed body for a locked draft stamp row, via the shared cache.
+
+    A draft stored in an older schema is upgraded and rewritten in place
+    (saved versions stay immutable); the rewrite mints a new draft ETag and
+    body revision, and the parsed result is cached under those.
+    """
+
+    version_id = UUID(str(draft["version_id"]))
+    user_id = UUID(str(draft["user_id"]))
+    draft_etag = str(draft["draft_etag"])
+    last_patched_at = draft["last_patched_at"] if isinstance(draft["last_patched_at"], datetime) else None
+    cached = document_cache_get(draft_document_key(version_id, user_id, draft_etag, draft["body_revision"]))
+    if cached is not None:
+        bind_document_etag(cached.document, cached.etag)
+        return DocumentLoad(parsed=cached, errors=[], raw_body=None, last_patched_at=last_patched_at, cache_hit=True)
+    row = repository.get_draft_body(conn, version_id, user_id)
+    if row is None:
+        raise RuntimeError("Locked draft row disappeared before its body was read.")
+    result, errors = upgrade_document_with_errors(row["body"])
+    if result is None:
+        return DocumentLoad(parsed=None, errors=errors, raw_body=row["body"])
+
+    body_revision = row["body_revision"]
+    size_bytes = _json_size_bytes(row["body"])
+    serialized = None
+    if result.requires_persisted_rewrite:
+        serialized = serialize_document(result.document)
+        rewritten = repository.rewrite_draft_body(
+            conn,
+            version_id,
+            user_id,
+            result.document,
+            next_draft_etag_from_etag(serialized.etag),
+            serialized_body=serialized,
+        )
+        draft_etag = str(rewritten["draft_etag"])
+        body_revision = rewritten["body_revision"]
+        index_body_references(
+            conn, version_id=version_id, draft_user_id=user_id, body=result.document, body_revision=body_revision
+        )
+        index_body_option_usage(
+            conn, version_id=version_id, draft_user_id=user_id, body=result.document, body_revision=body_revision
+        )
+        size_bytes = serialized.size_bytes
+        rewritten_at = rewritten["last_patched_at"]
+        last_patched_at = rewritten_at if isinstance(rewritten_at, datetime) else None
+
+    parsed = CachedDocument(document=result.document, size_bytes=size_bytes, etag=draft_etag, serialized=serialized)
+    document_cache_put(draft_document_key(version_id, user_id, draft_etag, body_revision), parsed)
+    bind_document_etag(parsed.document, parsed.etag)
+    return DocumentLoad(parsed=parsed, errors=[], raw_body=row["body"], last_patched_at=last_patched_at)
 
 
 def get_project_version_public(
@@ -128,21 +244,22 @@ def get_saved_document_or_read_safe(
 ) -> ProjectDocumentV1 | ProjectDocumentReadSafeEnvelope:
     start = perf_counter()
     with connection() as conn:
-        version = repository.get_project_version(conn, access.project_id, version_id)
+        version = repository.get_project_version_stamp(conn, access.project_id, version_id)
         if version is None:
             raise_project_version_not_found()
-    db_ms = _duration_ms(start)
-    document, errors = validate_document_with_errors(version["body"])
-    if document is not None:
-        _log_loaded(access.project_id, version_id, "version", version["body"], db_ms)
-        return document
+        load = load_saved_document(conn, access.project_id, version)
+    if load.parsed is not None:
+        _log_loaded(
+            access.project_id, version_id, "version", load.parsed.size_bytes, _duration_ms(start), load.cache_hit
+        )
+        return load.parsed.document
     return read_safe_envelope(
         access.project_id,
         version_id,
         "version",
-        raw_json_value(version["body"]),
+        raw_json_value(load.raw_body),
         request_id,
-        errors if access.mode == "edit" else [],
+        load.errors if access.mode == "edit" else [],
         row_schema_version=version["schema_version"],
     )
 
@@ -154,7 +271,7 @@ def get_raw_saved_document(version_id: UUID, access: ProjectAccess) -> JsonValue
         if version is None:
             raise_project_version_not_found()
     db_ms = _duration_ms(start)
-    _log_loaded(access.project_id, version_id, "version", version["body"], db_ms)
+    _log_loaded(access.project_id, version_id, "version", _json_size_bytes(version["body"]), db_ms)
     return raw_json_value(version["body"])
 
 
@@ -173,49 +290,38 @@ def get_draft_summary_or_read_safe(
 ) -> ProjectDraftSummary | ProjectDocumentReadSafeEnvelope:
     user = require_editor_user(access)
     with transaction() as conn:
-        version = repository.get_project_version(conn, access.project_id, version_id)
+        version = repository.get_project_version_stamp(conn, access.project_id, version_id)
         if version is None:
             raise_project_version_not_found()
-        version_result, version_errors = upgrade_document_with_errors(version["body"])
-        if version_result is None:
+        saved = load_saved_document(conn, access.project_id, version)
+        if saved.parsed is None:
             return read_safe_envelope(
                 access.project_id,
                 version_id,
                 "version",
-                raw_json_value(version["body"]),
+                raw_json_value(saved.raw_body),
                 request_id,
-                version_errors,
+                saved.errors,
                 row_schema_version=version["schema_version"],
             )
-        draft = repository.get_draft_for_update(conn, version_id, user.id)
-        draft_body: ProjectDocumentV1 | None = None
-        draft_etag: str | None = None
-        last_patched_at: datetime | None = None
+        draft = repository.get_draft_stamp_for_update(conn, version_id, user.id)
+        draft_load: DocumentLoad | None = None
         if draft is not None:
-            draft_result, draft_errors = upgrade_document_with_errors(draft["body"])
-            if draft_result is None:
+            draft_load = load_draft_document(conn, draft)
+            if draft_load.parsed is None:
                 return read_safe_envelope(
                     access.project_id,
                     version_id,
                     "draft",
-                    raw_json_value(draft["body"]),
+                    raw_json_value(draft_load.raw_body),
                     request_id,
-                    draft_errors,
+                    draft_load.errors,
                     row_schema_version=draft["schema_version"],
                 )
-            draft_body, draft_etag, last_patched_at = rewrite_draft_if_upgraded(conn, draft, draft_result)
-        version_body = version_result.document
         return draft_summary(
             version_id,
             access.project_id,
-            CurrentDocumentParts(
-                version_body=version_body,
-                version_etag=document_etag(version_body),
-                version_locked=bool(version["locked"]),
-                draft_body=draft_body,
-                draft_etag=draft_etag,
-                last_patched_at=last_patched_at,
-            ),
+            _current_document_parts(version, saved.parsed, draft_load),
         )
 
 
@@ -228,9 +334,8 @@ def get_saved_and_current_document_view(
 
 def get_saved_table_slice(version_id: UUID, table_name: str, access: ProjectAccess) -> BaseModel:
     contract = get_table_contract(table_name)
-    version_body = get_saved_document(version_id, access)
-    version_etag = document_etag(version_body)
-    return contract.build_response(access.project_id, version_id, "version", version_etag, None, version_body)
+    saved, _version = _load_saved_version(version_id, access)
+    return contract.build_response(access.project_id, version_id, "version", saved.etag, None, saved.document)
 
 
 def get_draft_table_slice(version_id: UUID, table_name: str, access: ProjectAccess) -> BaseModel:
@@ -304,68 +409,44 @@ def load_current_document_parts(version_id: UUID, access: ProjectAccess) -> Curr
     user = require_editor_user(access)
     start = perf_counter()
     with transaction() as conn:
-        version = repository.get_project_version(conn, access.project_id, version_id)
+        version = repository.get_project_version_stamp(conn, access.project_id, version_id)
         if version is None:
             raise_project_version_not_found()
-        draft = repository.get_draft_for_update(conn, version_id, user.id)
-        version_body = validate_document(version["body"])
-        draft_body: ProjectDocumentV1 | None = None
-        draft_etag: str | None = None
-        last_patched_at: datetime | None = None
+        draft = repository.get_draft_stamp_for_update(conn, version_id, user.id)
+        saved = load_saved_document(conn, access.project_id, version)
+        if saved.parsed is None:
+            raise_invalid_project_document(saved.errors)
+        draft_load: DocumentLoad | None = None
         if draft is not None:
-            draft_result, draft_errors = upgrade_document_with_errors(draft["body"])
-            if draft_result is None:
-                raise api_error(
-                    status.HTTP_422_UNPROCESSABLE_CONTENT,
-                    "invalid_project_document",
-                    "Project document failed validation.",
-                    {"errors": draft_errors},
-                )
-            draft_body, draft_etag, last_patched_at = rewrite_draft_if_upgraded(conn, draft, draft_result)
+            draft_load = load_draft_document(conn, draft)
+            if draft_load.parsed is None:
+                raise_invalid_project_document(draft_load.errors)
     db_ms = _duration_ms(start)
+    loaded = draft_load if draft_load is not None else saved
     _log_loaded(
         access.project_id,
         version_id,
-        "draft" if draft is not None else "version",
-        draft["body"] if draft is not None else version["body"],
+        "draft" if draft_load is not None else "version",
+        loaded.parsed.size_bytes if loaded.parsed is not None else 0,
         db_ms,
+        loaded.cache_hit,
     )
-    return CurrentDocumentParts(
-        version_body=version_body,
-        version_etag=document_etag(version_body),
-        version_locked=bool(version["locked"]),
-        draft_body=draft_body,
-        draft_etag=draft_etag,
-        last_patched_at=last_patched_at,
-    )
-
+    return _current_document_parts(version, saved.parsed, draft_load)
 
-def rewrite_draft_if_upgraded(
-    conn: Connection[Any],
-    draft: dict[str, object],
-    result: UpgradeResult,
-) -> tuple[ProjectDocumentV1, str, datetime | None]:
-    """Persist current-shape draft cache rows while saved versions stay immutable."""
 
-    draft_etag = str(draft["draft_etag"])
-    last_patched_at = draft["last_patched_at"] if isinstance(draft["last_patched_at"], datetime) else None
-    if not result.requires_persisted_rewrite:
-        return result.document, draft_etag, last_patched_at
-
-    serialized = serialize_document(result.document)
-    rewritten = repository.rewrite_draft_body(
-        conn,
-        UUID(str(draft["version_id"])),
-        UUID(str(draft["user_id"])),
-        result.document,
-        next_draft_etag_from_etag(serialized.etag),
-        serialized_body=serialized,
-    )
-    rewritten_at = rewritten["last_patched_at"]
-    return (
-        result.document,
-        str(rewritten["draft_etag"]),
-        rewritten_at if isinstance(rewritten_at, datetime) else None,
+def _current_document_parts(
+    version: dict[str, Any],
+    saved: CachedDocument,
+    draft_load: DocumentLoad | None,
+) -> CurrentDocumentParts:
+    draft = draft_load.parsed if draft_load is not None else None
+    return CurrentDocumentParts(
+        version_body=saved.document,
+        version_etag=saved.etag,
+        version_locked=bool(version["locked"]),
+        draft_body=draft.document if draft is not None else None,
+        draft_etag=draft.etag if draft is not None else None,
+        last_patched_at=draft_load.last_patched_at if draft_load is not None else None,
     )
 
 
@@ -441,16 +522,18 @@ def _log_loaded(
     project_id: UUID,
     version_id: UUID,
     source: ProjectDocumentSource,
-    raw_body: object,
+    size_bytes: int,
     db_ms: float,
+    cache_hit: bool = False,
 ) -> None:
     log.info(
         "project_document.loaded",
         project_id=str(project_id),
         version_id=str(version_id),
         source=source,
-        bytes=_json_size_bytes(raw_body),
+        bytes=size_bytes,
         db_ms=db_ms,
+        cache_hit=cache_hit,
     )
 
 
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
-from typing import Any, TypeAlias, cast
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from typing import NoReturn, TypeAlias, cast
 from uuid import uuid4
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from starlette import status
 
 from config import settings
@@ -24,28 +25,129 @@ from features.shared.errors import api_error
 JsonValue: TypeAlias = None | bool | int | float | str | list["JsonValue"] | dict[str, "JsonValue"]
 
 
+# Sections that are split one level further so an edit to one table (or one
+# equipment table) reserializes only that table, not every table beside it.
+_SPLIT_SECTIONS: frozenset[tuple[str, ...]] = frozenset({("tables",), ("tables", "equipment")})
+
+SectionPath: TypeAlias = tuple[str, ...]
+
+
 @dataclass(frozen=True)
-class SerializedProjectDocument:
-    json_value: dict[str, Any]
+class SerializedSection:
+    """The canonical JSON fragment and SHA-256 of one document section.
+
+    ``source_digest`` fingerprints pydantic's own (declaration-order) JSON for
+    the section. It is type-exact where ``==`` is not (``True == 1``), costs a
+    fraction of the canonical ``model_dump`` + sorted ``json.dumps``, and is
+    what decides whether a previous fragment can be reused. ``value`` is the
+    model object the fragment came from; documents are immutable, so an
+    identical object skips even the fingerprint.
+    """
+
+    value: object
+    source_digest: bytes
     json_text: str
-    json_bytes: bytes
+    digest: str
+
+
+@dataclass(frozen=True)
+class SerializedProjectDocument:
+    """A document serialized section by section.
+
+    ``json_text`` is assembled on demand from the fragments and is
+    byte-identical to ``json.dumps(model_dump(mode="json"), sort_keys=True,
+    separators=(",", ":"))``. The ETag is a Merkle-style digest over the
+    section digests, so it can be recomputed after an edit from the changed
+    sections alone. Only the fragments are held, which keeps a serialized form
+    cheap enough to cache next to its parsed document.
+    """
+
+    sections: dict[SectionPath, SerializedSection]
     etag: str
     size_bytes: int
+    # Sections whose content differs from the ``previous`` form this one was
+    # built against (every section when there was none).
+    changed_paths: tuple[SectionPath, ...] = ()
+
+    @property
+    def json_text(self) -> str:
+        return _join_sections(self.sections, 0)
 
+    @property
+    def reused_sections(self) -> int:
+        return len(self.sections) - len(self.changed_paths)
 
-def serialize_document(body: ProjectDocumentV1) -> SerializedProjectDocument:
-    json_value = body.model_dump(mode="json")
-    json_text = json.dumps(json_value, sort_keys=True, separators=(",", ":"))
-    json_bytes = json_text.encode("utf-8")
+
+def serialize_document(
+    body: ProjectDocumentV1,
+    previous: SerializedProjectDocument | None = None,
+) -> SerializedProjectDocument:
+    """Serialize ``body``, reusing any section unchanged since ``previous``.
+
+    ``previous`` is the serialized form of the body the mutation started from
+    (the write spine's basis). Without it every section is serialized.
+    """
+
+    sections: dict[SectionPath, SerializedSection] = {}
+    changed: list[SectionPath] = []
+    for path, parent, name in _iter_sections(body, ()):
+        prior = previous.sections.get(path) if previous is not None else None
+        section = _serialize_section(parent, name, prior)
+        if prior is None or section.digest != prior.digest:
+            changed.append(path)
+        sections[path] = section
+    manifest = "\n".join(f"{'.'.join(path)}:{sections[path].digest}" for path in sorted(sections))
     return SerializedProjectDocument(
-        json_value=json_value,
+        sections=sections,
+        etag=hashlib.sha256(manifest.encode("utf-8")).hexdigest(),
+        # ``json.dumps`` escapes non-ASCII, so characters and bytes coincide.
+        size_bytes=len(_join_sections(sections, 0)),
+        changed_paths=tuple(changed),
+    )
+
+
+def _iter_sections(model: BaseModel, prefix: SectionPath) -> Iterator[tuple[SectionPath, BaseModel, str]]:
+    for name in type(model).model_fields:
+        path = (*prefix, name)
+        value = getattr(model, name)
+        if path in _SPLIT_SECTIONS and isinstance(value, BaseModel) and type(value).model_fields:
+            yield from _iter_sections(value, path)
+        else:
+            yield path, model, name
+
+
+def _serialize_section(parent: BaseModel, name: str, prior: SerializedSection | None) -> SerializedSection:
+    value = getattr(parent, name)
+    if prior is not None and prior.value is value:
+        return prior
+    source_digest = hashlib.blake2b(
+        parent.model_dump_json(include={name}).encode("utf-8"),
+        digest_size=16,
+    ).digest()
+    if prior is not None and prior.source_digest == source_digest:
+        return replace(prior, value=value)
+    json_text = json.dumps(parent.model_dump(mode="json", include={name})[name], sort_keys=True, separators=(",", ":"))
+    return SerializedSection(
+        value=value,
+        source_digest=source_digest,
         json_text=json_text,
-        json_bytes=json_bytes,
-        etag=hashlib.sha256(json_bytes).hexdigest(),
-        size_bytes=len(json_bytes),
+        digest=hashlib.sha256(json_text.encode("utf-8")).hexdigest(),
     )
 
 
+def _join_sections(sections: dict[SectionPath, SerializedSection], depth: int) -> str:
+    groups: dict[str, dict[SectionPath, SerializedSection]] = {}
+    for path, section in sections.items():
+        groups.setdefault(path[depth], {})[path] = section
+    members: list[str] = []
+    for key in sorted(groups):
+        group = groups[key]
+        leaf = group.get(next(iter(group))[: depth + 1])
+        text = leaf.json_text if leaf is not None else _join_sections(group, depth + 1)
+        members.append(f"{json.dumps(key)}:{text}")
+    return "{" + ",".join(members) + "}"
+
+
 def document_etag(body: ProjectDocumentV1, serialized: SerializedProjectDocument | None = None) -> str:
     return (serialized or serialize_document(body)).etag
 
@@ -86,6 +188,10 @@ def validate_document(raw_body: object) -> ProjectDocumentV1:
     result, errors = upgrade_document_with_errors(raw_body)
     if result is not None:
         return result.document
+    raise_invalid_project_document(errors)
+
+
+def raise_invalid_project_document(errors: list[str]) -> NoReturn:
     raise api_error(
         422,
         "invalid_project_document",
@@ -46,6 +46,17 @@ class DocumentWriteMetrics:
     body_bytes: int = 0
     request_bytes: int = 0
     response_bytes: int = 0
+    # Document sections whose serialized fragment was reused from the basis.
+    reused_sections: int = 0
+    # Bytes of JSON sent to Postgres for the draft body: ``body_bytes`` on a
+    # full rewrite, only the patched sections on a partial update. Not bytes
+    # written: ``jsonb_set`` still stores a whole new jsonb (and TOAST) value.
+    body_bytes_sent: int = 0
+    partial_sections: int = 0
+    # Formula cells evaluated while building the response, and cells taken
+    # unchanged from the basis document's stored overlay.
+    formula_cells_recomputed: int = 0
+    formula_cells_reused: int = 0
 
     @classmethod
     def start(cls) -> DocumentWriteMetrics:
@@ -80,6 +91,11 @@ class DocumentWriteMetrics:
             body_bytes=self.body_bytes,
             request_bytes=self.request_bytes,
             response_bytes=self.response_bytes,
+            reused_sections=self.reused_sections,
+            body_bytes_sent=self.body_bytes_sent,
+            partial_sections=self.partial_sections,
+            formula_cells_recomputed=self.formula_cells_recomputed,
+            formula_cells_reused=self.formula_cells_reused,
         )
 
 
@@ -108,5 +124,13 @@ def measure_outgoing_validation() -> Iterator[None]:
         yield
 
 
+def record_formula_cells(*, recomputed: int, reused: int) -> None:
+    metrics = _active_metrics.get()
+    if metrics is None:
+        return
+    metrics.formula_cells_recomputed += recomputed
+    metrics.formula_cells_reused += reused
+
+
 def _rounded(value: float) -> float:
     return round(value, 3)
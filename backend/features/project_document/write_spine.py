@@ -24,17 +24,21 @@ from psycopg import Connection
 from starlette import status
 
 from database import transaction
+from features.assets.reference_index import attachment_tables_in_sections, index_body_references
 from features.assets.reference_validation import validate_document_asset_references
+from features.catalogs.option_usage_index import index_body_option_usage
 from features.project_document import repository
 from features.project_document.document import ProjectDocumentV1
+from features.project_document.document_cache import CachedDocument, document_cache_put, draft_document_key
+from features.project_document.formula.document_evaluator import bind_document_etag
 from features.project_document.models import ProjectDocumentSource
-from features.project_document.store import raise_project_version_not_found, rewrite_draft_if_upgraded
+from features.project_document.store import load_draft_document, load_saved_document, raise_project_version_not_found
 from features.project_document.validation import (
-    document_etag,
+    SerializedProjectDocument,
     enforce_document_body_size,
     next_draft_etag_from_etag,
-    upgrade_document_with_errors,
-    validate_document,
+    raise_invalid_project_document,
+    serialize_document,
 )
 from features.project_document.write_metrics import (
     DocumentWriteMetrics,
@@ -56,6 +60,22 @@ DocumentMutation = Callable[
 OnPersisted = Callable[[Connection[Any], dict[str, object] | None], None]
 
 
+@dataclass(frozen=True)
+class DraftBasis:
+    """The ETag-gated body a mutation starts from, as ``load_draft_basis`` found it.
+
+    ``serialized`` is the basis's section-by-section serialization when the
+    document cache had one (the previous write through this spine put it
+    there); the next write then reserializes only the sections it changed.
+    """
+
+    body: ProjectDocumentV1
+    serialized: SerializedProjectDocument | None
+    base_version_etag: str
+    version_etag: str
+    draft: dict[str, Any] | None
+
+
 def load_draft_context(
     conn: Connection[Any],
     project_id: UUID,
@@ -69,16 +89,44 @@ def load_draft_context(
 ) -> tuple[ProjectDocumentV1, str, str, dict[str, Any] | None]:
     """Load + ETag-gate the draft basis used by every mutating draft op.
 
+    Returns ``(base_body, base_version_etag, version_etag, draft_or_none)``;
+    see ``load_draft_basis``.
+    """
+    basis = load_draft_basis(
+        conn,
+        project_id,
+        version_id,
+        user_id,
+        if_match,
+        if_match_version,
+        draft_etag_mismatch_message=draft_etag_mismatch_message,
+        metrics=metrics,
+    )
+    return basis.body, basis.base_version_etag, basis.version_etag, basis.draft
+
+
+def load_draft_basis(
+    conn: Connection[Any],
+    project_id: UUID,
+    version_id: UUID,
+    user_id: UUID,
+    if_match: str | None,
+    if_match_version: str | None,
+    *,
+    draft_etag_mismatch_message: str,
+    metrics: DocumentWriteMetrics | None = None,
+) -> DraftBasis:
+    """Load + ETag-gate the draft basis used by every mutating draft op.
+
     Locks the version row, rejects writes against a locked version, then
     decides whether the basis is the saved version body (no draft yet) or
     the current draft. The right ETag header is checked depending on which
     basis we're using.
 
-    Returns ``(base_body, base_version_etag, version_etag, draft_or_none)``.
-    `version_etag` is always the hash of the *saved* version body — useful
+    `version_etag` is always the ETag of the *saved* version body — useful
     for the no-op response branch that still needs to advertise it.
     """
-    version = repository.get_project_version_for_update(conn, project_id, version_id)
+    version = repository.get_project_version_metadata_for_update(conn, project_id, version_id)
     if version is None:
         raise_project_version_not_found()
     if version["locked"]:
@@ -89,9 +137,12 @@ def load_draft_context(
         )
 
     with metrics.measure("version_parse_ms") if metrics is not None else nullcontext():
-        version_body = validate_document(version["body"])
-    version_etag = document_etag(version_body)
-    draft = repository.get_draft_for_update(conn, version_id, user_id)
+        saved = load_saved_document(conn, project_id, version)
+    if saved.parsed is None:
+        raise_invalid_project_document(saved.errors)
+    version_body = saved.parsed.document
+    version_etag = saved.parsed.etag
+    draft = repository.get_draft_stamp_for_update(conn, version_id, user_id)
 
     if draft is None:
         if if_match_version != version_etag:
@@ -101,7 +152,13 @@ def load_draft_context(
                 "The saved version changed before this draft was created.",
                 {"expected": version_etag},
             )
-        return version_body, version_etag, version_etag, None
+        return DraftBasis(
+            body=version_body,
+            serialized=saved.parsed.serialized,
+            base_version_etag=version_etag,
+            version_etag=version_etag,
+            draft=None,
+        )
 
     stored_draft_etag = str(draft["draft_etag"])
     if if_match != stored_draft_etag:
@@ -113,15 +170,11 @@ def load_draft_context(
         )
 
     with metrics.measure("draft_parse_ms") if metrics is not None else nullcontext():
-        draft_result, draft_errors = upgrade_document_with_errors(draft["body"])
-    if draft_result is None:
-        raise api_error(
-            status.HTTP_422_UNPROCESSABLE_CONTENT,
-            "invalid_project_document",
-            "Project document failed validation.",
-            {"errors": draft_errors},
-        )
-    base_body, draft_etag, _last_patched_at = rewrite_draft_if_upgraded(conn, draft, draft_result)
+        draft_load = load_draft_document(conn, draft)
+    if draft_load.parsed is None:
+        raise_invalid_project_document(draft_load.errors)
+    base_body = draft_load.parsed.document
+    draft_etag = draft_load.parsed.etag
 
     if stored_draft_etag != draft_etag:
         raise api_error(
@@ -130,8 +183,13 @@ def load_draft_context(
             draft_etag_mismatch_message,
             {"expected": draft_etag},
         )
-    base_version_etag = str(draft["base_version_etag"])
-    return base_body, base_version_etag, version_etag, {**draft, "draft_etag": draft_etag}
+    return DraftBasis(
+        body=base_body,
+        serialized=draft_load.parsed.serialized,
+        base_version_etag=str(draft["base_version_etag"]),
+        version_etag=version_etag,
+        draft={**draft, "draft_etag": draft_etag},
+    )
 
 
 @dataclass(frozen=True)
@@ -175,7 +233,7 @@ def apply_document_write(
     transaction_measurement = metrics.measure("txn_ms") if metrics is not None else nullcontext()
     with transaction_measurement:
         with transaction() as conn:
-            base_body, base_version_etag, version_etag, draft = load_draft_context(
+            basis = load_draft_basis(
                 conn,
                 access.project_id,
                 version_id,
@@ -185,6 +243,7 @@ def apply_document_write(
                 draft_etag_mismatch_message=draft_etag_mismatch_message,
                 metrics=metrics,
             )
+            base_body, version_etag, draft = basis.body, basis.version_etag, basis.draft
 
             outgoing_before = metrics.outgoing_validate_ms if metrics is not None else 0.0
             mutate_started_at = perf_counter()
@@ -204,24 +263,74 @@ def apply_document_write(
                     details=details,
                 )
 
-            if validate_asset_references:
-                with metrics.measure("asset_check_ms") if metrics is not None else nullcontext():
-                    validate_document_asset_references(conn, project_id=access.project_id, body=next_body)
             with metrics.measure("serialize_ms") if metrics is not None else nullcontext():
-                serialized_next = enforce_document_body_size(next_body)
+                serialized_next = enforce_document_body_size(next_body, serialize_document(next_body, basis.serialized))
             if metrics is not None:
                 metrics.body_bytes = serialized_next.size_bytes
+                metrics.reused_sections = serialized_next.reused_sections
+            # Attachment tables outside the changed sections were checked when
+            # the basis was written, so only the changed ones are re-checked
+            # and re-indexed.
+            changed_attachment_tables = attachment_tables_in_sections(serialized_next.changed_paths)
+            if validate_asset_references and changed_attachment_tables:
+                with metrics.measure("asset_check_ms") if metrics is not None else nullcontext():
+                    validate_document_asset_references(
+                        conn,
+                        project_id=access.project_id,
+                        body=next_body,
+                        table_keys=changed_attachment_tables,
+                    )
             with metrics.measure("sql_ms") if metrics is not None else nullcontext():
-                draft_etag = repository.upsert_draft(
+                persisted, draft_write = _persist_draft(
                     conn,
+                    basis,
                     version_id,
                     user_id,
                     next_body,
-                    base_version_etag,
+                    serialized_next,
                     next_draft_etag_from_etag(serialized_next.etag),
                     updated_via=updated_via,
-                    serialized_body=serialized_next,
                 )
+            if metrics is not None:
+                metrics.body_bytes_sent = draft_write.bytes_sent
+                metrics.partial_sections = draft_write.partial_sections
+            draft_etag = str(persisted["draft_etag"])
+            basis_indexed = draft is not None and draft.get("asset_references_revision") == draft["body_revision"]
+            options_indexed = draft is not None and draft.get("option_usage_revision") == draft["body_revision"]
+            index_body_references(
+                conn,
+                version_id=version_id,
+                draft_user_id=user_id,
+                body=next_body,
+                body_revision=int(persisted["body_revision"]),
+                table_keys=changed_attachment_tables if basis_indexed else None,
+            )
+            index_body_option_usage(
+                conn,
+                version_id=version_id,
+                draft_user_id=user_id,
+                body=next_body,
+                body_revision=int(persisted["body_revision"]),
+                changed_sections=serialized_next.changed_paths if options_indexed else None,
+            )
+            # Seed the cache with the body just written, serialization included,
+            # so the next write against this draft starts from warm fragments.
+            document_cache_put(
+                draft_document_key(version_id, user_id, draft_etag, persisted["body_revision"]),
+                CachedDocument(
+                    document=next_body,
+                    size_bytes=serialized_next.size_bytes,
+                    etag=draft_etag,
+                    serialized=serialized_next,
+                ),
+            )
+            # The response overlays for this body are derived from the basis
+            # body's stored overlays, re-evaluating only the cells it changed.
+            bind_document_etag(
+                next_body,
+                draft_etag,
+                basis_etag=draft["draft_etag"] if draft is not None else version_etag,
+            )
             if on_persisted is not None:
                 on_persisted(conn, details)
 
@@ -232,3 +341,82 @@ def apply_document_write(
         draft_etag=draft_etag,
         details=details,
     )
+
+
+# A partial update is only worth it while the changed sections stay well below
+# the whole body; past this fraction a plain rewrite sends no more bytes.
+PARTIAL_DRAFT_WRITE_MAX_FRACTION = 0.5
+
+
+@dataclass(frozen=True)
+class _DraftWrite:
+    # JSON sent as statement parameters; the row itself is rewritten whole.
+    bytes_sent: int
+    # Sections patched in place; 0 when the whole body was rewritten.
+    partial_sections: int
+
+
+def _persist_draft(
+    conn: Connection[Any],
+    basis: DraftBasis,
+    version_id: UUID,
+    user_id: UUID,
+    next_body: ProjectDocumentV1,
+    serialized_next: SerializedProjectDocument,
+    draft_etag: str,
+    *,
+    updated_via: str,
+) -> tuple[dict[str, Any], _DraftWrite]:
+    """Write the next draft body, patching only its changed sections when safe.
+
+    The patch path needs an existing draft row and the basis's own serialized
+    form (so the changed sections are known relative to exactly the stored
+    body). Everything else — the first write from a saved version, a basis
+    loaded without fragments, a shape change, or a patch that lost a race on
+    ``body_revision`` — falls back to the full upsert. Both paths run under the
+    same row lock and mint the same draft ETag.
+
+    A patch saves the JSON sent to, parsed and cast by the server, not storage
+    I/O: Postgres writes the ``jsonb_set`` result as a whole new row version.
+    """
+    sections = _partial_draft_sections(basis, serialized_next)
+    if sections is not None and basis.draft is not None:
+        patched = repository.patch_draft_sections(
+            conn,
+            version_id,
+            user_id,
+            sections=sections,
+            schema_version=next_body.schema_version,
+            expected_body_revision=int(basis.draft["body_revision"]),
+            draft_etag=draft_etag,
+            updated_via=updated_via,
+        )
+        if patched is not None:
+            sent = sum(len(json_text) for _path, json_text in sections)
+            return patched, _DraftWrite(bytes_sent=sent, partial_sections=len(sections))
+    persisted = repository.upsert_draft_row(
+        conn,
+        version_id,
+        user_id,
+        next_body,
+        basis.base_version_etag,
+        draft_etag,
+        updated_via=updated_via,
+        serialized_body=serialized_next,
+    )
+    return persisted, _DraftWrite(bytes_sent=serialized_next.size_bytes, partial_sections=0)
+
+
+def _partial_draft_sections(
+    basis: DraftBasis,
+    serialized_next: SerializedProjectDocument,
+) -> list[tuple[tuple[str, ...], str]] | None:
+    if basis.draft is None or basis.serialized is None:
+        return None
+    if basis.serialized.sections.keys() != serialized_next.sections.keys():
+        return None
+    changed = serialized_next.changed_paths
+    changed_bytes = sum(len(serialized_next.sections[path].json_text) for path in changed)
+    if not changed or changed_bytes > serialized_next.size_bytes * PARTIAL_DRAFT_WRITE_MAX_FRACTION:
+        return None
+    return [(path, serialized_next.sections[path].json_text) for path in changed]
@@ -1,22 +1,35 @@
-"""Derived geodata clients and climate-zone lookup for project locations."""
+"""Derived geodata clients and climate-zone lookup for project locations.
+
+Every external call goes through one process-wide HTTP client, so repeated
+lookups reuse kept-alive TLS connections to the same providers. County,
+elevation and address-geocoder answers are cached and coalesced by
+``geodata_cache``; the ``fetch_*`` chains below stay uncached so tests can
+drive them with a fake fetcher.
+"""
 
 from __future__ import annotations
 
 import json
 import ssl
+import threading
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
 import certifi
-from pydantic import BaseModel, ConfigDict, Field
+import httpx
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from starlette import status
 
 from config import settings
+from features.project_location.geodata_cache import (
+    address_key,
+    coordinate_key,
+    geodata_lookup_cache,
+    round_coordinates,
+)
 from features.project_location.locality_index import is_zip_only_query, load_locality_index, search_localities
 from features.project_location.models import GeocodeProjectLocationCandidate
 from features.project_location.reference_data import load_county_reference_rows
@@ -25,6 +38,9 @@ from features.shared.errors import api_error
 JsonFetcher = Callable[[str], dict[str, Any]]
 
 _SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+ELEVATION_LOOKUP_WARNING = "Could not derive site elevation from USGS EPQS or Open-Meteo."
+# Threads for the county lookup that runs beside the elevation lookup.
+_LOOKUP_WORKERS = 4
 
 
 class CountyGeodata(BaseModel):
@@ -88,6 +104,24 @@ class AddressGeocoderError(RuntimeError):
     """The live Census address geocoder failed or returned an invalid envelope."""
 
 
+_COUNTY_CACHE = geodata_lookup_cache(
+    "county", lambda: settings.geodata_coordinate_cache_ttl_seconds, TypeAdapter(CountyGeodata)
+)
+_ELEVATION_CACHE = geodata_lookup_cache(
+    "elevation", lambda: settings.geodata_coordinate_cache_ttl_seconds, TypeAdapter(ElevationGeodata | None)
+)
+_ADDRESS_CACHE = geodata_lookup_cache(
+    "address",
+    lambda: settings.geodata_address_cache_ttl_seconds,
+    TypeAdapter(list[GeocodeProjectLocationCandidate]),
+    # A search with no candidates is not cached: the geocoder may match it later.
+    found=bool,
+)
+_HTTP_CLIENT: httpx.Client | None = None
+_LOOKUP_POOL: ThreadPoolExecutor | None = None
+_CLIENTS_LOCK = threading.Lock()
+
+
 def derive_location_geodata(
     latitude: float,
     longitude: float,
@@ -95,11 +129,9 @@ def derive_location_geodata(
 ) -> DerivedLocationGeodata:
     """Derive county/state, elevation, and IECC climate zone from coordinates."""
     resolved_clients = clients or DeriveClients()
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        county_future = executor.submit(fetch_county_geodata, latitude, longitude, resolved_clients.fetch_json)
-        elevation_future = executor.submit(fetch_elevation_geodata, latitude, longitude, resolved_clients.fetch_json)
-        county = county_future.result()
-        elevation, elevation_warning = elevation_future.result()
+    county_future = _lookup_pool().submit(cached_county_geodata, latitude, longitude, resolved_clients.fetch_json)
+    elevation, elevation_warning = cached_elevation_geodata(latitude, longitude, resolved_clients.fetch_json)
+    county = county_future.result()
     climate_zone = lookup_climate_zone(county.county_fips)
     warnings: list[str] = []
     if elevation_warning is not None:
@@ -138,8 +170,36 @@ def geocode_address(query: str, clients: DeriveClients | None = None) -> list[Ge
     locality_candidates = search_localities(query, index)
     if locality_candidates:
         return locality_candidates
+    address = " ".join(query.split())
+    return _ADDRESS_CACHE.lookup(
+        address_key(address), lambda: _fetch_census_address_candidates(address, resolved_clients.fetch_json)
+    )
+
+
+def cached_county_geodata(latitude: float, longitude: float, fetch_json: JsonFetcher) -> CountyGeodata:
+    """``fetch_county_geodata`` for the rounded coordinates, through the shared cache."""
+    latitude, longitude = round_coordinates(latitude, longitude)
+    return _COUNTY_CACHE.lookup(
+        coordinate_key(latitude, longitude), lambda: fetch_county_geodata(latitude, longitude, fetch_json)
+    )
+
+
+def cached_elevation_geodata(
+    latitude: float,
+    longitude: float,
+    fetch_json: JsonFetcher,
+) -> tuple[ElevationGeodata | None, str | None]:
+    """``fetch_elevation_geodata`` for the rounded coordinates, through the shared cache."""
+    latitude, longitude = round_coordinates(latitude, longitude)
+    elevation = _ELEVATION_CACHE.lookup(
+        coordinate_key(latitude, longitude), lambda: fetch_elevation_geodata(latitude, longitude, fetch_json)[0]
+    )
+    return elevation, None if elevation is not None else ELEVATION_LOOKUP_WARNING
+
+
+def _fetch_census_address_candidates(query: str, fetch_json: JsonFetcher) -> list[GeocodeProjectLocationCandidate]:
     try:
-        payload = resolved_clients.fetch_json(_census_address_url(query))
+        payload = fetch_json(_census_address_url(query))
     except (RuntimeError, ValueError) as exc:
         raise AddressGeocoderError("Census address geocoder request failed.") from exc
     try:
@@ -224,7 +284,7 @@ def fetch_elevation_geodata(
     try:
         return _parse_open_meteo_elevation(fetch_json(_open_meteo_url(latitude, longitude))), None
     except (KeyError, TypeError, ValueError, RuntimeError):
-        return None, "Could not derive site elevation from USGS EPQS or Open-Meteo."
+        return None, ELEVATION_LOOKUP_WARNING
 
 
 def lookup_climate_zone(county_fips: str) -> ClimateZoneGeodata | None:
@@ -238,18 +298,51 @@ def lookup_climate_zone(county_fips: str) -> ClimateZoneGeodata | None:
 
 def fetch_json_url(url: str) -> dict[str, Any]:
     """Fetch a JSON document with the short timeout used by derived-geodata calls."""
-    request = Request(url, headers={"User-Agent": f"ph-navigator/{settings.app_version}"})
     try:
-        with urlopen(request, timeout=settings.location_derive_timeout_seconds, context=_SSL_CONTEXT) as response:
-            body = response.read()
-    except (HTTPError, URLError, TimeoutError) as exc:
+        response = _http_client().get(url)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
         raise RuntimeError(f"External location lookup failed: {url}") from exc
-    payload = json.loads(body.decode("utf-8-sig"))
+    payload = json.loads(response.content.decode("utf-8-sig"))
     if not isinstance(payload, dict):
         raise RuntimeError("External location lookup did not return a JSON object.")
     return payload
 
 
+def shutdown_geodata_clients() -> None:
+    """Close the shared HTTP client and lookup pool; both are rebuilt on next use."""
+    global _HTTP_CLIENT, _LOOKUP_POOL
+    with _CLIENTS_LOCK:
+        client, _HTTP_CLIENT = _HTTP_CLIENT, None
+        pool, _LOOKUP_POOL = _LOOKUP_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+    if client is not None:
+        client.close()
+
+
+def _http_client() -> httpx.Client:
+    global _HTTP_CLIENT
+    with _CLIENTS_LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = httpx.Client(
+                timeout=settings.location_derive_timeout_seconds,
+                verify=_SSL_CONTEXT,
+                follow_redirects=True,
+                headers={"User-Agent": f"ph-navigator/{settings.app_version}"},
+                limits=httpx.Limits(max_keepalive_connections=settings.geodata_http_max_keepalive_connections),
+            )
+        return _HTTP_CLIENT
+
+
+def _lookup_pool() -> ThreadPoolExecutor:
+    global _LOOKUP_POOL
+    with _CLIENTS_LOCK:
+        if _LOOKUP_POOL is None:
+            _LOOKUP_POOL = ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS, thread_name_prefix="geodata-lookup")
+        return _LOOKUP_POOL
+
+
 def _parse_fcc_county(payload: dict[str, Any]) -> CountyGeodata:
     county = payload["County"]
     state = payload["State"]
@@ -0,0 +1,258 @@
+"""Shared cache and single-flight for the external geodata lookups.
+
+Setting a location asks FCC/Census for the county and USGS/Open-Meteo for
+the elevation, and address search asks the Census geocoder. Each of those
+answers is stable for a long time, yet every coordinate change and every
+search made the round-trips again. Answers are now kept in the shared
+``geodata_lookup_cache`` table (migration 0022) for a per-kind TTL, keyed by
+rounded coordinates (:func:`round_coordinates`, :func:`coordinate_key`) or
+a normalized query (:func:`address_key`). Callers make the lookup with the
+rounded/normalized input, so a cached answer is exactly what a fresh lookup
+of its key would return.
+
+Concurrent lookups of one key in this process are coalesced: the first
+caller reads the table and, on a miss, calls the services; the others wait
+for its answer (or its exception). Only answers that found something are
+stored: not None, and for address search not an empty candidate list. So a
+provider outage or a search with no matches is retried on the next lookup. A TTL of 0 disables the
+table for that kind, and a database error is logged and treated as a miss.
+
+Hits, misses, coalesced waits and failed lookups are counted per kind
+(``geodata_cache_stats``, served on the admin API).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, Literal, TypeVar, cast
+
+import structlog
+from psycopg import Error as DatabaseError
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from database import transaction
+from features.project_location import repository
+
+log = structlog.get_logger(__name__)
+
+GeodataLookupKind = Literal["county", "elevation", "address"]
+
+# ~1 m of latitude: far below what county or elevation lookups resolve.
+COORDINATE_DECIMALS = 5
+# Shared-table writes between two sweeps of expired rows, per process.
+EXPIRY_SWEEP_WRITE_INTERVAL = 64
+
+ResultT = TypeVar("ResultT")
+
+
+class GeodataCacheStats(BaseModel):
+    """One lookup kind: this process's counters and the shared table's size."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: GeodataLookupKind
+    ttl_seconds: int
+    hits: int
+    misses: int
+    # Callers that waited on another thread's in-flight lookup of the same key.
+    coalesced: int
+    # Misses whose lookup raised or found nothing; these are not cached.
+    failures: int
+    # Hits over lookups that reached the table; null before the first one.
+    hit_rate: float | None
+    shared_entries: int
+
+
+def round_coordinates(latitude: float, longitude: float) -> tuple[float, float]:
+    """The coordinates a county/elevation lookup is made and cached with."""
+    return round(latitude, COORDINATE_DECIMALS), round(longitude, COORDINATE_DECIMALS)
+
+
+def coordinate_key(latitude: float, longitude: float) -> str:
+    latitude, longitude = round_coordinates(latitude, longitude)
+    return f"{latitude:.{COORDINATE_DECIMALS}f},{longitude:.{COORDINATE_DECIMALS}f}"
+
+
+def address_key(query: str) -> str:
+    """Whitespace-collapsed, case-folded address text for the geocode cache."""
+    return " ".join(query.split()).casefold()
+
+
+def _is_not_none(result: object) -> bool:
+    return result is not None
+
+
+class GeodataLookupCache(Generic[ResultT]):
+    """Shared-table cache of one lookup kind, with in-process single-flight.
+
+    ``found`` tells an answer worth storing from one that found nothing;
+    by default any answer other than None.
+    """
+
+    def __init__(
+        self,
+        kind: GeodataLookupKind,
+        ttl_seconds: Callable[[], int],
+        adapter: TypeAdapter[ResultT],
+        found: Callable[[ResultT], bool] = _is_not_none,
+    ) -> None:
+        self.kind: GeodataLookupKind = kind
+        # Read through a callable so settings changes (and tests) apply at once.
+        self._ttl_seconds = ttl_seconds
+        self._adapter = adapter
+        self._found = found
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[ResultT]] = {}
+        self.hits = self.misses = self.coalesced = self.failures = 0
+
+    def lookup(self, key: str, load: Callable[[], ResultT]) -> ResultT:
+        """The cached answer for ``key``, or ``load()``'s, stored if it found something."""
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+        try:
+            result = self._read_through(key, load)
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.coalesced = self.failures = 0
+
+    def stats(self, shared_entries: int) -> GeodataCacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return GeodataCacheStats(
+                kind=self.kind,
+                ttl_seconds=self._ttl_seconds(),
+                hits=self.hits,
+                misses=self.misses,
+                coalesced=self.coalesced,
+                failures=self.failures,
+                hit_rate=round(self.hits / lookups, 4) if lookups else None,
+                shared_entries=shared_entries,
+            )
+
+    def _read_through(self, key: str, load: Callable[[], ResultT]) -> ResultT:
+        ttl_seconds = self._ttl_seconds()
+        cached = self._shared_get(key) if ttl_seconds > 0 else None
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        try:
+            result = load()
+        except BaseException:
+            self._count_failure()
+            raise
+        found = self._found(result)
+        log.info(
+            "geodata_cache.fetched",
+            kind=self.kind,
+            found=found,
+            fetch_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        if not found:
+            self._count_failure()
+        elif ttl_seconds > 0:
+            self._shared_put(key, result, ttl_seconds)
+        return result
+
+    def _count_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def _shared_get(self, key: str) -> ResultT | None:
+        try:
+            with transaction() as conn:
+                row = repository.get_geodata_lookup(conn, kind=self.kind, lookup_key=key)
+        except DatabaseError as error:
+            log.warning("geodata_cache.read_failed", kind=self.kind, error_type=type(error).__name__)
+            return None
+        return self._adapter.validate_python(row["result"]) if row is not None else None
+
+    def _shared_put(self, key: str, result: ResultT, ttl_seconds: int) -> None:
+        # Round-trip dumps leave out computed fields, which the models'
+        # ``extra="forbid"`` would reject on the way back in.
+        stored = self._adapter.dump_python(result, mode="json", round_trip=True)
+        try:
+            with transaction() as conn:
+                repository.upsert_geodata_lookup(
+                    conn,
+                    kind=self.kind,
+                    lookup_key=key,
+                    result=stored,
+                    ttl_seconds=ttl_seconds,
+                )
+        except DatabaseError as error:
+            log.warning("geodata_cache.write_failed", kind=self.kind, error_type=type(error).__name__)
+            return
+        _count_shared_write()
+
+
+_CACHES: dict[GeodataLookupKind, GeodataLookupCache[object]] = {}
+
+
+def geodata_lookup_cache(
+    kind: GeodataLookupKind,
+    ttl_seconds: Callable[[], int],
+    adapter: TypeAdapter[ResultT],
+    found: Callable[[ResultT], bool] = _is_not_none,
+) -> GeodataLookupCache[ResultT]:
+    """Create the process's cache for ``kind`` (once, at import of its caller)."""
+    cache = GeodataLookupCache(kind, ttl_seconds, adapter, found)
+    _CACHES[kind] = cast(GeodataLookupCache[object], cache)
+    return cache
+
+
+def geodata_cache_stats() -> list[GeodataCacheStats]:
+    """Per-kind counters for this process, with the shared table's entry counts."""
+    with transaction() as conn:
+        totals = repository.geodata_lookup_totals(conn)
+    return [cache.stats(totals.get(kind, 0)) for kind, cache in _CACHES.items()]
+
+
+def reset_geodata_cache_stats() -> None:
+    for cache in _CACHES.values():
+        cache.reset()
+
+
+_writes_since_sweep = 0
+_sweep_lock = threading.Lock()
+
+
+def _count_shared_write() -> None:
+    global _writes_since_sweep
+    with _sweep_lock:
+        _writes_since_sweep += 1
+        if _writes_since_sweep < EXPIRY_SWEEP_WRITE_INTERVAL:
+            return
+        _writes_since_sweep = 0
+    try:
+        with transaction() as conn:
+            swept = repository.delete_expired_geodata_lookups(conn)
+    except DatabaseError as error:
+        log.warning("geodata_cache.sweep_failed", error_type=type(error).__name__)
+        return
+    if swept:
+        log.info("geodata_cache.swept", rows=swept)
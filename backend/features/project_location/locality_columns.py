@@ -0,0 +1,356 @@
+"""Columnar, memory-mapped form of the bundled Census locality index.
+
+The CSV artifacts stay the committed source of truth. Their validated rows
+are compiled (:func:`compile_locality_columns`, written at build time by
+``scripts.compile_locality_index``) into one binary file of fixed-width,
+sorted columns that every worker maps read-only, so the index is shared
+through the page cache instead of being parsed into ~50k Python records per
+process, and a worker start reads a small JSON header rather than the CSVs.
+
+Layout: an 8-byte magic, a little-endian uint32 header length, the JSON
+header (:class:`_CompiledHeader`), then 8-byte-aligned column payloads:
+
+- ``keys``: ``normalized_name \\x01 state`` as fixed-width ASCII, sorted, so an
+  exact name/state match and a name prefix are each one contiguous range
+  found by binary search; rows sharing a key are in the stable
+  kind/name/GEOID order;
+- ``kinds``, ``states``, ``county_fips``, ``geoids``: fixed-width per row;
+- ``name_offsets`` and ``source_name_offsets``: row boundaries in the UTF-8
+  ``text`` heap (display names keep their accents);
+- ``latitude_e6`` and ``longitude_e6``: int32 micro-degrees. Gazetteer
+  internal points carry six decimals, so these decode to exactly the CSV
+  value in half the space of float64 (float32 would not round-trip them);
+- ``zcta_codes`` (sorted) with ``zcta_latitude_e6``/``zcta_longitude_e6``.
+
+The header records the source artifacts' SHA-256 and row counts and the
+SHA-256 of the payload; a file compiled from other artifacts, by another
+format version, or damaged since is rejected with ``ValueError``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import struct
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from features.climate.spatial_index import SphereIndex
+from features.project_location.locality_contract import LOCALITY_KIND_ORDER, LocalityKind
+
+FORMAT_VERSION = 1
+_MAGIC = b"PHNLOCX\x00"
+_PREFIX = struct.Struct("<8sI")
+_ALIGNMENT = 8
+# Below every character of a normalized name, so a name's exact key sorts
+# before every longer name it prefixes.
+_KEY_SEPARATOR = "\x01"
+_MICRODEGREES = 1_000_000
+_KINDS: tuple[LocalityKind, ...] = tuple(sorted(LOCALITY_KIND_ORDER, key=LOCALITY_KIND_ORDER.__getitem__))
+
+Column = npt.NDArray[np.generic]
+
+
+@dataclass(frozen=True)
+class LocalityRecord:
+    kind: LocalityKind
+    state: str
+    county_fips_5: str | None
+    name: str
+    normalized_name: str
+    source_name: str
+    geoid: str
+    latitude: float
+    longitude: float
+
+
+@dataclass(frozen=True)
+class ZctaPoint:
+    latitude: float
+    longitude: float
+
+
+class _ColumnSpec(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    dtype: str
+    count: int
+    # From the start of the payload (the first aligned byte after the header).
+    offset: int
+
+
+class _CompiledHeader(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    format_version: int
+    # Source artifact name -> {"rows": ..., "sha256": ...}, as in the metadata.
+    sources: dict[str, dict[str, object]]
+    localities: int
+    zctas: int
+    payload_sha256: str
+    columns: dict[str, _ColumnSpec]
+
+
+def compile_locality_columns(
+    localities: Sequence[LocalityRecord],
+    zctas: Mapping[str, ZctaPoint],
+    *,
+    sources: Mapping[str, Mapping[str, object]],
+) -> bytes:
+    """Serialize validated records into the compiled index format."""
+    records = sorted(
+        localities,
+        key=lambda record: (
+            _key(record.normalized_name, record.state),
+            LOCALITY_KIND_ORDER[record.kind],
+            record.name,
+            record.geoid,
+        ),
+    )
+    postal_codes = sorted(zctas)
+    name_offsets, source_name_offsets, text = _text_heap(records)
+    columns: dict[str, Column] = {
+        "keys": _fixed_width([_key(record.normalized_name, record.state) for record in records]),
+        "kinds": np.array([LOCALITY_KIND_ORDER[record.kind] for record in records], dtype=np.uint8),
+        "states": _fixed_width([record.state for record in records]),
+        "county_fips": _fixed_width([record.county_fips_5 or "" for record in records]),
+        "geoids": _fixed_width([record.geoid for record in records]),
+        "name_offsets": name_offsets,
+        "source_name_offsets": source_name_offsets,
+        "text": text,
+        "latitude_e6": _microdegrees([record.latitude for record in records]),
+        "longitude_e6": _microdegrees([record.longitude for record in records]),
+        "zcta_codes": _fixed_width(postal_codes),
+        "zcta_latitude_e6": _microdegrees([zctas[code].latitude for code in postal_codes]),
+        "zcta_longitude_e6": _microdegrees([zctas[code].longitude for code in postal_codes]),
+    }
+
+    payload = bytearray()
+    specs: dict[str, _ColumnSpec] = {}
+    for name, column in columns.items():
+        payload.extend(b"\x00" * (-len(payload) % _ALIGNMENT))
+        specs[name] = _ColumnSpec(dtype=column.dtype.str, count=len(column), offset=len(payload))
+        payload.extend(column.tobytes())
+    header = _CompiledHeader(
+        format_version=FORMAT_VERSION,
+        sources={name: dict(details) for name, details in sources.items()},
+        localities=len(records),
+        zctas=len(postal_codes),
+        payload_sha256=hashlib.sha256(payload).hexdigest(),
+        columns=specs,
+    )
+    header_bytes = header.model_dump_json().encode()
+    prefix = _PREFIX.pack(_MAGIC, len(header_bytes)) + header_bytes
+    return prefix + b"\x00" * (-len(prefix) % _ALIGNMENT) + payload
+
+
+class LocalityColumns:
+    """Read-only queries over one compiled index buffer.
+
+    Rows are materialized as :class:`LocalityRecord` only for the positions a
+    query returns.
+    """
+
+    def __init__(self, buffer: mmap.mmap | bytes, *, sources: Mapping[str, Mapping[str, object]]) -> None:
+        view = memoryview(buffer)
+        if len(view) < _PREFIX.size:
+            raise ValueError("Compiled locality index is truncated.")
+        magic, header_length = _PREFIX.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Compiled locality index has an unknown format.")
+        header_end = _PREFIX.size + header_length
+        payload_start = header_end + -header_end % _ALIGNMENT
+        try:
+            header = _CompiledHeader.model_validate_json(bytes(view[_PREFIX.size : header_end]))
+        except ValidationError as exc:
+            raise ValueError("Compiled locality index has an invalid header.") from exc
+        if header.format_version != FORMAT_VERSION:
+            raise ValueError(f"Compiled locality index format {header.format_version} is not {FORMAT_VERSION}.")
+        if header.sources != {name: dict(details) for name, details in sources.items()}:
+            raise ValueError("Compiled locality index was built from other artifacts.")
+        if hashlib.sha256(view[payload_start:]).hexdigest() != header.payload_sha256:
+            raise ValueError("Compiled locality index integrity check failed.")
+
+        # Keep the mapping alive as long as the column views over it.
+        self._buffer = buffer
+        self._columns = {
+            name: np.frombuffer(
+                buffer, dtype=np.dtype(spec.dtype), count=spec.count, offset=payload_start + spec.offset
+            )
+            for name, spec in header.columns.items()
+        }
+        self._keys = self._column("keys", header.localities)
+        self._states = self._column("states", header.localities)
+        self._zcta_codes = self._column("zcta_codes", header.zctas)
+
+    @classmethod
+    def open(cls, path: Path, *, sources: Mapping[str, Mapping[str, object]]) -> LocalityColumns:
+        """Map the compiled file at ``path`` read-only."""
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, sources=sources)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def matches(self, state: str, normalized_name: str) -> list[LocalityRecord]:
+        """Rows with exactly this normalized name in ``state``, in stable order."""
+        start, stop = self._exact_range(_key(normalized_name, state))
+        return self._records(np.arange(start, stop))
+
+    def prefix_matches(self, prefix: str, *, state: str | None = None, limit: int) -> list[LocalityRecord]:
+        """Rows whose normalized name starts with ``prefix``, in key order.
+
+        Key order puts an exact name before longer names it prefixes, then
+        sorts alphabetically by name and state.
+        """
+        if not prefix or limit <= 0:
+            return []
+        start, stop = self._prefix_range(prefix)
+        positions = np.arange(start, stop)
+        if state is not None:
+            positions = positions[self._states[start:stop] == state.encode("ascii", "ignore")]
+        return self._records(positions[:limit])
+
+    def nearest(self, latitude: float, longitude: float, *, limit: int) -> list[LocalityRecord]:
+        """The ``limit`` rows whose internal points are nearest, nearest first."""
+        return self._records(self._sphere.nearest(latitude, longitude, limit))
+
+    def group_size(self, record: LocalityRecord) -> int:
+        """How many rows share ``record``'s normalized name and state."""
+        start, stop = self._exact_range(_key(record.normalized_name, record.state))
+        return stop - start
+
+    def zcta(self, postal_code: str) -> ZctaPoint | None:
+        encoded = postal_code.encode("ascii", "ignore")
+        if len(encoded) > self._zcta_codes.dtype.itemsize:
+            return None
+        position = int(np.searchsorted(self._zcta_codes, encoded))
+        if position == len(self._zcta_codes) or self._zcta_codes[position] != encoded:
+            return None
+        return ZctaPoint(
+            _degrees(self._columns["zcta_latitude_e6"][position]),
+            _degrees(self._columns["zcta_longitude_e6"][position]),
+        )
+
+    @cached_property
+    def _sphere(self) -> SphereIndex:
+        # Built on the first coordinate query only: the unit vectors are the
+        # one per-process copy of the index (about 1 MB for the 2025 release).
+        return SphereIndex(
+            self._columns["latitude_e6"] / _MICRODEGREES,
+            self._columns["longitude_e6"] / _MICRODEGREES,
+        )
+
+    def _column(self, name: str, count: int) -> Column:
+        column = self._columns.get(name)
+        if column is None or len(column) != count:
+            raise ValueError(f"Compiled locality index column {name} is missing or mis-sized.")
+        return column
+
+    def _exact_range(self, key: str) -> tuple[int, int]:
+        encoded = key.encode("ascii", "ignore")
+        # A needle wider than the key column would be truncated to it by the
+        # search, and no stored key can equal or start with it anyway.
+        if len(encoded) > self._keys.dtype.itemsize:
+            return 0, 0
+        return (
+            int(np.searchsorted(self._keys, encoded, side="left")),
+            int(np.searchsorted(self._keys, encoded, side="right")),
+        )
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        encoded = prefix.encode("ascii", "ignore")
+        if not encoded or len(encoded) > self._keys.dtype.itemsize:
+            return 0, 0
+        # The smallest key above every key that starts with the prefix.
+        upper = encoded[:-1] + bytes([encoded[-1] + 1])
+        return (
+            int(np.searchsorted(self._keys, encoded, side="left")),
+            int(np.searchsorted(self._keys, upper, side="left")),
+        )
+
+    def _records(self, positions: npt.NDArray[np.intp]) -> list[LocalityRecord]:
+        # Gather each column once and convert with ``tolist``: indexing numpy
+        # scalars row by row costs several times more per record.
+        columns = self._columns
+        text = columns["text"]
+        names = _text_slices(text, columns["name_offsets"], positions)
+        source_names = _text_slices(text, columns["source_name_offsets"], positions)
+        rows = zip(
+            self._keys[positions].tolist(),
+            columns["kinds"][positions].tolist(),
+            columns["county_fips"][positions].tolist(),
+            columns["geoids"][positions].tolist(),
+            columns["latitude_e6"][positions].tolist(),
+            columns["longitude_e6"][positions].tolist(),
+            names,
+            source_names,
+            strict=True,
+        )
+        records: list[LocalityRecord] = []
+        for key, kind, county_fips, geoid, latitude, longitude, name, source_name in rows:
+            normalized_name, _, state = key.decode("ascii").partition(_KEY_SEPARATOR)
+            records.append(
+                LocalityRecord(
+                    kind=_KINDS[kind],
+                    state=state,
+                    county_fips_5=county_fips.decode("ascii") or None,
+                    name=name,
+                    normalized_name=normalized_name,
+                    source_name=source_name,
+                    geoid=geoid.decode("ascii"),
+                    latitude=latitude / _MICRODEGREES,
+                    longitude=longitude / _MICRODEGREES,
+                )
+            )
+        return records
+
+
+def _key(normalized_name: str, state: str) -> str:
+    return f"{normalized_name}{_KEY_SEPARATOR}{state}"
+
+
+def _fixed_width(values: Sequence[str]) -> Column:
+    encoded = [value.encode("ascii") for value in values]
+    return np.array(encoded, dtype=f"S{max((len(value) for value in encoded), default=1) or 1}")
+
+
+def _text_heap(records: Sequence[LocalityRecord]) -> tuple[Column, Column, Column]:
+    heap = bytearray()
+    name_offsets: list[int] = []
+    source_name_offsets: list[int] = []
+    for field, offsets in (("name", name_offsets), ("source_name", source_name_offsets)):
+        for record in records:
+            offsets.append(len(heap))
+            heap.extend(getattr(record, field).encode("utf-8"))
+        offsets.append(len(heap))
+    return (
+        np.array(name_offsets, dtype="<u4"),
+        np.array(source_name_offsets, dtype="<u4"),
+        np.frombuffer(bytes(heap), dtype=np.uint8),
+    )
+
+
+def _text_slices(text: Column, offsets: Column, positions: npt.NDArray[np.intp]) -> list[str]:
+    bounds = zip(offsets[positions].tolist(), offsets[positions + 1].tolist(), strict=True)
+    return [text[start:stop].tobytes().decode("utf-8") for start, stop in bounds]
+
+
+def _microdegrees(values: Sequence[float]) -> Column:
+    scaled = [round(value * _MICRODEGREES) for value in values]
+    for value, micro in zip(values, scaled, strict=True):
+        if micro / _MICRODEGREES != value:
+            raise ValueError(f"Locality coordinate {value!r} has more than six decimals.")
+    return np.array(scaled, dtype="<i4")
+
+
+def _degrees(microdegrees: np.generic) -> float:
+    # Integer / 1e6 rounds correctly, so this is the CSV's float exactly.
+    return int(microdegrees) / _MICRODEGREES
@@ -1,4 +1,11 @@
-"""Validated, cached search over the bundled Census locality index."""
+"""Validated, cached search over the bundled Census locality index.
+
+The committed CSVs are validated against the metadata's hashes and row counts
+and compiled once into the memory-mapped columnar index of
+``locality_columns.py`` (``scripts.compile_locality_index`` does this at build
+time). A worker maps that compiled file when it matches the pinned artifacts,
+and otherwise recompiles it from the CSVs and rewrites it, best effort.
+"""
 
 from __future__ import annotations
 
@@ -7,15 +14,25 @@ import hashlib
 import io
 import json
 import math
+import os
 import re
-from collections import Counter, defaultdict
+import tempfile
+from collections import Counter
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from functools import cache
 from pathlib import Path
 from typing import cast
 
+import structlog
+
 from features.climate.proximity import haversine_miles
+from features.project_location.locality_columns import (
+    LocalityColumns,
+    LocalityRecord,
+    ZctaPoint,
+    compile_locality_columns,
+)
 from features.project_location.locality_contract import (
     COUNTY_SUBDIVISION_FUNCSTAT_ALLOWLIST,
     LOCALITY_COLUMNS,
@@ -30,46 +47,34 @@ from features.project_location.locality_contract import (
 from features.project_location.models import GeocodeProjectLocationCandidate
 from features.project_location.reference_data import load_county_reference_rows
 
+log = structlog.get_logger(__name__)
+
 MAX_CANDIDATES = 5
+MAX_SUGGESTIONS = 10
 
 _DATA_DIR = Path(__file__).with_name("data")
 _LOCALITY_PATH = _DATA_DIR / f"census_localities_{SOURCE_VINTAGE}.csv"
 _ZCTA_PATH = _DATA_DIR / f"census_zctas_{SOURCE_VINTAGE}.csv"
 _METADATA_PATH = _DATA_DIR / f"census_localities_{SOURCE_VINTAGE}.metadata.json"
+# Derived from the two CSVs; rebuilt when missing or stale, never committed.
+_COMPILED_PATH = _DATA_DIR / f"census_localities_{SOURCE_VINTAGE}.idx"
 _ZIP_ONLY = re.compile(r"\s*\d{5}(?:-\d{4})?\s*")
 _LOCALITY_QUERY = re.compile(
     r"^\s*(?P<name>.+?)(?:,\s*|\s+)(?P<state>[A-Za-z]{2})"
     r"(?:\s+(?P<postal_code>\d{5})(?:-\d{4})?)?\s*$"
 )
+# Typeahead text: a partial name, optionally followed by ", ST" (a state
+# still being typed filters nothing yet).
+_SUGGEST_QUERY = re.compile(r"^\s*(?P<name>[^,]*?)\s*(?:,\s*(?P<state>[A-Za-z]{0,2})\s*)?$")
 
 
 class LocalityIndexError(RuntimeError):
     """The bundled index is missing, corrupt, or incompatible."""
 
 
-@dataclass(frozen=True)
-class LocalityRecord:
-    kind: LocalityKind
-    state: str
-    county_fips_5: str | None
-    name: str
-    normalized_name: str
-    source_name: str
-    geoid: str
-    latitude: float
-    longitude: float
-
-
-@dataclass(frozen=True)
-class ZctaPoint:
-    latitude: float
-    longitude: float
-
-
 @dataclass(frozen=True)
 class LocalityIndex:
-    by_name_and_state: Mapping[tuple[str, str], tuple[LocalityRecord, ...]]
-    zctas: Mapping[str, ZctaPoint]
+    localities: LocalityColumns
     county_names: Mapping[str, str]
 
 
@@ -90,22 +95,62 @@ def clear_locality_index_cache() -> None:
 def _load_locality_index_result() -> LocalityIndex | LocalityIndexError:
     try:
         metadata = _read_metadata(_METADATA_PATH)
-        locality_bytes = _validated_artifact(_LOCALITY_PATH, metadata)
-        zcta_bytes = _validated_artifact(_ZCTA_PATH, metadata)
-        localities = _read_localities(locality_bytes, expected_rows=_artifact_rows(metadata, _LOCALITY_PATH.name))
-        zctas = _read_zctas(zcta_bytes, expected_rows=_artifact_rows(metadata, _ZCTA_PATH.name))
+        localities = _load_columns(metadata)
         county_names = {county_fips: row["county_name"] for county_fips, row in load_county_reference_rows().items()}
     except (OSError, UnicodeError, ValueError, TypeError, AttributeError, csv.Error, json.JSONDecodeError) as exc:
         return LocalityIndexError(str(exc))
+    return LocalityIndex(localities=localities, county_names=county_names)
+
+
+def write_compiled_locality_index() -> Path:
+    """Validate the CSV artifacts and (re)write the compiled index beside them."""
+    metadata = _read_metadata(_METADATA_PATH)
+    _atomic_write(_COMPILED_PATH, _compile_columns(metadata))
+    return _COMPILED_PATH
 
-    grouped: defaultdict[tuple[str, str], list[LocalityRecord]] = defaultdict(list)
-    for locality in localities:
-        grouped[(locality.state, locality.normalized_name)].append(locality)
-    return LocalityIndex(
-        by_name_and_state={key: tuple(value) for key, value in grouped.items()},
-        zctas=zctas,
-        county_names=county_names,
-    )
+
+def _load_columns(metadata: Mapping[str, object]) -> LocalityColumns:
+    sources = _compiled_sources(metadata)
+    try:
+        return LocalityColumns.open(_COMPILED_PATH, sources=sources)
+    except FileNotFoundError:
+        log.info("locality_index.compiling", reason="missing")
+    except (OSError, ValueError) as exc:
+        # The compiled file is derived data: anything wrong with it is
+        # repaired from the validated CSVs rather than being fatal.
+        log.warning("locality_index.compiling", reason=str(exc))
+    compiled = _compile_columns(metadata)
+    try:
+        _atomic_write(_COMPILED_PATH, compiled)
+    except OSError as exc:
+        log.warning("locality_index.compiled_write_failed", error_type=type(exc).__name__)
+        return LocalityColumns(compiled, sources=sources)
+    return LocalityColumns.open(_COMPILED_PATH, sources=sources)
+
+
+def _compile_columns(metadata: Mapping[str, object]) -> bytes:
+    locality_bytes = _validated_artifact(_LOCALITY_PATH, metadata)
+    zcta_bytes = _validated_artifact(_ZCTA_PATH, metadata)
+    localities = _read_localities(locality_bytes, expected_rows=_artifact_rows(metadata, _LOCALITY_PATH.name))
+    zctas = _read_zctas(zcta_bytes, expected_rows=_artifact_rows(metadata, _ZCTA_PATH.name))
+    return compile_locality_columns(localities, zctas, sources=_compiled_sources(metadata))
+
+
+def _compiled_sources(metadata: Mapping[str, object]) -> dict[str, Mapping[str, object]]:
+    """The metadata entries a compiled file must have been built from."""
+    return {path.name: _artifact_details(metadata, path.name) for path in (_LOCALITY_PATH, _ZCTA_PATH)}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as handle:
+        temporary_path = Path(handle.name)
+        handle.write(data)
+    try:
+        temporary_path.chmod(0o644)
+        os.replace(temporary_path, path)
+    except OSError:
+        temporary_path.unlink(missing_ok=True)
+        raise
 
 
 def search_localities(query: str, index: LocalityIndex | None = None) -> list[GeocodeProjectLocationCandidate]:
@@ -116,12 +161,12 @@ def search_localities(query: str, index: LocalityIndex | None = None) -> list[Ge
     resolved_index = index or load_locality_index()
     state = match.group("state").upper()
     normalized_name = normalize_locality_name(match.group("name"))
-    matches = list(resolved_index.by_name_and_state.get((state, normalized_name), ()))
+    matches = resolved_index.localities.matches(state, normalized_name)
     if not matches:
         return []
 
     supplied_postal_code = match.group("postal_code")
-    zcta = resolved_index.zctas.get(supplied_postal_code) if supplied_postal_code else None
+    zcta = resolved_index.localities.zcta(supplied_postal_code) if supplied_postal_code else None
     accepted_postal_code = supplied_postal_code if zcta is not None else None
 
     def sort_key(record: LocalityRecord) -> tuple[float, int, str, str]:
@@ -133,43 +178,113 @@ def search_localities(query: str, index: LocalityIndex | None = None) -> list[Ge
         return distance, LOCALITY_KIND_ORDER[record.kind], record.name, record.geoid
 
     matches.sort(key=sort_key)
-    ambiguous = len(matches) > 1
     selected_matches = matches[:MAX_CANDIDATES]
+    return _labelled_candidates(
+        selected_matches,
+        ambiguous=[len(matches) > 1] * len(selected_matches),
+        postal_code=accepted_postal_code,
+        county_names=resolved_index.county_names,
+    )
+
+
+def suggest_localities(
+    query: str,
+    index: LocalityIndex | None = None,
+    *,
+    limit: int = MAX_SUGGESTIONS,
+) -> list[GeocodeProjectLocationCandidate]:
+    """Typeahead: localities whose name starts with the typed text.
+
+    ``"spring"`` matches Springfield and Spring Lake in every state;
+    ``"spring, nj"`` only in New Jersey. An exact name comes before longer
+    names it prefixes, then names sort alphabetically, then by state.
+    """
+    match = _SUGGEST_QUERY.fullmatch(query)
+    if match is None:
+        return []
+    prefix = normalize_locality_name(match.group("name"))
+    if not prefix:
+        return []
+    resolved_index = index or load_locality_index()
+    state = match.group("state")
+    records = resolved_index.localities.prefix_matches(
+        prefix,
+        state=state.upper() if state and len(state) == 2 else None,
+        limit=limit,
+    )
+    return _labelled_candidates(
+        records,
+        ambiguous=[resolved_index.localities.group_size(record) > 1 for record in records],
+        postal_code=None,
+        county_names=resolved_index.county_names,
+    )
+
+
+def nearest_localities(
+    latitude: float,
+    longitude: float,
+    index: LocalityIndex | None = None,
+    *,
+    limit: int = MAX_CANDIDATES,
+) -> list[GeocodeProjectLocationCandidate]:
+    """Localities whose Census internal points are nearest the coordinates.
+
+    Internal points are representative, not boundaries: the nearest one is a
+    suggestion for the site's town, not proof the site lies within it.
+    """
+    resolved_index = index or load_locality_index()
+    records = resolved_index.localities.nearest(latitude, longitude, limit=limit)
+    return _labelled_candidates(
+        records,
+        ambiguous=[resolved_index.localities.group_size(record) > 1 for record in records],
+        postal_code=None,
+        county_names=resolved_index.county_names,
+    )
+
+
+def is_zip_only_query(query: str) -> bool:
+    return _ZIP_ONLY.fullmatch(query) is not None
+
+
+def _labelled_candidates(
+    records: Sequence[LocalityRecord],
+    *,
+    ambiguous: Sequence[bool],
+    postal_code: str | None,
+    county_names: Mapping[str, str],
+) -> list[GeocodeProjectLocationCandidate]:
+    """Candidates labelled by name, then qualified until every label is unique."""
     labels = [
         _candidate_label(
             record,
-            postal_code=accepted_postal_code,
-            ambiguous=ambiguous,
-            county_names=resolved_index.county_names,
+            postal_code=postal_code,
+            ambiguous=record_ambiguous,
+            county_names=county_names,
         )
-        for record in selected_matches
+        for record, record_ambiguous in zip(records, ambiguous, strict=True)
     ]
     duplicate_labels = Counter(labels)
     labels = [
         _candidate_label(
             record,
-            postal_code=accepted_postal_code,
-            ambiguous=ambiguous,
-            county_names=resolved_index.county_names,
+            postal_code=postal_code,
+            ambiguous=record_ambiguous,
+            county_names=county_names,
             include_source_type=duplicate_labels[label] > 1,
         )
-        for record, label in zip(selected_matches, labels, strict=True)
+        for record, record_ambiguous, label in zip(records, ambiguous, labels, strict=True)
     ]
     duplicate_labels = Counter(labels)
     return [
         _candidate(
             record,
             label=(label if duplicate_labels[label] == 1 else f"{label}, Census GEOID {record.geoid}"),
-            postal_code=accepted_postal_code,
+            postal_code=postal_code,
         )
-        for record, label in zip(selected_matches, labels, strict=True)
+        for record, label in zip(records, labels, strict=True)
     ]
 
 
-def is_zip_only_query(query: str) -> bool:
-    return _ZIP_ONLY.fullmatch(query) is not None
-
-
 def _candidate(
     record: LocalityRecord,
     *,
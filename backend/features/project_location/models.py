@@ -181,6 +181,10 @@ class ElevationLookupRequest(RequiredCoordinatesRequest):
     """Coordinates for a stateless site-elevation lookup (no persistence)."""
 
 
+class NearestLocalitiesRequest(RequiredCoordinatesRequest):
+    """Coordinates to name the nearest bundled Census localities for."""
+
+
 class ElevationLookupResponse(BaseModel):
     """Elevation suggestion for the Set Location modal's auto-fill.
 
@@ -208,6 +212,19 @@ class GeocodeProjectLocationRequest(BaseModel):
         return strip_blank_string(value)
 
 
+class SuggestLocalitiesRequest(BaseModel):
+    """Partially typed town name, optionally followed by ", ST"."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    query: str = Field(min_length=1, max_length=100)
+
+    @field_validator("query", mode="before")
+    @classmethod
+    def strip_query(cls, value: object) -> object:
+        return strip_blank_string(value)
+
+
 class GeocodeProjectLocationCandidate(BaseModel):
     """Typed address or locality candidate returned by Project Location search."""
 
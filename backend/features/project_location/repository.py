@@ -85,6 +85,89 @@ def upsert_location(
     return row
 
 
+def get_sun_path_payload(conn: Connection[Any], project_id: UUID, cache_key: str) -> bytes | None:
+    """Return the project's stored gzip sun-path JSON when it was built for ``cache_key``."""
+    row = conn.execute(
+        """
+        SELECT payload_gzip
+        FROM project_sun_paths
+        WHERE project_id = %(project_id)s
+          AND cache_key = %(cache_key)s
+        """,
+        {"project_id": project_id, "cache_key": cache_key},
+    ).fetchone()
+    return bytes(row["payload_gzip"]) if row else None
+
+
+def put_sun_path_payload(conn: Connection[Any], project_id: UUID, cache_key: str, payload_gzip: bytes) -> None:
+    """Replace the project's stored sun path; a no-op once the project is deleted."""
+    conn.execute(
+        """
+        INSERT INTO project_sun_paths (project_id, cache_key, payload_gzip)
+        SELECT id, %(cache_key)s, %(payload_gzip)s
+        FROM projects
+        WHERE id = %(project_id)s
+        ON CONFLICT (project_id) DO UPDATE
+        SET cache_key = EXCLUDED.cache_key,
+            payload_gzip = EXCLUDED.payload_gzip,
+            created_at = now()
+        """,
+        {"project_id": project_id, "cache_key": cache_key, "payload_gzip": payload_gzip},
+    )
+
+
+def get_geodata_lookup(conn: Connection[Any], *, kind: str, lookup_key: str) -> dict[str, Any] | None:
+    """Return the unexpired cached geodata answer for one lookup key."""
+    return conn.execute(
+        """
+        SELECT result, fetched_at
+        FROM geodata_lookup_cache
+        WHERE kind = %(kind)s
+          AND lookup_key = %(lookup_key)s
+          AND expires_at > now()
+        """,
+        {"kind": kind, "lookup_key": lookup_key},
+    ).fetchone()
+
+
+def upsert_geodata_lookup(
+    conn: Connection[Any],
+    *,
+    kind: str,
+    lookup_key: str,
+    result: object,
+    ttl_seconds: int,
+) -> None:
+    conn.execute(
+        """
+        INSERT INTO geodata_lookup_cache (kind, lookup_key, result, expires_at)
+        VALUES (%(kind)s, %(lookup_key)s, %(result)s, now() + make_interval(secs => %(ttl_seconds)s))
+        ON CONFLICT (kind, lookup_key) DO UPDATE
+        SET result = EXCLUDED.result,
+            fetched_at = now(),
+            expires_at = EXCLUDED.expires_at
+        """,
+        {"kind": kind, "lookup_key": lookup_key, "result": Jsonb(result), "ttl_seconds": ttl_seconds},
+    )
+
+
+def geodata_lookup_totals(conn: Connection[Any]) -> dict[str, int]:
+    """Unexpired cached answers per lookup kind."""
+    rows = conn.execute(
+        """
+        SELECT kind, count(*) AS entries
+        FROM geodata_lookup_cache
+        WHERE expires_at > now()
+        GROUP BY kind
+        """
+    ).fetchall()
+    return {str(row["kind"]): int(row["entries"]) for row in rows}
+
+
+def delete_expired_geodata_lookups(conn: Connection[Any]) -> int:
+    return conn.execute("DELETE FROM geodata_lookup_cache WHERE expires_at <= now()").rowcount
+
+
 def _adapt_value(field: str, value: object) -> object:
     if field == "geodata_provenance":
         return Jsonb(value)
@@ -15,8 +15,10 @@ from features.project_location.models import (
     EpwParseResponse,
     GeocodeProjectLocationRequest,
     GeocodeProjectLocationResponse,
+    NearestLocalitiesRequest,
     ProjectLocation,
     ProjectLocationUpdateResponse,
+    SuggestLocalitiesRequest,
     UpdateProjectLocationRequest,
 )
 from features.project_location.service import (
@@ -24,9 +26,11 @@ from features.project_location.service import (
     derive_weather_source,
     geocode_project_location,
     get_project_location,
-    get_project_sun_path,
+    get_project_sun_path_json,
     lookup_site_elevation,
+    nearest_project_localities,
     parse_epw_location,
+    suggest_project_localities,
     update_project_location,
 )
 from features.project_location.sun_path_schemas import SunPathAndCompassDTOSchema
@@ -58,11 +62,15 @@ def get_location(project_id: UUID, access: ProjectViewAccess) -> ProjectLocation
 
 
 @router.get("/{project_id}/sun-path", response_model=SunPathAndCompassDTOSchema | None)
-def get_sun_path(project_id: UUID, _access: ProjectViewAccess, response: Response) -> SunPathAndCompassDTOSchema | None:
+def get_sun_path(project_id: UUID, _access: ProjectViewAccess) -> Response:
     # Location is editable in place, so the diagram can change -- revalidate
-    # rather than reuse the immutable model_data cache policy (D-SP-1).
-    response.headers["Cache-Control"] = "private, max-age=0"
-    return get_project_sun_path(project_id)
+    # rather than reuse the immutable model_data cache policy (D-SP-1). The
+    # cached JSON is returned as-is; the response model documents its shape.
+    return Response(
+        content=get_project_sun_path_json(project_id),
+        media_type="application/json",
+        headers={"Cache-Control": "private, max-age=0"},
+    )
 
 
 @router.put("/{project_id}/location", response_model=ProjectLocationUpdateResponse)
@@ -104,6 +112,26 @@ def geocode_location(
     return geocode_project_location(payload)
 
 
+@router.post("/{project_id}/location/localities/suggest", response_model=GeocodeProjectLocationResponse)
+def suggest_localities(
+    project_id: UUID,
+    payload: SuggestLocalitiesRequest,
+    access: ProjectEditAccess,
+) -> GeocodeProjectLocationResponse:
+    require_editor_user(access)
+    return suggest_project_localities(payload)
+
+
+@router.post("/{project_id}/location/localities/nearest", response_model=GeocodeProjectLocationResponse)
+def nearest_localities(
+    project_id: UUID,
+    payload: NearestLocalitiesRequest,
+    access: ProjectEditAccess,
+) -> GeocodeProjectLocationResponse:
+    require_editor_user(access)
+    return nearest_project_localities(payload.latitude, payload.longitude)
+
+
 @router.post("/{project_id}/location/elevation", response_model=ElevationLookupResponse)
 def lookup_elevation(
     project_id: UUID,
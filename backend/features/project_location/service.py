@@ -6,7 +6,7 @@ from typing import Any, cast
 from uuid import UUID
 
 import structlog
-from fastapi import Request
+from fastapi import HTTPException, Request
 from psycopg import Connection
 from starlette import status
 
@@ -21,19 +21,20 @@ from features.climate import repository as climate_repository
 from features.climate.epw_catalog import download_epw_zip, nearest_epw_entry
 from features.climate.models import ClimateLocationSummary
 from features.climate.proximity import PhDatasetProvider, build_location_roster, build_proximity_payload
+from features.climate.spatial_index import nearest_dataset_locations
 from features.climate.weather_source import build_weather_source_payload
 from features.project_climate_source import repository as climate_source_repository
 from features.project_climate_source.service import attach_weather_source, upsert_source_by_kind
 from features.project_location import repository
 from features.project_location.derive import (
     AddressGeocoderError,
+    cached_elevation_geodata,
     derive_location_geodata,
-    fetch_elevation_geodata,
     fetch_json_url,
     geocode_address,
 )
 from features.project_location.epw import EPW_HEADER_PREFIX_BYTES, parse_epw_location_header
-from features.project_location.locality_index import LocalityIndexError
+from features.project_location.locality_index import LocalityIndexError, nearest_localities, suggest_localities
 from features.project_location.models import (
     ElevationLookupResponse,
     EpwDescriptor,
@@ -43,9 +44,10 @@ from features.project_location.models import (
     GeocodeProjectLocationResponse,
     ProjectLocation,
     ProjectLocationUpdateResponse,
+    SuggestLocalitiesRequest,
     UpdateProjectLocationRequest,
 )
-from features.project_location.sun_path import build_sun_path
+from features.project_location.sun_path_cache import NULL_SUN_PATH, sun_path_json
 from features.project_location.sun_path_schemas import SunPathAndCompassDTOSchema
 from features.projects.access import ProjectAccess
 from features.shared.errors import api_error
@@ -75,25 +77,23 @@ def get_project_location(project_id: UUID, *, include_private: bool = True) -> P
 
 
 def get_project_sun_path(project_id: UUID) -> SunPathAndCompassDTOSchema | None:
-    """Build the project's sun-path diagram, or None when the location is unset.
+    """The project's sun-path diagram, or None when the location is unset.
 
     Returns None -- never raises -- when there is no location row or
     latitude/longitude are unset, because the sun path is undefined without
-    coordinates. Optional fields fall back to neutral defaults: no elevation
-    -> sea level, no true north -> +Y, no time zone -> the meridian implied
-    by longitude.
+    coordinates (see ``SunPathKey.for_location`` for the other defaults).
     """
+    payload = get_project_sun_path_json(project_id)
+    if payload == NULL_SUN_PATH:
+        return None
+    return SunPathAndCompassDTOSchema.model_validate_json(payload)
+
+
+def get_project_sun_path_json(project_id: UUID) -> bytes:
+    """The serialized ``/sun-path`` body, served from ``sun_path_cache``."""
     with connection() as conn:
         row = repository.get_location(conn, project_id)
-    if row is None or row["latitude"] is None or row["longitude"] is None:
-        return None
-    return build_sun_path(
-        latitude=row["latitude"],
-        longitude=row["longitude"],
-        elevation_m=row["elevation_m"] if row["elevation_m"] is not None else 0.0,
-        true_north_deg=row["true_north_deg"] if row["true_north_deg"] is not None else 0.0,
-        time_zone=row["time_zone"],
-    )
+    return sun_path_json(project_id, row)
 
 
 def update_project_location(
@@ -252,12 +252,7 @@ def geocode_project_location(payload: GeocodeProjectLocationRequest) -> GeocodeP
     try:
         candidates = geocode_address(payload.query)
     except LocalityIndexError as exc:
-        log.error("project_location.locality_index_unavailable", reason=str(exc))
-        raise api_error(
-            status.HTTP_503_SERVICE_UNAVAILABLE,
-            "locality_index_unavailable",
-            "Town search is temporarily unavailable.",
-        ) from exc
+        raise _locality_index_unavailable(exc) from exc
     except AddressGeocoderError as exc:
         log.warning("project_location.address_geocoder_unavailable", reason=str(exc))
         raise api_error(
@@ -268,15 +263,43 @@ def geocode_project_location(payload: GeocodeProjectLocationRequest) -> GeocodeP
     return GeocodeProjectLocationResponse(candidates=candidates)
 
 
+def suggest_project_localities(payload: SuggestLocalitiesRequest) -> GeocodeProjectLocationResponse:
+    """Bundled Census localities whose names start with the typed text."""
+    try:
+        candidates = suggest_localities(payload.query)
+    except LocalityIndexError as exc:
+        raise _locality_index_unavailable(exc) from exc
+    return GeocodeProjectLocationResponse(candidates=candidates)
+
+
+def nearest_project_localities(latitude: float, longitude: float) -> GeocodeProjectLocationResponse:
+    """Bundled Census localities nearest the coordinates, nearest first."""
+    try:
+        candidates = nearest_localities(latitude, longitude)
+    except LocalityIndexError as exc:
+        raise _locality_index_unavailable(exc) from exc
+    return GeocodeProjectLocationResponse(candidates=candidates)
+
+
+def _locality_index_unavailable(exc: LocalityIndexError) -> HTTPException:
+    log.error("project_location.locality_index_unavailable", reason=str(exc))
+    return api_error(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "locality_index_unavailable",
+        "Town search is temporarily unavailable.",
+    )
+
+
 def lookup_site_elevation(latitude: float, longitude: float) -> ElevationLookupResponse:
     """Resolve site elevation for coordinates without persisting or attaching anything.
 
     The Set Location modal calls this to auto-fill its elevation field the moment
     coordinates change. Deliberately lighter than ``derive_project_location``: it
-    reuses the USGS-3DEP-then-Open-Meteo chain but writes no row and attaches no
-    climate sources, so setting a location has no surprise side effects.
+    reuses the (cached) USGS-3DEP-then-Open-Meteo chain but writes no row and
+    attaches no climate sources, so setting a location has no surprise side
+    effects.
     """
-    elevation, warning = fetch_elevation_geodata(latitude, longitude, fetch_json_url)
+    elevation, warning = cached_elevation_geodata(latitude, longitude, fetch_json_url)
     if elevation is None:
         return ElevationLookupResponse(warning=warning)
     return ElevationLookupResponse(elevation_m=elevation.elevation_m, source=elevation.source)
@@ -361,7 +384,7 @@ def auto_attach_certification_source(
     dataset = climate_repository.get_latest_dataset_for_provider(conn, provider)
     if dataset is None:
         return [f"No seeded {provider.upper()} climate dataset is available."]
-    candidate_rows = climate_repository.nearest_locations(
+    candidate_rows = nearest_dataset_locations(
         conn,
         dataset["id"],
         latitude=latitude,
@@ -9,11 +9,12 @@ does not import `project_location`).
 
 from __future__ import annotations
 
+import math
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import numpy as np
 from ladybug.compass import Compass
-from ladybug.dt import DateTime
 from ladybug.location import Location
 from ladybug.sunpath import Sunpath
 from ladybug_geometry.geometry2d.pointvector import Point2D
@@ -47,6 +48,11 @@ _HOURS_PER_DAY = 24
 # Vector components rounded to ~0.006 degrees -- far below visual resolution,
 # and it keeps the wire payload compact.
 _VECTOR_DECIMALS = 4
+# ladybug's calendar is 2017; its Julian days count from 1900-01-01.
+_DAYS_BEFORE_2017 = 42735
+# ladybug's default sunrise depression: the sun's full disc has cleared the
+# horizon (its angular diameter, degrees).
+_SUNRISE_DEPRESSION_DEG = 0.5334
 
 
 def utc_offset_hours(time_zone: str | None, longitude: float) -> float:
@@ -84,10 +90,32 @@ def build_sun_path(
     compass North tick lands on -X (due West). A wrong sign silently rotates
     the whole sun path, so do not "simplify" the identity mapping away.
     """
+    return build_sun_path_at_offset(
+        latitude=latitude,
+        longitude=longitude,
+        elevation_m=elevation_m,
+        true_north_deg=true_north_deg,
+        utc_offset=utc_offset_hours(time_zone, longitude),
+    )
+
+
+def build_sun_path_at_offset(
+    *,
+    latitude: float,
+    longitude: float,
+    elevation_m: float,
+    true_north_deg: float,
+    utc_offset: float,
+) -> SunPathAndCompassDTOSchema:
+    """`build_sun_path` for an already-resolved standard-time UTC offset (hours).
+
+    The diagram depends on the zone only through this offset, which is what
+    `sun_path_cache` keys on.
+    """
     location = Location(
         latitude=latitude,
         longitude=longitude,
-        time_zone=utc_offset_hours(time_zone, longitude),
+        time_zone=utc_offset,
         elevation=elevation_m,
     )
     sun_path = Sunpath.from_location(location, true_north_deg, _DAYLIGHT_SAVING_PERIOD)
@@ -108,46 +136,154 @@ def build_sun_path(
     return SunPathAndCompassDTOSchema(
         sunpath=sunpath_dto,
         compass=compass_dto,
-        sun_positions=_build_sun_position_grid(sun_path, true_north_deg),
+        sun_positions=_build_sun_position_grid(
+            latitude=latitude,
+            longitude=longitude,
+            utc_offset=utc_offset,
+            true_north_deg=true_north_deg,
+        ),
     )
 
 
-def _build_sun_position_grid(sun_path: Sunpath, true_north_deg: float) -> SunPositionGridSchema:
-    """Hourly solar-position grid from the dome's own ``Sunpath`` instance.
+def _build_sun_position_grid(
+    *,
+    latitude: float,
+    longitude: float,
+    utc_offset: float,
+    true_north_deg: float,
+) -> SunPositionGridSchema:
+    """Hourly solar-position grid, computed for the whole year at once.
 
-    Same-instance construction is what guarantees the vectors share the
-    dome's unit-radius, true-north-baked frame (PRD D-2): ladybug builds the
-    analemma vertices from ``sun.position_3d(radius=1)``, which is exactly
-    ``sun_vector_reversed`` -- the unit vector emitted here.
+    A NumPy port of the algorithm behind ladybug's
+    ``Sunpath.calculate_sun_from_hoy`` and ``calculate_sunrise_sunset`` (the
+    NOAA solar equations), for the same location, calendar (ladybug's
+    non-leap 2017) and north angle as the dome's ``Sunpath``. Calling ladybug
+    once per hour was most of a diagram's build time; the port is exact to
+    the emitted 4 decimals, which ``test_grid_matches_ladybug_sunpath`` pins. ladybug draws
+    the analemma vertices from ``sun.position_3d(radius=1)``, i.e. the
+    ``sun_vector_reversed`` emitted here, so the grid stays in the dome's
+    unit-radius, true-north-baked frame (PRD D-2).
     """
-    unit_vectors: list[tuple[float, float, float]] = []
-    sunrise_sunset: list[tuple[float | None, float | None]] = []
-    for day_of_year in range(1, _DAYS_PER_YEAR + 1):
-        day_start_hoy = (day_of_year - 1) * _HOURS_PER_DAY
-        for hour in range(_HOURS_PER_DAY):
-            sun = sun_path.calculate_sun_from_hoy(day_start_hoy + hour)
-            vector = sun.sun_vector_reversed
-            unit_vectors.append(
-                (
-                    round(vector.x, _VECTOR_DECIMALS),
-                    round(vector.y, _VECTOR_DECIMALS),
-                    round(vector.z, _VECTOR_DECIMALS),
-                )
-            )
-        noon = DateTime.from_hoy(day_start_hoy + 12)
-        edges = sun_path.calculate_sunrise_sunset(noon.month, noon.day)
-        sunrise = edges["sunrise"]
-        sunset = edges["sunset"]
-        sunrise_sunset.append(
-            (
-                round(sunrise.float_hour, _VECTOR_DECIMALS) if sunrise is not None else None,
-                round(sunset.float_hour, _VECTOR_DECIMALS) if sunset is not None else None,
-            )
+    days = np.arange(1, _DAYS_PER_YEAR + 1, dtype=np.float64)
+    hours = np.arange(_HOURS_PER_DAY, dtype=np.float64)
+    latitude_rad = math.radians(latitude)
+    # ladybug stores the longitude in radians and converts back.
+    longitude_deg = math.degrees(math.radians(longitude))
+
+    declination, eq_of_time = _solar_geometry(_julian_day(days[:, np.newaxis], hours[np.newaxis, :], utc_offset))
+    # Solar time in minutes, then the hour angle from solar noon (degrees).
+    solar_time = (hours * 60 + eq_of_time + 4 * longitude_deg - 60 * utc_offset) % 1440
+    hour_angle = solar_time / 4 - 180
+    cos_zenith = math.sin(latitude_rad) * np.sin(declination) + math.cos(latitude_rad) * np.cos(declination) * np.cos(
+        np.radians(hour_angle)
+    )
+    zenith = np.arccos(np.clip(cos_zenith, -1.0, 1.0))
+    altitude = 90 - np.degrees(zenith)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        altitude = altitude + _atmospheric_refraction(altitude) / 3600
+        azimuth_cos = (math.sin(latitude_rad) * np.cos(zenith) - np.sin(declination)) / (
+            math.cos(latitude_rad) * np.sin(zenith)
         )
+        azimuth_from_south = np.degrees(np.arccos(azimuth_cos))
+    azimuth = np.where(hour_angle > 0, (azimuth_from_south + 180) % 360, (540 - azimuth_from_south) % 360)
+    # Out-of-domain azimuths only occur exactly at solar noon, where ladybug
+    # also falls back to due south.
+    azimuth = np.where(np.isnan(azimuth), 180.0, azimuth)
+
+    altitude_rad = np.radians(altitude)
+    azimuth_rad = np.radians(azimuth)
+    x = np.cos(altitude_rad) * np.sin(azimuth_rad)
+    y = np.cos(altitude_rad) * np.cos(azimuth_rad)
+    z = np.sin(altitude_rad)
+    if true_north_deg != 0:
+        # Counter-clockwise about +Z by the north angle, as ladybug's Sun does.
+        north = math.radians(true_north_deg)
+        x, y = x * math.cos(north) - y * math.sin(north), x * math.sin(north) + y * math.cos(north)
+    unit_vectors = np.round(np.stack([x, y, z], axis=-1).reshape(-1, 3), _VECTOR_DECIMALS)
+
     return SunPositionGridSchema(
         true_north_deg=true_north_deg,
         hours=[float(hour) for hour in range(_HOURS_PER_DAY)],
         days=list(range(1, _DAYS_PER_YEAR + 1)),
-        unit_vectors=unit_vectors,
-        sunrise_sunset=sunrise_sunset,
+        unit_vectors=[(vx, vy, vz) for vx, vy, vz in unit_vectors.tolist()],
+        sunrise_sunset=_sunrise_sunset(days, latitude=latitude, longitude=longitude, utc_offset=utc_offset),
+    )
+
+
+def _julian_day(day_of_year: np.ndarray, hour: np.ndarray | float, utc_offset: float) -> np.ndarray:
+    # ladybug rounds the day fraction to two decimals before the offset.
+    return _DAYS_BEFORE_2017 + day_of_year + 2415018.5 + np.round(hour * 60 / 1440.0, 2) - utc_offset / 24
+
+
+def _solar_geometry(julian_day: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Solar declination (radians) and equation of time (minutes) per instant."""
+    century = (julian_day - 2451545) / 36525
+    mean_long = (280.46646 + century * (36000.76983 + century * 0.0003032)) % 360
+    mean_anom = 357.52911 + century * (35999.05029 - 0.0001537 * century)
+    eccent = 0.016708634 - century * (0.000042037 + 0.0000001267 * century)
+    eq_of_center = (
+        np.sin(np.radians(mean_anom)) * (1.914602 - century * (0.004817 + 0.000014 * century))
+        + np.sin(np.radians(2 * mean_anom)) * (0.019993 - 0.000101 * century)
+        + np.sin(np.radians(3 * mean_anom)) * 0.000289
+    )
+    apparent_long = mean_long + eq_of_center - 0.00569 - 0.00478 * np.sin(np.radians(125.04 - 1934.136 * century))
+    mean_obliquity = 23 + (26 + (21.448 - century * (46.815 + century * (0.00059 - century * 0.001813))) / 60) / 60
+    obliquity = mean_obliquity + 0.00256 * np.cos(np.radians(125.04 - 1934.136 * century))
+    declination = np.arcsin(np.sin(np.radians(obliquity)) * np.sin(np.radians(apparent_long)))
+    var_y = np.tan(np.radians(obliquity / 2)) ** 2
+    eq_of_time = 4 * np.degrees(
+        var_y * np.sin(2 * np.radians(mean_long))
+        - 2 * eccent * np.sin(np.radians(mean_anom))
+        + 4 * eccent * var_y * np.sin(np.radians(mean_anom)) * np.cos(2 * np.radians(mean_long))
+        - 0.5 * var_y**2 * np.sin(4 * np.radians(mean_long))
+        - 1.25 * eccent**2 * np.sin(np.radians(2 * mean_anom))
     )
+    return declination, eq_of_time
+
+
+def _atmospheric_refraction(altitude: np.ndarray) -> np.ndarray:
+    """Approximate refraction correction in arc-seconds for an apparent altitude."""
+    tan_altitude = np.tan(np.radians(altitude))
+    return np.select(
+        [altitude > 85, altitude > 5, altitude > -0.575],
+        [
+            0.0,
+            58.1 / tan_altitude - 0.07 / tan_altitude**3 + 0.000086 / tan_altitude**5,
+            1735 + altitude * (-518.2 + altitude * (103.4 + altitude * (-12.79 + altitude * 0.711))),
+        ],
+        -20.772 / tan_altitude,
+    )
+
+
+def _sunrise_sunset(
+    days: np.ndarray, *, latitude: float, longitude: float, utc_offset: float
+) -> list[tuple[float | None, float | None]]:
+    """Per day (sunrise, sunset) in decimal hours LST, or None/None with no sunrise."""
+    declination, eq_of_time = _solar_geometry(_julian_day(days, 12.0, utc_offset))
+    latitude_rad = math.radians(latitude)
+    longitude_deg = math.degrees(math.radians(longitude))
+    noon = (720 - 4 * longitude_deg - eq_of_time + utc_offset * 60) / 1440.0
+    with np.errstate(invalid="ignore"):
+        # Degrees; NaN on days the sun never crosses the horizon.
+        sunrise_hour_angle = np.degrees(
+            np.arccos(
+                math.cos(math.pi / 2 + math.radians(_SUNRISE_DEPRESSION_DEG))
+                / (math.cos(latitude_rad) * np.cos(declination))
+                - math.tan(latitude_rad) * np.tan(declination)
+            )
+        )
+    sunrise = _minute_float_hour(24 * (noon - sunrise_hour_angle * 4 / 1440.0))
+    sunset = _minute_float_hour(24 * (noon + sunrise_hour_angle * 4 / 1440.0))
+    return [
+        (None if math.isnan(rise) else rise, None if math.isnan(set_) else set_)
+        for rise, set_ in zip(sunrise.tolist(), sunset.tolist(), strict=True)
+    ]
+
+
+def _minute_float_hour(float_hour: np.ndarray) -> np.ndarray:
+    # ladybug returns whole-minute DateTimes (minutes rounded half-to-even,
+    # as NumPy rounds) and wraps edges that fall on the neighbouring day.
+    whole_hour = np.trunc(float_hour)
+    clock = whole_hour + np.round((float_hour - whole_hour) * 60) / 60
+    clock = np.where(clock < 0, clock + 24, np.where(clock >= 24, clock - 24, clock))
+    return np.round(clock, _VECTOR_DECIMALS)
@@ -0,0 +1,146 @@
+"""Memoized sun-path diagrams for the project sun-path route.
+
+A sun path is a pure function of a project's coordinates, elevation,
+standard-time UTC offset and true north, yet the route rebuilt the whole
+ladybug diagram on every request. :class:`SunPathKey` rounds those inputs
+(well below anything visible on the dome) and digests them with
+:data:`SUN_PATH_BUILDER_VERSION`; the diagram is built from the rounded
+values, so a payload is exactly a function of its key.
+
+Payloads come from two tiers with that key. The first is a per-process LRU
+of the payload JSON, capped at ``sun_path_cache_max_entries``. The second is
+the project's gzip row in ``project_sun_paths`` (migration 0021), so a new
+worker or a deploy does not rebuild. Only a miss in both builds the diagram,
+and the build refills both. A location edit changes the key: the project's
+row no longer matches and is overwritten by the next build.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+from config import settings
+from database import connection, transaction
+from features.project_location import repository
+from features.project_location.sun_path import build_sun_path_at_offset, utc_offset_hours
+
+# Bump when the builder's output changes for the same inputs, so cached
+# diagrams from the old builder stop matching.
+SUN_PATH_BUILDER_VERSION = 1
+# The `/sun-path` body for a project without coordinates.
+NULL_SUN_PATH = b"null"
+
+_COORDINATE_DECIMALS = 6
+_ELEVATION_DECIMALS = 2
+_UTC_OFFSET_DECIMALS = 4
+_TRUE_NORTH_DECIMALS = 6
+
+
+@dataclass(frozen=True)
+class SunPathKey:
+    """The rounded inputs a sun-path diagram is built from."""
+
+    latitude: float
+    longitude: float
+    elevation_m: float
+    utc_offset: float
+    true_north_deg: float
+
+    @classmethod
+    def for_location(cls, row: Mapping[str, Any] | None) -> SunPathKey | None:
+        """Key for a ``project_location`` row, or None when the sun path is undefined.
+
+        There is no sun path without latitude/longitude. Optional fields fall
+        back to neutral defaults: no elevation -> sea level, no true north ->
+        +Y, no time zone -> the meridian implied by longitude.
+        """
+        if row is None or row["latitude"] is None or row["longitude"] is None:
+            return None
+        longitude = float(row["longitude"])
+        return cls(
+            latitude=round(float(row["latitude"]), _COORDINATE_DECIMALS),
+            longitude=round(longitude, _COORDINATE_DECIMALS),
+            elevation_m=round(float(row["elevation_m"] or 0.0), _ELEVATION_DECIMALS),
+            utc_offset=round(utc_offset_hours(row["time_zone"], longitude), _UTC_OFFSET_DECIMALS),
+            true_north_deg=round(float(row["true_north_deg"] or 0.0), _TRUE_NORTH_DECIMALS),
+        )
+
+    @property
+    def digest(self) -> str:
+        material = json.dumps({**asdict(self), "builder_version": SUN_PATH_BUILDER_VERSION}, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+
+def sun_path_json(project_id: UUID, location: Mapping[str, Any] | None) -> bytes:
+    """The serialized diagram for the project's location row, or ``null`` when unset."""
+    key = SunPathKey.for_location(location)
+    if key is None:
+        return NULL_SUN_PATH
+    digest = key.digest
+    payload = _MEMORY.get(digest)
+    if payload is not None:
+        return payload
+
+    with connection() as conn:
+        stored = repository.get_sun_path_payload(conn, project_id, digest)
+    if stored is not None:
+        payload = gzip.decompress(stored)
+    else:
+        diagram = build_sun_path_at_offset(
+            latitude=key.latitude,
+            longitude=key.longitude,
+            elevation_m=key.elevation_m,
+            true_north_deg=key.true_north_deg,
+            utc_offset=key.utc_offset,
+        )
+        payload = diagram.model_dump_json().encode()
+        with transaction() as conn:
+            repository.put_sun_path_payload(conn, project_id, digest, gzip.compress(payload, mtime=0))
+    _MEMORY.put(digest, payload)
+    return payload
+
+
+def reset_sun_path_cache() -> None:
+    _MEMORY.clear()
+
+
+class _PayloadLru:
+    """Entry-capped LRU of diagram JSON by key digest, shared by the request threadpool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, digest: str) -> bytes | None:
+        if settings.sun_path_cache_max_entries <= 0:
+            return None
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is not None:
+                self._entries.move_to_end(digest)
+            return payload
+
+    def put(self, digest: str, payload: bytes) -> None:
+        max_entries = settings.sun_path_cache_max_entries
+        if max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = payload
+            self._entries.move_to_end(digest)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_MEMORY = _PayloadLru()
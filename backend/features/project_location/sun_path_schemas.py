@@ -38,8 +38,9 @@ class SunPathSchema(BaseModel):
 class SunPositionGridSchema(BaseModel):
     """Hourly solar positions for the whole year (sun-study scrubbing).
 
-    Built from the SAME ladybug ``Sunpath`` instance as the dome geometry, so
-    the vectors live in the identical unit-radius, origin-centered,
+    Computed with ladybug's solar-position algorithm (vectorized in
+    ``sun_path.py``) for the SAME location and north angle as the dome's
+    ``Sunpath``, so the vectors live in the identical unit-radius, origin-centered,
     true-north-baked frame as the analemmas/arcs — a grid vector at a whole
     hour coincides exactly with the corresponding analemma vertex. Hours are
     local standard time (DST off) on a 365-day year, matching the dome. The
@@ -6,9 +6,9 @@ from typing import Any
 from uuid import UUID
 
 from psycopg import Connection, sql
-from psycopg.types.json import Jsonb
 
 from features.project_document.document import ProjectDocumentV1
+from features.project_document.repository import serialized_jsonb
 from features.project_document.validation import SerializedProjectDocument, serialize_document
 from features.projects.models import CreateProjectRequest, UpdateProjectRequest
 
@@ -320,18 +320,20 @@ def insert_project_with_initial_version(
     version = conn.execute(
         """
         INSERT INTO project_versions (
-            project_id, name, kind, locked, body, schema_version,
-            body_size_bytes, created_by, updated_by
+            project_id, name, kind, locked, body, version_etag,
+            schema_version, body_size_bytes, created_by, updated_by
         )
         VALUES (
             %(project_id)s, 'Working', 'working', false, %(body)s,
-            %(schema_version)s, %(body_size_bytes)s, %(user_id)s, %(user_id)s
+            %(version_etag)s, %(schema_version)s, %(body_size_bytes)s,
+            %(user_id)s, %(user_id)s
         )
         RETURNING id
         """,
         {
             "project_id": project["id"],
-            "body": Jsonb(serialized.json_value),
+            "body": serialized_jsonb(serialized),
+            "version_etag": serialized.etag,
             "schema_version": body.schema_version,
             "body_size_bytes": body_size_bytes,
             "user_id": owner_id,
@@ -14,10 +14,12 @@ from config import settings
 from database import connection, transaction
 from features.access.capabilities import PROJECT_ACCESS_ALL
 from features.access.user_capabilities import global_capabilities_for_user
+from features.assets.reference_index import index_body_references
 from features.assets.storage_r2 import R2Client
 from features.auth import repository as auth_repository
 from features.auth.models import UserPublic
 from features.auth.service import client_ip, user_agent
+from features.catalogs.option_usage_index import index_body_option_usage
 from features.project_document.templates import empty_project_document
 from features.project_document.validation import enforce_document_body_size
 from features.projects import repository
@@ -148,6 +150,8 @@ def create_project(payload: CreateProjectRequest, user: UserPublic, request_meta
                 serialized_body.size_bytes,
                 serialized_body=serialized_body,
             )
+            index_body_references(conn, version_id=project["active_version_id"], draft_user_id=None, body=body)
+            index_body_option_usage(conn, version_id=project["active_version_id"], draft_user_id=None, body=body)
             auth_repository.log_action(
                 conn,
                 action="project_create",
@@ -0,0 +1,99 @@
+"""Spawned worker-process pools for CPU-heavy feature work.
+
+Envelope screening, HBJSON extraction and asset rendering each keep one
+``ProcessPoolExecutor`` for the life of the process, created on first use.
+Workers are spawned rather than forked: the API process holds a database
+pool and logging locks that a forked child must not inherit.
+
+A worker that dies outright (killed by the OS, or a crash in native code)
+breaks its whole pool. :class:`SpawnedProcessPool` then drops the pool so
+the next job gets fresh workers. :func:`run_with_alarm` is the worker-side
+wall-clock limit.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import signal
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import FrameType
+from typing import Any, TypeVar
+
+__all__ = ["SpawnedProcessPool", "run_with_alarm"]
+
+_T = TypeVar("_T")
+
+
+class SpawnedProcessPool:
+    """A lazily spawned process pool that is discarded once it breaks.
+
+    ``workers`` and ``initargs`` are read each time the pool is created, so
+    settings changed since the last discard take effect. ``initializer``
+    runs once in each worker and must be picklable.
+    """
+
+    def __init__(
+        self,
+        workers: Callable[[], int],
+        *,
+        initializer: Callable[..., object] | None = None,
+        initargs: Callable[[], tuple[Any, ...]] = tuple,
+    ) -> None:
+        self._workers = workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                    initargs=self._initargs(),
+                )
+            return self._pool
+
+    def run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """``fn(*args)`` in a worker, waiting for the result.
+
+        ``BrokenProcessPool`` is re-raised after the pool is discarded.
+        """
+        try:
+            return self.executor().submit(fn, *args).result()
+        except BrokenProcessPool:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        """Drop the pool without waiting; queued jobs are cancelled."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_with_alarm(
+    fn: Callable[..., _T], args: tuple[Any, ...], timeout_seconds: float, timeout_error: BaseException
+) -> _T:
+    """Worker entry point: ``fn(*args)``, raising ``timeout_error`` after ``timeout_seconds``.
+
+    The error is built by the caller (it must pickle) so the message can
+    name the job. A limit of 0 or less runs without an alarm.
+    """
+
+    def timed_out(_signum: int, _frame: FrameType | None) -> None:
+        raise timeout_error
+
+    if timeout_seconds > 0:
+        signal.signal(signal.SIGALRM, timed_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
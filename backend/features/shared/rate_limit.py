@@ -0,0 +1,359 @@
+"""Request budgets shared by the GH router, the agent device flow and login.
+
+A :class:`RateLimitBudget` names a per-route limit and its algorithm:
+
+- ``sliding_window`` — a sliding-window counter. Hits in the current fixed
+  window plus the previous window's hits, weighted by how much of it still
+  overlaps the trailing period. No burst at a window edge, O(1) state per key.
+- ``token_bucket`` — ``limit`` tokens refilled evenly over the period. Suits
+  pollers: a full bucket absorbs a burst, then the steady rate applies.
+
+Only allowed hits are counted, so a client that keeps hammering past its
+budget recovers at the budget's rate instead of locking itself out.
+
+The store is ``settings.rate_limit_backend``. ``memory`` keeps per-process
+state: cheap, but every worker enforces its own copy of the budget. Idle keys
+are pruned once their state is indistinguishable from a fresh key, and each
+budget holds at most ``rate_limit_memory_max_keys`` keys (least recently hit
+evicted first). ``postgres`` shares state across workers through the UNLOGGED
+``rate_limit_buckets`` table (migration 0019), with the database clock as the
+time source; it fails open, since a limiter outage must not take login down.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Literal, Protocol
+
+import structlog
+from psycopg import Connection
+from pydantic import BaseModel
+from starlette import status
+
+from config import settings
+from database import transaction
+from features.shared.errors import api_error
+
+log = structlog.get_logger(__name__)
+
+RateLimitAlgorithm = Literal["sliding_window", "token_bucket"]
+
+_PRUNE_INTERVAL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class RateLimitBudget:
+    """``limit`` hits per ``period_seconds`` for each key of one route family."""
+
+    name: str
+    limit: int
+    period_seconds: float = 60.0
+    algorithm: RateLimitAlgorithm = "sliding_window"
+
+    @property
+    def idle_seconds(self) -> float:
+        """How long after its last hit a key's state equals a fresh key's."""
+        if self.algorithm == "token_bucket":
+            return self.period_seconds
+        return 2 * self.period_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class BucketState:
+    """One key's state.
+
+    ``sliding_window``: ``stamp`` is the current window index, ``current`` and
+    ``previous`` the hits in it and the one before. ``token_bucket``:
+    ``stamp`` is the last refill time and ``current`` the tokens left.
+    """
+
+    stamp: float
+    current: float
+    previous: float = 0.0
+
+
+class RateLimitStats(BaseModel):
+    budget: str
+    backend: str
+    allowed: int
+    limited: int
+    tracked_keys: int | None
+
+
+class RateLimitStore(Protocol):
+    backend: str
+
+    def hit(self, budget: RateLimitBudget, key: str) -> RateLimitDecision: ...
+
+    def reset(self, budget_names: frozenset[str] | None = None) -> None: ...
+
+    def tracked_keys(self, budget_name: str) -> int | None: ...
+
+
+def check_rate_limit(budget: RateLimitBudget, key: str) -> RateLimitDecision:
+    """Record one hit for ``key`` against ``budget`` and return the verdict."""
+    store = _store()
+    decision = store.hit(budget, key)
+    _METRICS.record(budget.name, store.backend, decision.allowed)
+    return decision
+
+
+def enforce_rate_limit(budget: RateLimitBudget, key: str, message: str) -> None:
+    """Raise ``429 rate_limited`` once ``key`` exceeds ``budget``."""
+    decision = check_rate_limit(budget, key)
+    if not decision.allowed:
+        raise api_error(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            "rate_limited",
+            message,
+            {"retry_after_seconds": math.ceil(decision.retry_after_seconds)},
+        )
+
+
+def reset_rate_limits(*budget_names: str) -> None:
+    """Clear the named budgets' state (all budgets when none are named)."""
+    names = frozenset(budget_names) or None
+    _MEMORY_STORE.reset(names)
+    if settings.rate_limit_backend == "postgres":
+        _POSTGRES_STORE.reset(names)
+    _METRICS.reset(names)
+
+
+def rate_limit_stats() -> list[RateLimitStats]:
+    """Per-budget hit counts of this process since start (or the last reset)."""
+    store = _store()
+    return [
+        RateLimitStats(
+            budget=name,
+            backend=backend,
+            allowed=allowed,
+            limited=limited,
+            tracked_keys=store.tracked_keys(name) if backend == store.backend else None,
+        )
+        for (name, backend), (allowed, limited) in sorted(_METRICS.snapshot().items())
+    ]
+
+
+def apply_hit(budget: RateLimitBudget, state: BucketState | None, now: float) -> tuple[BucketState, RateLimitDecision]:
+    """The algorithm step both stores share: the next state and the verdict."""
+    if budget.algorithm == "token_bucket":
+        return _token_bucket(budget, state, now)
+    return _sliding_window(budget, state, now)
+
+
+def _token_bucket(
+    budget: RateLimitBudget, state: BucketState | None, now: float
+) -> tuple[BucketState, RateLimitDecision]:
+    capacity = float(max(budget.limit, 0))
+    rate = capacity / budget.period_seconds
+    tokens = capacity if state is None else min(capacity, state.current + max(now - state.stamp, 0.0) * rate)
+    if tokens >= 1:
+        return BucketState(now, tokens - 1), RateLimitDecision(True)
+    retry_after = (1 - tokens) / rate if rate > 0 else budget.period_seconds
+    return BucketState(now, tokens), RateLimitDecision(False, retry_after)
+
+
+def _sliding_window(
+    budget: RateLimitBudget, state: BucketState | None, now: float
+) -> tuple[BucketState, RateLimitDecision]:
+    period = budget.period_seconds
+    window = math.floor(now / period)
+    current = previous = 0.0
+    if state is not None and state.stamp == window:
+        current, previous = state.current, state.previous
+    elif state is not None and state.stamp == window - 1:
+        previous = state.current
+    elapsed = now / period - window
+    estimate = previous * (1 - elapsed) + current
+    if estimate + 1 <= budget.limit:
+        return BucketState(window, current + 1, previous), RateLimitDecision(True)
+    retry_after = _window_retry_after(budget, current, previous, elapsed)
+    return BucketState(window, current, previous), RateLimitDecision(False, retry_after)
+
+
+def _window_retry_after(budget: RateLimitBudget, current: float, previous: float, elapsed: float) -> float:
+    """Seconds until one more hit fits, assuming no other hits land meanwhile."""
+    period = budget.period_seconds
+    if current + 1 <= budget.limit and previous > 0:
+        # The previous window's weight has to decay enough.
+        fits_at = 1 - (budget.limit - current - 1) / previous
+        return max(fits_at - elapsed, 0.0) * period
+    # Only the next window's rollover helps; from then on the current hits
+    # decay as the previous window's.
+    fits_at = 1 - (budget.limit - 1) / current if current > 0 and budget.limit >= 1 else 1.0
+    return (1 - elapsed + max(fits_at, 0.0)) * period
+
+
+class _MemoryStore:
+    backend = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # budget name -> key -> (last hit, state), least recently hit first.
+        self._buckets: dict[str, OrderedDict[str, tuple[float, BucketState]]] = {}
+        # budget name -> idle horizon, remembered for the prune pass.
+        self._horizons: dict[str, float] = {}
+        self._pruned_at = monotonic()
+
+    def hit(self, budget: RateLimitBudget, key: str) -> RateLimitDecision:
+        now = monotonic()
+        with self._lock:
+            if now - self._pruned_at >= _PRUNE_INTERVAL_SECONDS:
+                self._prune(now)
+            keys = self._buckets.setdefault(budget.name, OrderedDict())
+            entry = keys.pop(key, None)
+            state, decision = apply_hit(budget, entry[1] if entry else None, now)
+            keys[key] = (now, state)
+            while len(keys) > max(settings.rate_limit_memory_max_keys, 1):
+                keys.popitem(last=False)
+            self._horizons[budget.name] = budget.idle_seconds
+            return decision
+
+    def reset(self, budget_names: frozenset[str] | None = None) -> None:
+        with self._lock:
+            for name in list(self._buckets):
+                if budget_names is None or name in budget_names:
+                    del self._buckets[name]
+
+    def tracked_keys(self, budget_name: str) -> int | None:
+        with self._lock:
+            return len(self._buckets.get(budget_name, ()))
+
+    def _prune(self, now: float) -> None:
+        self._pruned_at = now
+        for name, keys in self._buckets.items():
+            horizon = self._horizons.get(name, 0.0)
+            while keys:
+                last_hit, _state = next(iter(keys.values()))
+                if now - last_hit < horizon:
+                    break
+                keys.popitem(last=False)
+
+
+class _PostgresStore:
+    backend = "postgres"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    def hit(self, budget: RateLimitBudget, key: str) -> RateLimitDecision:
+        try:
+            with transaction() as conn:
+                self._maybe_prune(conn)
+                return self._hit(conn, budget, key)
+        except Exception as exc:
+            log.warning("rate_limit.store_failed", budget=budget.name, error=str(exc))
+            return RateLimitDecision(True)
+
+    def reset(self, budget_names: frozenset[str] | None = None) -> None:
+        with transaction() as conn:
+            if budget_names is None:
+                conn.execute("DELETE FROM rate_limit_buckets")
+            else:
+                conn.execute(
+                    "DELETE FROM rate_limit_buckets WHERE budget = ANY(%(budgets)s)",
+                    {"budgets": sorted(budget_names)},
+                )
+
+    def tracked_keys(self, budget_name: str) -> int | None:
+        with transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT count(*) AS keys
+                FROM rate_limit_buckets
+                WHERE budget = %(budget)s AND idle_after > clock_timestamp()
+                """,
+                {"budget": budget_name},
+            ).fetchone()
+        return int(row["keys"]) if row else 0
+
+    def _hit(self, conn: Connection[Any], budget: RateLimitBudget, key: str) -> RateLimitDecision:
+        # The no-op upsert locks the key's row (inserting it if absent) until
+        # commit, so concurrent workers apply their hits one at a time.
+        row = conn.execute(
+            """
+            INSERT INTO rate_limit_buckets (budget, key, algorithm, stamp, current_count, previous_count, idle_after)
+            VALUES (%(budget)s, %(key)s, %(algorithm)s, NULL, 0, 0, clock_timestamp())
+            ON CONFLICT (budget, key) DO UPDATE SET budget = EXCLUDED.budget
+            RETURNING algorithm, stamp, current_count, previous_count, idle_after,
+                      extract(epoch FROM clock_timestamp())::float8 AS now
+            """,
+            {"budget": budget.name, "key": key, "algorithm": budget.algorithm},
+        ).fetchone()
+        if row is None:
+            raise RuntimeError("Rate-limit upsert did not return a row.")
+        now = float(row["now"])
+        state = None
+        if row["stamp"] is not None and row["algorithm"] == budget.algorithm:
+            state = BucketState(float(row["stamp"]), float(row["current_count"]), float(row["previous_count"]))
+        next_state, decision = apply_hit(budget, state, now)
+        conn.execute(
+            """
+            UPDATE rate_limit_buckets
+            SET algorithm = %(algorithm)s,
+                stamp = %(stamp)s,
+                current_count = %(current)s,
+                previous_count = %(previous)s,
+                idle_after = to_timestamp(%(idle_after)s)
+            WHERE budget = %(budget)s AND key = %(key)s
+            """,
+            {
+                "budget": budget.name,
+                "key": key,
+                "algorithm": budget.algorithm,
+                "stamp": next_state.stamp,
+                "current": next_state.current,
+                "previous": next_state.previous,
+                "idle_after": now + budget.idle_seconds,
+            },
+        )
+        return decision
+
+    def _maybe_prune(self, conn: Connection[Any]) -> None:
+        now = monotonic()
+        with self._lock:
+            if now - self._pruned_at < _PRUNE_INTERVAL_SECONDS:
+                return
+            self._pruned_at = now
+        conn.execute("DELETE FROM rate_limit_buckets WHERE idle_after < clock_timestamp()")
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[tuple[str, str], list[int]] = {}
+
+    def record(self, budget_name: str, backend: str, allowed: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault((budget_name, backend), [0, 0])
+            counts[0 if allowed else 1] += 1
+
+    def snapshot(self) -> dict[tuple[str, str], tuple[int, int]]:
+        with self._lock:
+            return {key: (counts[0], counts[1]) for key, counts in self._counts.items()}
+
+    def reset(self, budget_names: frozenset[str] | None) -> None:
+        with self._lock:
+            for key in list(self._counts):
+                if budget_names is None or key[0] in budget_names:
+                    del self._counts[key]
+
+
+def _store() -> RateLimitStore:
+    return _POSTGRES_STORE if settings.rate_limit_backend == "postgres" else _MEMORY_STORE
+
+
+_MEMORY_STORE = _MemoryStore()
+_POSTGRES_STORE = _PostgresStore()
+_METRICS = _Metrics()
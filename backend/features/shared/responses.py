@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
 
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
 
 
 def json_download_response(content: str, filename: str) -> Response:
@@ -35,6 +37,16 @@ def pdf_download_response(data: bytes, filename: str) -> Response:
     return _download_response(data, filename, "application/pdf")
 
 
+def ndjson_stream_response(lines: Iterable[BaseModel]) -> StreamingResponse:
+    """Stream one JSON document per line, flushing each as it is produced."""
+
+    def encoded() -> Iterator[str]:
+        for line in lines:
+            yield line.model_dump_json() + "\n"
+
+    return StreamingResponse(encoded(), media_type="application/x-ndjson")
+
+
 def download_filename_part(
     value: str,
     fallback: str,
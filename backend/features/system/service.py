@@ -7,6 +7,7 @@ from time import perf_counter
 import structlog
 
 from database import check_connection, pool_stats
+from features.project_document.document_cache import document_cache_stats
 
 log = structlog.get_logger(__name__)
 
@@ -16,5 +17,18 @@ def readiness() -> dict[str, object]:
     ok = check_connection()
     duration_ms = round((perf_counter() - start) * 1000, 2)
     stats = pool_stats()
-    log.info("system.ready", db_ok=ok, db_ms=duration_ms, **stats)
-    return {"status": "ok" if ok else "unavailable", "db": ok, "db_ms": duration_ms, "pool": stats}
+    document_cache = document_cache_stats()
+    log.info(
+        "system.ready",
+        db_ok=ok,
+        db_ms=duration_ms,
+        **stats,
+        **{f"document_cache_{key}": value for key, value in document_cache.items()},
+    )
+    return {
+        "status": "ok" if ok else "unavailable",
+        "db": ok,
+        "db_ms": duration_ms,
+        "pool": stats,
+        "document_cache": document_cache,
+    }
@@ -19,22 +19,28 @@ from features.aperture_drift.routes import router as aperture_drift_router
 from features.aperture_hbjson_export.routes import router as aperture_hbjson_export_router
 from features.aperture_u_value.routes import router as aperture_u_value_router
 from features.apertures.routes import router as apertures_router
+from features.assets.render_pool import shutdown_render_pool
 from features.assets.routes import jobs_router as asset_jobs_router
 from features.assets.routes import router as assets_router
 from features.auth.cookies import sliding_session_cookie_middleware
+from features.auth.password_pool import shutdown_password_pool
 from features.auth.routes import router as auth_router
+from features.auth.session_cache import start_session_cache_listener, stop_session_cache_listener
 from features.catalogs import routers as catalog_routers
 from features.climate.routes import router as climate_router
 from features.envelope.routes import router as envelope_router
+from features.envelope.screening import shutdown_screening_pool
 from features.gh_api.routes import router as gh_api_router
 from features.heat_pumps.routes import router as heat_pumps_router
 from features.mcp.routes import agent_router as agent_token_router
 from features.mcp.routes import router as mcp_token_router
 from features.mcp.server import mcp as phn_mcp
+from features.model_viewer.extraction_jobs import shutdown_extraction_pool
 from features.model_viewer.routes import router as model_viewer_router
 from features.project_climate_source.routes import router as project_climate_source_router
 from features.project_document.routes import diff_router as project_diff_router
 from features.project_document.routes import router as project_document_router
+from features.project_location.derive import shutdown_geodata_clients
 from features.project_location.routes import router as project_location_router
 from features.project_status.routes import router as project_status_router
 from features.projects.routes import router as projects_router
@@ -52,10 +58,17 @@ configure_logging(settings)
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     open_pool()
+    start_session_cache_listener()
     async with phn_mcp.session_manager.run():
         try:
             yield
         finally:
+            stop_session_cache_listener()
+            shutdown_screening_pool()
+            shutdown_extraction_pool()
+            shutdown_render_pool()
+            shutdown_password_pool()
+            shutdown_geodata_clients()
             close_pool()
 
 
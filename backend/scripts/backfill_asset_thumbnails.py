@@ -0,0 +1,74 @@
+"""Render missing or failed asset thumbnails in bulk.
+
+Candidates are uploaded, live assets whose ``thumbnail_status`` is one of
+``--status`` (default ``pending`` and ``failed``): uploads whose interactive
+render never ran, or ran into a timeout or decoder error. Each one goes
+through the render queue at backfill priority, so the command holds at most
+``asset_render_queue_max`` queued jobs at a time. ``--dry-run`` only counts
+the candidates.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from concurrent.futures import Future
+from uuid import UUID
+
+from config import settings
+from database import connection
+from features.assets import repository
+from features.assets.render_pool import RenderPriority, render_queue_stats, shutdown_render_pool
+from features.assets.storage_r2 import R2Client
+from features.assets.thumbnailer import Thumbnailer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render missing or failed project asset thumbnails.")
+    parser.add_argument("project_ids", nargs="*", type=UUID, help="Projects to backfill (default: every project).")
+    parser.add_argument(
+        "--status",
+        action="append",
+        choices=["pending", "failed", "ready", "na"],
+        help="Thumbnail statuses to re-render; repeatable (default: pending and failed).",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Render at most this many assets.")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the candidates.")
+    args = parser.parse_args()
+
+    with connection() as conn:
+        candidates = repository.list_thumbnail_backfill_candidates(
+            conn,
+            project_ids=args.project_ids or None,
+            statuses=args.status or ["pending", "failed"],
+            limit=args.limit,
+        )
+    if args.dry_run:
+        print(json.dumps({"candidates": len(candidates)}, indent=2, sort_keys=True))
+        return
+
+    thumbnailer = Thumbnailer(R2Client(settings))
+    jobs: list[Future[str | None]] = []
+    try:
+        for candidate in candidates:
+            jobs.append(
+                thumbnailer.queue_render(UUID(str(candidate["project_id"])), candidate["id"], RenderPriority.BACKFILL)
+            )
+        outcomes = Counter(_outcome(job) for job in jobs)
+        stats = [row.model_dump() for row in render_queue_stats() if row.priority == "backfill"]
+    finally:
+        shutdown_render_pool()
+    print(json.dumps({"candidates": len(candidates), "outcomes": outcomes, "queue": stats}, indent=2, sort_keys=True))
+
+
+def _outcome(job: Future[str | None]) -> str:
+    try:
+        status = job.result()
+    except Exception:
+        return "error"
+    return status or "missing"
+
+
+if __name__ == "__main__":
+    main()
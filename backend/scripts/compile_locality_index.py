@@ -0,0 +1,36 @@
+"""Compile the bundled Census locality CSVs into the memory-mapped index.
+
+Workers map ``features/project_location/data/census_localities_2025.idx``
+instead of parsing the CSVs. Run this at build time so no worker compiles it
+on its first town search (a worker that finds it missing or stale rebuilds
+it, best effort):
+
+    uv run python -m scripts.compile_locality_index
+
+The CSVs are validated against the metadata's hashes and row counts first.
+Missing or invalid CSVs are reported and the command still exits 0: the
+deploy build must not fail on them, since a worker without the index only
+answers town search with ``locality_index_unavailable``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from features.project_location.locality_index import LocalityIndexError, write_compiled_locality_index
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    argparse.ArgumentParser(description=__doc__).parse_args(argv)
+    try:
+        path = write_compiled_locality_index()
+    except (LocalityIndexError, OSError, ValueError) as exc:
+        print(f"Skipped compiling the locality index: {exc}", file=sys.stderr)
+        return
+    print(f"Wrote compiled locality index to {path} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
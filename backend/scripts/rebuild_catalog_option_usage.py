@@ -0,0 +1,48 @@
+"""Backfill and audit the ``project_catalog_option_usage`` index.
+
+Report-only by default: every saved and draft body is re-parsed and compared
+with its usage rows, and the drift is printed per project. ``--apply``
+rewrites drifted rows and stamps every body as indexed, one transaction per
+project. ``--strict`` exits non-zero when any drift was found, for use as a
+periodic check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+from uuid import UUID
+
+from database import connection, transaction
+from features.catalogs.option_usage_index import rebuild_project_option_usage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill or audit the catalog option usage index.")
+    parser.add_argument("project_ids", nargs="*", type=UUID, help="Projects to check (default: every project).")
+    parser.add_argument("--apply", action="store_true", help="Repair drifted rows instead of only reporting them.")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when any project had drift.")
+    args = parser.parse_args()
+
+    project_ids: list[UUID] = args.project_ids or _all_project_ids()
+    report: dict[str, object] = {}
+    drifted = 0
+    for project_id in project_ids:
+        with transaction() as conn:
+            drift = rebuild_project_option_usage(conn, project_id, apply=args.apply)
+        drifted += drift.bodies_drifted
+        report[str(project_id)] = asdict(drift)
+    print(json.dumps(report, indent=2, sort_keys=True))
+    if args.strict and drifted:
+        raise SystemExit(1)
+
+
+def _all_project_ids() -> list[UUID]:
+    with connection() as conn:
+        rows = conn.execute("SELECT id FROM projects ORDER BY id").fetchall()
+    return [UUID(str(row["id"])) for row in rows]
+
+
+if __name__ == "__main__":
+    main()
@@ -23,11 +23,11 @@ from pydantic import BaseModel, Field
 from config import settings
 from database import transaction
 from features.auth.service import create_or_update_user
-from features.climate import repository as climate_repository
 from features.climate.importers import get_provider
 from features.climate.object_store import ClimateBundleStore
 from features.climate.seeding import seed_all_from_object_store
 from features.climate.service import SeedResult
+from features.climate.spatial_index import nearest_dataset_locations
 from features.heat_pumps.models import (
     HeatPumpIndoorEquipRow,
     HeatPumpIndoorEquipTableEnvelope,
@@ -502,13 +502,13 @@ def _pin_nearest_phi_source(
 ) -> dict[str, Any] | None:
     """Attach the PHI station nearest the project site as the advisory PHI source.
 
-    Symmetric with the Phius source; reuses the backend nearest-station query
+    Symmetric with the Phius source; reuses the backend nearest-station index
     so no proximity math lives here. Returns ``None`` when PHI is unpublished
     or its dataset has no located stations.
     """
     if phi is None:
         return None
-    nearest = climate_repository.nearest_locations(
+    nearest = nearest_dataset_locations(
         conn, phi.dataset_id, latitude=float(site["latitude"]), longitude=float(site["longitude"]), limit=1
     )
     if not nearest:
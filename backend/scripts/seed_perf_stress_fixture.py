@@ -10,13 +10,13 @@ from urllib.parse import quote
 from uuid import UUID
 
 from psycopg import Connection
-from psycopg.types.json import Jsonb
 from pydantic import BaseModel
 
 from config import settings
 from database import transaction
 from features.auth.service import create_or_update_user
 from features.project_document.document import ProjectDocumentV1
+from features.project_document.repository import serialized_jsonb
 from features.project_document.validation import SerializedProjectDocument, serialize_document, validate_document
 from features.projects.models import CreateProjectRequest
 from features.projects.repository import insert_project_with_initial_version
@@ -543,6 +543,7 @@ def _upsert_perf_project(
             kind = 'working',
             locked = false,
             body = %(body)s,
+            version_etag = %(version_etag)s,
             schema_version = %(schema_version)s,
             body_size_bytes = %(body_size_bytes)s,
             updated_by = %(user_id)s,
@@ -552,7 +553,8 @@ def _upsert_perf_project(
         {
             "version_id": version_id,
             "user_id": user_id,
-            "body": Jsonb(serialized_body.json_value),
+            "body": serialized_jsonb(serialized_body),
+            "version_etag": serialized_body.etag,
             "schema_version": body.schema_version,
             "body_size_bytes": serialized_body.size_bytes,
         },
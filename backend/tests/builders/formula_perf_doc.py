@@ -0,0 +1,141 @@
+"""Deterministic formula-evaluation perf document builder."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from features.project_document.custom_fields import CustomFieldType, TableFieldDef
+from features.project_document.document import ProjectDocumentV1, PumpRow, RoomRow
+from features.project_document.formula import (
+    FieldRegistryEntry,
+    ast_to_json,
+    formula_facing_field_type,
+    infer_result_type,
+    parse,
+    resolve_refs,
+)
+from features.project_document.formula.resolver import collect_field_refs
+from features.projects.models import CreateProjectRequest
+from features.projects.service import empty_project_document
+
+ROOM_COUNT = 4000
+PUMP_COUNT = 50
+
+# Row arithmetic, a formula-to-formula chain, and text building on Rooms; a
+# linked rollup on Pumps so link resolution and field access are exercised.
+ROOM_FORMULAS: tuple[tuple[str, str, str], ...] = (
+    ("cf_volume", "Volume", "{Ceiling Height} * 25 * {iCFA}"),
+    ("cf_volume_per_person", "Volume Per Person", "if({People} > 0, {Volume} / {People}, null)"),
+    ("cf_label", "Label", '{Display Name} & " / " & text({People}) & " ppl"'),
+)
+# Same-row arithmetic only — every one is column-vectorizable — for the
+# column-evaluation benchmark.
+ARITHMETIC_ROOM_FORMULAS: tuple[tuple[str, str, str], ...] = (
+    ("cf_volume", "Volume", "{Ceiling Height} * 25 * {iCFA}"),
+    ("cf_floor_area", "Floor Area", "25 * {iCFA}"),
+    ("cf_volume_per_person", "Volume Per Person", "{Volume} / {People}"),
+    ("cf_area_per_person", "Area Per Person", "{Floor Area} / ({People} + 1)"),
+    ("cf_height_delta", "Height Delta", "-({Ceiling Height} - 2.7) * 100 % 7"),
+    ("cf_air_changes", "Air Changes", "number({People}) * 30 / ({Volume} + 1)"),
+)
+PUMP_FORMULAS: tuple[tuple[str, str, str], ...] = (
+    ("cf_served_volume", "Served Volume", 'sum(linked_from(rooms, "cf_pump").cf_volume)'),
+    ("cf_served_rooms", "Served Rooms", 'count(linked_from(rooms, "cf_pump"))'),
+)
+
+
+def build_formula_perf_document(
+    room_formulas: Sequence[tuple[str, str, str]] = ROOM_FORMULAS,
+) -> ProjectDocumentV1:
+    """Build a document whose formula overlay is dominated by evaluation."""
+
+    body = empty_project_document(
+        CreateProjectRequest(
+            name="formula perf",
+            bt_number="perf",
+            cert_programs=[],
+            phius_number=None,
+            phius_dropbox_url=None,
+        )
+    )
+    room_fields = _with_formulas(
+        [*body.tables.rooms.field_defs, _field_def("cf_pump", "Pump", CustomFieldType.linked_record, _PUMP_LINK)],
+        room_formulas,
+    )
+    pump_fields = _with_formulas(list(body.tables.equipment.pumps.field_defs), PUMP_FORMULAS)
+    rooms = [
+        RoomRow(
+            id=f"rm_{index:04d}",
+            custom_values={
+                "number": f"{index:04d}",
+                "name": f"Room {index}",
+                "num_people": index % 4,
+                "ceiling_height_m": 2.4 + (index % 5) * 0.1,
+                "icfa_factor": 1.0 if index % 3 else 0.5,
+            },
+            custom_links={"cf_pump": [f"pmp_{index % PUMP_COUNT:03d}"]},
+        )
+        for index in range(ROOM_COUNT)
+    ]
+    pumps = [PumpRow(id=f"pmp_{index:03d}") for index in range(PUMP_COUNT)]
+    return body.model_copy(
+        update={
+            "tables": body.tables.model_copy(
+                update={
+                    "rooms": body.tables.rooms.model_copy(update={"field_defs": room_fields, "rows": rooms}),
+                    "equipment": body.tables.equipment.model_copy(
+                        update={
+                            "pumps": body.tables.equipment.pumps.model_copy(
+                                update={"field_defs": pump_fields, "rows": pumps}
+                            )
+                        }
+                    ),
+                }
+            )
+        }
+    )
+
+
+_PUMP_LINK: dict[str, object] = {"target_table_path": ["equipment", "pumps"], "max_links": 1}
+
+
+def _with_formulas(
+    fields: list[TableFieldDef],
+    formulas: Sequence[tuple[str, str, str]],
+) -> list[TableFieldDef]:
+    for field_key, display_name, source in formulas:
+        registry = [
+            FieldRegistryEntry(
+                field_id=field.field_key,
+                display_name=field.display_name,
+                origin="custom",
+                field_type=formula_facing_field_type(field.field_type.value),
+            )
+            for field in fields
+        ]
+        resolved = resolve_refs(parse(source), registry)
+        config: dict[str, object] = {
+            "source": source,
+            "ast": ast_to_json(resolved),
+            "deps": collect_field_refs(resolved),
+            "result_type": infer_result_type(resolved),
+        }
+        fields = [*fields, _field_def(field_key, display_name, CustomFieldType.formula, config)]
+    return fields
+
+
+def _field_def(
+    field_key: str,
+    display_name: str,
+    field_type: CustomFieldType,
+    config: dict[str, object],
+) -> TableFieldDef:
+    return TableFieldDef(
+        field_key=field_key,
+        display_name=display_name,
+        field_type=field_type,
+        config=config,
+        created_at=datetime(2026, 10, 18, tzinfo=UTC),
+        origin="custom",
+    )
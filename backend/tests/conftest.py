@@ -54,6 +54,16 @@ def _route_database_url_for_worker() -> None:
     os.environ.setdefault("PASSWORD_ARGON2_TIME_COST", "1")
     os.environ.setdefault("PASSWORD_ARGON2_MEMORY_COST", "1024")
     os.environ.setdefault("PASSWORD_ARGON2_PARALLELISM", "1")
+    # Extract HBJSON inline: a spawned worker per xdist process costs
+    # seconds of honeybee imports. The pool has its own tests.
+    os.environ.setdefault("MODEL_EXTRACTION_WORKERS", "0")
+    # Render thumbnails and HEIC conversions in the calling thread, so
+    # upload tests see their results synchronously. The queue has its own
+    # tests.
+    os.environ.setdefault("ASSET_RENDER_WORKERS", "0")
+    # No object store in tests: GH export payloads stay in process memory.
+    # The export-cache tests exercise the object-store tier with a fake.
+    os.environ.setdefault("GH_EXPORT_CACHE_OBJECT_STORE", "false")
     worker = os.environ.get("PYTEST_XDIST_WORKER")
     if not worker or worker == "master":
         return
@@ -98,12 +108,14 @@ def _bootstrap_test_database() -> None:
 _bootstrap_test_database()
 
 
+import time  # noqa: E402
 from collections.abc import Iterator  # noqa: E402
 
 import pytest  # noqa: E402
 
 from config import settings  # noqa: E402
 from database import transaction  # noqa: E402
+from features.auth import session_cache  # noqa: E402
 from features.project_location.derive import DerivedLocationGeodata  # noqa: E402
 
 _TEST_DB_PATTERN = re.compile(r"_test(?:_gw\d+)?$")
@@ -122,6 +134,24 @@ def _refuse_to_truncate_dev_db() -> None:
         )
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _session_cache_listener() -> Iterator[None]:
+    """Run the auth session cache the way the app lifespan does.
+
+    Tests drive `TestClient(app)` without entering its lifespan, so the
+    NOTIFY listener is started here; otherwise the cache never serves and
+    the auth suites would only cover the cold path.
+    """
+    session_cache.start_session_cache_listener()
+    deadline = time.monotonic() + 10
+    while settings.auth_session_cache_ttl_seconds > 0 and not session_cache.session_cache_listening():
+        if time.monotonic() > deadline:
+            raise RuntimeError("The auth session cache listener did not connect.")
+        time.sleep(0.02)
+    yield
+    session_cache.stop_session_cache_listener()
+
+
 def synthetic_geodata(latitude: float, longitude: float) -> DerivedLocationGeodata:
     """No-network geodata default so a Set Location write never hits external APIs."""
     return DerivedLocationGeodata(
@@ -147,6 +177,18 @@ def _stub_location_geodata(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("features.project_location.service.derive_location_geodata", synthetic_geodata)
 
 
+@pytest.fixture(autouse=True)
+def _disable_geodata_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep stubbed geodata lookups out of the shared lookup cache.
+
+    Tests stub the same coordinates and queries with different answers, and
+    the cache table outlives a test. Cache tests re-enable the TTLs and
+    truncate ``geodata_lookup_cache`` themselves.
+    """
+    monkeypatch.setattr(settings, "geodata_coordinate_cache_ttl_seconds", 0)
+    monkeypatch.setattr(settings, "geodata_address_cache_ttl_seconds", 0)
+
+
 @pytest.fixture()
 def clean_document_tables() -> Iterator[None]:
     """Truncate project-document and auth state before and after a test.
@@ -165,10 +207,14 @@ def _truncate() -> None:
         conn.execute(
             """
             TRUNCATE user_action_log, sessions, project_status_items,
-                     project_version_drafts, project_versions, project_location, projects, users
+                     project_version_drafts, project_versions, project_location, projects, users,
+                     envelope_calculation_results
             RESTART IDENTITY CASCADE
             """
         )
+    # The TRUNCATE notification is asynchronous; a test must not start with
+    # the previous test's sessions cached.
+    session_cache.clear_session_cache()
 
 
 _CATALOG_TRUNCATE = """
@@ -195,3 +241,4 @@ def clean_catalog_tables() -> Iterator[None]:
 def _truncate_catalogs() -> None:
     with transaction() as conn:
         conn.execute(_CATALOG_TRUNCATE)
+    session_cache.clear_session_cache()
@@ -0,0 +1,230 @@
+"""Two-tier envelope calculation cache: shared table, version stamps, eviction, admin routes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from psycopg import OperationalError
+
+from database import transaction
+from features.access import repository as access_repository
+from features.access.capabilities import ADMIN_USERS_MANAGE
+from features.auth.service import create_or_update_user
+from features.envelope import calculation_cache, condensation, repository, thermal
+from features.envelope import service as envelope_service
+from features.envelope.boundary_conditions import ISO_6946_TABLE
+from features.envelope.calculation_cache import (
+    calculation_cache_stats,
+    reset_calculation_cache,
+    thermal_cache_get,
+    thermal_cache_put,
+)
+from features.envelope.thermal import ThermalResult, calculate_assembly_thermal
+from main import app
+from tests.envelope.test_envelope_document_contracts import (
+    ORIGIN,
+    create_project,
+    signed_in_client,
+    write_saved_body,
+)
+from tests.envelope.test_envelope_thermal_and_export import _thermal_fixture_body
+
+
+@pytest.fixture()
+def clean_calculation_cache(clean_document_tables: None) -> Iterator[None]:
+    reset_calculation_cache()
+    yield
+    reset_calculation_cache()
+
+
+def _thermal_url(project_id: object, version_id: object) -> str:
+    return f"/api/v1/projects/{project_id}/versions/{version_id}/envelope/assemblies/asm_wall_c3/thermal?source=version"
+
+
+def _thermal_results(count: int) -> list[ThermalResult]:
+    body = _thermal_fixture_body()
+    materials = {material.id: material for material in body.tables.project_materials}
+    base = body.tables.assemblies[0]
+    return [
+        calculate_assembly_thermal(
+            base.model_copy(update={"layers": [base.layers[0].model_copy(update={"thickness_mm": 50.0 + index})]}),
+            materials,
+            ISO_6946_TABLE,
+        )
+        for index in range(count)
+    ]
+
+
+def _stored_rows() -> list[tuple[str, int]]:
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT input_hash, calculation_version FROM envelope_calculation_results ORDER BY input_hash"
+        ).fetchall()
+    return [(row["input_hash"], row["calculation_version"]) for row in rows]
+
+
+def _stats(kind: str) -> calculation_cache.CalculationCacheStats:
+    return next(stats for stats in calculation_cache_stats() if stats.kind == kind)
+
+
+def test_a_cold_worker_reads_results_another_worker_stored(
+    clean_calculation_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    project_id, version_id = project["id"], project["active_version_id"]
+    write_saved_body(version_id, _thermal_fixture_body())
+    first = client.get(_thermal_url(project_id, version_id), headers={"Origin": ORIGIN})
+    assert first.status_code == 200
+
+    # A fresh process: empty LRU, same table.
+    reset_calculation_cache()
+
+    def no_calculation(*_args: object, **_kwargs: object) -> ThermalResult:
+        raise AssertionError("the shared tier should have answered")
+
+    monkeypatch.setattr(envelope_service, "calculate_assembly_thermal", no_calculation)
+    second = client.get(_thermal_url(project_id, version_id), headers={"Origin": ORIGIN})
+    third = client.get(_thermal_url(project_id, version_id), headers={"Origin": ORIGIN})
+
+    assert second.status_code == third.status_code == 200
+    assert second.json() == third.json() == first.json()
+    stats = _stats("thermal")
+    assert (stats.memory_hits, stats.shared_hits, stats.misses) == (1, 1, 0)
+    assert stats.hit_rate == 1.0
+    assert stats.shared_entries == 1
+
+
+def test_stored_results_round_trip_byte_identical(clean_calculation_cache: None) -> None:
+    result = _thermal_results(1)[0]
+    thermal_cache_put(result)
+    reset_calculation_cache()
+
+    cached = thermal_cache_get(result.input_hash)
+
+    assert cached == result
+
+
+def test_rows_from_another_calculation_version_are_misses_and_overwritten(
+    clean_calculation_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    result = _thermal_results(1)[0]
+    thermal_cache_put(result)
+    reset_calculation_cache()
+    monkeypatch.setattr(thermal, "CALCULATION_VERSION", thermal.CALCULATION_VERSION + 1)
+
+    assert thermal_cache_get(result.input_hash) is None
+    thermal_cache_put(result)
+
+    assert _stored_rows() == [(result.input_hash, thermal.CALCULATION_VERSION)]
+    # Condensation keeps its own version stamp.
+    assert _stats("condensation").calculation_version == condensation.CALCULATION_VERSION
+
+
+def test_rows_that_no_longer_validate_are_misses_and_deleted(clean_calculation_cache: None) -> None:
+    results = _thermal_results(2)
+    for result in results:
+        thermal_cache_put(result)
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE envelope_calculation_results SET result_json = %s WHERE input_hash = %s",
+            ('{"legacy_field": 1}', results[0].input_hash),
+        )
+    reset_calculation_cache()
+
+    cached = calculation_cache.thermal_cache_get_many([result.input_hash for result in results])
+
+    assert cached == {results[1].input_hash: results[1]}
+    assert [input_hash for input_hash, _version in _stored_rows()] == [results[1].input_hash]
+    assert _stats("thermal").misses == 1
+
+
+def test_eviction_keeps_the_most_recently_used_rows_within_budget(
+    clean_calculation_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    results = _thermal_results(4)
+    for result in results[:3]:
+        thermal_cache_put(result)
+    with transaction() as conn:
+        largest = conn.execute("SELECT max(size_bytes) AS size FROM envelope_calculation_results").fetchone()
+        assert largest is not None
+        row_bytes = largest["size"]
+        conn.execute(
+            "UPDATE envelope_calculation_results SET last_used_at = now() - interval '1 hour' WHERE input_hash = %s",
+            (results[0].input_hash,),
+        )
+    monkeypatch.setattr(calculation_cache.settings, "calculation_cache_max_bytes", row_bytes * 2 + 1)
+    monkeypatch.setattr(calculation_cache, "EVICTION_WRITE_INTERVAL", 1)
+
+    thermal_cache_put(results[3])
+
+    assert {input_hash for input_hash, _version in _stored_rows()} == {results[2].input_hash, results[3].input_hash}
+
+
+def test_shared_tier_errors_fall_back_to_calculating(
+    clean_calculation_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def unavailable(*_args: object, **_kwargs: object) -> None:
+        raise OperationalError("connection refused")
+
+    monkeypatch.setattr(repository, "touch_calculation_results", unavailable)
+    monkeypatch.setattr(repository, "upsert_calculation_result", unavailable)
+    client = signed_in_client()
+    project = create_project(client)
+    write_saved_body(project["active_version_id"], _thermal_fixture_body())
+
+    response = client.get(_thermal_url(project["id"], project["active_version_id"]), headers={"Origin": ORIGIN})
+
+    assert response.status_code == 200
+    assert response.json()["r_construction_m2k_w"] == pytest.approx(2.5)
+
+
+def test_disabled_shared_tier_never_touches_the_table(
+    clean_calculation_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(calculation_cache.settings, "calculation_cache_max_bytes", 0)
+    result = _thermal_results(1)[0]
+
+    thermal_cache_put(result)
+
+    assert _stored_rows() == []
+    assert thermal_cache_get(result.input_hash) == result
+
+
+def _logged_in(email: str, *, admin: bool) -> TestClient:
+    user = create_or_update_user(email=email, display_name=email.split("@")[0], password="password")
+    if admin:
+        with transaction() as conn:
+            access_repository.ensure_global_grant(conn, user_id=user.id, capability=ADMIN_USERS_MANAGE, granted_by=None)
+    client = TestClient(app, headers={"Origin": ORIGIN, "X-PHN-CSRF": "1"})
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "password"})
+    assert response.status_code == 200
+    return client
+
+
+def test_admin_routes_report_and_purge_the_cache(clean_calculation_cache: None) -> None:
+    for result in _thermal_results(2):
+        thermal_cache_put(result)
+    member = _logged_in("member@example.com", admin=False)
+    admin = _logged_in("ops@example.com", admin=True)
+
+    assert member.get("/api/v1/admin/calculation-cache").status_code == 403
+    assert member.delete("/api/v1/admin/calculation-cache").status_code == 403
+    stats = admin.get("/api/v1/admin/calculation-cache")
+    assert stats.status_code == 200
+    thermal_stats = next(row for row in stats.json() if row["kind"] == "thermal")
+    assert (thermal_stats["shared_entries"], thermal_stats["memory_entries"]) == (2, 2)
+
+    purged = admin.delete("/api/v1/admin/calculation-cache", params={"kind": "thermal"})
+
+    assert purged.status_code == 200
+    assert purged.json() == {"kind": "thermal", "purged_entries": 2}
+    assert _stored_rows() == []
+    assert _stats("thermal").memory_entries == 0
@@ -710,21 +710,21 @@ def test_ventilated_outer_air_layer_reports_stack_diagnostic() -> None:
     assert "ventilated_stack_convention" in {item.code for item in result.diagnostics}
 
 
-def test_path_enumeration_caps_at_64_and_uses_widest_segment_fallback() -> None:
-    material_ids = [f"pmat_option_{index}" for index in range(3)]
+def test_path_enumeration_caps_at_512_and_uses_widest_segment_fallback() -> None:
+    material_ids = [f"pmat_option_{index}" for index in range(4)]
     materials = {
         material_id: _material(material_id, conductivity=0.04 + index * 0.01, mu=2.0 + index)
         for index, material_id in enumerate(material_ids)
     }
-    assembly = _assembly([_layer(index, material_ids, widths_mm=[100.0, 200.0, 300.0]) for index in range(4)])
+    assembly = _assembly([_layer(index, material_ids, widths_mm=[100.0, 200.0, 300.0, 250.0]) for index in range(5)])
 
     result = calculate_assembly_condensation(assembly, materials, _climate(), ISO_6946_TABLE)
 
-    assert result.path_count == 81
+    assert result.path_count == 1024
     assert result.paths_evaluated == 1
     assert result.status.flags == ["path_limit_fallback"]
     assert "path_limit_fallback" in {item.code for item in result.diagnostics}
-    assert result.worst_path_id == "seg_0_2|seg_1_2|seg_2_2|seg_3_2"
+    assert result.worst_path_id == "seg_0_2|seg_1_2|seg_2_2|seg_3_2|seg_4_2"
 
 
 def test_orientation_reverses_vapor_profile_layer_order() -> None:
@@ -0,0 +1,206 @@
+"""Batch condensation engine parity and path-cap tests.
+
+``fixtures/condensation/batch_parity.json`` was frozen from the per-path
+scalar engine that preceded the batch engine: one SHA-256 of
+``CondensationResult.model_dump_json()`` per corpus case. Do not regenerate
+it from the current engine; a physics change that moves a hash needs its own
+reviewed golden, like the PHI workbook fixtures.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from itertools import product
+
+import pytest
+
+from features.envelope.boundary_conditions import ISO_6946_TABLE
+from features.envelope.condensation import CondensationSettings, calculate_assembly_condensation
+from features.project_document.document import (
+    Assembly,
+    AssemblyLayer,
+    AssemblyOrientation,
+    AssemblyType,
+    ExteriorCondition,
+    ProjectMaterial,
+)
+from tests.envelope.test_envelope_condensation import _FIXTURE_DIR, _assembly, _climate, _layer, _material
+
+_MATERIALS: dict[str, ProjectMaterial] = {
+    material.id: material
+    for material in (
+        _material("pmat_masonry", category="masonry", conductivity=0.18, mu=20.0),
+        _material("pmat_insulation", conductivity=0.04, mu=2.0),
+        _material("pmat_fiber", conductivity=0.035, mu=1.0),
+        _material("pmat_osb", category="board", conductivity=0.13, mu=150.0),
+        _material("pmat_stud", category="timber", conductivity=0.12, mu=50.0),
+        _material("pmat_board", category="board", conductivity=0.25, mu=8.0),
+        _material("pmat_vapor_retarder", category="membrane", conductivity=None, mu=None, sd_m=15.0),
+        _material("pmat_smart_membrane", category="membrane", conductivity=None, mu=None, sd_m=2.0),
+        _material("pmat_air", category="air_horizontal_heat_flow", conductivity=0.18, mu=None, sd_m=None),
+    )
+}
+
+_ASSEMBLIES: dict[str, list[AssemblyLayer]] = {
+    "reference": [
+        _layer(0, "pmat_masonry", thickness_mm=20.0),
+        _layer(1, "pmat_insulation", thickness_mm=180.0),
+        _layer(2, "pmat_board", thickness_mm=13.0),
+    ],
+    "stud_wall": [
+        _layer(0, "pmat_osb", thickness_mm=15.0),
+        _layer(1, ["pmat_fiber", "pmat_stud"], thickness_mm=200.0, widths_mm=[555.0, 45.0]),
+        _layer(2, "pmat_smart_membrane", thickness_mm=1.0),
+        _layer(3, "pmat_board", thickness_mm=13.0),
+    ],
+    "inboard_membrane": [
+        _layer(0, "pmat_masonry", thickness_mm=20.0),
+        _layer(1, ["pmat_insulation", "pmat_stud"], thickness_mm=150.0, widths_mm=[400.0, 50.0]),
+        _layer(2, "pmat_vapor_retarder", thickness_mm=1.0),
+        _layer(3, ["pmat_board", "pmat_air"], thickness_mm=25.0, widths_mm=[300.0, 300.0]),
+    ],
+    "alternating": [
+        _layer(0, ["pmat_osb", "pmat_masonry"], thickness_mm=100.0, widths_mm=[500.0, 100.0]),
+        _layer(1, "pmat_board", thickness_mm=20.0),
+        _layer(2, ["pmat_insulation", "pmat_fiber", "pmat_stud"], thickness_mm=100.0, widths_mm=[300.0, 250.0, 50.0]),
+        _layer(3, "pmat_board", thickness_mm=20.0),
+    ],
+    "sixty_four_paths": [
+        _layer(0, ["pmat_osb", "pmat_masonry", "pmat_board", "pmat_stud"], thickness_mm=18.0),
+        _layer(1, ["pmat_insulation", "pmat_fiber", "pmat_stud", "pmat_air"], thickness_mm=140.0),
+        _layer(2, "pmat_smart_membrane", thickness_mm=1.0),
+        _layer(3, ["pmat_board", "pmat_osb", "pmat_fiber", "pmat_masonry"], thickness_mm=20.0),
+    ],
+}
+
+_CLIMATES = {
+    "mild": ([-5.0, -3.0, 2.0, 8.0, 14.0, 19.0, 23.0, 22.0, 17.0, 10.0, 4.0, -2.0], None),
+    "cold": ([-10.0] * 12, [-12.0] * 12),
+    "humid_summer": (
+        [2.0, 4.0, 9.0, 15.0, 21.0, 27.0, 31.0, 30.0, 25.0, 18.0, 10.0, 4.0],
+        [-2.0, 0.0, 4.0, 10.0, 17.0, 24.0, 27.0, 26.0, 21.0, 13.0, 5.0, 0.0],
+    ),
+}
+
+_SETTINGS = {
+    "continental": CondensationSettings(),
+    "humidity_class_4": CondensationSettings(
+        interior_climate_model="iso13788_humidity_class",
+        humidity_class=4,
+        setpoint_temp_c=20.0,
+    ),
+    "fixed_humid": CondensationSettings(
+        interior_climate_model="fixed_setpoint",
+        setpoint_temp_c=20.0,
+        setpoint_rh=0.7,
+    ),
+    "fixed_cool": CondensationSettings(
+        interior_climate_model="fixed_setpoint",
+        setpoint_temp_c=16.0,
+        setpoint_rh=0.5,
+        ma_limit_g_m2=5000.0,
+    ),
+}
+
+_VARIANTS: dict[str, tuple[AssemblyType, ExteriorCondition, AssemblyOrientation]] = {
+    "wall": ("wall", "outdoor_air", "first_layer_outside"),
+    "reversed": ("wall", "outdoor_air", "last_layer_outside"),
+    "roof": ("roof", "ventilated", "first_layer_outside"),
+}
+
+CASES = [
+    "/".join(key)
+    for key in product(_ASSEMBLIES, _VARIANTS, _CLIMATES, _SETTINGS)
+    if key[0] != "sixty_four_paths" or key[1] == "wall"
+]
+
+
+def _case_assembly(assembly_key: str, variant_key: str) -> Assembly:
+    assembly_type, exterior_condition, orientation = _VARIANTS[variant_key]
+    return _assembly(
+        _ASSEMBLIES[assembly_key],
+        assembly_type=assembly_type,
+        exterior_condition=exterior_condition,
+        orientation=orientation,
+    )
+
+
+def _result_digest(case: str) -> str:
+    assembly_key, variant_key, climate_key, settings_key = case.split("/")
+    air_c, dewpoint_c = _CLIMATES[climate_key]
+    result = calculate_assembly_condensation(
+        _case_assembly(assembly_key, variant_key),
+        _MATERIALS,
+        _climate(air_c, dewpoint_c),
+        ISO_6946_TABLE,
+        _SETTINGS[settings_key],
+    )
+    return hashlib.sha256(result.model_dump_json().encode()).hexdigest()
+
+
+@pytest.fixture(scope="module")
+def frozen_digests() -> dict[str, str]:
+    return json.loads((_FIXTURE_DIR / "batch_parity.json").read_text())
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_batch_engine_is_byte_identical_to_frozen_scalar_results(
+    case: str,
+    frozen_digests: dict[str, str],
+) -> None:
+    assert _result_digest(case) == frozen_digests[case]
+
+
+def _single_path_assembly(assembly: Assembly, path_id: str) -> Assembly:
+    segment_ids = set(path_id.split("|"))
+    return assembly.model_copy(
+        update={
+            "layers": [
+                layer.model_copy(update={"segments": [seg for seg in layer.segments if seg.id in segment_ids]})
+                for layer in assembly.layers
+            ]
+        }
+    )
+
+
+def test_paths_past_the_old_cap_match_their_single_path_results() -> None:
+    material_ids = ["pmat_osb", "pmat_insulation", "pmat_stud"]
+    assembly = _assembly(
+        [
+            _layer(0, material_ids, thickness_mm=18.0),
+            _layer(1, material_ids, thickness_mm=140.0),
+            _layer(2, material_ids, thickness_mm=40.0),
+            _layer(3, material_ids, thickness_mm=20.0),
+            _layer(4, "pmat_smart_membrane", thickness_mm=1.0),
+        ]
+    )
+    air_c, dewpoint_c = _CLIMATES["mild"]
+    climate = _climate(air_c, dewpoint_c)
+    settings = _SETTINGS["fixed_humid"]
+
+    result = calculate_assembly_condensation(assembly, _MATERIALS, climate, ISO_6946_TABLE, settings)
+
+    assert result.path_count == result.paths_evaluated == 81
+    assert result.status.flags == []
+    assert {summary.verdict for summary in result.path_summaries} >= {"d1", "d4"}
+    for summary in result.path_summaries:
+        single = calculate_assembly_condensation(
+            _single_path_assembly(assembly, summary.path_id),
+            _MATERIALS,
+            climate,
+            ISO_6946_TABLE,
+            settings,
+        )
+        # The single path's headline numbers come from the scalar month model.
+        assert (
+            single.verdict,
+            single.peak_accumulated_moisture_g_m2,
+            single.final_accumulated_moisture_g_m2,
+            single.interface_count,
+        ) == (
+            summary.verdict,
+            summary.peak_accumulated_moisture_g_m2,
+            summary.final_accumulated_moisture_g_m2,
+            summary.interface_count,
+        )
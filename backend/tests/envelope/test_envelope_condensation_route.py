@@ -10,8 +10,8 @@ from fastapi.testclient import TestClient
 from features.climate.record import ClimateRecord
 from features.envelope import service as envelope_service
 from features.envelope.boundary_conditions import SurfaceFilmTable
+from features.envelope.calculation_cache import reset_calculation_cache
 from features.envelope.condensation import CondensationResult
-from features.envelope.condensation_cache import reset_condensation_cache
 from features.envelope.surface_film_store import SurfaceFilmTableUnavailableError
 from features.project_climate_source.service import _condensation_source_priority
 from features.project_document.document import (
@@ -35,9 +35,9 @@ from tests.envelope.test_envelope_thermal_and_export import _thermal_fixture_bod
 
 @pytest.fixture()
 def clean_condensation_route_tables(clean_document_tables: None) -> Iterator[None]:
-    reset_condensation_cache()
+    reset_calculation_cache()
     yield
-    reset_condensation_cache()
+    reset_calculation_cache()
 
 
 def _url(project_id: object, version_id: object, *, source: str = "version") -> str:
@@ -0,0 +1,180 @@
+"""Project-wide envelope screening: NDJSON route, cache reuse, pool and MCP tool."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import cast
+
+import pytest
+from fastapi.testclient import TestClient
+from mcp.server.fastmcp import Context
+
+from features.envelope import screening
+from features.envelope.calculation_cache import reset_calculation_cache
+from features.mcp.tools import tool_screen_envelope_assemblies
+from features.project_document.document import ProjectDocumentV1
+from tests.envelope.test_envelope_condensation_route import _attach_custom_climate, _body_with_vapor
+from tests.envelope.test_envelope_document_contracts import (
+    ORIGIN,
+    create_project,
+    signed_in_client,
+    write_saved_body,
+)
+
+ASSEMBLY_IDS = ("asm_wall_c3", "asm_wall_thick", "asm_wall_ground")
+
+
+@pytest.fixture()
+def clean_screening_tables(clean_document_tables: None) -> Iterator[None]:
+    reset_calculation_cache()
+    yield
+    reset_calculation_cache()
+    screening.shutdown_screening_pool()
+
+
+def _screening_body() -> ProjectDocumentV1:
+    raw = _body_with_vapor().model_dump(mode="json")
+    wall = raw["tables"]["assemblies"][0]
+    thick = json.loads(json.dumps(wall))
+    thick.update(id="asm_wall_thick", name="WALL-THICK")
+    thick["layers"][0]["thickness_mm"] = 240.0
+    ground = json.loads(json.dumps(wall))
+    ground.update(id="asm_wall_ground", name="WALL-GROUND", exterior_condition="ground")
+    raw["tables"]["assemblies"] = [wall, thick, ground]
+    return ProjectDocumentV1.model_validate(raw)
+
+
+def _screening_url(project_id: object, version_id: object) -> str:
+    return f"/api/v1/projects/{project_id}/versions/{version_id}/envelope/screening?source=version"
+
+
+def _assembly_url(project_id: object, version_id: object, assembly_id: str, kind: str) -> str:
+    return (
+        f"/api/v1/projects/{project_id}/versions/{version_id}/envelope/assemblies/{assembly_id}/{kind}?source=version"
+    )
+
+
+def _screened_project(client: TestClient) -> tuple[str, str]:
+    project = create_project(client)
+    project_id = cast(str, project["id"])
+    version_id = cast(str, project["active_version_id"])
+    write_saved_body(version_id, _screening_body())
+    _attach_custom_climate(client, project_id)
+    return project_id, version_id
+
+
+def _stream(client: TestClient, project_id: str, version_id: str) -> list[dict[str, object]]:
+    response = client.get(_screening_url(project_id, version_id), headers={"Origin": ORIGIN})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_screening_streams_the_per_assembly_route_payloads(
+    clean_screening_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+    workers: int,
+) -> None:
+    monkeypatch.setattr(screening.settings, "envelope_screening_workers", workers)
+    client = signed_in_client()
+    project_id, version_id = _screened_project(client)
+
+    lines = _stream(client, project_id, version_id)
+
+    assert [line["kind"] for line in lines] == ["start", "assembly", "assembly", "assembly", "end"]
+    assert lines[0]["assembly_count"] == 3
+    assert cast(dict[str, object], lines[0]["climate_source"])["kind"] == "custom"
+    assert lines[-1] == {"kind": "end", "screened": 3, "failed": 0, "condensation_cache_hits": 0}
+    by_id = {line["assembly_id"]: line for line in lines[1:-1]}
+    assert set(by_id) == set(ASSEMBLY_IDS)
+    for assembly_id in ASSEMBLY_IDS:
+        for kind in ("thermal", "condensation"):
+            single = client.get(_assembly_url(project_id, version_id, assembly_id, kind), headers={"Origin": ORIGIN})
+            assert single.status_code == 200, single.text
+            assert by_id[assembly_id][kind] == single.json()
+    ground = cast(dict[str, object], by_id["asm_wall_ground"]["condensation"])
+    assert ground["climate_source"] is None
+    assert cast(dict[str, object], ground["status"])["state"] == "not_screened"
+
+
+def test_screening_reads_and_fills_the_condensation_cache(
+    clean_screening_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(screening.settings, "envelope_screening_workers", 0)
+    client = signed_in_client()
+    project_id, version_id = _screened_project(client)
+    warmed = client.get(
+        _assembly_url(project_id, version_id, "asm_wall_c3", "condensation"), headers={"Origin": ORIGIN}
+    )
+    assert warmed.status_code == 200
+
+    first = _stream(client, project_id, version_id)
+    second = _stream(client, project_id, version_id)
+
+    assert first[-1]["condensation_cache_hits"] == 1
+    assert second[-1]["condensation_cache_hits"] == 3
+    assert first[1:-1] == second[1:-1]
+
+
+def test_one_failing_assembly_is_reported_without_ending_the_stream(
+    clean_screening_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(screening.settings, "envelope_screening_workers", 0)
+    calculate = screening.calculate_assembly_thermal
+
+    def failing_thermal(assembly, materials_by_id, film_table):  # type: ignore[no-untyped-def]
+        if assembly.id == "asm_wall_thick":
+            raise ValueError("boom")
+        return calculate(assembly, materials_by_id, film_table)
+
+    monkeypatch.setattr(screening, "calculate_assembly_thermal", failing_thermal)
+    client = signed_in_client()
+    project_id, version_id = _screened_project(client)
+
+    lines = _stream(client, project_id, version_id)
+
+    assert {
+        "kind": "error",
+        "assembly_id": "asm_wall_thick",
+        "code": "screening_failed",
+        "message": "This assembly could not be screened.",
+    } in lines
+    assert lines[-1] == {"kind": "end", "screened": 2, "failed": 1, "condensation_cache_hits": 0}
+
+
+def test_mcp_screen_tool_returns_document_order_and_drops_monthly_profiles(
+    clean_screening_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(screening.settings, "envelope_screening_workers", 0)
+    client = signed_in_client()
+    project_id, version_id = _screened_project(client)
+    issued = client.post(
+        f"/api/v1/projects/{project_id}/mcp-tokens",
+        headers={"Origin": ORIGIN},
+        json={"label": "Envelope screen", "scopes": ["project:read"]},
+    )
+    monkeypatch.setenv("PHN_MCP_TOKEN", issued.json()["token"])
+
+    result = tool_screen_envelope_assemblies(
+        project_id, version_id, cast(Context, None), allow_env_token=True, source="version"
+    )
+    detailed = tool_screen_envelope_assemblies(
+        project_id,
+        version_id,
+        cast(Context, None),
+        allow_env_token=True,
+        source="version",
+        include_monthly=True,
+    )
+
+    rows = cast(list[dict[str, dict[str, object]]], result["assemblies"])
+    assert [row["assembly_id"] for row in rows] == list(ASSEMBLY_IDS)
+    assert result["assembly_count"] == 3
+    assert result["failures"] == []
+    assert "monthly" not in rows[0]["condensation"]
+    assert "monthly" in cast(list[dict[str, dict[str, object]]], detailed["assemblies"])[0]["condensation"]
@@ -1,8 +1,10 @@
 """Bulk-download zip/manifest coverage for the asset service.
 
-``AssetService.start_bulk_download`` runs the bundle build synchronously
-and returns a ``completed`` (or ``failed``) job. These tests drive the
-real route against fake object storage and inspect the resulting zip:
+``AssetService.start_bulk_download`` queues a ``pending`` job and builds
+the bundle as a background task, which the test client runs before the
+POST returns; the helper then reads the finished job from its status
+URL. These tests drive the real route against fake object storage and
+inspect the resulting zip:
 asset ordering, ``MANIFEST.csv`` contents, the ``{table}/{row.name}``
 filename pattern with collision de-duplication, the filter surface, and
 the ``asset_bulk_download_failed`` payload.
@@ -20,8 +22,11 @@ import zipfile
 from typing import Any
 from uuid import UUID
 
+import pytest
 from fastapi.testclient import TestClient
 
+from database import transaction
+from features.assets import downloads, repository
 from features.assets.storage_r2 import asset_object_key
 from features.project_document.tables._attachment_fields import DATASHEET_FIELD_KEY, PDF_REPORT_FIELD_KEY
 from features.project_document.tables.pumps import PUMPS_BUILT_IN_FIELD_DEFS
@@ -125,7 +130,10 @@ def _bulk_download(client: TestClient, project_id: object, body: dict[str, objec
         json=body,
     )
     assert response.status_code == 202, response.text
-    return response.json()
+    assert response.json()["status"] == "pending"
+    job = client.get(response.json()["status_url"])
+    assert job.status_code == 200, job.text
+    return job.json()
 
 
 def _open_bundle(fake_r2: FakeR2Client, project_id: object, result_asset_id: str) -> zipfile.ZipFile:
@@ -179,6 +187,13 @@ def test_bulk_download_preserves_order_and_writes_manifest(clean_document_tables
         ]
         assert bundle.read("pumps/pmp_1__datasheet.pdf") == PDF_MAGIC + b"alpha"
         assert bundle.read("pumps/pmp_1__datasheet (2).pdf") == PDF_MAGIC + b"bravo"
+        # PDFs are already compressed and are stored as-is; the manifest is deflated.
+        assert bundle.getinfo("pumps/pmp_2__spec.pdf").compress_type == zipfile.ZIP_STORED
+        assert bundle.getinfo("MANIFEST.csv").compress_type == zipfile.ZIP_DEFLATED
+        result = client.get(_asset_url(project_id, result_asset_id)).json()
+        zip_bytes = fake_r2.objects[asset_object_key(UUID(str(project_id)), result_asset_id, "zip")][0]
+        assert result["content_hash_sha256"] == hashlib.sha256(zip_bytes).hexdigest()
+        assert result["size_bytes"] == len(zip_bytes)
 
         manifest = bundle.read("MANIFEST.csv").decode()
         manifest_lines = manifest.splitlines()
@@ -302,3 +317,96 @@ def test_bulk_download_with_no_matching_assets_fails(clean_document_tables: None
         assert "No matching assets" in job["error_details"]["message"]
     finally:
         _clear_fake_asset_service()
+
+
+def test_bulk_download_fetches_concurrently_in_order_and_reports_progress(
+    clean_document_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_r2 = FakeR2Client()
+    _install_fake_asset_service(fake_r2)
+    monkeypatch.setattr(downloads.settings, "asset_bulk_download_fetch_workers", 3)
+    # Spill every object and the bundle to disk.
+    monkeypatch.setattr(downloads.settings, "asset_bulk_download_spool_bytes", 16)
+    reported: list[int] = []
+    set_job_progress = repository.set_job_progress
+
+    def recording_set_job_progress(conn: Any, *, project_id: UUID, job_id: str, progress: int) -> None:
+        reported.append(progress)
+        set_job_progress(conn, project_id=project_id, job_id=job_id, progress=progress)
+
+    monkeypatch.setattr(repository, "set_job_progress", recording_set_job_progress)
+    try:
+        client = signed_in_client()
+        project = create_project(client)
+        project_id = project["id"]
+        bodies = [PDF_MAGIC + bytes([index]) * (200 + index) for index in range(7)]
+        asset_ids = [
+            _upload_pdf(client, project_id, fake_r2, body, f"sheet-{index}.pdf") for index, body in enumerate(bodies)
+        ]
+        rows = [_pump_row(f"pmp_{index}", f"P-{index}", [asset_id]) for index, asset_id in enumerate(asset_ids)]
+        _save_pumps_version(client, project_id, project["active_version_id"], rows)
+
+        job = _bulk_download(client, project_id, {"include_manifest_csv": False})
+
+        assert job["status"] == "completed", job
+        bundle = _open_bundle(fake_r2, project_id, job["result_asset_id"])
+        assert [bundle.read(name) for name in bundle.namelist()] == bodies
+        assert reported[0] == 0 and reported == sorted(reported) and reported[-1] == 99
+    finally:
+        _clear_fake_asset_service()
+
+
+def test_bulk_download_fails_when_an_object_is_missing(clean_document_tables: None) -> None:
+    fake_r2 = FakeR2Client()
+    _install_fake_asset_service(fake_r2)
+    try:
+        client = signed_in_client()
+        project = create_project(client)
+        project_id = project["id"]
+        asset_a = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"alpha", "a.pdf")
+        asset_b = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"bravo", "b.pdf")
+        rows = [_pump_row("pmp_1", "P-1", [asset_a, asset_b])]
+        _save_pumps_version(client, project_id, project["active_version_id"], rows)
+        del fake_r2.objects[next(key for key in fake_r2.objects if f"/{asset_b}/" in key)]
+
+        job = _bulk_download(client, project_id, {})
+
+        assert job["status"] == "failed", job
+        assert job["error_code"] == "asset_bulk_download_failed"
+        assert not [key for key in fake_r2.objects if key.endswith(".zip")]
+    finally:
+        _clear_fake_asset_service()
+
+
+def test_a_job_whose_worker_died_is_failed_when_read(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project_id = UUID(str(create_project(client)["id"]))
+    with transaction() as conn:
+        owner = conn.execute("SELECT owner_id FROM projects WHERE id = %s", (project_id,)).fetchone()
+        assert owner is not None
+        for job_id in ("job_dead", "job_alive", "job_never_started"):
+            repository.insert_job(conn, job_id=job_id, project_id=project_id, created_by=owner["owner_id"], metadata={})
+        repository.set_job_progress(conn, project_id=project_id, job_id="job_dead", progress=40)
+        repository.set_job_progress(conn, project_id=project_id, job_id="job_alive", progress=40)
+        conn.execute(
+            """
+            UPDATE project_jobs
+            SET heartbeat_at = heartbeat_at - INTERVAL '11 minutes',
+                created_at = created_at - INTERVAL '11 minutes'
+            WHERE id IN ('job_dead', 'job_never_started')
+            """
+        )
+
+    jobs = {
+        job_id: client.get(f"/api/v1/projects/{project_id}/jobs/{job_id}").json()
+        for job_id in ("job_dead", "job_alive", "job_never_started")
+    }
+
+    assert jobs["job_alive"]["status"] == "running"
+    for job_id in ("job_dead", "job_never_started"):
+        assert jobs[job_id]["status"] == "failed", jobs[job_id]
+        assert jobs[job_id]["error_code"] == "job_interrupted"
+    # A worker that was only slow cannot bring the failed job back to running.
+    with transaction() as conn:
+        repository.set_job_progress(conn, project_id=project_id, job_id="job_dead", progress=50)
+        assert (repository.get_job(conn, project_id, "job_dead") or {})["status"] == "failed"
@@ -3,7 +3,7 @@
 ``AssetService.sweep_orphaned_assets`` moves unreferenced/expired assets
 to the ``_orphaned`` prefix. The dry-run must report only true orphans
 and protect any asset referenced by a *saved version* or an *active
-draft* (``_referenced_asset_ids_for_project`` unions both). This test
+draft* (``referenced_asset_ids_for_project`` unions both). This test
 plants one asset in each protected lane plus one genuine orphan and
 asserts only the orphan is planned for a move.
 """
@@ -0,0 +1,171 @@
+"""Asset-reference index: maintained on write, stale bodies parsed, rebuild repairs drift."""
+
+from __future__ import annotations
+
+from typing import Any
+from uuid import UUID
+
+from database import connection, transaction
+from features.assets import repository
+from features.assets.reference_index import (
+    attachment_tables_in_sections,
+    rebuild_project_asset_references,
+    referenced_asset_ids_for_project,
+    saved_body_asset_references,
+)
+from features.assets.registry import list_asset_references
+from features.assets.routes import get_asset_service
+from features.assets.service import AssetService
+from features.project_document.tables._attachment_fields import DATASHEET_FIELD_KEY
+from features.project_document.validation import validate_document
+from main import app
+from tests.test_assets_orphan_sweeper import PDF_MAGIC, _draft_pumps_url, _put_pumps, _save, _upload_pdf
+from tests.test_assets_service import FakeR2Client, NoopThumbnailer
+from tests.test_project_document import ORIGIN, create_project, signed_in_client
+
+
+def _index_rows(version_id: object) -> list[dict[str, Any]]:
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT draft_user_id, table_key, field_key, row_id, position, asset_id
+            FROM project_asset_references
+            WHERE version_id = %(version_id)s
+            ORDER BY draft_user_id NULLS FIRST, position
+            """,
+            {"version_id": version_id},
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def _stamps(version_id: object) -> list[tuple[int, int | None]]:
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT body_revision, asset_references_revision FROM project_versions WHERE id = %(version_id)s
+            UNION ALL
+            SELECT body_revision, asset_references_revision FROM project_version_drafts
+            WHERE version_id = %(version_id)s
+            """,
+            {"version_id": version_id},
+        ).fetchall()
+    return [(row["body_revision"], row["asset_references_revision"]) for row in rows]
+
+
+def test_index_follows_draft_writes_and_save(clean_document_tables: None) -> None:
+    fake_r2 = FakeR2Client()
+    app.dependency_overrides[get_asset_service] = lambda: AssetService(fake_r2, NoopThumbnailer())
+    try:
+        client = signed_in_client()
+        project = create_project(client)
+        project_id, version_id = str(project["id"]), str(project["active_version_id"])
+        first = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"first", "first.pdf")
+        second = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"second", "second.pdf")
+
+        version_etag = _put_pumps(client, project_id, version_id, [first])
+        assert [(row["draft_user_id"] is not None, row["asset_id"]) for row in _index_rows(version_id)] == [
+            (True, first)
+        ]
+        draft = client.get(_draft_pumps_url(project_id, version_id)).json()
+        attach = client.post(
+            f"/api/v1/projects/{project_id}/assets/{second}/attach",
+            headers={"Origin": ORIGIN},
+            json={
+                "version_id": version_id,
+                "table_key": "pumps",
+                "row_id": "pmp_1",
+                "field_key": DATASHEET_FIELD_KEY,
+                "index": 0,
+                "if_match": draft["draft_etag"],
+            },
+        )
+        assert attach.status_code == 200, attach.text
+        draft_rows = _index_rows(version_id)
+        assert [(row["asset_id"], row["position"]) for row in draft_rows] == [(second, 0), (first, 1)]
+        assert {row["row_id"] for row in draft_rows} == {"pmp_1"}
+
+        _save(client, project_id, version_id, version_etag)
+
+        # The draft's rows went with the draft; the saved body is indexed.
+        saved_rows = _index_rows(version_id)
+        assert [(row["draft_user_id"], row["asset_id"]) for row in saved_rows] == [(None, second), (None, first)]
+        assert all(indexed == revision for revision, indexed in _stamps(version_id))
+        with connection() as conn:
+            indexed = saved_body_asset_references(conn, UUID(version_id), kind="datasheet")
+            saved = conn.execute("SELECT body FROM project_versions WHERE id = %s", (version_id,)).fetchone()
+        assert saved is not None
+        body = validate_document(saved["body"])
+        assert indexed == list_asset_references(body, kind="datasheet")
+    finally:
+        app.dependency_overrides.pop(get_asset_service, None)
+
+
+def test_stale_bodies_are_parsed_and_rebuild_repairs_them(clean_document_tables: None) -> None:
+    fake_r2 = FakeR2Client()
+    app.dependency_overrides[get_asset_service] = lambda: AssetService(fake_r2, NoopThumbnailer())
+    try:
+        client = signed_in_client()
+        project = create_project(client)
+        project_id, version_id = str(project["id"]), str(project["active_version_id"])
+        asset_id = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"kept", "kept.pdf")
+        _put_pumps(client, project_id, version_id, [asset_id])
+
+        # A body written behind the index's back: drop its rows and rewrite
+        # the body in place, which mints a fresh body revision.
+        with transaction() as conn:
+            conn.execute("DELETE FROM project_asset_references WHERE version_id = %s", (version_id,))
+            conn.execute("UPDATE project_version_drafts SET body = body WHERE version_id = %s", (version_id,))
+        assert not _index_rows(version_id)
+
+        with connection() as conn:
+            assert asset_id in referenced_asset_ids_for_project(conn, UUID(project_id))
+            assert saved_body_asset_references(conn, UUID(version_id)) == []
+
+        with transaction() as conn:
+            report = rebuild_project_asset_references(conn, UUID(project_id))
+        assert report.bodies_checked == 2
+        assert report.bodies_drifted == 1
+        assert report.references_added == 1
+        assert not report.applied
+        assert not _index_rows(version_id)
+
+        with transaction() as conn:
+            rebuild_project_asset_references(conn, UUID(project_id), apply=True)
+        assert [row["asset_id"] for row in _index_rows(version_id)] == [asset_id]
+        assert all(indexed == revision for revision, indexed in _stamps(version_id))
+        with transaction() as conn:
+            assert rebuild_project_asset_references(conn, UUID(project_id)).bodies_drifted == 0
+    finally:
+        app.dependency_overrides.pop(get_asset_service, None)
+
+
+def test_a_reference_indexed_twice_is_stored_once(clean_document_tables: None) -> None:
+    fake_r2 = FakeR2Client()
+    app.dependency_overrides[get_asset_service] = lambda: AssetService(fake_r2, NoopThumbnailer())
+    try:
+        client = signed_in_client()
+        project = create_project(client)
+        project_id, version_id = str(project["id"]), str(project["active_version_id"])
+        asset_id = _upload_pdf(client, project_id, fake_r2, PDF_MAGIC + b"once", "once.pdf")
+        _put_pumps(client, project_id, version_id, [asset_id])
+    finally:
+        app.dependency_overrides.pop(get_asset_service, None)
+    (indexed,) = _index_rows(version_id)
+
+    # A second writer that diffed against the same old index re-adds it.
+    with transaction() as conn:
+        references = repository.list_body_asset_references(
+            conn, version_id=UUID(version_id), draft_user_id=indexed["draft_user_id"]
+        )
+        repository.insert_body_asset_references(
+            conn, version_id=UUID(version_id), draft_user_id=indexed["draft_user_id"], references=references
+        )
+
+    assert _index_rows(version_id) == [indexed]
+
+
+def test_changed_sections_map_to_attachment_tables() -> None:
+    assert attachment_tables_in_sections([("settings",)]) == frozenset()
+    assert "pumps" in attachment_tables_in_sections([("tables", "equipment", "pumps")])
+    assert "pumps" not in attachment_tables_in_sections([("tables", "project_materials")])
+    assert "project_materials" in attachment_tables_in_sections([("tables",)])
@@ -0,0 +1,183 @@
+"""Asset render service: reduced-size renders, queue priority, backpressure, limits."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pypdfium2 as pdfium
+import pytest
+from PIL import Image
+
+from database import connection
+from features.assets import render_pool, repository
+from features.assets.heic_conversion import AssetConversionError, convert_heic_upload_to_jpeg
+from features.assets.models import AssetRow
+from features.assets.render_pool import (
+    RenderPriority,
+    RenderTimeoutError,
+    run_in_render_worker,
+    shutdown_render_pool,
+    submit_render,
+)
+from features.assets.rendering import pdf_render_scale, render_thumbnail
+from features.assets.routes import get_asset_service
+from features.assets.service import AssetService
+from features.assets.thumbnailer import Thumbnailer
+from main import app
+from tests.test_assets_orphan_sweeper import _upload_pdf
+from tests.test_assets_service import FakeR2Client, NoopThumbnailer
+from tests.test_project_document import create_project, signed_in_client
+
+
+@pytest.fixture
+def render_queue(monkeypatch: pytest.MonkeyPatch) -> Iterator[pytest.MonkeyPatch]:
+    monkeypatch.setattr(render_pool.settings, "asset_render_workers", 1)
+    shutdown_render_pool()
+    yield monkeypatch
+    shutdown_render_pool()
+
+
+def _pdf_bytes(width: float, height: float) -> bytes:
+    document = pdfium.PdfDocument.new()
+    document.new_page(width, height)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def test_pdf_renders_at_the_scale_that_fits_the_box() -> None:
+    assert pdf_render_scale(612, 792) == pytest.approx(400 / 792)
+    assert pdf_render_scale(100, 100) == 1.0
+
+    rendered = render_thumbnail("application/pdf", _pdf_bytes(612, 792))
+
+    assert rendered.metadata == {"page_count": 1}
+    assert Image.open(io.BytesIO(rendered.image)).size == (310, 400)
+
+
+def test_rotated_jpeg_is_reduced_and_made_upright() -> None:
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored landscape, displayed portrait
+    output = io.BytesIO()
+    Image.new("RGB", (2400, 1600), "red").save(output, format="JPEG", exif=exif.tobytes())
+
+    rendered = render_thumbnail("image/jpeg", output.getvalue(), "webp")
+
+    assert rendered.metadata == {"image_dimensions": (1600, 2400)}
+    assert (rendered.content_type, rendered.extension) == ("image/webp", "webp")
+    with Image.open(io.BytesIO(rendered.image)) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (267, 400)
+
+
+def test_interactive_jobs_run_ahead_of_queued_backfill(render_queue: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    order: list[str] = []
+
+    def blocker() -> None:
+        order.append("blocker")
+        release.wait(timeout=10)
+
+    first = submit_render(RenderPriority.BACKFILL, "blocker", blocker)
+    while not order:
+        time.sleep(0.01)
+    backfill = submit_render(RenderPriority.BACKFILL, "backfill", lambda: order.append("backfill"))
+    interactive = submit_render(RenderPriority.INTERACTIVE, "interactive", lambda: order.append("interactive"))
+    release.set()
+    for job in (first, backfill, interactive):
+        job.result(timeout=10)
+
+    assert order == ["blocker", "interactive", "backfill"]
+    stats = {row.priority: row for row in render_pool.render_queue_stats()}
+    assert stats["interactive"].queued == 0
+    assert stats["backfill"].completed >= 2
+
+
+def test_backfill_submitters_block_while_the_queue_is_full(render_queue: pytest.MonkeyPatch) -> None:
+    render_queue.setattr(render_pool.settings, "asset_render_queue_max", 1)
+    release = threading.Event()
+    submitted = threading.Event()
+    running = submit_render(RenderPriority.BACKFILL, "running", lambda: release.wait(timeout=10))
+    while render_pool.render_queue_stats()[RenderPriority.BACKFILL].running == 0:
+        time.sleep(0.01)
+    waiting = submit_render(RenderPriority.BACKFILL, "waiting", lambda: None)
+
+    def submit_one_more() -> None:
+        submit_render(RenderPriority.BACKFILL, "blocked", lambda: None).result(timeout=10)
+        submitted.set()
+
+    thread = threading.Thread(target=submit_one_more)
+    thread.start()
+    assert not submitted.wait(timeout=0.3)
+    # Interactive work is never held back by the backfill bound.
+    submit_render(RenderPriority.INTERACTIVE, "interactive", lambda: None)
+
+    release.set()
+    thread.join(timeout=10)
+    assert submitted.is_set()
+    running.result(timeout=10)
+    waiting.result(timeout=10)
+
+
+def test_worker_render_is_cut_off_at_its_time_limit(render_queue: pytest.MonkeyPatch) -> None:
+    with pytest.raises(RenderTimeoutError):
+        run_in_render_worker(time.sleep, 5, timeout_seconds=0.5)
+    assert run_in_render_worker(len, b"abc", timeout_seconds=5) == 3
+
+
+def test_heic_conversion_stops_waiting_on_a_backed_up_queue(render_queue: pytest.MonkeyPatch) -> None:
+    render_queue.setattr(render_pool.settings, "asset_heic_conversion_queue_wait_seconds", 0)
+    render_queue.setattr(render_pool.settings, "asset_heic_conversion_timeout_seconds", 1)
+    release = threading.Event()
+    busy = submit_render(RenderPriority.INTERACTIVE, "busy", lambda: release.wait(timeout=10))
+    asset = AssetRow(
+        id="asset-heic",
+        project_id=str(UUID(int=1)),
+        asset_kind="site_photo",
+        object_key="originals/photo.heic",
+        original_filename="photo.heic",
+        display_name="photo.heic",
+        content_type="image/heic",
+        size_bytes=3,
+        content_hash_sha256="0" * 64,
+        upload_status="uploaded",
+        created_at=datetime.now(UTC),
+        created_by="user",
+    )
+
+    try:
+        with pytest.raises(AssetConversionError, match="heic_conversion_timeout"):
+            convert_heic_upload_to_jpeg(asset, FakeR2Client())
+    finally:
+        release.set()
+    busy.result(timeout=10)
+    stats = {row.priority: row for row in render_pool.render_queue_stats()}
+    assert stats["interactive"].queued == 0
+
+
+def test_thumbnailer_renders_an_uploaded_pdf(clean_document_tables: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(render_pool.settings, "asset_thumbnail_format", "webp")
+    fake_r2 = FakeR2Client()
+    app.dependency_overrides[get_asset_service] = lambda: AssetService(fake_r2, NoopThumbnailer())
+    try:
+        client = signed_in_client()
+        project_id = UUID(str(create_project(client)["id"]))
+        asset_id = _upload_pdf(client, project_id, fake_r2, _pdf_bytes(612, 792), "sheet.pdf")
+    finally:
+        app.dependency_overrides.pop(get_asset_service, None)
+
+    status = Thumbnailer(fake_r2).queue_render(project_id, asset_id, RenderPriority.BACKFILL).result(timeout=30)
+
+    assert status == "ready"
+    with connection() as conn:
+        asset = repository.get_asset_by_id(conn, project_id, asset_id)
+    assert asset is not None
+    metadata = asset["metadata"]
+    assert metadata["thumbnail_object_key"].endswith("/thumb.webp")
+    assert metadata["page_count"] == 1
+    assert fake_r2.objects[metadata["thumbnail_object_key"]][1] == "image/webp"
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import hashlib
 import io
-from typing import Any
+from collections.abc import Iterator
+from typing import IO, Any
 from uuid import UUID
 
 import pytest
@@ -76,10 +77,18 @@ class FakeR2Client:
         body, _content_type = self._require(object_key)
         return body
 
+    def iter_object_chunks(self, object_key: str, chunk_size: int) -> Iterator[bytes]:
+        body, _content_type = self._require(object_key)
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
     def put_object(self, object_key: str, body: bytes, content_type: str) -> str:
         self.objects[object_key] = (body, content_type)
         return hashlib.md5(body, usedforsecurity=False).hexdigest()
 
+    def upload_fileobj(self, object_key: str, body: IO[bytes], content_type: str) -> None:
+        self.objects[object_key] = (body.read(), content_type)
+
     def copy_object(self, source_key: str, dest_key: str) -> None:
         self.objects[dest_key] = self.objects[source_key]
 
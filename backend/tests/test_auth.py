@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 from collections.abc import Callable, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
@@ -15,10 +16,11 @@ from fastapi.testclient import TestClient
 
 from config import settings
 from database import connection, transaction
+from features.auth import password_pool, session_cache
 from features.auth import service as auth_service
 from features.auth.cookies import set_session_cookie
 from features.auth.passwords import hash_password, verify_password
-from features.auth.rate_limit import reserve_login_verification_slot, reset_login_rate_limiter
+from features.auth.rate_limit import reset_login_rate_limiter
 from features.auth.service import create_or_update_user, now_utc, session_expires_at
 from main import app
 from scripts import seed_frame_catalog, seed_glazing_catalog, seed_materials_catalog, seed_user
@@ -40,7 +42,6 @@ def login_rate_limit(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
     monkeypatch.setattr(settings, "login_rate_limit_enabled", True)
     monkeypatch.setattr(settings, "login_rate_limit_per_ip_per_minute", 10)
     monkeypatch.setattr(settings, "login_rate_limit_per_account_per_minute", 10)
-    monkeypatch.setattr(settings, "login_password_verify_concurrency_limit", 4)
     reset_login_rate_limiter()
     yield
     reset_login_rate_limiter()
@@ -304,6 +305,9 @@ def test_touch_session_throttle_skips_write_within_window(
 
     with transaction() as conn:
         conn.execute("UPDATE sessions SET last_seen_at = now() - interval '90 seconds'")
+    # last_seen_at is not watched by the cache's NOTIFY triggers; only the
+    # request path moves it, so hand-run SQL must drop the cached copy.
+    session_cache.clear_session_cache()
 
     assert client.get("/api/v1/auth/session").status_code == 200
     after = _read_last_seen_at()
@@ -475,7 +479,10 @@ def test_login_concurrency_limit_rejects_before_argon2(
     login_rate_limit: None,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(settings, "login_password_verify_concurrency_limit", 1)
+    """The password pool is the one admission limit: a full pool answers 503 without verifying."""
+    monkeypatch.setattr(password_pool.settings, "password_hash_workers", 1)
+    monkeypatch.setattr(password_pool.settings, "password_hash_queue_max", 0)
+    password_pool.shutdown_password_pool()
     calls = 0
 
     def fake_verify_password(password: str, password_hash: str) -> bool:
@@ -485,16 +492,28 @@ def test_login_concurrency_limit_rejects_before_argon2(
 
     monkeypatch.setattr(auth_service, "verify_password", fake_verify_password)
     client = TestClient(app)
+    release, running = threading.Event(), threading.Event()
 
-    with reserve_login_verification_slot():
+    def occupy() -> None:
+        running.set()
+        release.wait(timeout=10)
+
+    holder = threading.Thread(target=password_pool.run_password_job, args=(occupy,))
+    holder.start()
+    try:
+        assert running.wait(timeout=10)
         response = client.post(
             "/api/v1/auth/login",
             headers={"Origin": ORIGIN, "X-Forwarded-For": "203.0.113.40"},
             json={"email": "missing@example.com", "password": "wrong"},
         )
+    finally:
+        release.set()
+        holder.join(timeout=10)
+        password_pool.shutdown_password_pool()
 
-    assert response.status_code == 429
-    assert response.json()["error_code"] == "rate_limited"
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "password_hashing_busy"
     assert calls == 0
     with connection() as conn:
         row = conn.execute("SELECT count(*) AS n FROM user_action_log WHERE action = 'login_failed'").fetchone()
@@ -0,0 +1,131 @@
+"""Argon2 pool: off the request thread, load shedding, rehash on sign-in."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from database import connection
+from features.auth import password_pool
+from features.auth import service as auth_service
+from features.auth.password_pool import (
+    PasswordHashingBusyError,
+    password_hashing_stats,
+    run_password_job,
+    shutdown_password_pool,
+)
+from features.auth.service import create_or_update_user
+from main import app
+from tests.test_project_document import ORIGIN
+
+LOGIN = {"email": "ed@example.com", "password": "password"}
+
+
+@pytest.fixture
+def one_worker(monkeypatch: pytest.MonkeyPatch) -> Iterator[pytest.MonkeyPatch]:
+    monkeypatch.setattr(password_pool.settings, "password_hash_workers", 1)
+    monkeypatch.setattr(password_pool.settings, "password_hash_queue_max", 0)
+    shutdown_password_pool()
+    yield monkeypatch
+    shutdown_password_pool()
+
+
+def _occupy_worker() -> tuple[threading.Event, threading.Thread]:
+    """Hold the only worker until the returned event is set."""
+    release, running = threading.Event(), threading.Event()
+
+    def blocker() -> None:
+        running.set()
+        release.wait(timeout=10)
+
+    thread = threading.Thread(target=run_password_job, args=(blocker,))
+    thread.start()
+    assert running.wait(timeout=10)
+    return release, thread
+
+
+def test_verification_runs_on_the_pool_and_is_timed(one_worker: pytest.MonkeyPatch) -> None:
+    threads: list[str] = []
+    before = password_hashing_stats().completed
+
+    assert run_password_job(lambda: threads.append(threading.current_thread().name) or True)
+
+    assert threads[0].startswith("password-hash")
+    stats = password_hashing_stats()
+    assert stats.completed == before + 1
+    assert stats.in_flight == 0 and stats.mean_run_ms is not None
+
+
+def test_a_full_pool_sheds_sign_ins_with_503(clean_document_tables: None, one_worker: pytest.MonkeyPatch) -> None:
+    create_or_update_user(email="ed@example.com", display_name="Ed May", password="password")
+    rejected = password_hashing_stats().rejected
+    release, thread = _occupy_worker()
+    try:
+        with pytest.raises(PasswordHashingBusyError):
+            run_password_job(len, "x")
+        response = TestClient(app).post("/api/v1/auth/login", headers={"Origin": ORIGIN}, json=LOGIN)
+    finally:
+        release.set()
+        thread.join(timeout=10)
+
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "password_hashing_busy"
+    assert password_hashing_stats().rejected == rejected + 2
+    # Nothing was verified, so nothing was audited as a failed sign-in.
+    with connection() as conn:
+        row = conn.execute("SELECT count(*) AS n FROM user_action_log WHERE action = 'login_failed'").fetchone()
+    assert row == {"n": 0}
+
+
+def test_queued_jobs_wait_for_a_worker(one_worker: pytest.MonkeyPatch) -> None:
+    one_worker.setattr(password_pool.settings, "password_hash_queue_max", 1)
+    release, thread = _occupy_worker()
+    results: list[int] = []
+    waiter = threading.Thread(target=lambda: results.append(run_password_job(len, "abc")))
+    waiter.start()
+    try:
+        with pytest.raises(PasswordHashingBusyError):
+            _wait_until_in_flight(2)
+            run_password_job(len, "x")
+    finally:
+        release.set()
+        thread.join(timeout=10)
+        waiter.join(timeout=10)
+    assert results == [3]
+
+
+def _wait_until_in_flight(count: int) -> None:
+    for _ in range(500):
+        if password_hashing_stats().in_flight >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("jobs never reached the pool")
+
+
+def test_sign_in_rehashes_a_password_made_with_old_costs(
+    clean_document_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create_or_update_user(email="ed@example.com", display_name="Ed May", password="password")
+    with connection() as conn:
+        before = conn.execute("SELECT password_hash, password_set_at FROM users").fetchone()
+    assert before is not None
+    monkeypatch.setattr(auth_service.settings, "password_argon2_time_cost", settings.password_argon2_time_cost + 1)
+    client = TestClient(app)
+
+    assert client.post("/api/v1/auth/login", headers={"Origin": ORIGIN}, json=LOGIN).status_code == 200
+
+    with connection() as conn:
+        after = conn.execute("SELECT password_hash, password_set_at FROM users").fetchone()
+    assert after is not None
+    assert after["password_hash"] != before["password_hash"]
+    assert f"t={settings.password_argon2_time_cost}," in after["password_hash"]
+    assert after["password_set_at"] == before["password_set_at"]
+    # The re-hash still verifies, and is left alone from now on.
+    assert client.post("/api/v1/auth/login", headers={"Origin": ORIGIN}, json=LOGIN).status_code == 200
+    with connection() as conn:
+        again = conn.execute("SELECT password_hash FROM users").fetchone()
+    assert again == {"password_hash": after["password_hash"]}
@@ -0,0 +1,180 @@
+"""Session/principal cache: warm requests skip queries, NOTIFY invalidates."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from database import transaction
+from features.access import repository as access_repository
+from features.access.capabilities import ADMIN_USERS_MANAGE, CATALOG_EDIT
+from features.admin import service as admin_service
+from features.auth import repository as auth_repository
+from features.auth import session_cache
+from features.auth.models import UserPublic
+from features.auth.service import create_or_update_user
+from main import app
+from tests.test_project_document import ORIGIN, create_project
+
+URL = "/api/v1/auth/session"
+
+
+@pytest.fixture
+def session_cache_on(monkeypatch: pytest.MonkeyPatch, clean_document_tables: None) -> Iterator[dict[str, int]]:
+    """Count the cold-path queries of the cache (its listener runs suite-wide)."""
+    calls = {"session": 0, "principal": 0}
+    session_query = auth_repository.get_session_with_user
+    principal_query = access_repository.get_principal_inputs
+
+    def counting_session_query(*args: Any, **kwargs: Any) -> Any:
+        calls["session"] += 1
+        return session_query(*args, **kwargs)
+
+    def counting_principal_query(*args: Any, **kwargs: Any) -> Any:
+        calls["principal"] += 1
+        return principal_query(*args, **kwargs)
+
+    monkeypatch.setattr(auth_repository, "get_session_with_user", counting_session_query)
+    monkeypatch.setattr(access_repository, "get_principal_inputs", counting_principal_query)
+    monkeypatch.setattr(settings, "auth_session_cache_ttl_seconds", 30)
+    monkeypatch.setattr(settings, "session_touch_throttle_seconds", 60)
+    _wait_for(session_cache.session_cache_listening)
+    session_cache.clear_session_cache()
+    yield calls
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.02)
+
+
+def _signed_in() -> tuple[TestClient, UUID, UUID]:
+    user = create_or_update_user(email="ed@example.com", display_name="Ed May", password="password")
+    client = TestClient(app)
+    login = client.post(
+        "/api/v1/auth/login",
+        headers={"Origin": ORIGIN},
+        json={"email": "ed@example.com", "password": "password"},
+    )
+    assert login.status_code == 200
+    return client, user.id, UUID(str(client.cookies.get(settings.session_cookie_name)))
+
+
+def test_warm_requests_resolve_the_caller_without_queries(session_cache_on: dict[str, int]) -> None:
+    client, _user_id, _session_id = _signed_in()
+    # Login resolves the new user's capabilities for its response.
+    assert session_cache_on == {"session": 0, "principal": 1}
+    project_id = create_project(client)["id"]
+
+    for _ in range(3):
+        assert client.get(URL).status_code == 200
+        assert client.get(f"/api/v1/projects/{project_id}").status_code == 200
+    # Only the first request after login queried the session.
+    assert session_cache_on == {"session": 1, "principal": 1}
+
+
+def test_invalidated_session_is_rejected_once_notified(session_cache_on: dict[str, int]) -> None:
+    client, _user_id, session_id = _signed_in()
+    assert client.get(URL).status_code == 200
+
+    # Another process (or hand-run SQL) revokes the session.
+    with transaction() as conn:
+        conn.execute("UPDATE sessions SET invalidated_at = now(), invalidation_reason = 'admin_revoked'")
+    _wait_for(lambda: session_cache.get_session(session_id) is None)
+
+    response = client.get(URL)
+    assert response.status_code == 401
+    assert response.json()["error_code"] == "session_invalidated"
+
+
+def test_grant_changes_reach_cached_principals(session_cache_on: dict[str, int]) -> None:
+    client, user_id, _session_id = _signed_in()
+    assert client.get(URL).status_code == 200
+    inputs = session_cache.get_principal_inputs(user_id)
+    assert inputs is not None and inputs.global_capabilities == frozenset()
+
+    with transaction() as conn:
+        access_repository.ensure_global_grant(conn, user_id=user_id, capability=CATALOG_EDIT, granted_by=None)
+    _wait_for(lambda: session_cache.get_principal_inputs(user_id) is None)
+
+    assert client.get(URL).status_code == 200
+    inputs = session_cache.get_principal_inputs(user_id)
+    assert inputs is not None and inputs.global_capabilities == frozenset({CATALOG_EDIT})
+
+
+def test_writers_drop_this_process_entries_as_soon_as_they_commit(
+    session_cache_on: dict[str, int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client, user_id, session_id = _signed_in()
+    actor = create_or_update_user(email="admin@example.com", display_name="Admin", password="password")
+    with transaction() as conn:
+        access_repository.ensure_global_grant(conn, user_id=actor.id, capability=ADMIN_USERS_MANAGE, granted_by=None)
+    assert client.get(URL).status_code == 200
+    assert session_cache.get_principal_inputs(user_id) is not None
+    # Ignore notifications: only the writer's own invalidation can act.
+    monkeypatch.setattr(session_cache, "_apply", lambda _payload: None)
+
+    admin_service.set_admin(actor, target_user_id=user_id, make_admin=True, ip_address=None, user_agent=None)
+    assert session_cache.get_principal_inputs(user_id) is None
+    assert client.get(URL).status_code == 200
+    assert session_cache.get_session(session_id) is not None
+
+    admin_service.deactivate_user(actor, target_user_id=user_id, ip_address=None, user_agent=None)
+    assert session_cache.get_session(session_id) is None
+    assert client.get(URL).status_code == 401
+
+
+def test_a_session_due_a_touch_takes_the_cold_path(session_cache_on: dict[str, int]) -> None:
+    client, _user_id, _session_id = _signed_in()
+    assert client.get(URL).status_code == 200
+
+    with transaction() as conn:
+        # last_seen_at is not watched, so the cached entry survives this.
+        conn.execute("UPDATE sessions SET last_seen_at = now() - interval '90 seconds'")
+    assert client.get(URL).status_code == 200
+    assert session_cache_on["session"] == 1
+
+    session_cache.clear_session_cache()
+    assert client.get(URL).status_code == 200  # cold: touches
+    assert client.get(URL).status_code == 200  # warm again
+    assert session_cache_on["session"] == 2
+
+
+def test_stale_reads_are_not_cached_and_nothing_serves_without_the_listener(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "auth_session_cache_ttl_seconds", 30)
+    user = UserPublic(id=uuid4(), email="ed@example.com", display_name="Ed May", units_preference="SI")
+    entry = session_cache.CachedSession(
+        user=user,
+        expires_at=datetime.now(UTC) + timedelta(hours=1),
+        last_seen_at=datetime.now(UTC),
+        principal=session_cache.PrincipalInputs(is_staff=False, global_capabilities=frozenset()),
+    )
+    session_id = uuid4()
+    session_cache.stop_session_cache_listener()
+    try:
+        assert session_cache.cache_generation() is None
+
+        session_cache._CACHE.set_listening(True)
+        generation = session_cache.cache_generation()
+        session_cache.invalidate_user(user.id)  # lands between read and put
+        session_cache.put_session(session_id, entry, generation)
+        assert session_cache.get_session(session_id) is None
+
+        session_cache.put_session(session_id, entry, session_cache.cache_generation())
+        assert session_cache.get_session(session_id) == entry
+        session_cache._CACHE.set_listening(False)
+        assert session_cache.get_session(session_id) is None
+    finally:
+        session_cache.start_session_cache_listener()
+        _wait_for(session_cache.session_cache_listening)
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import json
+import threading
 from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
 import pytest
 from fastapi import HTTPException
 
+from config import settings
 from database import connection, transaction
 from features.auth.service import create_or_update_user
+from features.catalogs import option_jobs_service
 from features.catalogs.option_jobs_models import CatalogOptionOperation
 from features.catalogs.option_jobs_service import (
     begin_option_edit,
@@ -18,6 +23,7 @@ from features.catalogs.option_jobs_service import (
     get_unresolved_job,
     preview_cascade,
     rewrite_document_options,
+    rewrite_stored_document_options,
     run_job,
 )
 from features.project_document import repository as document_repository
@@ -372,3 +378,103 @@ def test_expired_running_job_becomes_retryable(clean_document_tables: None) -> N
     assert recovered.status == "failed"
     assert recovered.error == "Catalog cascade worker lease expired; retry the job."
     assert run_job(job.id).status == "completed"
+
+
+@pytest.mark.parametrize(
+    ("field_key", "operations"),
+    [
+        ("manufacturer", [CatalogOptionOperation(kind="rename", old_label="Old", new_label="New")]),
+        ("manufacturer", [CatalogOptionOperation(kind="merge", old_label="Old", new_label="Other")]),
+        ("operation", [CatalogOptionOperation(kind="rename", old_label="Casement", new_label="Tilt-turn")]),
+    ],
+)
+def test_stored_body_rewrite_matches_the_model_rewrite(
+    field_key: str, operations: list[CatalogOptionOperation]
+) -> None:
+    body = _body()
+    stored = json.loads(enforce_document_body_size(body).json_text)
+
+    rewritten, stats = rewrite_stored_document_options(
+        stored, catalog_table="frame_types", field_key=field_key, operations=operations
+    )
+    expected, expected_stats = rewrite_document_options(
+        body, catalog_table="frame_types", field_key=field_key, operations=operations
+    )
+
+    assert stats == expected_stats
+    assert rewritten == expected
+    assert stored == json.loads(enforce_document_body_size(body).json_text)
+    unchanged = [CatalogOptionOperation(kind="rename", old_label="Missing", new_label="New")]
+    assert rewrite_stored_document_options(
+        stored, catalog_table="frame_types", field_key=field_key, operations=unchanged
+    ) == (None, option_jobs_service.DocumentRewriteStats())
+
+
+def test_job_rewrites_projects_on_parallel_workers(
+    clean_document_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "catalog_option_job_workers", 3)
+    user = create_or_update_user(email="ed@example.com", display_name="Ed", password="password")
+    for bt_number in ("2426", "2427", "2428", "2429"):
+        _insert_project(_body(bt_number), user.id)
+    threads: set[str] = set()
+    process_project = option_jobs_service._process_project
+
+    def tracking(*args: Any, **kwargs: Any) -> Any:
+        threads.add(threading.current_thread().name)
+        return process_project(*args, **kwargs)
+
+    monkeypatch.setattr(option_jobs_service, "_process_project", tracking)
+    job = create_job(catalog_table="frame_types", field_key="manufacturer", operations=_rename(), created_by=user.id)
+
+    completed = run_job(job.id)
+
+    assert completed.status == "completed"
+    assert (completed.progress, completed.total_projects, completed.processed_projects) == (100, 4, 4)
+    assert completed.result.projects_touched == 4
+    assert completed.result.versions_created == 4
+    assert threads and all(name.startswith("catalog-cascade") for name in threads)
+
+
+def test_crashed_job_resumes_with_only_the_unfinished_projects(
+    clean_document_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "catalog_option_job_workers", 1)
+    user = create_or_update_user(email="ed@example.com", display_name="Ed", password="password")
+    for bt_number in ("2426", "2427", "2428"):
+        _insert_project(_body(bt_number), user.id)
+    processed: list[str] = []
+    process_project = option_jobs_service._process_project
+
+    def crash_on_second(project: dict[str, Any], **kwargs: Any) -> Any:
+        processed.append(str(project["name"]))
+        if len(processed) == 2:
+            raise KeyboardInterrupt  # the worker dies; nothing is recorded
+        return process_project(project, **kwargs)
+
+    monkeypatch.setattr(option_jobs_service, "_process_project", crash_on_second)
+    job = create_job(catalog_table="frame_types", field_key="manufacturer", operations=_rename(), created_by=user.id)
+    with pytest.raises(KeyboardInterrupt):
+        run_job(job.id)
+
+    with transaction() as conn:
+        checkpoint = conn.execute(
+            "SELECT status, processed_projects, total_projects FROM catalog_option_jobs WHERE id = %(job_id)s",
+            {"job_id": job.id},
+        ).fetchone()
+        conn.execute(
+            "UPDATE catalog_option_jobs SET heartbeat_at = now() - INTERVAL '6 minutes' WHERE id = %(job_id)s",
+            {"job_id": job.id},
+        )
+    assert checkpoint == {"status": "running", "processed_projects": 1, "total_projects": 3}
+
+    resumed = run_job(job.id)
+
+    assert resumed.status == "completed"
+    assert resumed.result.projects_touched == 3
+    assert resumed.result.versions_created == 3
+    # The first project was finished before the crash and is not redone; the
+    # one the dead worker held is retried.
+    assert len(processed) == 4 and len(set(processed)) == 3
+    assert processed[0] not in processed[1:]
+    assert processed[1] in processed[2:]
@@ -0,0 +1,113 @@
+"""Catalog option usage index: counted like the cascade, kept on write, stale bodies parsed."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from database import connection, transaction
+from features.auth.service import create_or_update_user
+from features.catalogs import option_jobs_repository
+from features.catalogs.option_jobs_models import CatalogOptionOperation
+from features.catalogs.option_jobs_service import create_job, preview_cascade, run_job
+from features.catalogs.option_usage_index import (
+    document_option_usage,
+    option_usage_in_sections,
+    rebuild_project_option_usage,
+)
+from tests.test_assets_orphan_sweeper import _put_pumps
+from tests.test_catalog_option_jobs import _body, _insert_project, _rename
+from tests.test_project_document import create_project, signed_in_client
+
+
+def _stamps(project_id: UUID) -> list[tuple[int, int | None]]:
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT body_revision, option_usage_revision FROM project_versions WHERE project_id = %(project_id)s
+            UNION ALL
+            SELECT d.body_revision, d.option_usage_revision
+            FROM project_version_drafts d JOIN project_versions v ON v.id = d.version_id
+            WHERE v.project_id = %(project_id)s
+            """,
+            {"project_id": project_id},
+        ).fetchall()
+    return [(row["body_revision"], row["option_usage_revision"]) for row in rows]
+
+
+def _preview(old_label: str, field_key: str = "manufacturer") -> int:
+    operations = [CatalogOptionOperation(kind="rename", old_label=old_label, new_label=f"{old_label} 2")]
+    return preview_cascade(catalog_table="frame_types", field_key=field_key, operations=operations)
+
+
+def test_usage_counts_only_what_a_cascade_would_rewrite() -> None:
+    usage = document_option_usage(_body())
+
+    # The manual frame has no catalog origin, so only two frames count.
+    assert usage[("project_frames", "frame_types", "manufacturer", "Old")] == 1
+    assert usage[("project_frames", "frame_types", "manufacturer", "Custom")] == 1
+    assert usage[("project_frames", "frame_types", "operation", "Casement")] == 2
+    assert usage[("manufacturer_filters", "frame_types", "manufacturer", "Old")] == 1
+    assert not any(key[1] == "glazing_types" for key in usage)
+    assert option_usage_in_sections([("tables", "project_frames")])
+    assert option_usage_in_sections([("tables",)])
+    assert not option_usage_in_sections([("tables", "pumps"), ("project",)])
+
+
+def test_stale_bodies_are_parsed_until_rebuilt_then_answered_by_the_index(
+    clean_document_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_or_update_user(email="ed@example.com", display_name="Ed", password="password")
+    # Inserted straight through the repository, so nothing indexed the body.
+    project_id, _ = _insert_project(_body(), user.id)
+    assert [stamp for _, stamp in _stamps(project_id)] == [None]
+    assert _preview("Old") == 1
+    assert _preview("Casement", "operation") == 1
+
+    with transaction() as conn:
+        dry_run = rebuild_project_option_usage(conn, project_id)
+    assert (dry_run.bodies_drifted, dry_run.rows_added, dry_run.applied) == (1, 6, False)
+    with transaction() as conn:
+        rebuild_project_option_usage(conn, project_id, apply=True)
+    with transaction() as conn:
+        assert rebuild_project_option_usage(conn, project_id).bodies_drifted == 0
+
+    parsed: list[Any] = []
+    stale_bodies = option_jobs_repository.iter_active_project_bodies
+
+    def tracking(conn: Any, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        for row in stale_bodies(conn, **kwargs):
+            parsed.append(row)
+            yield row
+
+    monkeypatch.setattr(option_jobs_repository, "iter_active_project_bodies", tracking)
+    assert _preview("Old") == 1
+    assert _preview("Missing") == 0
+    assert parsed == []
+
+    job = create_job(catalog_table="frame_types", field_key="manufacturer", operations=_rename(), created_by=user.id)
+    assert run_job(job.id).result.versions_created == 1
+
+    # The cascade indexed the version it appended, which is now active.
+    assert all(stamp == revision for revision, stamp in _stamps(project_id))
+    assert _preview("Old") == 0
+    assert _preview("New") == 1
+    assert parsed == []
+
+
+def test_draft_writes_outside_option_tables_keep_the_index_current(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    project_id = UUID(str(project["id"]))
+    assert all(stamp == revision for revision, stamp in _stamps(project_id))
+
+    _put_pumps(client, project["id"], project["active_version_id"], [])
+
+    stamps = _stamps(project_id)
+    assert len(stamps) == 2
+    assert all(stamp == revision for revision, stamp in stamps)
+    with transaction() as conn:
+        assert rebuild_project_option_usage(conn, project_id).bodies_drifted == 0
@@ -0,0 +1,184 @@
+"""Nearest-station index: parity with haversine ranking, radius queries, and reuse."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from typing import Any
+from uuid import UUID
+
+import pytest
+from psycopg import Connection
+
+from database import connection
+from features.climate import epw_catalog, repository, spatial_index
+from features.climate.epw_catalog import EpwCatalogEntry, epw_entries_for_region, nearest_epw_entries
+from features.climate.importers.phius import parse_phius_mon_file
+from features.climate.proximity import haversine_miles
+from features.climate.service import seed_dataset
+from features.climate.spatial_index import SphereIndex, nearest_dataset_locations
+from tests.test_climate_datasets import _STATION_FILE, clean_climate_tables
+
+__all__ = ["clean_climate_tables"]
+
+
+def _random_points(count: int, seed: int) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(-89.0, 89.0), rng.uniform(-180.0, 180.0)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("query", [(42.33, -73.37), (-33.9, 151.2), (0.0, 179.9), (89.5, 0.0)])
+def test_nearest_matches_brute_force_haversine(query: tuple[float, float]) -> None:
+    points = _random_points(2_000, seed=7)
+    index = SphereIndex([lat for lat, _ in points], [lon for _, lon in points])
+
+    expected = sorted(range(len(points)), key=lambda i: (haversine_miles(*query, *points[i]), i))[:25]
+
+    assert index.nearest(*query, 25).tolist() == expected
+    distances = index.distances_mi(*query)
+    for position in expected:
+        assert distances[position] == pytest.approx(haversine_miles(*query, *points[position]), abs=1e-6)
+
+
+def test_within_and_masked_nearest() -> None:
+    points = _random_points(500, seed=11)
+    index = SphereIndex([lat for lat, _ in points], [lon for _, lon in points])
+    query = (40.0, -105.0)
+    mask = index.distances_mi(*query) >= 0
+    mask[::2] = False
+
+    inside = index.within(*query, 1_500.0)
+    masked = index.nearest(*query, 10, mask=mask)
+
+    assert set(inside.tolist()) == {i for i, point in enumerate(points) if haversine_miles(*query, *point) <= 1_500.0}
+    assert all(position % 2 == 1 for position in masked.tolist())
+    assert index.nearest(*query, 0).tolist() == []
+    assert len(index.nearest(*query, 10_000)) == len(points)
+
+
+def test_equidistant_points_keep_position_order() -> None:
+    index = SphereIndex([10.0, 0.0, -10.0, 0.0], [0.0, 10.0, 0.0, -10.0])
+
+    assert index.nearest(0.0, 0.0, 3).tolist() == [0, 1, 2]
+
+
+def _catalog(count: int, seed: int) -> tuple[EpwCatalogEntry, ...]:
+    rng = random.Random(seed)
+    entries: list[EpwCatalogEntry] = []
+    for station in range(count):
+        latitude, longitude = rng.uniform(25.0, 49.0), rng.uniform(-124.0, -67.0)
+        region = rng.choice(["MA", "NY", "CO"])
+        for period in ("2007-2021", "2009-2023", "2011-2025"):
+            entries.append(
+                EpwCatalogEntry(
+                    country="USA",
+                    region=region,
+                    name=f"Station.{station}",
+                    wmo=None,
+                    source_data="SRC-TMYx",
+                    latitude=latitude + rng.uniform(-0.002, 0.002),
+                    longitude=longitude,
+                    elevation_m=None,
+                    time_zone_offset_hours=None,
+                    url=f"https://climate.onebuilding.org/S{station}_TMYx.{period}.zip",
+                )
+            )
+        entries.append(replace(entries[-1], url=f"https://climate.onebuilding.org/S{station}_TMY3.zip"))
+    return tuple(entries)
+
+
+def _reference_rank(
+    entries: list[EpwCatalogEntry], latitude: float, longitude: float, limit: int | None
+) -> list[EpwCatalogEntry]:
+    """The pre-index per-request ranking, kept as the parity oracle."""
+    reduced = epw_catalog._collapse_to_recent_per_type(entries)
+    decorated = [
+        (haversine_miles(latitude, longitude, entry.latitude, entry.longitude), epw_catalog._station_key(entry), entry)
+        for entry in reduced
+    ]
+    nearest_per_station: dict[tuple[str, str, str], float] = {}
+    for distance, key, _entry in decorated:
+        nearest_per_station[key] = min(distance, nearest_per_station.get(key, distance))
+    decorated.sort(key=lambda row: (round(nearest_per_station[row[1]], 6), row[1], epw_catalog._recency_rank(row[2])))
+    capped = decorated if limit is None else decorated[: max(limit, 0)]
+    return [replace(entry, distance_mi=distance) for distance, _key, entry in capped]
+
+
+def test_epw_ranking_matches_per_request_haversine(monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog = _catalog(300, seed=3)
+    monkeypatch.setattr(epw_catalog, "load_epw_catalog", lambda _urls: catalog)
+    site = (42.33, -73.37)
+
+    assert nearest_epw_entries(*site, country="usa", limit=40) == _reference_rank(list(catalog), *site, 40)
+    assert epw_entries_for_region(
+        country="USA", region=" ma ", latitude=site[0], longitude=site[1], limit=None
+    ) == _reference_rank([entry for entry in catalog if entry.region == "MA"], *site, None)
+    assert nearest_epw_entries(*site, country="CAN", limit=5) == []
+    expected_nearest = min(
+        catalog,
+        key=lambda entry: (
+            round(haversine_miles(*site, entry.latitude, entry.longitude), 6),
+            epw_catalog._recency_rank(entry),
+        ),
+    )
+    assert epw_catalog.nearest_epw_entry(*site) == replace(
+        expected_nearest,
+        distance_mi=haversine_miles(*site, expected_nearest.latitude, expected_nearest.longitude),
+    )
+
+
+def test_epw_catalog_index_is_built_once_per_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog = _catalog(20, seed=5)
+    monkeypatch.setattr(epw_catalog, "load_epw_catalog", lambda _urls: catalog)
+    built: list[int] = []
+    real_collapse = epw_catalog._collapse_to_recent_per_type
+
+    def counting_collapse(entries: list[EpwCatalogEntry]) -> list[EpwCatalogEntry]:
+        built.append(len(entries))
+        return real_collapse(entries)
+
+    monkeypatch.setattr(epw_catalog, "_collapse_to_recent_per_type", counting_collapse)
+    monkeypatch.setattr(epw_catalog, "_CATALOG_INDEX", None)
+
+    for _ in range(3):
+        nearest_epw_entries(40.0, -100.0, limit=5)
+    assert epw_catalog.find_entry_by_url(catalog[7].url) == catalog[7]
+
+    assert built == [len(catalog)]
+
+
+def test_dataset_index_is_built_once_and_ranks_by_great_circle(
+    clean_climate_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    home = parse_phius_mon_file(_STATION_FILE)
+    stations = [
+        home.model_copy(
+            update={
+                "display_name": f"Grid.{lat}.{lon}",
+                "station_id": f"Grid.{lat}.{lon}",
+                "location": home.location.model_copy(update={"latitude": float(lat), "longitude": float(lon)}),
+            }
+        )
+        for lat in range(30, 50, 4)
+        for lon in range(-120, -70, 8)
+    ]
+    dataset_id = seed_dataset("phius", "2099", stations, label=None).dataset_id
+    spatial_index.reset_dataset_location_indexes()
+    loads: list[UUID] = []
+    real_load = repository.located_location_coordinates
+
+    def counting_load(conn: Connection[Any], dataset: UUID) -> list[dict[str, Any]]:
+        loads.append(dataset)
+        return real_load(conn, dataset)
+
+    monkeypatch.setattr(repository, "located_location_coordinates", counting_load)
+    site = (41.3, -101.1)
+
+    with connection() as conn:
+        first = nearest_dataset_locations(conn, dataset_id, latitude=site[0], longitude=site[1], limit=6)
+        second = nearest_dataset_locations(conn, dataset_id, latitude=site[0], longitude=site[1], limit=6)
+
+    expected = sorted(stations, key=lambda s: haversine_miles(*site, s.location.latitude, s.location.longitude))[:6]
+    assert [row["station_id"] for row in first] == [station.station_id for station in expected]
+    assert second == first
+    assert loads == [dataset_id]
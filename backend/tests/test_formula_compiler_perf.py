@@ -0,0 +1,55 @@
+"""Perf gate for compiled formula evaluation against the tree-walking interpreter.
+
+Marked ``perf``: deselected from the default (parallel) run; CI runs it
+serially with ``-m perf``.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pytest
+
+from features.project_document.formula.analysis import count_ast_nodes
+from features.project_document.formula.ast_nodes import FormulaAST
+from features.project_document.formula.evaluator import EvalResult, evaluate, interpret
+from features.project_document.formula.parser import parse
+from tests.test_project_document_formula_evaluator import _resolve_for_test
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "formula_compiler_perf.json"
+SOURCE = (
+    '(if({Area} > 10 and {Height} >= 2.5, concat(upper({Name}), " ", text({Area} * 1.5 + {Height} / 2)), "small"))'
+    ' & "-" & text(len({Name}) % 3)'
+)
+ROWS = [{"area": float(index % 40), "name": f"room {index}", "height": 2.5 + index % 3} for index in range(5000)]
+
+
+def _median_ms(evaluator: Callable[..., EvalResult], ast: FormulaAST) -> float:
+    samples: list[float] = []
+    for _ in range(7):
+        start = perf_counter()
+        for row in ROWS:
+            evaluator(ast, row.get)
+        samples.append((perf_counter() - start) * 1000)
+    return median(samples)
+
+
+@pytest.mark.perf
+def test_compiled_formula_perf_gate() -> None:
+    ast = _resolve_for_test(parse(SOURCE), set())
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    max_ratio = float(baseline["compiled_to_interpreted_max_ratio"])
+    assert count_ast_nodes(ast) == 29
+    assert [evaluate(ast, row.get) for row in ROWS[:200]] == [interpret(ast, row.get) for row in ROWS[:200]]
+
+    interpreted_ms = _median_ms(interpret, ast)
+    compiled_ms = _median_ms(evaluate, ast)
+
+    ratio = compiled_ms / interpreted_ms
+    assert ratio < max_ratio, (
+        f"compiled {compiled_ms:.2f}ms / interpreted {interpreted_ms:.2f}ms = {ratio:.2f} exceeded {max_ratio:.2f}"
+    )
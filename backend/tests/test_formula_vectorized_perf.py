@@ -0,0 +1,46 @@
+"""Perf gate for column-at-a-time evaluation of same-row arithmetic formulas.
+
+Marked ``perf``: deselected from the default (parallel) run; CI runs it
+serially with ``-m perf``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pytest
+
+from features.project_document.document import ProjectDocumentV1
+from features.project_document.formula import document_evaluator
+from tests.builders.formula_perf_doc import ARITHMETIC_ROOM_FORMULAS, ROOM_COUNT, build_formula_perf_document
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "formula_vectorized_perf.json"
+
+
+def _median_ms(body: ProjectDocumentV1) -> float:
+    samples: list[float] = []
+    for _ in range(5):
+        document_evaluator.reset_formula_overlay_cache()
+        start = perf_counter()
+        document_evaluator.evaluate_document_formulas(body)
+        samples.append((perf_counter() - start) * 1000)
+    return median(samples)
+
+
+@pytest.mark.perf
+def test_vectorized_formula_perf_gate(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = build_formula_perf_document(ARITHMETIC_ROOM_FORMULAS)
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    max_ratio = float(baseline["vectorized_to_scalar_max_ratio"])
+
+    vectorized_ms = _median_ms(body)
+    monkeypatch.setattr(document_evaluator, "VECTORIZE_MIN_ROWS", ROOM_COUNT + 1)
+    scalar_ms = _median_ms(body)
+
+    ratio = vectorized_ms / scalar_ms
+    assert ratio < max_ratio, (
+        f"vectorized {vectorized_ms:.2f}ms / scalar {scalar_ms:.2f}ms = {ratio:.2f} exceeded {max_ratio:.2f}"
+    )
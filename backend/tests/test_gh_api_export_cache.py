@@ -0,0 +1,113 @@
+"""GH export routes: conditional GET and the per-revision export cache."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import transaction
+from features.gh_api import export_cache
+from features.gh_api.export_cache import get_gh_export_storage, reset_gh_export_cache
+from main import app
+from tests.test_assets_service import FakeR2Client
+from tests.test_gh_api_foundation import _create_project, _gh_url
+from tests.test_project_document import signed_in_client
+
+ROUTES = ("/constructions/hbjson", "/aperture-types", "/aperture-constructions/hbjson", "/tables/pumps")
+
+
+@pytest.fixture
+def body_loads(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[int]]:
+    """Count the saved-body loads the export routes make."""
+    loads: list[int] = []
+    load = export_cache.resolve_version_and_body
+
+    def counting_load(*args: Any, **kwargs: Any) -> Any:
+        loads.append(1)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(export_cache, "resolve_version_and_body", counting_load)
+    reset_gh_export_cache()
+    yield loads
+    reset_gh_export_cache()
+
+
+def test_matching_etag_is_answered_without_loading_the_body(clean_document_tables: None, body_loads: list[int]) -> None:
+    _create_project(signed_in_client(), "2610")
+    anon = TestClient(app)
+
+    for route in ROUTES:
+        first = anon.get(_gh_url("2610") + route)
+        assert first.status_code == 200, first.text
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and first.headers["last-modified"].endswith("GMT")
+
+        repeat = anon.get(_gh_url("2610") + route)
+        assert repeat.json() == first.json()
+        assert repeat.headers["etag"] == etag
+
+        not_modified = anon.get(_gh_url("2610") + route, headers={"If-None-Match": f'W/"other", {etag}'})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+    # One export per route; the repeat and the 304 never touched the body.
+    assert len(body_loads) == len(ROUTES)
+
+
+def test_query_params_and_body_writes_change_the_etag(clean_document_tables: None, body_loads: list[int]) -> None:
+    project = _create_project(signed_in_client(), "2611")
+    anon = TestClient(app)
+    url = _gh_url("2611") + "/constructions/hbjson"
+
+    strict = anon.get(url)
+    defaults = anon.get(url, params={"on_missing_thermal": "user_defaults"})
+    assert strict.headers["etag"] != defaults.headers["etag"]
+
+    # Any write of the body re-draws its revision, even one that leaves it equal.
+    with transaction() as conn:
+        conn.execute("UPDATE project_versions SET body = body WHERE id = %s", (project["active_version_id"],))
+    rewritten = anon.get(url, headers={"If-None-Match": strict.headers["etag"]})
+    assert rewritten.status_code == 200
+    assert rewritten.headers["etag"] != strict.headers["etag"]
+    assert len(body_loads) == 3
+
+
+def test_project_rename_changes_the_envelope_but_reuses_the_payload(
+    clean_document_tables: None, body_loads: list[int]
+) -> None:
+    project = _create_project(signed_in_client(), "2612")
+    anon = TestClient(app)
+    url = _gh_url("2612") + "/aperture-types"
+    before = anon.get(url)
+
+    with transaction() as conn:
+        conn.execute("UPDATE projects SET name = 'Renamed' WHERE id = %s", (project["id"],))
+    after = anon.get(url, headers={"If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.json()["project"]["name"] == "Renamed"
+    assert after.headers["etag"] != before.headers["etag"]
+    assert len(body_loads) == 1
+
+
+def test_object_store_tier_serves_other_processes(clean_document_tables: None, body_loads: list[int]) -> None:
+    fake_r2 = FakeR2Client()
+    app.dependency_overrides[get_gh_export_storage] = lambda: fake_r2
+    try:
+        project = _create_project(signed_in_client(), "2613")
+        anon = TestClient(app)
+        url = _gh_url("2613") + "/tables/pumps"
+        first = anon.get(url)
+        assert [key for key in fake_r2.objects if "/gh-exports/" in key]
+
+        # A fresh process: empty memory tier, same object store.
+        reset_gh_export_cache()
+        second = anon.get(url)
+    finally:
+        app.dependency_overrides.pop(get_gh_export_storage, None)
+
+    assert second.json() == first.json()
+    assert second.json()["project"]["project_id"] == project["id"]
+    assert len(body_loads) == 1
@@ -0,0 +1,147 @@
+"""Sectioned `/model_data` container: exact round trip, packed meshes, ranged decode."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+import numpy as np
+import pytest
+
+from features.model_viewer.artifact import (
+    HEADER_PREFETCH_BYTES,
+    ArtifactFormatError,
+    artifact_head_length,
+    decode_artifact,
+    decode_section,
+    encode_artifact,
+    parse_artifact_index,
+)
+from features.model_viewer.mesh_lod import decimate_mesh
+
+
+def _mesh(offset: float) -> dict[str, Any]:
+    return {
+        "vertices": [[0.0 + offset, -0.0, 3.0479999999999996], [1.1, 0.0, 0.1 + 0.2], [0.0, 2.2, 1e-300]],
+        "faces": [[0, 1, 2]],
+    }
+
+
+def _payload() -> dict[str, Any]:
+    return {
+        "faces": [
+            {"identifier": f"face_{index}", "geometry": {"mesh": _mesh(index), "area": 1.5}, "apertures": []}
+            for index in range(3)
+        ],
+        "spaces": [
+            {
+                "volumes": [
+                    # A quad face has no fixed stride: it must stay inline JSON.
+                    {"geometry": [{"mesh": {"vertices": [[0.0, 0.0, 0.0]] * 4, "faces": [[0, 1, 2, 3]]}}]},
+                    {"geometry": [{"mesh": None}]},
+                ]
+            }
+        ],
+        "load_summary": {"faces_extracted": 3, "extraction_warnings": []},
+    }
+
+
+def test_round_trip_is_exact_and_deterministic() -> None:
+    payload = _payload()
+
+    artifact = encode_artifact(payload)
+
+    assert artifact == encode_artifact(_payload())
+    decoded = decode_artifact(artifact)
+    assert decoded == payload
+    assert json.dumps(decoded) == json.dumps(payload)  # -0.0 and float repr survive
+
+
+def test_triangle_meshes_are_packed_into_typed_buffers() -> None:
+    artifact = encode_artifact(_payload())
+    index = parse_artifact_index(artifact)
+
+    assert index.keys() == ["faces", "spaces", "load_summary"]
+    assert {"faces.vertices", "faces.indices"} <= index.sections.keys()
+    assert "spaces.vertices" not in index.sections
+
+    faces_json = index.sections["faces"]
+    packed = json.loads(gzip.decompress(artifact[faces_json.offset : faces_json.offset + faces_json.length]))
+    assert packed[2]["geometry"]["mesh"] == {"vertex_range": [6, 9], "face_range": [2, 3]}
+    vertices = index.sections["faces.vertices"]
+    buffer = gzip.decompress(artifact[vertices.offset : vertices.offset + vertices.length])
+    assert np.frombuffer(buffer, dtype="<f8").reshape(-1, 3)[6].tolist() == _mesh(2)["vertices"][0]
+
+
+def test_a_section_decodes_from_its_span_alone() -> None:
+    payload = _payload()
+    artifact = encode_artifact(payload)
+    head = artifact[:HEADER_PREFETCH_BYTES]
+    index = parse_artifact_index(head[: artifact_head_length(head)])
+
+    for key in index.keys():
+        start, end = index.span(key)
+        assert decode_section(index, key, artifact[start : end + 1], start) == payload[key]
+
+
+def test_other_bytes_are_rejected() -> None:
+    with pytest.raises(ArtifactFormatError):
+        artifact_head_length(gzip.compress(b"{}"))
+    with pytest.raises(ArtifactFormatError):
+        parse_artifact_index(encode_artifact(_payload())[:20])
+
+
+def _grid_mesh(size: int) -> dict[str, Any]:
+    """A flat ``size`` x ``size`` quad grid split into 2·size² triangles."""
+    vertices = [[float(x), float(y), 0.25] for y in range(size + 1) for x in range(size + 1)]
+    faces = []
+    for y in range(size):
+        for x in range(size):
+            corner = y * (size + 1) + x
+            faces.append([corner, corner + 1, corner + size + 2])
+            faces.append([corner, corner + size + 2, corner + size + 1])
+    return {"vertices": vertices, "faces": faces}
+
+
+def test_decimation_fits_the_budget_and_stays_in_bounds() -> None:
+    mesh = _grid_mesh(40)
+    vertices = np.asarray(mesh["vertices"], dtype=np.float64)
+    triangles = np.asarray(mesh["faces"], dtype=np.uint32)
+
+    coarse_vertices, coarse_triangles = decimate_mesh(vertices, triangles, 200)
+
+    assert 0 < len(coarse_triangles) <= 200
+    assert coarse_triangles.max() < len(coarse_vertices)
+    assert (coarse_vertices.min(axis=0) >= vertices.min(axis=0)).all()
+    assert (coarse_vertices.max(axis=0) <= vertices.max(axis=0)).all()
+    # Winding is kept: the grid faces +z, and so does every coarse triangle.
+    a, b, c = (coarse_vertices[coarse_triangles[:, corner]] for corner in range(3))
+    assert (np.cross(b - a, c - a)[:, 2] > 0).all()
+    assert decimate_mesh(vertices, triangles, len(triangles))[1] is triangles
+
+
+def test_level_of_detail_sections_are_read_separately() -> None:
+    payload = {
+        "shading_elements": [
+            {"shades": [{"geometry": {"mesh": _grid_mesh(30)}}]},
+            {"shades": [{"geometry": {"mesh": _mesh(0.0)}}]},
+        ],
+        "faces": _payload()["faces"],
+    }
+    artifact = encode_artifact(payload, lod_triangle_budget=100)
+    index = parse_artifact_index(artifact)
+
+    assert "shading_elements.lod.vertices" in index.sections
+    assert "faces.lod.vertices" not in index.sections
+    assert decode_artifact(artifact) == payload
+
+    start, end = index.span("shading_elements", level_of_detail=True)
+    full_start, full_end = index.span("shading_elements")
+    assert start == full_start and end < full_end
+    coarse = decode_section(index, "shading_elements", artifact[start : end + 1], start, level_of_detail=True)
+    large, small = (group["shades"][0]["geometry"]["mesh"] for group in coarse)
+    assert 0 < len(large["faces"]) <= 100
+    assert small == _mesh(0.0)
+    assert decode_section(index, "faces", artifact, level_of_detail=True) == payload["faces"]
+    assert encode_artifact(payload) == encode_artifact(payload, lod_triangle_budget=1_800)
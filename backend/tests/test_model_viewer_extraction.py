@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import json
 import os
+import random
 from collections import Counter
 from pathlib import Path
 from typing import Any, TypedDict
@@ -30,7 +31,9 @@ from ladybug_geometry.geometry3d.line import LineSegment3D
 from ladybug_geometry.geometry3d.pointvector import Point3D
 
 from features.model_viewer.extraction import (
+    _SHADE_MERGE_TOLERANCE,
     ModelParseError,
+    _join_mesh_faces,
     extract_geometry_summary,
     extract_model_data,
     parse_hb_model,
@@ -195,6 +198,51 @@ def test_primary_shade_groups_merged(primary_data: CombinedModelDataSchema) -> N
         assert mesh.faces
 
 
+def _sequential_join(faces: list[tuple[Point3D, ...]]) -> tuple[list[list[float]], list[list[int]]]:
+    """The original per-vertex bucket scan, kept as the parity oracle."""
+    vertices: list[Point3D] = []
+    buckets: dict[tuple[int, int, int], list[int]] = {}
+    joined: list[list[int]] = []
+
+    def find_or_add(point: Point3D) -> int:
+        key = tuple(round(value / _SHADE_MERGE_TOLERANCE) for value in (point.x, point.y, point.z))
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for index in buckets.get((key[0] + dx, key[1] + dy, key[2] + dz), []):
+                        if point.is_equivalent(vertices[index], _SHADE_MERGE_TOLERANCE):
+                            return index
+        vertices.append(point)
+        buckets.setdefault((key[0], key[1], key[2]), []).append(len(vertices) - 1)
+        return len(vertices) - 1
+
+    for face in faces:
+        joined.append([find_or_add(point) for point in face])
+    return [[vertex.x, vertex.y, vertex.z] for vertex in vertices], joined
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_shade_mesh_join_matches_the_sequential_merge(seed: int) -> None:
+    """Coincident, near-tolerance and exactly-one-tolerance-apart corners
+    merge exactly as the per-vertex `is_equivalent` scan did."""
+    rng = random.Random(seed)
+    tolerance = _SHADE_MERGE_TOLERANCE
+    anchors = [(rng.uniform(-50, 50), rng.uniform(-50, 50), rng.uniform(0, 20)) for _ in range(12)]
+    jitters = [0.0, 0.0, 0.3, 0.5, 0.9, 1.0, 1.0000001, 1.6, 2.2]
+    faces: list[tuple[Point3D, ...]] = []
+    for _ in range(60):
+        corners = []
+        for _ in range(3):
+            x, y, z = rng.choice(anchors)
+            corners.append(Point3D(x + rng.choice(jitters) * tolerance, y - rng.choice(jitters) * tolerance, z))
+        faces.append(tuple(corners))
+    faces.append(tuple(Point3D(0.5 * tolerance * step, 0.0, 0.0) for step in range(-1, 2)))
+
+    mesh = _join_mesh_faces(faces)
+
+    assert (mesh.vertices, mesh.faces) == _sequential_join(faces)
+
+
 def test_primary_ventilation_duct_type_normalized(primary_data: CombinedModelDataSchema) -> None:
     """One system shared across 4 rooms dedupes to one DTO; duct_type is
     forced from list membership (crit. 7) — the fixture's GH export tags
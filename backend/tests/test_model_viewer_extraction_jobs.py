@@ -0,0 +1,196 @@
+"""Extraction worker pool: artifact parity, single flight per hash, limits."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+import config
+from config import Settings
+from features.model_viewer import extraction_jobs
+from features.model_viewer.artifact import encode_artifact
+from features.model_viewer.extraction import ModelParseError, extract_model_data, parse_hb_model
+from features.model_viewer.extraction_jobs import (
+    ModelExtractionLimitError,
+    extract_artifacts,
+    gzip_json,
+    run_extraction,
+    shutdown_extraction_pool,
+)
+
+PRIMARY_BYTES = (Path(__file__).parent / "fixtures" / "ph_nav_v2_example.hbjson").read_bytes()
+
+
+@pytest.fixture
+def extraction_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[pytest.MonkeyPatch]:
+    monkeypatch.setattr(extraction_jobs.settings, "model_extraction_workers", 1)
+    shutdown_extraction_pool()
+    yield monkeypatch
+    shutdown_extraction_pool()
+
+
+def test_artifacts_match_the_one_shot_encodings() -> None:
+    payload = extract_model_data(parse_hb_model(json.loads(PRIMARY_BYTES))).model_dump(mode="json", by_alias=True)
+
+    extracted = extract_artifacts(PRIMARY_BYTES)
+
+    assert extracted.json_artifact == gzip.compress(json.dumps(payload, separators=(",", ":")).encode(), mtime=0)
+    assert extracted.sectioned_artifact == encode_artifact(payload)
+    assert extracted.faces_extracted == len(payload["faces"])
+    assert gzip_json({"a": [], "b": {"c": [1, "é"]}, "d": [None, 2.5]}) == gzip.compress(
+        json.dumps({"a": [], "b": {"c": [1, "é"]}, "d": [None, 2.5]}, separators=(",", ":")).encode(), mtime=0
+    )
+
+
+def test_concurrent_callers_share_one_extraction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(extraction_jobs.settings, "model_extraction_workers", 0)
+    started = threading.Event()
+    release = threading.Event()
+    loads: list[int] = []
+
+    def load_raw() -> bytes:
+        loads.append(1)
+        started.set()
+        release.wait(timeout=10)
+        return PRIMARY_BYTES
+
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        owner = threads.submit(run_extraction, "hash-a", load_raw)
+        assert started.wait(timeout=10)
+        waiters = [threads.submit(run_extraction, "hash-a", load_raw) for _ in range(3)]
+        release.set()
+        results = [owner.result(), *(waiter.result() for waiter in waiters)]
+
+    assert loads == [1]
+    assert all(result is results[0] for result in results)
+    assert extraction_jobs._IN_FLIGHT == {}
+
+
+def test_waiters_see_the_owner_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(extraction_jobs.settings, "model_extraction_workers", 0)
+    release = threading.Event()
+
+    def load_raw() -> bytes:
+        release.wait(timeout=10)
+        return b"not json"
+
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        owner = threads.submit(run_extraction, "hash-b", load_raw)
+        while "hash-b" not in extraction_jobs._IN_FLIGHT:
+            pass
+        waiter = threads.submit(run_extraction, "hash-b", load_raw)
+        release.set()
+        for future in (owner, waiter):
+            with pytest.raises(ModelParseError, match="Invalid JSON"):
+                future.result()
+
+
+def test_pool_extracts_in_a_worker_process(extraction_pool: pytest.MonkeyPatch) -> None:
+    budget = extraction_jobs.settings.model_data_lod_triangle_budget
+
+    assert run_extraction("hash-c", lambda: PRIMARY_BYTES) == extract_artifacts(
+        PRIMARY_BYTES, lod_triangle_budget=budget
+    )
+
+
+def test_time_limit_is_a_permanent_failure(extraction_pool: pytest.MonkeyPatch) -> None:
+    extraction_pool.setattr(extraction_jobs.settings, "model_extraction_timeout_seconds", 0.001)
+
+    with pytest.raises(ModelExtractionLimitError, match="time limit"):
+        run_extraction("hash-d", lambda: PRIMARY_BYTES)
+
+
+def test_memory_limit_is_a_permanent_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The address-space cap surfaces in the job as MemoryError (run here, in-process)."""
+
+    def exhausted(_raw: bytes, *, lod_triangle_budget: int) -> None:
+        raise MemoryError
+
+    monkeypatch.setattr(extraction_jobs, "extract_artifacts", exhausted)
+
+    with pytest.raises(ModelExtractionLimitError, match="out of memory"):
+        extraction_jobs._extract_in_worker(PRIMARY_BYTES, 0)
+
+
+def test_a_worker_killed_twice_on_one_model_is_a_permanent_failure(extraction_pool: pytest.MonkeyPatch) -> None:
+    class KilledPool:
+        def run(self, *_args: object) -> None:
+            raise BrokenProcessPool
+
+        def discard(self) -> None:
+            pass
+
+    extraction_pool.setattr(extraction_jobs, "_POOL", KilledPool())
+    extraction_pool.setattr(extraction_jobs, "_WORKER_DEATHS", OrderedDict())
+
+    with pytest.raises(BrokenProcessPool):
+        run_extraction("hash-e", lambda: PRIMARY_BYTES)
+    with pytest.raises(BrokenProcessPool):
+        run_extraction("hash-f", lambda: PRIMARY_BYTES)
+    with pytest.raises(ModelExtractionLimitError, match="killed repeatedly"):
+        run_extraction("hash-e", lambda: PRIMARY_BYTES)
+    assert extraction_jobs._WORKER_DEATHS == {"hash-f": 1}
+
+    # Only the most recent single deaths are remembered.
+    extraction_pool.setattr(extraction_jobs, "_WORKER_DEATHS_MAX_ENTRIES", 2)
+    for content_hash in ("hash-g", "hash-h"):
+        with pytest.raises(BrokenProcessPool):
+            run_extraction(content_hash, lambda: PRIMARY_BYTES)
+    assert list(extraction_jobs._WORKER_DEATHS) == ["hash-g", "hash-h"]
+
+
+def test_a_death_in_a_shared_pool_is_not_held_against_any_model(extraction_pool: pytest.MonkeyPatch) -> None:
+    both_submitted = threading.Barrier(2)
+
+    class SharedKilledPool:
+        def run(self, *_args: object) -> None:
+            both_submitted.wait(timeout=10)
+            raise BrokenProcessPool
+
+        def discard(self) -> None:
+            pass
+
+    extraction_pool.setattr(extraction_jobs, "_POOL", SharedKilledPool())
+    extraction_pool.setattr(extraction_jobs, "_WORKER_DEATHS", OrderedDict())
+
+    def extract(content_hash: str) -> BaseException | None:
+        try:
+            run_extraction(content_hash, lambda: PRIMARY_BYTES)
+        except BaseException as exc:
+            return exc
+        return None
+
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            outcomes = list(executor.map(extract, ["hash-killer", "hash-healthy"]))
+        assert all(isinstance(outcome, BrokenProcessPool) for outcome in outcomes)
+    assert extraction_jobs._WORKER_DEATHS == {}
+
+
+@pytest.mark.parametrize(("cpus", "memory_mb", "extraction_workers"), [(1, 2048, 1), (2, 4096, 1), (4, 8192, 2)])
+def test_default_worker_pools_fit_the_container_memory(
+    monkeypatch: pytest.MonkeyPatch, cpus: int, memory_mb: int, extraction_workers: int
+) -> None:
+    """Render's `standard` plan (render.prod.yaml) is the first case: 1 CPU, 2 GB."""
+    monkeypatch.setattr(config, "_available_cpus", lambda: cpus)
+    monkeypatch.setattr(config, "_available_memory_mb", lambda: memory_mb)
+    for name in ("ASSET_RENDER_WORKERS", "ENVELOPE_SCREENING_WORKERS", "MODEL_EXTRACTION_MEMORY_LIMIT_MB"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("MODEL_EXTRACTION_WORKERS", str(extraction_workers))
+
+    deployed = Settings()
+
+    assert deployed.memory_budget_mb <= memory_mb
+    assert deployed.model_extraction_memory_limit_mb >= 512
+    # Every pool and cache is counted: growing one leaves less for extraction.
+    roomier = Settings(project_document_cache_max_bytes=512 * 1024 * 1024)
+    assert roomier.memory_budget_mb <= memory_mb
+    assert roomier.model_extraction_memory_limit_mb < deployed.model_extraction_memory_limit_mb
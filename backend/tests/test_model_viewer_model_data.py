@@ -21,7 +21,9 @@ from mcp.server.fastmcp.exceptions import ToolError
 import features.mcp.tools_model_viewer as mcp_tools
 from database import connection, transaction
 from features.assets.service import AssetService
-from features.model_viewer.model_data import model_data_object_key
+from features.model_viewer import extraction_jobs, model_data
+from features.model_viewer.artifact import ARTIFACT_MEDIA_TYPE, decode_artifact
+from features.model_viewer.model_data import model_data_object_key, sectioned_artifact_object_key
 from main import app
 from tests.test_assets_service import NoopThumbnailer
 from tests.test_mcp import clean_mcp_tables
@@ -175,6 +177,108 @@ def test_per_feature_routes_return_model_data_subsets(clean_document_tables: Non
         assert subset.json() == bulk[key]
 
 
+def test_model_data_negotiates_the_sectioned_artifact(clean_document_tables: None, fake_r2: FakeR2Client) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    file_row = _linked_file(client, fake_r2, project["id"], PRIMARY_BYTES)
+    url = _model_data_url(project["id"], file_row["id"])
+    compat = client.get(url)
+
+    sectioned = client.get(url, headers={"Accept": f"{ARTIFACT_MEDIA_TYPE}, application/json;q=0.5"})
+
+    assert sectioned.status_code == 200
+    assert sectioned.headers["content-type"] == ARTIFACT_MEDIA_TYPE
+    assert "Accept" in sectioned.headers["vary"] and "Accept" in compat.headers["vary"]
+    assert sectioned.headers["etag"] != compat.headers["etag"]
+    assert decode_artifact(sectioned.content) == compat.json()
+    revalidated = client.get(url, headers={"Accept": ARTIFACT_MEDIA_TYPE, "If-None-Match": sectioned.headers["etag"]})
+    assert revalidated.status_code == 304
+    declined = client.get(url, headers={"Accept": f"{ARTIFACT_MEDIA_TYPE};q=0, application/json"})
+    assert declined.headers["content-type"] == "application/json"
+
+
+def test_per_feature_routes_range_read_one_section(
+    clean_document_tables: None, fake_r2: FakeR2Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    file_row = _linked_file(client, fake_r2, project["id"], PRIMARY_BYTES)
+    bulk = client.get(_model_data_url(project["id"], file_row["id"])).json()
+    artifact_key = sectioned_artifact_object_key(file_row["asset_id"])
+    whole_reads: list[str] = []
+    ranges: list[tuple[int, int]] = []
+    get_object, get_object_prefix = fake_r2.get_object, fake_r2.get_object_prefix
+
+    def recording_get_object(object_key: str) -> bytes:
+        whole_reads.append(object_key)
+        return get_object(object_key)
+
+    def recording_get_object_prefix(object_key: str, byte_range: tuple[int, int]) -> bytes:
+        ranges.append(byte_range)
+        return get_object_prefix(object_key, byte_range)
+
+    monkeypatch.setattr(fake_r2, "get_object", recording_get_object)
+    monkeypatch.setattr(fake_r2, "get_object_prefix", recording_get_object_prefix)
+
+    spaces = client.get(_files_url(project["id"], f"/{file_row['id']}/spaces"))
+
+    assert spaces.json() == bulk["spaces"]
+    assert whole_reads == []
+    assert ranges and all(end - start < len(fake_r2.objects[artifact_key][0]) for start, end in ranges)
+
+    # Artifacts written before the sectioned format are rebuilt from the gzip
+    # JSON artifact on first subset read, without re-parsing the HBJSON.
+    monkeypatch.undo()
+    del fake_r2.objects[artifact_key]
+    monkeypatch.setattr(model_data, "run_extraction", _no_reextraction)
+    faces = client.get(_files_url(project["id"], f"/{file_row['id']}/faces"))
+    assert faces.json() == bulk["faces"]
+    assert artifact_key in fake_r2.objects
+
+
+def test_subset_read_storage_failure_does_not_reextract(
+    clean_document_tables: None, fake_r2: FakeR2Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Only a confirmed-missing object re-extracts; an outage is a 503."""
+    client = signed_in_client()
+    project = create_project(client)
+    file_row = _linked_file(client, fake_r2, project["id"], PRIMARY_BYTES)
+
+    def broken_get_object_prefix(object_key: str, byte_range: tuple[int, int]) -> bytes:
+        raise ConnectionError("simulated R2 outage")
+
+    monkeypatch.setattr(fake_r2, "get_object_prefix", broken_get_object_prefix)
+    monkeypatch.setattr(model_data, "run_extraction", _no_reextraction)
+
+    response = client.get(_files_url(project["id"], f"/{file_row['id']}/spaces"))
+
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "model_data_unavailable"
+    assert response.json()["details"] == {"kind": "transient"}
+
+
+def _no_reextraction(*_args: object) -> None:
+    raise AssertionError("the HBJSON must not be re-extracted")
+
+
+def test_per_feature_routes_serve_level_of_detail_meshes(
+    clean_document_tables: None, fake_r2: FakeR2Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(extraction_jobs.settings, "model_data_lod_triangle_budget", 1)
+    client = signed_in_client()
+    project = create_project(client)
+    file_row = _linked_file(client, fake_r2, project["id"], PRIMARY_BYTES)
+    url = _files_url(project["id"], f"/{file_row['id']}/shading_elements")
+
+    full = client.get(url).json()
+    coarse = client.get(url, params={"lod": "true"}).json()
+
+    assert full == client.get(_model_data_url(project["id"], file_row["id"])).json()["shading_elements"]
+    assert len(coarse) == len(full)
+    for group in coarse:
+        assert len(group["shades"][0]["geometry"]["mesh"]["faces"]) <= 1
+
+
 def test_anonymous_viewer_can_read_model_data(clean_document_tables: None, fake_r2: FakeR2Client) -> None:
     """US-VIEW-7 crit. 12: read endpoints are view-access (share-the-URL)."""
     editor = signed_in_client()
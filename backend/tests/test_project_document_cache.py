@@ -0,0 +1,146 @@
+"""Process-wide parsed-document cache tests."""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from psycopg.types.json import Jsonb
+
+from database import transaction
+from features.project_document import document_cache
+from features.project_document.document_cache import (
+    CachedDocument,
+    document_cache_get,
+    document_cache_put,
+    document_cache_stats,
+    draft_document_key,
+    invalidate_draft_document,
+    reset_document_cache,
+    saved_document_key,
+)
+from features.projects.models import CreateProjectRequest
+from features.projects.service import empty_project_document
+from main import app
+from tests.test_project_document import (
+    ORIGIN,
+    create_project,
+    create_rooms_draft,
+    draft_rooms_url,
+    save_url,
+    saved_rooms_url,
+    signed_in_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> None:
+    reset_document_cache()
+
+
+def _entry(size_bytes: int) -> CachedDocument:
+    document = empty_project_document(CreateProjectRequest(name="Cache", bt_number="BT-1", cert_programs=[]))
+    return CachedDocument(document=document, size_bytes=size_bytes, etag="etag")
+
+
+def test_cache_evicts_least_recently_used_entries_past_the_byte_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(document_cache.settings, "project_document_cache_max_bytes", 250)
+    first, second, third = (saved_document_key(uuid4(), 1) for _ in range(3))
+    document_cache_put(first, _entry(100))
+    document_cache_put(second, _entry(100))
+    assert document_cache_get(first) is not None
+    document_cache_put(third, _entry(100))
+
+    assert document_cache_get(second) is None
+    assert document_cache_get(first) is not None
+    stats = document_cache_stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 200
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_cache_skips_bodies_larger_than_the_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(document_cache.settings, "project_document_cache_max_bytes", 50)
+    key = saved_document_key(uuid4(), 1)
+    document_cache_put(key, _entry(100))
+
+    assert document_cache_get(key) is None
+    assert document_cache_stats()["bytes"] == 0
+
+
+def test_draft_invalidation_is_scoped_to_one_user() -> None:
+    version_id, mine, theirs = uuid4(), uuid4(), uuid4()
+    saved_key = saved_document_key(version_id, 1)
+    my_draft = draft_document_key(version_id, mine, "a", 2)
+    their_draft = draft_document_key(version_id, theirs, "b", 3)
+    for key in (saved_key, my_draft, their_draft):
+        document_cache_put(key, _entry(10))
+
+    invalidate_draft_document(version_id, mine)
+
+    assert document_cache_get(my_draft) is None
+    assert document_cache_get(their_draft) is not None
+    assert document_cache_get(saved_key) is not None
+
+
+def test_repeated_saved_reads_hit_the_cache(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+
+    first = client.get(saved_rooms_url(project["id"], project["active_version_id"]))
+    hits_before = document_cache_stats()["hits"]
+    second = client.get(saved_rooms_url(project["id"], project["active_version_id"]))
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert document_cache_stats()["hits"] == hits_before + 1
+
+
+def test_direct_body_rewrite_is_never_served_stale(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    document_url = f"/api/v1/projects/{project['id']}/versions/{version_id}/document"
+    assert client.get(document_url).json()["project"]["name"] == "West Stockbridge House"
+
+    with transaction() as conn:
+        row = conn.execute("SELECT body FROM project_versions WHERE id = %(id)s", {"id": version_id}).fetchone()
+        assert row is not None
+        body = dict(row["body"])
+        body["project"] = {**body["project"], "name": "Renamed Out Of Band"}
+        conn.execute(
+            "UPDATE project_versions SET body = %(body)s WHERE id = %(id)s",
+            {"body": Jsonb(body), "id": version_id},
+        )
+
+    assert client.get(document_url).json()["project"]["name"] == "Renamed Out Of Band"
+
+
+def test_draft_write_and_save_refresh_cached_documents(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    created = create_rooms_draft(client, project["id"], version_id)["created"]
+
+    draft = client.get(draft_rooms_url(project["id"], version_id)).json()
+    assert [row["id"] for row in draft["rooms"]] == ["rm_living"]
+    assert draft["draft_etag"] == created["draft_etag"]
+
+    saved = client.post(
+        save_url(project["id"], version_id),
+        headers={"Origin": ORIGIN, "If-Match": created["version_etag"]},
+    )
+    assert saved.status_code == 200
+
+    after_save = client.get(saved_rooms_url(project["id"], version_id)).json()
+    assert [row["id"] for row in after_save["rooms"]] == ["rm_living"]
+    assert after_save["version_etag"] == saved.json()["version_etag"]
+
+
+def test_ready_reports_document_cache_stats() -> None:
+    payload = TestClient(app).get("/api/v1/ready").json()
+
+    assert set(payload["document_cache"]) == {"hits", "misses", "evictions", "entries", "bytes", "max_bytes"}
@@ -0,0 +1,113 @@
+"""Compiled formula evaluation: parity with the interpreter and code-cache keys."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from features.project_document.formula import document_evaluator
+from features.project_document.formula.ast_nodes import Literal_, ast_to_json
+from features.project_document.formula.compiler import (
+    compile_stored_formula,
+    compiled_formula_cache_size,
+    registry_fingerprint,
+    reset_compiled_formula_cache,
+)
+from features.project_document.formula.evaluator import EvalFuse, EvalSuccess, evaluate, interpret
+from features.project_document.formula.parser import parse
+from tests.builders.formula_perf_doc import PUMP_COUNT, ROOM_COUNT, build_formula_perf_document
+from tests.test_project_document_formula_evaluator import CASES, _normalize, _resolve_for_test
+
+FUSE_SOURCES = (
+    '(if({A} > 1 and {B} != 0, {A} / {B}, -{A})) & " " & upper(concat({C}, "x"))',
+    '(if(null, 1, 2)) + len(replace({C}, "a", "bb"))',
+    "not ({A} < 2 or {B} >= 3) = true",
+)
+FUSE_ROW = {"a": 3.0, "b": 2, "c": "banana"}
+
+
+@pytest.mark.parametrize("case", CASES, ids=[c["name"] for c in CASES])
+def test_compiled_evaluation_matches_the_interpreter(case: dict[str, Any]) -> None:
+    resolved = _resolve_for_test(parse(case["source"]), set(case.get("resolve_drop", [])))
+    row = {_normalize(k): v for k, v in case.get("row", {}).items()}
+
+    compiled = evaluate(resolved, row.get)
+    interpreted = interpret(resolved, row.get)
+
+    assert compiled == interpreted
+    if isinstance(compiled, EvalSuccess) and isinstance(interpreted, EvalSuccess):
+        assert type(compiled.value) is type(interpreted.value)
+
+
+@pytest.mark.parametrize("source", FUSE_SOURCES)
+def test_shared_fuse_trips_at_the_same_node(source: str) -> None:
+    resolved = _resolve_for_test(parse(source), set())
+    for max_nodes in range(0, 40):
+        compiled_fuse = EvalFuse(nodes_evaluated=0, max_nodes=max_nodes)
+        interpreted_fuse = EvalFuse(nodes_evaluated=0, max_nodes=max_nodes)
+
+        compiled = evaluate(resolved, FUSE_ROW.get, fuse=compiled_fuse)
+        interpreted = interpret(resolved, FUSE_ROW.get, fuse=interpreted_fuse)
+
+        assert compiled == interpreted, max_nodes
+        assert compiled_fuse.nodes_evaluated == interpreted_fuse.nodes_evaluated, max_nodes
+
+
+def test_equal_but_retyped_asts_do_not_share_compiled_code() -> None:
+    as_float = Literal_(kind="literal", value=1.0, inferred_type="number")
+    as_bool = Literal_(kind="literal", value=True, inferred_type="number")
+    assert as_float == as_bool
+
+    assert evaluate(as_float, lambda _field_id: None) == EvalSuccess(value=1.0)
+    result = evaluate(as_bool, lambda _field_id: None)
+    assert isinstance(result, EvalSuccess)
+    assert result.value is True
+
+
+def test_stored_formula_cache_keys_on_canonical_text_and_registry() -> None:
+    reset_compiled_formula_cache()
+    payload = ast_to_json(_resolve_for_test(parse("{A} * 2"), set()))
+    reordered = dict(reversed(list(payload.items())))
+    registry = registry_fingerprint([("a", "number"), ("f", "formula")])
+    formulas = frozenset({"f"})
+
+    first = compile_stored_formula(payload, registry_fingerprint=registry, formula_field_keys=formulas)
+    again = compile_stored_formula(reordered, registry_fingerprint=registry, formula_field_keys=formulas)
+    retyped = compile_stored_formula(
+        payload,
+        registry_fingerprint=registry_fingerprint([("a", "formula"), ("f", "formula")]),
+        formula_field_keys=frozenset({"a", "f"}),
+    )
+
+    assert again is first
+    assert retyped is not first
+    assert compiled_formula_cache_size() == 2
+    reset_compiled_formula_cache()
+    assert compiled_formula_cache_size() == 0
+
+
+def test_malformed_stored_ast_raises_like_ast_from_json() -> None:
+    with pytest.raises(ValueError):
+        compile_stored_formula("not an ast", registry_fingerprint="", formula_field_keys=frozenset())
+
+
+def test_document_overlay_evaluates_chains_links_and_rollups() -> None:
+    document_evaluator.reset_formula_overlay_cache()
+    overlay = document_evaluator.evaluate_document_formulas(build_formula_perf_document())
+
+    rooms = overlay[("rooms",)]
+    assert len(rooms) == ROOM_COUNT
+    # Room 1: ceiling 2.5 m, iCFA 1.0, one person.
+    assert rooms["rm_0001"] == {
+        "record_id": "0001 — Room 1",
+        "cf_volume": 62.5,
+        "cf_volume_per_person": 62.5,
+        "cf_label": "0001 — Room 1 / 1 ppl",
+    }
+    assert rooms["rm_0000"]["cf_volume_per_person"] is None
+    pumps = overlay[("equipment", "pumps")]
+    assert len(pumps) == PUMP_COUNT
+    served = [row_id for row_id, row in rooms.items() if int(row_id.removeprefix("rm_")) % PUMP_COUNT == 1]
+    assert pumps["pmp_001"]["cf_served_rooms"] == float(len(served))
+    assert pumps["pmp_001"]["cf_served_volume"] == pytest.approx(sum(rooms[row_id]["cf_volume"] for row_id in served))
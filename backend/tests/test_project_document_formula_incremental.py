@@ -0,0 +1,226 @@
+"""Incremental formula overlays: stored per ETag, re-evaluated only where inputs changed."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from features.project_document.document import ProjectDocumentV1, RoomRow
+from features.project_document.formula import overlay_store
+from features.project_document.formula.document_evaluator import (
+    bind_document_etag,
+    evaluate_document_formulas,
+    reset_formula_overlay_cache,
+)
+from features.project_document.formula.overlay_store import formula_overlay_stats, reset_formula_overlay_store
+from features.project_document.write_metrics import DocumentWriteMetrics, active_write_metrics
+from tests.builders.formula_perf_doc import PUMP_COUNT, ROOM_COUNT, build_formula_perf_document
+from tests.test_project_document import ORIGIN, create_project, draft_rooms_url, room_payload, signed_in_client
+
+RoomEdit = Callable[[list[RoomRow]], list[RoomRow]]
+
+
+def _with_rooms(body: ProjectDocumentV1, edit: RoomEdit) -> ProjectDocumentV1:
+    rooms = body.tables.rooms.model_copy(update={"rows": edit(list(body.tables.rooms.rows))})
+    return body.model_copy(update={"tables": body.tables.model_copy(update={"rooms": rooms})})
+
+
+def _set_values(index: int, **values: object) -> RoomEdit:
+    def edit(rows: list[RoomRow]) -> list[RoomRow]:
+        row = rows[index]
+        rows[index] = row.model_copy(update={"custom_values": {**row.custom_values, **values}})
+        return rows
+
+    return edit
+
+
+def _set_pump(index: int, pump_id: str) -> RoomEdit:
+    def edit(rows: list[RoomRow]) -> list[RoomRow]:
+        rows[index] = rows[index].model_copy(update={"custom_links": {"cf_pump": [pump_id]}})
+        return rows
+
+    return edit
+
+
+def _append_copy(rows: list[RoomRow]) -> list[RoomRow]:
+    return [*rows, rows[1].model_copy(update={"id": "rm_added"})]
+
+
+EDITS: dict[str, RoomEdit] = {
+    "ceiling_height": _set_values(7, ceiling_height_m=3.1),
+    # True == 1: a retyped value must not count as unchanged.
+    "people_retyped": _set_values(9, num_people=True),
+    "people_to_zero": _set_values(5, num_people=0),
+    "name": _set_values(3, name="Renamed"),
+    "relinked": _set_pump(10, "pmp_020"),
+    "dangling_link": _set_pump(11, "pmp_missing"),
+    "removed": lambda rows: rows[:5] + rows[6:],
+    "reordered": lambda rows: list(reversed(rows)),
+    "added": _append_copy,
+}
+
+
+def _evaluate_incrementally(basis: ProjectDocumentV1, body: ProjectDocumentV1) -> tuple[Any, DocumentWriteMetrics]:
+    reset_formula_overlay_store()
+    reset_formula_overlay_cache()
+    bind_document_etag(basis, "basis")
+    evaluate_document_formulas(basis)
+    reset_formula_overlay_cache()
+    bind_document_etag(body, "next", basis_etag="basis")
+    metrics = DocumentWriteMetrics.start()
+    with active_write_metrics(metrics):
+        overlays = evaluate_document_formulas(body)
+    return overlays, metrics
+
+
+def _evaluate_fully(body: ProjectDocumentV1) -> Any:
+    reset_formula_overlay_cache()
+    return evaluate_document_formulas(body)
+
+
+def _typed(overlays: Any) -> dict[Any, Any]:
+    return {
+        table_path: {
+            row_id: [(key, type(value), value) for key, value in cells.items()] for row_id, cells in rows.items()
+        }
+        for table_path, rows in overlays.items()
+    }
+
+
+@pytest.mark.parametrize("edit", EDITS.values(), ids=EDITS.keys())
+def test_incremental_overlay_matches_full_evaluation(edit: RoomEdit) -> None:
+    basis = build_formula_perf_document()
+    body = _with_rooms(basis, edit)
+
+    incremental, metrics = _evaluate_incrementally(basis, body)
+
+    assert _typed(incremental) == _typed(_evaluate_fully(body))
+    assert metrics.formula_cells_reused > 0
+
+
+def test_editing_one_room_recomputes_its_cells_and_one_rollup() -> None:
+    basis = build_formula_perf_document()
+    body = _with_rooms(basis, _set_values(7, ceiling_height_m=3.1))
+
+    overlays, metrics = _evaluate_incrementally(basis, body)
+
+    # cf_volume and cf_volume_per_person on the room; cf_served_volume on its
+    # pump. Label and record id do not read the height; the room count rollup
+    # does not read any room field.
+    assert metrics.formula_cells_recomputed == 3
+    total_cells = sum(len(cells) for rows in overlays.values() for cells in rows.values())
+    assert metrics.formula_cells_reused == total_cells - 3
+    assert total_cells == ROOM_COUNT * 4 + PUMP_COUNT * 2
+
+
+def test_relinking_a_room_recomputes_both_pump_rollups() -> None:
+    basis = build_formula_perf_document()
+    body = _with_rooms(basis, _set_pump(10, "pmp_020"))
+
+    _overlays, metrics = _evaluate_incrementally(basis, body)
+
+    assert metrics.formula_cells_recomputed == 4
+
+
+def test_errored_dependency_reads_as_missing_ref_in_any_order() -> None:
+    basis = build_formula_perf_document()
+    body = _with_rooms(basis, _set_values(5, ceiling_height_m="tall"))
+
+    overlays = _evaluate_fully(body)
+
+    room = overlays[("rooms",)]["rm_0005"]
+    assert room["cf_volume"] == {"error": "type_mismatch"}
+    assert room["cf_volume_per_person"] == {"error": "missing_ref"}
+    assert overlays[("equipment", "pumps")]["pmp_005"]["cf_served_volume"] == {"error": "missing_ref"}
+
+
+def test_stored_overlay_is_reused_across_requests() -> None:
+    reset_formula_overlay_store()
+    reset_formula_overlay_cache()
+    first = build_formula_perf_document()
+    bind_document_etag(first, "etag-1")
+    computed = evaluate_document_formulas(first)
+
+    # A later request parses its own copy of the same body.
+    reset_formula_overlay_cache()
+    again = build_formula_perf_document()
+    bind_document_etag(again, "etag-1")
+    metrics = DocumentWriteMetrics.start()
+    with active_write_metrics(metrics):
+        assert evaluate_document_formulas(again) is computed
+
+    assert metrics.formula_cells_recomputed == 0
+    assert formula_overlay_stats()["hits"] == 1
+
+
+def test_unbound_documents_are_not_stored() -> None:
+    reset_formula_overlay_store()
+    reset_formula_overlay_cache()
+    evaluate_document_formulas(build_formula_perf_document())
+
+    assert formula_overlay_stats()["entries"] == 0
+
+
+def test_overlay_store_evicts_past_its_entry_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(overlay_store.settings, "formula_overlay_store_max_entries", 1)
+    reset_formula_overlay_store()
+    for etag in ("etag-a", "etag-b"):
+        reset_formula_overlay_cache()
+        body = build_formula_perf_document()
+        bind_document_etag(body, etag)
+        evaluate_document_formulas(body)
+
+    stats = formula_overlay_stats()
+    assert stats["entries"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_draft_write_logs_recomputed_formula_cells(
+    clean_document_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    emitted: list[DocumentWriteMetrics] = []
+    original_emit = DocumentWriteMetrics.emit
+
+    def capture(self: DocumentWriteMetrics, **kwargs: Any) -> None:
+        emitted.append(self)
+        original_emit(self, **kwargs)
+
+    monkeypatch.setattr(DocumentWriteMetrics, "emit", capture)
+    client = signed_in_client()
+    project = create_project(client)
+    project_id, version_id = project["id"], project["active_version_id"]
+    payload = room_payload()
+    first_room = payload["rooms"][0]
+    rooms: list[dict[str, Any]] = [
+        {**first_room, "id": f"rm_{index}", "custom_values": {**first_room["custom_values"], "number": str(index)}}
+        for index in range(3)
+    ]
+    payload["rooms"] = rooms
+    initial = client.get(draft_rooms_url(project_id, version_id)).json()
+    created = client.put(
+        draft_rooms_url(project_id, version_id),
+        headers={"Origin": ORIGIN, "If-Match-Version": initial["version_etag"]},
+        json=payload,
+    )
+    assert created.status_code == 200
+
+    rooms[1]["custom_values"]["name"] = "Kitchen"
+    edited = client.put(
+        draft_rooms_url(project_id, version_id),
+        headers={"Origin": ORIGIN, "If-Match": created.json()["draft_etag"]},
+        json=payload,
+    )
+
+    assert edited.status_code == 200
+    rows_computed = edited.json()["rows_computed"]
+    assert [rows_computed[f"rm_{index}"]["record_id"] for index in range(3)] == [
+        "0 — Living Room",
+        "1 — Kitchen",
+        "2 — Living Room",
+    ]
+    # Only the renamed room's record id is re-evaluated.
+    assert emitted[-1].formula_cells_recomputed == 1
+    assert emitted[-1].formula_cells_reused == 2
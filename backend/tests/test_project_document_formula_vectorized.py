@@ -0,0 +1,158 @@
+"""Column-at-a-time formula evaluation: classification and per-row parity."""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any
+
+import pytest
+
+from features.project_document.formula import document_evaluator
+from features.project_document.formula.analysis import is_vectorizable
+from features.project_document.formula.evaluator import EvalError, EvalSuccess, evaluate
+from features.project_document.formula.parser import parse
+from features.project_document.formula.vectorized import MISSING_REF, vectorize_formula
+from tests.builders.formula_perf_doc import ARITHMETIC_ROOM_FORMULAS, build_formula_perf_document
+from tests.test_project_document_formula_evaluator import CASES, _normalize, _resolve_for_test
+
+VECTORIZABLE = (
+    "{A} + {B}",
+    "-{A}",
+    "({A} - 2.5) * {B} / 3 % 2",
+    "number({A}) * 2",
+    "number({A} + 1)",
+    "{A} * null",
+)
+SCALAR_ONLY = (
+    "{A}",
+    "42",
+    "{A} > 1",
+    "if({A} > 1, {A}, 0)",
+    '{A} & "x"',
+    "len({A}) * 2",
+    '{A} + "1"',
+    "{A} + true",
+    "not {A}",
+    "{Missing} + 1",
+)
+# Every operand kind the scalar path distinguishes. No inf/nan: stored
+# documents are jsonb, which cannot hold them.
+VALUES: tuple[object, ...] = (
+    None,
+    0,
+    0.0,
+    -0.0,
+    2,
+    -3.5,
+    1e308,
+    10**20,
+    True,
+    False,
+    "12",
+    " 3.5 ",
+    "",
+    "abc",
+    "nan",
+    [1],
+)
+PARITY_SOURCES = (
+    *VECTORIZABLE,
+    "{A} / {B}",
+    "{A} % {B}",
+    "{A} * {B} * 1e308",
+    "number({A}) / number({B})",
+    "-number({B}) - -{A}",
+)
+
+
+def _encoded(result: EvalSuccess | EvalError) -> object:
+    return result.value if isinstance(result, EvalSuccess) else {"error": result.code}
+
+
+def _assert_cells_equal(actual: list[object], expected: list[object]) -> None:
+    assert [type(cell) for cell in actual] == [type(cell) for cell in expected]
+    # repr() keeps -0.0 apart from 0.0.
+    assert [repr(cell) for cell in actual] == [repr(cell) for cell in expected]
+
+
+@pytest.mark.parametrize("source", VECTORIZABLE)
+def test_same_row_arithmetic_is_vectorizable(source: str) -> None:
+    assert is_vectorizable(_resolve_for_test(parse(source), set()))
+
+
+@pytest.mark.parametrize("source", SCALAR_ONLY)
+def test_other_formulas_stay_scalar(source: str) -> None:
+    ast = _resolve_for_test(parse(source), {"Missing"})
+    assert not is_vectorizable(ast)
+    assert vectorize_formula(ast) is None
+
+
+@pytest.mark.parametrize("source", PARITY_SOURCES)
+def test_column_matches_scalar_evaluation_for_every_operand_pair(source: str) -> None:
+    ast = _resolve_for_test(parse(source), set())
+    vectorized = vectorize_formula(ast)
+    assert vectorized is not None
+    rows = [{"a": a, "b": b} for a, b in itertools.product(VALUES, repeat=2)]
+
+    cells = vectorized.evaluate(
+        {key: [row[key] for row in rows] for key in vectorized.field_keys},
+        len(rows),
+    )
+
+    _assert_cells_equal(cells, [_encoded(evaluate(ast, row.get)) for row in rows])
+
+
+@pytest.mark.parametrize(
+    "case",
+    [case for case in CASES if is_vectorizable(_resolve_for_test(parse(case["source"]), set()))],
+    ids=lambda case: case["name"],
+)
+def test_vectorizable_corpus_cases_match_scalar_evaluation(case: dict[str, Any]) -> None:
+    ast = _resolve_for_test(parse(case["source"]), set())
+    row = {_normalize(key): value for key, value in case.get("row", {}).items()}
+    vectorized = vectorize_formula(ast)
+    assert vectorized is not None
+
+    cells = vectorized.evaluate({key: [row.get(key)] for key in vectorized.field_keys}, 1)
+
+    _assert_cells_equal(cells, [_encoded(evaluate(ast, row.get))])
+
+
+def test_missing_ref_input_keeps_left_to_right_error_precedence() -> None:
+    vectorized = vectorize_formula(_resolve_for_test(parse("{A} / {B}"), set()))
+    assert vectorized is not None
+
+    cells = vectorized.evaluate({"a": [MISSING_REF, "x", None, 1], "b": [0, MISSING_REF, MISSING_REF, 0]}, 4)
+
+    assert cells == [
+        {"error": "missing_ref"},
+        {"error": "missing_ref"},
+        {"error": "missing_ref"},
+        {"error": "div_by_zero"},
+    ]
+
+
+def test_document_overlay_matches_scalar_evaluation(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = build_formula_perf_document(ARITHMETIC_ROOM_FORMULAS)
+    rows = list(body.tables.rooms.rows)
+    # Nulls, text, bools and an errored upstream formula mixed into the columns.
+    for index, value in enumerate((None, "2.5", True, "tall", 0, -0.0)):
+        row = rows[index * 7]
+        rows[index * 7] = row.model_copy(
+            update={"custom_values": {**row.custom_values, "ceiling_height_m": value, "num_people": value}}
+        )
+    body = body.model_copy(
+        update={"tables": body.tables.model_copy(update={"rooms": body.tables.rooms.model_copy(update={"rows": rows})})}
+    )
+
+    document_evaluator.reset_formula_overlay_cache()
+    vectorized = document_evaluator.evaluate_document_formulas(body)
+    monkeypatch.setattr(document_evaluator, "VECTORIZE_MIN_ROWS", len(rows) + 1)
+    document_evaluator.reset_formula_overlay_cache()
+    scalar = document_evaluator.evaluate_document_formulas(body)
+
+    for row_id, cells in scalar[("rooms",)].items():
+        assert list(vectorized[("rooms",)][row_id]) == list(cells)
+        _assert_cells_equal(list(vectorized[("rooms",)][row_id].values()), list(cells.values()))
+    assert vectorized[("rooms",)]["rm_0021"]["cf_volume"] == {"error": "type_mismatch"}
+    assert vectorized[("rooms",)]["rm_0021"]["cf_volume_per_person"] == {"error": "missing_ref"}
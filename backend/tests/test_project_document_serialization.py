@@ -0,0 +1,256 @@
+"""Section-by-section serialization, partial draft writes, and stored version ETag tests."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from uuid import UUID
+
+import pytest
+from psycopg.types.json import Jsonb
+
+from database import transaction
+from features.project_document import repository
+from features.project_document.document import ProjectDocumentV1
+from features.project_document.document_cache import document_cache_get, draft_document_key, reset_document_cache
+from features.project_document.rows import RoomRow
+from features.project_document.validation import serialize_document
+from features.projects.models import CreateProjectRequest
+from features.projects.service import empty_project_document
+from tests.test_project_document import (
+    ORIGIN,
+    create_project,
+    create_rooms_draft,
+    draft_rooms_url,
+    room_payload,
+    save_url,
+    saved_rooms_url,
+    signed_in_client,
+)
+
+
+def _document_with_room(**custom_values: Any) -> ProjectDocumentV1:
+    body = empty_project_document(CreateProjectRequest(name="Serialize", bt_number="BT-1", cert_programs=[]))
+    raw_row = room_payload()["rooms"][0]
+    row = RoomRow.model_validate({**raw_row, "custom_values": {**raw_row["custom_values"], **custom_values}})
+    rooms = body.tables.rooms.model_copy(update={"rows": [row]})
+    return body.model_copy(update={"tables": body.tables.model_copy(update={"rooms": rooms})})
+
+
+def _canonical_text(body: ProjectDocumentV1) -> str:
+    return json.dumps(body.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+
+
+def _version_etag_column(version_id: object) -> str | None:
+    with transaction() as conn:
+        row = conn.execute("SELECT version_etag FROM project_versions WHERE id = %(id)s", {"id": version_id}).fetchone()
+    assert row is not None
+    return row["version_etag"]
+
+
+def test_serialized_text_is_the_canonical_dump() -> None:
+    body = _document_with_room()
+    serialized = serialize_document(body)
+
+    assert serialized.json_text == _canonical_text(body)
+    assert serialized.size_bytes == len(serialized.json_text.encode("utf-8"))
+    assert ("tables", "rooms") in serialized.sections
+    assert ("tables", "equipment", "pumps") in serialized.sections
+
+
+def test_incremental_serialization_reuses_untouched_sections() -> None:
+    base = _document_with_room()
+    previous = serialize_document(base)
+    # Built independently, so no section model survives by identity.
+    edited = _document_with_room(name="Kitchen")
+
+    incremental = serialize_document(edited, previous)
+
+    assert incremental.json_text == _canonical_text(edited)
+    assert incremental.etag == serialize_document(edited).etag != previous.etag
+    assert incremental.reused_sections == len(incremental.sections) - 1
+    assert incremental.sections[("tables", "rooms")].json_text != previous.sections[("tables", "rooms")].json_text
+
+
+def test_incremental_serialization_detects_equal_but_retyped_values() -> None:
+    base = _document_with_room(num_people=1)
+    retyped = _document_with_room(num_people=True)
+    assert retyped == base  # `True == 1`, so equality alone would reuse the stale fragment.
+
+    incremental = serialize_document(retyped, serialize_document(base))
+
+    assert '"num_people":true' in incremental.json_text
+    assert incremental.etag != serialize_document(base).etag
+
+
+def test_save_stores_the_version_etag(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    created = create_rooms_draft(client, project["id"], version_id)["created"]
+    assert _version_etag_column(version_id) == created["version_etag"]
+
+    saved = client.post(
+        save_url(project["id"], version_id),
+        headers={"Origin": ORIGIN, "If-Match": created["version_etag"]},
+    )
+
+    assert saved.status_code == 200
+    assert _version_etag_column(version_id) == saved.json()["version_etag"]
+
+
+def test_out_of_band_body_rewrite_clears_and_backfills_the_version_etag(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    original_etag = _version_etag_column(version_id)
+    assert original_etag is not None
+
+    with transaction() as conn:
+        row = conn.execute("SELECT body FROM project_versions WHERE id = %(id)s", {"id": version_id}).fetchone()
+        assert row is not None
+        body = dict(row["body"])
+        body["project"] = {**body["project"], "name": "Renamed Out Of Band"}
+        conn.execute(
+            "UPDATE project_versions SET body = %(body)s WHERE id = %(id)s",
+            {"body": Jsonb(body), "id": version_id},
+        )
+    assert _version_etag_column(version_id) is None
+
+    version_etag = client.get(saved_rooms_url(project["id"], version_id)).json()["version_etag"]
+
+    assert version_etag == _version_etag_column(version_id) != original_etag
+    assert version_etag == serialize_document(ProjectDocumentV1.model_validate(body)).etag
+
+
+def test_consecutive_draft_writes_reuse_the_cached_serialization(clean_document_tables: None) -> None:
+    reset_document_cache()
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    created = create_rooms_draft(client, project["id"], version_id)["created"]
+
+    payload = room_payload()
+    payload["rooms"][0]["custom_values"]["name"] = "Kitchen"
+    updated = client.put(
+        draft_rooms_url(project["id"], version_id),
+        json=payload,
+        headers={"Origin": ORIGIN, "If-Match": created["draft_etag"]},
+    )
+    assert updated.status_code == 200
+
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT user_id, draft_etag, body_revision FROM project_version_drafts WHERE version_id = %(id)s",
+            {"id": version_id},
+        ).fetchone()
+    assert row is not None
+    assert row["draft_etag"] == updated.json()["draft_etag"]
+    cached = document_cache_get(
+        draft_document_key(UUID(str(version_id)), row["user_id"], row["draft_etag"], row["body_revision"])
+    )
+    assert cached is not None
+    assert cached.serialized is not None
+    assert 0 < cached.serialized.reused_sections < len(cached.serialized.sections)
+    assert client.get(draft_rooms_url(project["id"], version_id)).json()["rooms"][0]["custom_values"]["name"] == (
+        "Kitchen"
+    )
+
+
+def _rename_first_room(client: Any, project_id: object, version_id: object, draft_etag: str, name: str) -> Any:
+    payload = room_payload()
+    payload["rooms"][0]["custom_values"]["name"] = name
+    response = client.put(
+        draft_rooms_url(project_id, version_id),
+        json=payload,
+        headers={"Origin": ORIGIN, "If-Match": draft_etag},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _spy_on_section_patches(monkeypatch: pytest.MonkeyPatch) -> list[list[tuple[str, ...]]]:
+    calls: list[list[tuple[str, ...]]] = []
+    original = repository.patch_draft_sections
+
+    def spy(*args: Any, **kwargs: Any) -> dict[str, Any] | None:
+        calls.append([path for path, _json_text in kwargs["sections"]])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(repository, "patch_draft_sections", spy)
+    return calls
+
+
+def _stored_draft_body(version_id: object) -> ProjectDocumentV1:
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT body FROM project_version_drafts WHERE version_id = %(id)s", {"id": version_id}
+        ).fetchone()
+    assert row is not None
+    return ProjectDocumentV1.model_validate(row["body"])
+
+
+def test_single_table_write_patches_only_the_changed_section(
+    clean_document_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    reset_document_cache()
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    created = create_rooms_draft(client, project["id"], version_id)["created"]
+    before = _stored_draft_body(version_id)
+    patches = _spy_on_section_patches(monkeypatch)
+
+    updated = _rename_first_room(client, project["id"], version_id, created["draft_etag"], "Kitchen")
+
+    assert patches == [[("tables", "rooms")]]
+    after = _stored_draft_body(version_id)
+    assert after.tables.rooms.rows[0].custom_values["name"] == "Kitchen"
+    assert after.model_copy(update={"tables": before.tables}) == before
+    reset_document_cache()
+    draft = client.get(draft_rooms_url(project["id"], version_id)).json()
+    assert draft["draft_etag"] == updated["draft_etag"]
+    assert draft["rooms"][0]["custom_values"]["name"] == "Kitchen"
+
+
+def test_draft_write_without_cached_fragments_rewrites_the_whole_body(
+    clean_document_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    created = create_rooms_draft(client, project["id"], version_id)["created"]
+    reset_document_cache()
+    patches = _spy_on_section_patches(monkeypatch)
+
+    _rename_first_room(client, project["id"], version_id, created["draft_etag"], "Kitchen")
+
+    assert patches == []
+    assert _stored_draft_body(version_id).tables.rooms.rows[0].custom_values["name"] == "Kitchen"
+
+
+def test_section_patch_refuses_a_body_revision_it_was_not_diffed_against(clean_document_tables: None) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    version_id = project["active_version_id"]
+    create_rooms_draft(client, project["id"], version_id)
+
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT user_id, body_revision FROM project_version_drafts WHERE version_id = %(id)s",
+            {"id": version_id},
+        ).fetchone()
+        assert row is not None
+        patched = repository.patch_draft_sections(
+            conn,
+            UUID(str(version_id)),
+            row["user_id"],
+            sections=[(("tables", "apertures"), "[]")],
+            schema_version=10,
+            expected_body_revision=row["body_revision"] - 1,
+            draft_etag="stale",
+        )
+
+    assert patched is None
@@ -36,6 +36,7 @@ from main import app
 from tests.test_assets_service import FakeR2Client, NoopThumbnailer
 from tests.test_climate_datasets import _STATION_FILE, clean_climate_tables
 from tests.test_mcp import ORIGIN, clean_mcp_tables, create_project, signed_in_client
+from tests.test_project_location_locality_index import install_locality_fixture
 
 __all__ = ["clean_climate_tables", "clean_mcp_tables"]
 
@@ -973,6 +974,70 @@ def test_geocode_location_returns_503_for_corrupt_locality_index_without_address
     clear_locality_index_cache()
 
 
+def test_locality_suggest_and_nearest_routes_search_the_compiled_index(
+    clean_mcp_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    install_locality_fixture(tmp_path, monkeypatch)
+    client = signed_in_client()
+    project_id = cast(str, create_project(client)["id"])
+
+    suggested = client.post(
+        f"/api/v1/projects/{project_id}/location/localities/suggest",
+        headers={"Origin": ORIGIN},
+        json={"query": "west st"},
+    )
+    nearest = client.post(
+        f"/api/v1/projects/{project_id}/location/localities/nearest",
+        headers={"Origin": ORIGIN},
+        json={"latitude": 40.70, "longitude": -74.32},
+    )
+    out_of_range = client.post(
+        f"/api/v1/projects/{project_id}/location/localities/nearest",
+        headers={"Origin": ORIGIN},
+        json={"latitude": 91, "longitude": -74.32},
+    )
+
+    assert suggested.status_code == 200
+    assert [candidate["label"] for candidate in suggested.json()["candidates"]] == [
+        "West Stockbridge, MA — Place",
+        "West Stockbridge, MA — Town / county subdivision, Berkshire County",
+    ]
+    assert nearest.status_code == 200
+    assert [candidate["label"] for candidate in nearest.json()["candidates"]][:2] == [
+        "Springfield, NJ — Place",
+        "Springfield, NJ — Town / county subdivision, Union County",
+    ]
+    assert out_of_range.status_code == 422
+    clear_locality_index_cache()
+
+
+def test_locality_suggest_returns_503_for_corrupt_locality_index(
+    clean_mcp_tables: None,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    from features.project_location import locality_index
+
+    corrupt_metadata = tmp_path / "metadata.json"
+    corrupt_metadata.write_text("{}")
+    monkeypatch.setattr(locality_index, "_METADATA_PATH", corrupt_metadata)
+    clear_locality_index_cache()
+    client = signed_in_client()
+    project_id = cast(str, create_project(client)["id"])
+
+    response = client.post(
+        f"/api/v1/projects/{project_id}/location/localities/suggest",
+        headers={"Origin": ORIGIN},
+        json={"query": "Spring"},
+    )
+
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "locality_index_unavailable"
+    clear_locality_index_cache()
+
+
 def test_geocode_location_returns_503_for_corrupt_county_reference(
     clean_mcp_tables: None,
     monkeypatch: pytest.MonkeyPatch,
@@ -0,0 +1,216 @@
+"""Geodata lookup cache: shared TTL table, single-flight, kept-alive HTTP client."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import HTTPException
+
+from config import settings
+from database import transaction
+from features.project_location import derive
+from features.project_location.derive import (
+    DeriveClients,
+    cached_county_geodata,
+    derive_location_geodata,
+    fetch_json_url,
+    geocode_address,
+)
+from features.project_location.geodata_cache import GeodataCacheStats, geodata_cache_stats, reset_geodata_cache_stats
+
+_FCC_COUNTY: dict[str, object] = {
+    "County": {"name": "Berkshire", "FIPS": "25003"},
+    "State": {"code": "MA", "FIPS": "25"},
+}
+
+
+class _StubGeodataServer(ThreadingHTTPServer):
+    """FCC and USGS stand-ins on localhost, recording requests and connections."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.paths: list[str] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.lock = threading.Lock()
+
+    def rewrite(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"http://127.0.0.1:{self.server_address[1]}/{parts.netloc}{parts.path}?{parts.query}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StubGeodataServer
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.paths.append(self.path)
+            self.server.connections.add(self.client_address)
+        payload = _FCC_COUNTY if self.path.startswith("/geo.fcc.gov/") else {"value": 302.0}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def geodata_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(settings, "geodata_coordinate_cache_ttl_seconds", 3600)
+    monkeypatch.setattr(settings, "geodata_address_cache_ttl_seconds", 3600)
+    _truncate_lookups()
+    reset_geodata_cache_stats()
+    yield
+    _truncate_lookups()
+
+
+@pytest.fixture()
+def stub_server() -> Iterator[_StubGeodataServer]:
+    server = _StubGeodataServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _truncate_lookups() -> None:
+    with transaction() as conn:
+        conn.execute("TRUNCATE geodata_lookup_cache")
+
+
+def _stats(kind: str) -> GeodataCacheStats:
+    return next(stats for stats in geodata_cache_stats() if stats.kind == kind)
+
+
+def test_repeat_derivations_are_served_from_the_cache_over_kept_alive_connections(
+    geodata_cache: None, stub_server: _StubGeodataServer
+) -> None:
+    clients = DeriveClients(fetch_json=lambda url: fetch_json_url(stub_server.rewrite(url)))
+
+    first = derive_location_geodata(42.3250004, -73.367, clients)
+    # Rounds to the same key: answered without a request.
+    again = derive_location_geodata(42.325, -73.3670001, clients)
+    derive_location_geodata(42.4, -73.3, clients)
+    derive_location_geodata(42.5, -73.2, clients)
+
+    assert (first.county, first.county_fips, first.elevation_m) == ("Berkshire", "25003", 302.0)
+    assert again == first
+    assert len(stub_server.paths) == 6
+    # The lookups were made with the rounded coordinates they are cached under.
+    assert all("42.325&" in path for path in stub_server.paths[:2])
+    # Sequential lookups reuse the shared client's connections.
+    assert len(stub_server.connections) < len(stub_server.paths)
+    county, elevation = _stats("county"), _stats("elevation")
+    assert (county.hits, county.misses, county.shared_entries) == (1, 3, 3)
+    assert (elevation.hits, elevation.misses, elevation.shared_entries) == (1, 3, 3)
+
+
+def test_concurrent_lookups_of_one_key_share_a_single_request(geodata_cache: None) -> None:
+    release = threading.Event()
+    fetched: list[str] = []
+
+    def slow_fcc(url: str) -> dict[str, object]:
+        fetched.append(url)
+        release.wait(timeout=5)
+        return _FCC_COUNTY
+
+    results: list[str] = []
+
+    def look_up() -> None:
+        results.append(cached_county_geodata(42.325, -73.367, slow_fcc).county)
+
+    threads = [threading.Thread(target=look_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while _stats("county").coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == ["Berkshire"] * 4
+    assert len(fetched) == 1
+    assert _stats("county").misses == 1
+
+
+def test_failed_and_expired_lookups_are_fetched_again(geodata_cache: None) -> None:
+    def offline(_url: str) -> dict[str, object]:
+        raise RuntimeError("offline")
+
+    with pytest.raises(HTTPException):
+        cached_county_geodata(42.325, -73.367, offline)
+    assert _stats("county").failures == 1
+    assert _stats("county").shared_entries == 0
+
+    fetched: list[str] = []
+
+    def fcc(url: str) -> dict[str, object]:
+        fetched.append(url)
+        return _FCC_COUNTY
+
+    cached_county_geodata(42.325, -73.367, fcc)
+    cached_county_geodata(42.325, -73.367, fcc)
+    assert len(fetched) == 1
+
+    with transaction() as conn:
+        conn.execute("UPDATE geodata_lookup_cache SET expires_at = now() - interval '1 second'")
+    cached_county_geodata(42.325, -73.367, fcc)
+    assert len(fetched) == 2
+
+
+def test_address_answers_are_cached_by_normalized_query(geodata_cache: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    # No bundled locality matches, so every query falls through to Census.
+    monkeypatch.setattr(derive, "search_localities", lambda _query, _index: [])
+    monkeypatch.setattr(derive, "load_locality_index", lambda: None)
+    fetched: list[str] = []
+
+    def census(url: str) -> dict[str, object]:
+        fetched.append(url)
+        match = {
+            "matchedAddress": "1 MAIN ST, WEST STOCKBRIDGE, MA, 01266",
+            "coordinates": {"x": -73.367, "y": 42.325},
+            "addressComponents": {"city": "WEST STOCKBRIDGE", "state": "MA", "zip": "01266"},
+        }
+        return {"result": {"addressMatches": [match]}}
+
+    clients = DeriveClients(fetch_json=census)
+    first = geocode_address("1 Main St,  West Stockbridge, MA", clients)
+    again = geocode_address(" 1 MAIN ST, west stockbridge, ma", clients)
+
+    assert len(fetched) == 1
+    assert "address=1+Main+St%2C+West+Stockbridge%2C+MA" in fetched[0]
+    assert again == first
+    assert again[0].full_site_address == first[0].full_site_address
+    assert _stats("address").hits == 1
+
+
+def test_address_searches_with_no_matches_are_not_cached(geodata_cache: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(derive, "search_localities", lambda _query, _index: [])
+    monkeypatch.setattr(derive, "load_locality_index", lambda: None)
+    fetched: list[str] = []
+
+    def census(url: str) -> dict[str, object]:
+        fetched.append(url)
+        return {"result": {"addressMatches": []}}
+
+    clients = DeriveClients(fetch_json=census)
+
+    assert geocode_address("1 Nowhere Rd, West Stockbridge, MA", clients) == []
+    assert geocode_address("1 Nowhere Rd, West Stockbridge, MA", clients) == []
+    assert len(fetched) == 2
+    address = _stats("address")
+    assert (address.hits, address.failures, address.shared_entries) == (0, 2, 0)
@@ -0,0 +1,216 @@
+"""Compiled, memory-mapped Census locality index: parity, rebuilds, prefix and nearest search."""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+import pytest
+
+from features.project_location import locality_index
+from features.project_location.locality_columns import LocalityColumns
+from features.project_location.locality_contract import LOCALITY_COLUMNS, ZCTA_COLUMNS
+from features.project_location.locality_index import (
+    LocalityIndexError,
+    clear_locality_index_cache,
+    load_locality_index,
+    nearest_localities,
+    search_localities,
+    suggest_localities,
+    write_compiled_locality_index,
+)
+from scripts.compile_locality_index import main as compile_locality_index_main
+
+LOCALITY_ROWS: tuple[tuple[str, ...], ...] = tuple(
+    tuple(line.split(","))
+    for line in (
+        "place,NJ,34,,Springfield,springfield,Springfield CDP,3470020,S,40.697966,-74.317116",
+        "county_subdivision,NJ,34,005,Springfield,springfield,Springfield township,3400570020,A,40.039565,-74.716713",
+        "county_subdivision,NJ,34,039,Springfield,springfield,Springfield township,3403970050,A,40.706073,-74.32754",
+        "place,NJ,34,,Spring Lake,spring lake,Spring Lake borough,3470050,A,40.153,-74.028",
+        "place,MA,25,,Springfield,springfield,Springfield city,2567000,A,42.1015,-72.5898",
+        "place,MA,25,,West Stockbridge,west stockbridge,West Stockbridge CDP,2575000,S,42.312354,-73.388044",
+        "county_subdivision,MA,25,003,West Stockbridge,west stockbridge,"
+        "West Stockbridge town,2500378690,A,42.334,-73.367",
+        "place,PR,72,,Añasco,anasco,Añasco zona urbana,7202000,S,18.2833,-67.14",
+    )
+)
+ZCTA_ROWS: tuple[tuple[str, ...], ...] = (("07081", "40.698", "-74.318"), ("01266", "42.31", "-73.39"))
+
+
+def install_locality_fixture(
+    directory: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    localities: Sequence[tuple[str, ...]] = LOCALITY_ROWS,
+    zctas: Sequence[tuple[str, ...]] = ZCTA_ROWS,
+) -> Path:
+    """Point the loader at CSV artifacts and metadata written to ``directory``.
+
+    Returns the path the compiled index will be written to.
+    """
+    locality_path = directory / "census_localities_2025.csv"
+    zcta_path = directory / "census_zctas_2025.csv"
+    metadata_path = directory / "census_localities_2025.metadata.json"
+    compiled_path = directory / "census_localities_2025.idx"
+    locality_path.write_bytes(_csv_bytes(LOCALITY_COLUMNS, [(*row, "2025") for row in localities]))
+    zcta_path.write_bytes(_csv_bytes(ZCTA_COLUMNS, [(*row, "2025") for row in zctas]))
+    metadata_path.write_text(
+        json.dumps(
+            {
+                "schema_version": 1,
+                "source_vintage": "2025",
+                "county_subdivision_funcstat_allowlist": ["A", "B", "C", "G"],
+                "place_funcstat_allowlist": ["A", "B", "C", "G", "S"],
+                "artifacts": {
+                    path.name: {"rows": rows, "sha256": hashlib.sha256(path.read_bytes()).hexdigest()}
+                    for path, rows in ((locality_path, len(localities)), (zcta_path, len(zctas)))
+                },
+            }
+        )
+    )
+    monkeypatch.setattr(locality_index, "_LOCALITY_PATH", locality_path)
+    monkeypatch.setattr(locality_index, "_ZCTA_PATH", zcta_path)
+    monkeypatch.setattr(locality_index, "_METADATA_PATH", metadata_path)
+    monkeypatch.setattr(locality_index, "_COMPILED_PATH", compiled_path)
+    clear_locality_index_cache()
+    return compiled_path
+
+
+def _csv_bytes(columns: Sequence[str], rows: Sequence[tuple[str, ...]]) -> bytes:
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+@pytest.fixture()
+def compiled_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    yield install_locality_fixture(tmp_path, monkeypatch)
+    clear_locality_index_cache()
+
+
+def test_compiled_index_answers_like_the_csv_rows_and_is_mapped_on_later_loads(
+    compiled_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = search_localities("Springfield, NJ 07081")
+
+    assert compiled_path.exists()
+    assert [candidate.label for candidate in first] == [
+        "Springfield, NJ 07081 — Place",
+        "Springfield, NJ 07081 — Town / county subdivision, Union County",
+        "Springfield, NJ 07081 — Town / county subdivision, Burlington County",
+    ]
+    assert [candidate.latitude for candidate in first] == [40.697966, 40.706073, 40.039565]
+    # Every row decodes back to exactly what the CSV validator produced.
+    csv_records = locality_index._read_localities(
+        locality_index._LOCALITY_PATH.read_bytes(), expected_rows=len(LOCALITY_ROWS)
+    )
+    columns = load_locality_index().localities
+    assert len(columns) == len(csv_records)
+    for record in csv_records:
+        assert record in columns.matches(record.state, record.normalized_name)
+    assert columns.matches("NJ", "springfiel") == []
+    assert columns.zcta("01266") is not None
+    assert columns.zcta("99999") is None
+
+    def unexpected_parse(*_args: object, **_kwargs: object) -> object:
+        raise AssertionError("A current compiled index must not reparse the CSVs")
+
+    monkeypatch.setattr(locality_index, "_read_localities", unexpected_parse)
+    clear_locality_index_cache()
+    assert search_localities("Springfield, NJ 07081") == first
+
+
+def test_stale_or_damaged_compiled_index_is_rebuilt_but_bad_csvs_stay_fatal(
+    compiled_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    write_compiled_locality_index()
+    compiled = bytearray(compiled_path.read_bytes())
+    compiled[-1] ^= 0xFF
+    compiled_path.write_bytes(compiled)
+
+    assert [candidate.label for candidate in search_localities("West Stockbridge, MA")] == [
+        "West Stockbridge, MA — Place",
+        "West Stockbridge, MA — Town / county subdivision, Berkshire County",
+    ]
+    assert compiled_path.read_bytes() != bytes(compiled)
+
+    # New artifacts: the compiled file no longer matches their hashes.
+    install_locality_fixture(tmp_path, monkeypatch, localities=LOCALITY_ROWS[:1])
+    assert len(load_locality_index().localities) == 1
+
+    # A current compiled file already holds the verified rows, but one that
+    # must be recompiled from a CSV failing its integrity check is fatal.
+    compiled_path.unlink()
+    locality_index._LOCALITY_PATH.write_text("tampered")
+    clear_locality_index_cache()
+    with pytest.raises(LocalityIndexError, match="integrity"):
+        load_locality_index()
+
+
+def test_unwritable_compiled_path_serves_the_index_from_memory(
+    compiled_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(locality_index, "_COMPILED_PATH", tmp_path / "missing-dir" / compiled_path.name)
+    clear_locality_index_cache()
+
+    assert [candidate.city for candidate in search_localities("Añasco, PR")] == ["Añasco"]
+
+
+def test_compiled_index_rejects_other_artifacts(compiled_path: Path) -> None:
+    write_compiled_locality_index()
+    with pytest.raises(ValueError, match="other artifacts"):
+        LocalityColumns.open(compiled_path, sources={"census_localities_2025.csv": {"rows": 1, "sha256": "0"}})
+
+
+def test_suggestions_follow_typed_prefix_and_optional_state(compiled_path: Path) -> None:
+    everywhere = suggest_localities("spring")
+    in_new_jersey = suggest_localities("Spring, nj")
+
+    assert [candidate.label for candidate in everywhere] == [
+        "Spring Lake, NJ",
+        "Springfield, MA",
+        "Springfield, NJ — Place",
+        "Springfield, NJ — Town / county subdivision, Burlington County",
+        "Springfield, NJ — Town / county subdivision, Union County",
+    ]
+    assert all(candidate.result_type == "locality" and candidate.postal_code is None for candidate in everywhere)
+    assert in_new_jersey == [everywhere[0], *everywhere[2:]]
+    # A state still being typed does not filter yet.
+    assert suggest_localities("spring, n") == everywhere
+    assert [candidate.city for candidate in suggest_localities("ANAS")] == ["Añasco"]
+    assert len(suggest_localities("spring", limit=2)) == 2
+    assert suggest_localities(" , ") == []
+    assert suggest_localities("springs") == []
+
+
+def test_nearest_localities_rank_internal_points_by_distance(compiled_path: Path) -> None:
+    candidates = nearest_localities(42.32, -73.38, limit=3)
+
+    assert [candidate.label for candidate in candidates] == [
+        "West Stockbridge, MA — Place",
+        "West Stockbridge, MA — Town / county subdivision, Berkshire County",
+        "Springfield, MA",
+    ]
+    assert (candidates[0].latitude, candidates[0].longitude) == (42.312354, -73.388044)
+
+
+def test_compile_script_reports_bad_csvs_without_failing_the_build(
+    compiled_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    compile_locality_index_main([])
+    assert compiled_path.exists()
+    assert "Wrote compiled locality index" in capsys.readouterr().out
+
+    compiled_path.unlink()
+    locality_index._LOCALITY_PATH.unlink()
+    compile_locality_index_main([])
+
+    assert not compiled_path.exists()
+    assert "Skipped compiling the locality index" in capsys.readouterr().err
@@ -0,0 +1,130 @@
+"""Perf gate for the memory-mapped locality index against the CSV loader it replaced.
+
+Marked ``perf``: deselected from the default (parallel) run; CI runs it
+serially with ``-m perf``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pytest
+
+from features.project_location import locality_index
+from features.project_location.locality_columns import LocalityColumns, LocalityRecord
+from features.project_location.locality_contract import normalize_locality_name
+from features.project_location.locality_index import clear_locality_index_cache
+from tests.test_project_location_locality_index import install_locality_fixture
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "locality_index_perf.json"
+SYLLABLES = ("ash", "bel", "cor", "dun", "el", "fair", "glen", "har", "iv", "kings", "lake", "mar", "nor", "oak")
+SUFFIXES = ("", "ton", "ville", "field", "burg", " city", " springs", " heights")
+STATES = ("MA", "NJ", "NY", "PA", "OH", "CA", "TX", "WA", "CO", "GA")
+
+
+def _synthetic_rows(count: int) -> list[tuple[str, ...]]:
+    rng = random.Random(2025)
+    rows: list[tuple[str, ...]] = []
+    for position in range(count):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).title() + rng.choice(SUFFIXES)
+        subdivision = position % 3 == 0
+        rows.append(
+            (
+                "county_subdivision" if subdivision else "place",
+                rng.choice(STATES),
+                "34",
+                f"{position % 1000:03d}" if subdivision else "",
+                name,
+                normalize_locality_name(name),
+                f"{name} {'town' if subdivision else 'city'}",
+                f"{position:010d}",
+                "A",
+                f"{rng.uniform(25, 49):.6f}",
+                f"{rng.uniform(-124, -67):.6f}",
+            )
+        )
+    return rows
+
+
+@pytest.fixture()
+def large_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[list[tuple[str, ...]]]:
+    rows = _synthetic_rows(50_000)
+    zctas = [(f"{code:05d}", "40.000000", "-74.000000") for code in range(1000, 35_000)]
+    install_locality_fixture(tmp_path, monkeypatch, localities=rows, zctas=zctas)
+    locality_index.write_compiled_locality_index()
+    yield rows
+    clear_locality_index_cache()
+
+
+def _median_seconds(operation: Callable[[], object], repeats: int) -> float:
+    samples: list[float] = []
+    for _ in range(repeats):
+        start = perf_counter()
+        operation()
+        samples.append(perf_counter() - start)
+    return median(samples)
+
+
+def _csv_load() -> dict[tuple[str, str], list[LocalityRecord]]:
+    """The replaced loader: verify and parse both CSVs, then group in dicts."""
+    metadata = locality_index._read_metadata(locality_index._METADATA_PATH)
+    localities = locality_index._read_localities(
+        locality_index._validated_artifact(locality_index._LOCALITY_PATH, metadata),
+        expected_rows=locality_index._artifact_rows(metadata, locality_index._LOCALITY_PATH.name),
+    )
+    locality_index._read_zctas(
+        locality_index._validated_artifact(locality_index._ZCTA_PATH, metadata),
+        expected_rows=locality_index._artifact_rows(metadata, locality_index._ZCTA_PATH.name),
+    )
+    grouped: defaultdict[tuple[str, str], list[LocalityRecord]] = defaultdict(list)
+    for record in localities:
+        grouped[(record.state, record.normalized_name)].append(record)
+    return grouped
+
+
+def _mapped_load() -> LocalityColumns:
+    metadata = locality_index._read_metadata(locality_index._METADATA_PATH)
+    return LocalityColumns.open(locality_index._COMPILED_PATH, sources=locality_index._compiled_sources(metadata))
+
+
+@pytest.mark.perf
+def test_mapped_locality_index_perf_gate(large_index: list[tuple[str, ...]]) -> None:
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    csv_load_s = _median_seconds(_csv_load, 3)
+    mapped_load_s = _median_seconds(_mapped_load, 7)
+    grouped = _csv_load()
+    columns = _mapped_load()
+    queries = [(row[1], row[5]) for row in large_index[:: len(large_index) // 200]]
+
+    def exact() -> None:
+        for state, name in queries:
+            assert set(columns.matches(state, name)) == set(grouped[(state, name)])
+
+    def prefix() -> None:
+        for _state, name in queries:
+            columns.prefix_matches(name[:3], limit=10)
+
+    def nearest() -> None:
+        for latitude in range(30, 50):
+            columns.nearest(latitude, -90.0, limit=5)
+
+    columns.nearest(40.0, -90.0, limit=1)  # Build the coordinate index outside the timing.
+    exact_us = _median_seconds(exact, 5) / len(queries) * 1e6
+    prefix_us = _median_seconds(prefix, 5) / len(queries) * 1e6
+    nearest_ms = _median_seconds(nearest, 5) / 20 * 1000
+
+    load_ratio = mapped_load_s / csv_load_s
+    timings = (
+        f"CSV load {csv_load_s * 1000:.1f}ms, mapped load {mapped_load_s * 1000:.2f}ms, "
+        f"exact {exact_us:.1f}us, prefix {prefix_us:.1f}us, nearest {nearest_ms:.2f}ms"
+    )
+    assert load_ratio < float(baseline["mapped_to_csv_load_max_ratio"]), timings
+    assert exact_us < float(baseline["exact_query_max_us"]), timings
+    assert prefix_us < float(baseline["prefix_query_max_us"]), timings
+    assert nearest_ms < float(baseline["nearest_query_max_ms"]), timings
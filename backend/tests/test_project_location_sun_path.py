@@ -15,8 +15,11 @@ from fastapi.testclient import TestClient
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ToolError
 
+from database import connection
+from features.project_location import sun_path_cache
 from features.project_location.mcp import tool_get_project_sun_path
-from features.project_location.sun_path import build_sun_path, utc_offset_hours
+from features.project_location.sun_path import build_sun_path, build_sun_path_at_offset, utc_offset_hours
+from features.project_location.sun_path_cache import reset_sun_path_cache
 from features.project_location.sun_path_schemas import SunPathAndCompassDTOSchema
 from main import app
 from tests.test_mcp import ORIGIN, clean_mcp_tables, create_project, signed_in_client
@@ -209,6 +212,42 @@ def test_grid_payload_size_bounded() -> None:
     assert len(raw) < 500_000
 
 
+@pytest.mark.parametrize(
+    ("latitude", "longitude", "utc_offset", "true_north_deg"),
+    [(_LAT, _LON, -5.0, 0.0), (-33.87, 151.21, 10.0, 270.0), (78.2, 15.6, 1.0, 37.5)],
+)
+def test_grid_matches_ladybug_sunpath(
+    latitude: float, longitude: float, utc_offset: float, true_north_deg: float
+) -> None:
+    """The vectorized grid reproduces ladybug's per-hour Sunpath calls."""
+    from ladybug.dt import DateTime
+    from ladybug.location import Location
+    from ladybug.sunpath import Sunpath
+
+    grid = build_sun_path_at_offset(
+        latitude=latitude,
+        longitude=longitude,
+        elevation_m=0.0,
+        true_north_deg=true_north_deg,
+        utc_offset=utc_offset,
+    ).sun_positions
+    sun_path = Sunpath.from_location(
+        Location(latitude=latitude, longitude=longitude, time_zone=utc_offset), true_north_deg, None
+    )
+
+    for hoy, grid_vector in enumerate(grid.unit_vectors):
+        vector = sun_path.calculate_sun_from_hoy(hoy).sun_vector_reversed
+        assert grid_vector == pytest.approx((vector.x, vector.y, vector.z), abs=1e-4)
+    for day_index, (sunrise, sunset) in enumerate(grid.sunrise_sunset):
+        noon = DateTime.from_hoy(day_index * 24 + 12)
+        edges = sun_path.calculate_sunrise_sunset(noon.month, noon.day)
+        for grid_edge, edge in ((sunrise, edges["sunrise"]), (sunset, edges["sunset"])):
+            if edge is None:
+                assert grid_edge is None
+            else:
+                assert grid_edge == pytest.approx(edge.float_hour, abs=1e-3)
+
+
 # --- Route ------------------------------------------------------------------
 
 
@@ -258,6 +297,42 @@ def test_route_returns_diagram_for_located_project(clean_mcp_tables: None) -> No
     assert len(body["compass"]["major_azimuth_ticks"]) == 4
 
 
+def test_route_serves_cached_diagram_until_location_changes(
+    clean_mcp_tables: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = signed_in_client()
+    project = create_project(client)
+    project_id = cast(str, project["id"])
+    save_location(client, project_id, latitude=_LAT, longitude=_LON, time_zone="America/New_York")
+    reset_sun_path_cache()
+    builds: list[float] = []
+
+    def counting_build(**kwargs: float) -> SunPathAndCompassDTOSchema:
+        builds.append(kwargs["latitude"])
+        return build_sun_path_at_offset(**kwargs)
+
+    monkeypatch.setattr(sun_path_cache, "build_sun_path_at_offset", counting_build)
+    url = f"/api/v1/projects/{project_id}/sun-path"
+
+    first = TestClient(app).get(url)
+    assert TestClient(app).get(url).content == first.content
+    # A fresh process reads the persisted row instead of rebuilding.
+    reset_sun_path_cache()
+    assert TestClient(app).get(url).content == first.content
+    assert builds == [_LAT]
+    with connection() as conn:
+        rows = conn.execute("SELECT cache_key FROM project_sun_paths").fetchall()
+    assert len(rows) == 1
+
+    save_location(client, project_id, true_north_deg=90.0)
+    moved = TestClient(app).get(url).json()
+
+    assert builds == [_LAT, _LAT]
+    assert moved["sun_positions"]["true_north_deg"] == 90.0
+    with connection() as conn:
+        assert conn.execute("SELECT cache_key FROM project_sun_paths").fetchall() != rows
+
+
 # --- MCP parity -------------------------------------------------------------
 
 
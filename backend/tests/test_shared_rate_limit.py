@@ -0,0 +1,114 @@
+"""Shared rate limiter: algorithms, memory bounds, the Postgres store, metrics."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi import HTTPException
+
+from config import settings
+from features.shared import rate_limit
+from features.shared.rate_limit import (
+    RateLimitBudget,
+    apply_hit,
+    check_rate_limit,
+    enforce_rate_limit,
+    rate_limit_stats,
+    reset_rate_limits,
+)
+
+
+@pytest.fixture
+def limiter() -> Iterator[None]:
+    reset_rate_limits()
+    yield
+    reset_rate_limits()
+
+
+def _run(budget: RateLimitBudget, times: list[float]) -> list[bool]:
+    state = None
+    verdicts = []
+    for now in times:
+        state, decision = apply_hit(budget, state, now)
+        verdicts.append(decision.allowed)
+    return verdicts
+
+
+def test_sliding_window_weights_the_previous_window() -> None:
+    budget = RateLimitBudget("test", 3, period_seconds=60)
+    state = None
+    for now in (1.0, 2.0, 3.0):
+        state, decision = apply_hit(budget, state, now)
+        assert decision.allowed
+    state, denied = apply_hit(budget, state, 4.0)
+    assert not denied.allowed
+    # Three hits in the previous window still weigh 3 * 0.5 at mid-window,
+    # so one more hit fits at 90s and a fifth only later.
+    assert denied.retry_after_seconds == pytest.approx(56 + 20)
+    assert _run(budget, [1.0, 2.0, 3.0, 90.0, 90.5]) == [True, True, True, True, False]
+    # Two windows on, the old hits no longer count.
+    assert _run(budget, [1.0, 2.0, 3.0, 121.0, 121.5, 122.0, 122.5]) == [True] * 6 + [False]
+
+
+def test_token_bucket_absorbs_a_burst_then_refills_evenly() -> None:
+    budget = RateLimitBudget("test", 6, period_seconds=60, algorithm="token_bucket")
+    state = None
+    for _ in range(6):
+        state, decision = apply_hit(budget, state, 0.0)
+        assert decision.allowed
+    state, denied = apply_hit(budget, state, 0.0)
+    assert not denied.allowed
+    assert denied.retry_after_seconds == pytest.approx(10)
+    assert apply_hit(budget, state, 10.0)[1].allowed
+    # Denied hits spend nothing: a hammering client still refills.
+    assert _run(budget, [0.0] * 20 + [10.0]) == [True] * 6 + [False] * 14 + [True]
+
+
+def test_memory_store_prunes_idle_keys_and_caps_each_budget(limiter: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(settings, "rate_limit_memory_max_keys", 2)
+    store = rate_limit._MemoryStore()
+    budget = RateLimitBudget("test", 5, period_seconds=10)
+
+    for key in ("a", "b", "c"):
+        store.hit(budget, key)
+    assert store.tracked_keys("test") == 2  # "a", least recently hit, was evicted
+
+    clock[0] += 55
+    store.hit(budget, "c")
+    clock[0] += 10  # the prune interval has passed: "b" idle 65s, "c" 10s
+    store.hit(budget, "d")
+    assert list(store._buckets["test"]) == ["c", "d"]
+
+
+def test_postgres_store_shares_one_budget_across_workers(limiter: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "rate_limit_backend", "postgres")
+    reset_rate_limits()
+    budget = RateLimitBudget("shared", 2)
+    worker_a, worker_b = rate_limit._PostgresStore(), rate_limit._PostgresStore()
+
+    assert worker_a.hit(budget, "203.0.113.9").allowed
+    assert worker_b.hit(budget, "203.0.113.9").allowed
+    assert not worker_a.hit(budget, "203.0.113.9").allowed
+    assert worker_b.hit(budget, "198.51.100.1").allowed
+    assert worker_a.tracked_keys("shared") == 2
+
+    assert check_rate_limit(budget, "198.51.100.1").allowed
+    assert not check_rate_limit(budget, "198.51.100.1").allowed
+    [stats] = [row for row in rate_limit_stats() if row.budget == "shared"]
+    assert (stats.backend, stats.allowed, stats.limited, stats.tracked_keys) == ("postgres", 1, 1, 2)
+
+
+def test_enforce_reports_when_to_retry(limiter: None) -> None:
+    budget = RateLimitBudget("test", 1, period_seconds=30, algorithm="token_bucket")
+    enforce_rate_limit(budget, "k", "slow down")
+
+    with pytest.raises(HTTPException) as raised:
+        enforce_rate_limit(budget, "k", "slow down")
+
+    assert raised.value.status_code == 429
+    assert isinstance(raised.value.detail, dict)
+    assert raised.value.detail["error_code"] == "rate_limited"
+    assert 0 < raised.value.detail["details"]["retry_after_seconds"] <= 30
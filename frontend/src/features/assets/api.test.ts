@@ -1,7 +1,8 @@
 // @vitest-environment jsdom
 import { afterEach, describe, expect, it, vi } from "vitest";
 
-import { AssetDownloadError, bulkDownloadAssetId, downloadAsset } from "./api";
+import { AssetDownloadError, bulkDownloadAssetId, downloadAsset, waitForJob } from "./api";
+import type { JobResponse } from "./types";
 
 const ERROR_CASES = [
   [
@@ -129,3 +130,74 @@ describe("bulkDownloadAssetId", () => {
     ).toThrow("Could not prepare this download. Try again.");
   });
 });
+
+describe("waitForJob", () => {
+  const pending: JobResponse = {
+    id: "job-1",
+    project_id: "project-1",
+    job_type: "asset_bulk_download",
+    status: "pending",
+    progress: 0,
+    result_asset_id: null,
+    error_code: null,
+    status_url: "/api/v1/projects/project-1/jobs/job-1",
+  };
+  const jobResponse = (job: JobResponse) =>
+    new Response(JSON.stringify(job), { status: 200, headers: { "Content-Type": "application/json" } });
+
+  it("polls the status URL until the job settles", async () => {
+    const responses: JobResponse[] = [
+      { ...pending, status: "running", progress: 40 },
+      { ...pending, status: "completed", progress: 100, result_asset_id: "asset-9" },
+    ];
+    const fetchMock = vi.fn(
+      async (_input: RequestInfo | URL) =>
+        new Response(JSON.stringify(responses.shift()), {
+          status: 200,
+          headers: { "Content-Type": "application/json" },
+        }),
+    );
+    vi.stubGlobal("fetch", fetchMock);
+
+    const job = await waitForJob("project-1", pending, { intervalMs: 0 });
+
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(String(fetchMock.mock.calls[0][0])).toContain("/api/v1/projects/project-1/jobs/job-1");
+    expect(bulkDownloadAssetId(job)).toBe("asset-9");
+  });
+
+  it("retries a status read that failed on the server", async () => {
+    const fetchMock = vi
+      .fn<(input: RequestInfo | URL) => Promise<Response>>()
+      .mockResolvedValueOnce(new Response("", { status: 503, statusText: "Service Unavailable" }))
+      .mockResolvedValueOnce(jobResponse({ ...pending, status: "completed", result_asset_id: "asset-9" }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    const job = await waitForJob("project-1", pending, { intervalMs: 0 });
+
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(job.status).toBe("completed");
+  });
+
+  it("gives up once the job runs past the wait limit", async () => {
+    const fetchMock = vi.fn(async () => jobResponse({ ...pending, status: "running" }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    await expect(waitForJob("project-1", pending, { intervalMs: 10, maxWaitMs: 25 })).rejects.toThrow(
+      "This download is taking too long to prepare. Try again later.",
+    );
+    expect(fetchMock.mock.calls.length).toBeLessThanOrEqual(2);
+  });
+
+  it("stops polling when the caller aborts", async () => {
+    const fetchMock = vi.fn(async () => jobResponse({ ...pending, status: "running" }));
+    vi.stubGlobal("fetch", fetchMock);
+    const controller = new AbortController();
+
+    const waiting = waitForJob("project-1", pending, { intervalMs: 1000, signal: controller.signal });
+    controller.abort();
+
+    await expect(waiting).rejects.toThrow();
+    expect(fetchMock).not.toHaveBeenCalled();
+  });
+});
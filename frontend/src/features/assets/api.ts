@@ -135,13 +135,82 @@ export async function startBulkDownload(args: {
   tableKey?: string;
   columnKey?: string;
   kind?: AssetKind;
+  signal?: AbortSignal;
 }): Promise<JobResponse> {
-  return fetchJson<JobResponse>(`/api/v1/projects/${args.projectId}/assets/bulk-download`, {
-    method: "POST",
-    body: JSON.stringify({
-      filter: { table_key: args.tableKey, column_key: args.columnKey, kind: args.kind },
-      include_manifest_csv: true,
-    }),
+  const job = await fetchJson<JobResponse>(
+    `/api/v1/projects/${args.projectId}/assets/bulk-download`,
+    {
+      method: "POST",
+      body: JSON.stringify({
+        filter: { table_key: args.tableKey, column_key: args.columnKey, kind: args.kind },
+        include_manifest_csv: true,
+      }),
+      signal: args.signal,
+    },
+  );
+  return waitForJob(args.projectId, job, { signal: args.signal });
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+// Longer than the server's 10-minute cutoff for a job whose worker stopped, so
+// a dead job normally comes back failed before the client gives up on it.
+const JOB_MAX_WAIT_MS = 15 * 60 * 1000;
+const JOB_MAX_RETRY_DELAY_MS = 30_000;
+
+export type WaitForJobOptions = {
+  intervalMs?: number;
+  maxWaitMs?: number;
+  signal?: AbortSignal;
+};
+
+// The bundle is built in the background; poll the job until it settles, the
+// wait runs past `maxWaitMs`, or `signal` aborts. A status read that fails
+// with a network error or a 5xx (a deploy restarting the API) is retried
+// with a doubling delay; other errors end the wait.
+export async function waitForJob(
+  projectId: string,
+  job: JobResponse,
+  { intervalMs = JOB_POLL_INTERVAL_MS, maxWaitMs = JOB_MAX_WAIT_MS, signal }: WaitForJobOptions = {},
+): Promise<JobResponse> {
+  const statusUrl = job.status_url ?? `/api/v1/projects/${projectId}/jobs/${job.id}`;
+  const deadline = Date.now() + maxWaitMs;
+  let current = job;
+  let delayMs = intervalMs;
+  while (current.status === "pending" || current.status === "running") {
+    if (Date.now() + delayMs > deadline) {
+      throw new Error("This download is taking too long to prepare. Try again later.");
+    }
+    await abortableDelay(delayMs, signal);
+    try {
+      current = await fetchJson<JobResponse>(statusUrl, { signal });
+      delayMs = intervalMs;
+    } catch (error) {
+      if (signal?.aborted || !isRetryableJobPollError(error)) throw error;
+      delayMs = Math.min(Math.max(delayMs * 2, intervalMs), JOB_MAX_RETRY_DELAY_MS);
+    }
+  }
+  return current;
+}
+
+function isRetryableJobPollError(error: unknown): boolean {
+  return !(error instanceof ApiRequestError) || error.status >= 500;
+}
+
+function abortableDelay(ms: number, signal?: AbortSignal): Promise<void> {
+  return new Promise((resolve, reject) => {
+    if (signal?.aborted) {
+      reject(signal.reason);
+      return;
+    }
+    const onAbort = () => {
+      clearTimeout(timer);
+      reject(signal?.reason);
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener("abort", onAbort);
+      resolve();
+    }, ms);
+    signal?.addEventListener("abort", onAbort, { once: true });
   });
 }
 
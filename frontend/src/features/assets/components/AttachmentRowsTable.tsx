@@ -1,4 +1,4 @@
-import { useCallback, useMemo } from "react";
+import { useCallback, useEffect, useMemo, useRef } from "react";
 import {
   ALL_FIELD_LOCKS,
   DataTable,
@@ -35,6 +35,13 @@ export function AttachmentRowsTable({
   onReplaceRows: (rows: AttachmentRow[]) => Promise<void>;
 }) {
   const { downloadError, runDownload } = useAssetDownload();
+  // Stop polling bulk-download jobs once the table is gone.
+  const unmounted = useRef(new AbortController());
+  useEffect(() => {
+    const controller = new AbortController();
+    unmounted.current = controller;
+    return () => controller.abort();
+  }, []);
   const rows = useMemo(() => (Array.isArray(slice.rows) ? slice.rows : []), [slice.rows]);
 
   const replaceCell = useCallback(
@@ -113,6 +120,7 @@ export function AttachmentRowsTable({
         tableKey: tableName,
         columnKey: fieldKey,
         kind: config.assetKind,
+        signal: unmounted.current.signal,
       });
       await downloadAsset(projectId, bulkDownloadAssetId(job));
     });